@@ -3,7 +3,9 @@
 Prepare static LIPID MAPS data for fast, reliable metabolite matching.
 
 This script creates an optimized lookup structure from LIPID MAPS data,
-enabling O(1) matching without any external dependencies.
+enabling O(1) matching without any external dependencies. Indices are saved
+as JSON (portable) and as a compact binary index that LIPID_MAPS_STATIC_MATCH
+memory-maps instead of parsing.
 """
 
 import pandas as pd
@@ -12,6 +14,8 @@ from pathlib import Path
 from datetime import datetime
 import logging
 
+from core.infrastructure.lookup_index import index_from_static_json
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -156,7 +160,7 @@ def prepare_lipidmaps_indices(df: pd.DataFrame) -> dict:
 
 
 def save_indices(indices: dict, output_dir: Path = Path("data")):
-    """Save indices to JSON file for fast loading."""
+    """Save indices as JSON and as a memory-mappable binary index."""
     
     output_dir.mkdir(exist_ok=True)
     
@@ -170,6 +174,11 @@ def save_indices(indices: dict, output_dir: Path = Path("data")):
     
     logger.info(f"Saved LIPID MAPS indices to {output_file}")
     
+    # Binary index, preferred by the matcher
+    index_file = output_dir / f"lipidmaps_static_{version}.idx"
+    index_from_static_json(indices, meta={"version": version}).save(index_file)
+    logger.info(f"Saved binary LIPID MAPS index to {index_file}")
+    
     # Also save statistics
     stats = {
         "version": version,
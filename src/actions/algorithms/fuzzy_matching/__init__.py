@@ -28,6 +28,8 @@ Development:
 
 # Import fuzzy matching functions
 # from .string_similarity import calculate_similarity, batch_fuzzy_match  # To be implemented
+from .fuzzy_index import FuzzyIndex, FuzzyMatch, token_sort_key
+from .vector_index import VectorIndex, normalize_rows
 # from .semantic_similarity import semantic_similarity                    # To be implemented
 
-__all__ = []  # Functions will be exported when implemented
+__all__ = ["FuzzyIndex", "FuzzyMatch", "token_sort_key", "VectorIndex", "normalize_rows"]
@@ -0,0 +1,264 @@
+"""Reusable fuzzy lookup index over reference names.
+
+Scoring every query against every reference name with
+``process.extractOne`` is O(queries x references) in Python. ``FuzzyIndex``
+prepares the references once and then, per query:
+
+1. restricts candidates to names whose length can reach the score cutoff
+   (exact: a token-sort ratio is bounded by the length difference),
+2. ranks those candidates by shared character n-grams using an inverted
+   index and keeps the best ``max_candidates``,
+3. scores the remaining candidates in one vectorized call (rapidfuzz when
+   installed).
+
+Small references (``exhaustive_limit``) skip step 2 and are scored in
+full with ``cdist``, so results there are identical to exhaustive search.
+Reference names that normalize to the same key keep all their records.
+"""
+
+import logging
+import math
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# Optional dependency for vectorized scoring
+try:
+    from rapidfuzz import fuzz as rf_fuzz
+    from rapidfuzz import process as rf_process
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    from fuzzywuzzy import fuzz as fw_fuzz  # type: ignore[import-untyped]
+    HAS_RAPIDFUZZ = False
+
+logger = logging.getLogger(__name__)
+
+_NON_ALNUM = re.compile(r"[\W_]+")
+
+# Queries scored per cdist call in exhaustive mode
+QUERY_BATCH_SIZE = 1024
+
+
+def token_sort_key(text: Any) -> str:
+    """Lowercase, strip punctuation and sort tokens (token-sort-ratio key)."""
+    if text is None:
+        return ""
+    tokens = _NON_ALNUM.sub(" ", str(text)).lower().split()
+    return " ".join(sorted(tokens))
+
+
+@dataclass
+class FuzzyMatch:
+    """Best reference match for one query."""
+
+    key: str
+    score: float
+    payloads: List[Any] = field(default_factory=list)
+
+
+class FuzzyIndex:
+    """Token-sort fuzzy index with n-gram candidate pruning."""
+
+    def __init__(
+        self,
+        names: Sequence[Any],
+        payloads: Optional[Sequence[Any]] = None,
+        ngram_size: int = 3,
+        max_candidates: int = 256,
+        exhaustive_limit: int = 5000,
+        max_gram_fraction: float = 0.1,
+    ):
+        """
+        Build the index.
+
+        Args:
+            names: Reference names
+            payloads: Record returned for each name (defaults to the name)
+            ngram_size: Character n-gram length for candidate pruning
+            max_candidates: Candidates scored per query after pruning
+            exhaustive_limit: Up to this many distinct keys every query is
+                scored against every key
+            max_gram_fraction: N-grams occurring in more than this fraction
+                of keys are too common to prune with and are ignored
+        """
+        if payloads is None:
+            payloads = names
+        if len(payloads) != len(names):
+            raise ValueError("names and payloads must have the same length")
+
+        self.ngram_size = ngram_size
+        self.max_candidates = max_candidates
+
+        groups: Dict[str, List[Any]] = {}
+        for name, payload in zip(names, payloads):
+            key = token_sort_key(name)
+            if key:
+                groups.setdefault(key, []).append(payload)
+
+        self.keys: List[str] = list(groups)
+        self._payloads: List[List[Any]] = list(groups.values())
+        self._lengths = np.fromiter(
+            (len(k) for k in self.keys), dtype=np.int32, count=len(self.keys)
+        )
+        self._by_length = np.argsort(self._lengths, kind="stable")
+        self._sorted_lengths = self._lengths[self._by_length]
+        self.exhaustive = len(self.keys) <= exhaustive_limit
+
+        self._postings: Dict[str, np.ndarray] = {}
+        if not self.exhaustive:
+            postings: Dict[str, List[int]] = defaultdict(list)
+            for key_id, key in enumerate(self.keys):
+                for gram in self._grams(key):
+                    postings[gram].append(key_id)
+            max_postings = max(1, int(len(self.keys) * max_gram_fraction))
+            self._postings = {
+                gram: np.asarray(ids, dtype=np.int32)
+                for gram, ids in postings.items()
+                if len(ids) <= max_postings
+            }
+
+        logger.debug(
+            f"Built fuzzy index: {len(names)} names, {len(self.keys)} keys, "
+            f"{len(self._postings)} n-grams"
+        )
+
+    def __len__(self) -> int:
+        """Number of distinct keys."""
+        return len(self.keys)
+
+    def _grams(self, key: str) -> set:
+        padded = f" {key} "
+        n = self.ngram_size
+        return {padded[i : i + n] for i in range(max(1, len(padded) - n + 1))}
+
+    @staticmethod
+    def _length_window(length: int, score_cutoff: float) -> tuple:
+        """Key lengths that can reach ``score_cutoff`` against ``length``."""
+        ratio = score_cutoff / 100.0
+        if ratio <= 0:
+            return 0, np.iinfo(np.int32).max
+        return (
+            math.ceil(length * ratio / (2.0 - ratio) - 1e-9),
+            math.floor(length * (2.0 - ratio) / ratio + 1e-9),
+        )
+
+    def _candidates(self, query_key: str, score_cutoff: float) -> np.ndarray:
+        """Key ids worth scoring for ``query_key``."""
+        low, high = self._length_window(len(query_key), score_cutoff)
+        start = np.searchsorted(self._sorted_lengths, low, side="left")
+        stop = np.searchsorted(self._sorted_lengths, high, side="right")
+        window = self._by_length[start:stop]
+
+        if self.exhaustive or len(window) <= self.max_candidates:
+            return window
+
+        postings = [
+            self._postings[gram]
+            for gram in self._grams(query_key)
+            if gram in self._postings
+        ]
+        if not postings:
+            # Only very common n-grams: score the whole length window
+            return window
+
+        ids, counts = np.unique(np.concatenate(postings), return_counts=True)
+        in_window = (self._lengths[ids] >= low) & (self._lengths[ids] <= high)
+        ids, counts = ids[in_window], counts[in_window]
+        if len(ids) > self.max_candidates:
+            top = np.argpartition(-counts, self.max_candidates - 1)
+            ids = ids[top[: self.max_candidates]]
+        return ids
+
+    def candidates(self, query: Any, score_cutoff: float = 0.0) -> List[Any]:
+        """
+        Payloads of the keys ``query`` would be scored against.
+
+        Lets callers with their own scoring use the index for blocking only.
+        """
+        query_key = token_sort_key(query)
+        if not query_key or not self.keys:
+            return []
+        return [
+            payload
+            for key_id in np.sort(self._candidates(query_key, score_cutoff))
+            for payload in self._payloads[key_id]
+        ]
+
+    def _score(self, query_key: str, candidate_keys: List[str]) -> np.ndarray:
+        if HAS_RAPIDFUZZ:
+            return rf_process.cdist(
+                [query_key], candidate_keys, scorer=rf_fuzz.ratio, dtype=np.float32
+            )[0]
+        return np.array(
+            [fw_fuzz.ratio(query_key, key) for key in candidate_keys], dtype=np.float32
+        )
+
+    def best_matches(
+        self, queries: Iterable[Any], score_cutoff: float = 0.0
+    ) -> List[Optional[FuzzyMatch]]:
+        """
+        Find the best-scoring reference key for each query.
+
+        Scores are token-sort ratios in 0-100. Ties resolve to the reference
+        inserted first.
+
+        Args:
+            queries: Query names
+            score_cutoff: Minimum score; weaker best matches yield None
+
+        Returns:
+            One FuzzyMatch or None per query, in query order
+        """
+        query_keys = [token_sort_key(q) for q in queries]
+        if not self.keys:
+            return [None] * len(query_keys)
+        if self.exhaustive and HAS_RAPIDFUZZ:
+            return self._best_matches_exhaustive(query_keys, score_cutoff)
+
+        results: List[Optional[FuzzyMatch]] = []
+        for query_key in query_keys:
+            if not query_key:
+                results.append(None)
+                continue
+            candidates = self._candidates(query_key, score_cutoff)
+            if len(candidates) == 0:
+                results.append(None)
+                continue
+            # Insertion order breaks ties, as with extractOne
+            candidates = np.sort(candidates)
+            scores = self._score(query_key, [self.keys[i] for i in candidates])
+            best = int(np.argmax(scores))
+            results.append(self._result(int(candidates[best]), scores[best], score_cutoff))
+        return results
+
+    def _best_matches_exhaustive(
+        self, query_keys: List[str], score_cutoff: float
+    ) -> List[Optional[FuzzyMatch]]:
+        """Score query batches against every key with one cdist call each."""
+        results: List[Optional[FuzzyMatch]] = []
+        for start in range(0, len(query_keys), QUERY_BATCH_SIZE):
+            batch = query_keys[start : start + QUERY_BATCH_SIZE]
+            scores = rf_process.cdist(
+                batch, self.keys, scorer=rf_fuzz.ratio, dtype=np.float32, workers=-1
+            )
+            best = scores.argmax(axis=1)
+            for row, query_key in enumerate(batch):
+                if not query_key:
+                    results.append(None)
+                    continue
+                key_id = int(best[row])
+                results.append(self._result(key_id, scores[row, key_id], score_cutoff))
+        return results
+
+    def _result(
+        self, key_id: int, score: float, score_cutoff: float
+    ) -> Optional[FuzzyMatch]:
+        score = float(score)
+        if score < score_cutoff:
+            return None
+        return FuzzyMatch(
+            key=self.keys[key_id], score=score, payloads=self._payloads[key_id]
+        )
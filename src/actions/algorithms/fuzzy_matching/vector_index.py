@@ -0,0 +1,280 @@
+"""Top-k cosine similarity search over embedding matrices.
+
+Reference embeddings are held as one contiguous, row-normalized float32
+matrix, so cosine similarity is a dot product. ``VectorIndex.search``
+scores blocks of queries with a single matrix product each and selects the
+top k per row with ``argpartition``; blocks are sized to bound the score
+matrix in memory. Matrices can be saved as ``.npy`` and memory-mapped back,
+so large references are not re-embedded or loaded eagerly.
+
+Large references can use an approximate index instead:
+
+- ``hnsw``: FAISS ``IndexHNSWFlat`` (requires faiss),
+- ``ivf``: FAISS ``IndexIVFFlat`` when faiss is installed, otherwise a
+  NumPy inverted-file index (spherical k-means lists, ``nprobe`` lists
+  scanned per query).
+
+``ann="auto"`` picks HNSW with faiss, NumPy IVF without, and only for
+references of at least ``ann_min_size`` rows; smaller references are always
+searched exactly.
+"""
+
+import json
+import logging
+import math
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Optional dependency for approximate search
+try:
+    import faiss  # type: ignore[import-untyped]
+    HAS_FAISS = True
+except ImportError:
+    HAS_FAISS = False
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on elements in one (queries x references) score block
+MAX_BLOCK_ELEMENTS = 1 << 25
+
+ANN_METHODS = ("auto", "hnsw", "ivf", "none")
+
+
+def normalize_rows(vectors: Any) -> np.ndarray:
+    """Row-normalize to a C-contiguous float32 matrix; zero rows stay zero."""
+    matrix = np.array(vectors, dtype=np.float32, order="C", ndmin=2)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+class _NumpyIVF:
+    """Inverted-file index over a normalized matrix (spherical k-means lists)."""
+
+    def __init__(self, matrix: np.ndarray, nlist: int, nprobe: int, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        sample_size = min(len(matrix), nlist * 64)
+        sample = np.asarray(matrix[np.sort(rng.choice(len(matrix), sample_size, replace=False))])
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+        for _ in range(10):
+            labels = self._assign(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            empty = np.bincount(labels, minlength=nlist) == 0
+            # Re-seed empty lists from random sample rows
+            sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+            centroids = normalize_rows(sums)
+
+        labels = self._assign(matrix, centroids)
+        self.order = np.argsort(labels, kind="stable")
+        self.offsets = np.concatenate(([0], np.cumsum(np.bincount(labels, minlength=nlist))))
+        # List-ordered copy so every list is a contiguous slice
+        self.lists = np.ascontiguousarray(matrix[self.order])
+        self.centroids = centroids
+        self.nprobe = min(nprobe, nlist)
+
+    @staticmethod
+    def _assign(matrix: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        labels = np.empty(len(matrix), dtype=np.int64)
+        step = max(1, MAX_BLOCK_ELEMENTS // len(centroids))
+        for start in range(0, len(matrix), step):
+            block = np.asarray(matrix[start : start + step])
+            labels[start : start + step] = (block @ centroids.T).argmax(axis=1)
+        return labels
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k (scores, rows) per query; missing slots hold -inf / -1."""
+        count = len(queries)
+        best_scores = np.full((count, k), -np.inf, dtype=np.float32)
+        best_rows = np.full((count, k), -1, dtype=np.int64)
+
+        centroid_scores = queries @ self.centroids.T
+        probes = np.argpartition(-centroid_scores, self.nprobe - 1, axis=1)[:, : self.nprobe]
+        probe_lists, probe_queries = probes.ravel(), np.repeat(np.arange(count), self.nprobe)
+        by_list = np.argsort(probe_lists, kind="stable")
+        probe_lists, probe_queries = probe_lists[by_list], probe_queries[by_list]
+        bounds = np.searchsorted(probe_lists, np.arange(len(self.centroids) + 1))
+
+        # Scan each list once for all queries probing it
+        for list_id in range(len(self.centroids)):
+            start, stop = self.offsets[list_id], self.offsets[list_id + 1]
+            q_ids = probe_queries[bounds[list_id] : bounds[list_id + 1]]
+            if stop == start or len(q_ids) == 0:
+                continue
+            scores = queries[q_ids] @ self.lists[start:stop].T
+            rows = np.broadcast_to(self.order[start:stop], scores.shape)
+            merged_scores = np.concatenate([best_scores[q_ids], scores], axis=1)
+            merged_rows = np.concatenate([best_rows[q_ids], rows], axis=1)
+            keep = np.argpartition(-merged_scores, k - 1, axis=1)[:, :k]
+            best_scores[q_ids] = np.take_along_axis(merged_scores, keep, axis=1)
+            best_rows[q_ids] = np.take_along_axis(merged_rows, keep, axis=1)
+        return best_scores, best_rows
+
+
+class VectorIndex:
+    """Cosine top-k index over a normalized float32 embedding matrix."""
+
+    def __init__(
+        self,
+        vectors: Any,
+        ids: Optional[Sequence[Any]] = None,
+        ann: str = "auto",
+        ann_min_size: int = 50_000,
+        nprobe: int = 32,
+        normalized: bool = False,
+    ):
+        """
+        Build the index.
+
+        Args:
+            vectors: (n, d) embeddings; a mapping of id -> vector is accepted
+                and supplies ``ids`` from its keys
+            ids: Identifier returned for each row (defaults to row numbers)
+            ann: Approximate index: auto, hnsw, ivf or none
+            ann_min_size: Minimum rows before ``auto`` builds an approximate index
+            nprobe: Lists scanned per query by IVF indexes
+            normalized: ``vectors`` is already a normalized float32 matrix
+                (e.g. memory-mapped from ``save``); used without copying
+        """
+        if ann not in ANN_METHODS:
+            raise ValueError(f"ann must be one of {ANN_METHODS}, got '{ann}'")
+        if isinstance(vectors, dict):
+            ids = list(vectors) if ids is None else ids
+            vectors = list(vectors.values())
+
+        if normalized and isinstance(vectors, np.ndarray) and vectors.dtype == np.float32:
+            self.matrix = vectors
+        else:
+            self.matrix = normalize_rows(vectors) if len(vectors) else np.zeros((0, 0), np.float32)
+        self.ids = list(ids) if ids is not None else None
+        if self.ids is not None and len(self.ids) != len(self.matrix):
+            raise ValueError("ids and vectors must have the same length")
+
+        self.method = "none"
+        self._ann: Any = None
+        if len(self.matrix) and ann != "none" and (ann != "auto" or len(self.matrix) >= ann_min_size):
+            self._build_ann(ann, nprobe)
+
+    def __len__(self) -> int:
+        return len(self.matrix)
+
+    @property
+    def dimension(self) -> int:
+        return self.matrix.shape[1] if self.matrix.ndim == 2 else 0
+
+    def _build_ann(self, ann: str, nprobe: int) -> None:
+        count = len(self.matrix)
+        nlist = int(min(4096, max(1, math.sqrt(count))))
+        if ann in ("auto", "hnsw") and HAS_FAISS:
+            index = faiss.IndexHNSWFlat(self.dimension, 32, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efSearch = max(64, nprobe * 2)
+            index.add(np.ascontiguousarray(self.matrix))
+            self._ann, self.method = index, "hnsw"
+        elif ann == "ivf" and HAS_FAISS:
+            quantizer = faiss.IndexFlatIP(self.dimension)
+            index = faiss.IndexIVFFlat(
+                quantizer, self.dimension, nlist, faiss.METRIC_INNER_PRODUCT
+            )
+            index.train(np.ascontiguousarray(self.matrix))
+            index.add(np.ascontiguousarray(self.matrix))
+            index.nprobe = min(nprobe, nlist)
+            self._ann, self.method = index, "ivf"
+        else:
+            if ann == "hnsw":
+                logger.warning("faiss not installed; using NumPy IVF instead of HNSW")
+            self._ann, self.method = _NumpyIVF(self.matrix, nlist, nprobe), "ivf"
+        logger.debug(f"Built {self.method} index over {count} vectors")
+
+    # Persistence
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the normalized matrix as ``.npy`` (ids to ``<path>.ids.json``)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.save(f, np.ascontiguousarray(self.matrix))
+        if self.ids is not None:
+            Path(f"{path}.ids.json").write_text(json.dumps(self.ids))
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True, **kwargs: Any) -> "VectorIndex":
+        """
+        Load a matrix written by ``save``.
+
+        Args:
+            path: ``.npy`` file
+            mmap: Memory-map the matrix instead of reading it into memory
+            **kwargs: Passed to the constructor (ann, ann_min_size, nprobe)
+        """
+        matrix = np.load(path, mmap_mode="r" if mmap else None)
+        ids_path = Path(f"{path}.ids.json")
+        ids = json.loads(ids_path.read_text()) if ids_path.exists() else None
+        return cls(matrix, ids=ids, normalized=True, **kwargs)
+
+    # Search
+    def search(
+        self,
+        queries: Any,
+        top_k: int = 5,
+        threshold: Optional[float] = None,
+        block_size: int = 1024,
+    ) -> List[List[Tuple[Any, float]]]:
+        """
+        Find the most similar rows for each query.
+
+        Args:
+            queries: (m, d) query embeddings (normalized here)
+            top_k: Results per query
+            threshold: Minimum cosine similarity
+            block_size: Maximum queries scored per matrix product
+
+        Returns:
+            Per query, (id, similarity) pairs by decreasing similarity, equal
+            similarities ordered by row
+        """
+        queries = normalize_rows(queries)
+        k = min(top_k, len(self.matrix))
+        if k <= 0 or len(queries) == 0:
+            return [[] for _ in range(len(queries))]
+
+        if self.method == "none":
+            rows_per_block = max(1, min(block_size, MAX_BLOCK_ELEMENTS // len(self.matrix)))
+        else:
+            rows_per_block = max(1, block_size) * 4
+        results: List[List[Tuple[Any, float]]] = []
+        for start in range(0, len(queries), rows_per_block):
+            block = queries[start : start + rows_per_block]
+            scores, rows = self._search_block(block, k)
+            results.extend(self._collect(scores, rows, threshold))
+        return results
+
+    def _search_block(self, block: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        if self.method == "none":
+            scores = block @ self.matrix.T
+            if k < scores.shape[1]:
+                rows = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                return np.take_along_axis(scores, rows, axis=1), rows
+            rows = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+            return scores, rows
+        if HAS_FAISS and not isinstance(self._ann, _NumpyIVF):
+            scores, rows = self._ann.search(np.ascontiguousarray(block), k)
+            return scores, rows.astype(np.int64)
+        return self._ann.search(block, k)
+
+    def _collect(
+        self, scores: np.ndarray, rows: np.ndarray, threshold: Optional[float]
+    ) -> List[List[Tuple[Any, float]]]:
+        # Decreasing score, then increasing row (matches a stable sort)
+        order = np.lexsort((rows, -scores), axis=1)
+        scores = np.take_along_axis(scores, order, axis=1)
+        rows = np.take_along_axis(rows, order, axis=1)
+        results = []
+        for row_scores, row_ids in zip(scores.tolist(), rows.tolist()):
+            hits = []
+            for score, row in zip(row_scores, row_ids):
+                if row < 0 or (threshold is not None and score < threshold):
+                    continue
+                hits.append((self.ids[row] if self.ids is not None else row, score))
+            results.append(hits)
+        return results
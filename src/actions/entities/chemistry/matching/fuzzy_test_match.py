@@ -5,23 +5,80 @@ This action provides fuzzy matching for clinical chemistry/laboratory test names
 Unlike proteins and metabolites where fuzzy matching is a fallback, for chemistry 
 tests it's the PRIMARY matching method due to high variability in test naming 
 conventions across vendors, laboratories, and healthcare systems.
+
+Batch matching prepares the normalized, abbreviation-expanded and synonym
+forms of every test once per side and scores a block of source tests
+against the target tests one algorithm at a time with ``cdist``. Each
+pair's result is still that of ``MultiAlgorithmMatcher.match_tests``: the
+first algorithm (in the configured order) that matches above the threshold.
+Beyond ``exhaustive_pair_limit`` pairs, each source test is only scored
+against the targets a blocking index proposes: the same normalized name,
+synonym group or LOINC code, or shared character n-grams.
 """
 
 import re
-from typing import Dict, Any, List, Optional, Literal, Tuple
+from dataclasses import dataclass
+from typing import Dict, Any, FrozenSet, List, Optional, Literal, Sequence, Tuple
 from functools import lru_cache
 
+import numpy as np
 import pandas as pd
 from pydantic import BaseModel, Field
 
+# Optional dependency for vectorized scoring
 try:
-    from fuzzywuzzy import fuzz  # type: ignore[import-untyped]
-except ImportError:
-    # Fallback to rapidfuzz if fuzzywuzzy not available
     from rapidfuzz import fuzz
+    from rapidfuzz import process as rf_process
+    from rapidfuzz.distance import Levenshtein as rf_levenshtein
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    from fuzzywuzzy import fuzz  # type: ignore[import-untyped]
+    HAS_RAPIDFUZZ = False
 
 from actions.typed_base import TypedStrategyAction
 from actions.registry import register_action
+from actions.algorithms.fuzzy_matching.fuzzy_index import FuzzyIndex
+
+# Scores follow fuzzywuzzy (with python-Levenshtein): integer percentages,
+# token_sort compares ASCII-folded, punctuation-free, sorted tokens, and
+# partial_ratio only tries windows aligned on the matching blocks.
+_LATIN1_CHARS = dict.fromkeys(range(128, 256))
+_NON_WORD = re.compile(r"(?ui)\W")
+
+
+def _token_sort_form(text: str) -> str:
+    """fuzzywuzzy's token_sort preprocessing (full_process with force_ascii)."""
+    processed = _NON_WORD.sub(" ", text.translate(_LATIN1_CHARS)).lower().strip()
+    return " ".join(sorted(processed.split()))
+
+
+def _ratio(source: str, target: str) -> int:
+    """fuzzywuzzy's ratio, rounded to an integer percentage."""
+    return round(fuzz.ratio(source, target))
+
+
+def _token_sort_ratio(source: str, target: str) -> int:
+    """fuzzywuzzy's token_sort_ratio under either library."""
+    return _ratio(_token_sort_form(source), _token_sort_form(target))
+
+
+def _partial_ratio(source: str, target: str) -> int:
+    """fuzzywuzzy's partial_ratio under either library."""
+    if not HAS_RAPIDFUZZ:
+        return fuzz.partial_ratio(source, target)
+    if source == target:
+        return 100
+    if not source or not target:
+        return 0
+    shorter, longer = (source, target) if len(source) <= len(target) else (target, source)
+    best = 0.0
+    for block in rf_levenshtein.opcodes(shorter, longer).as_matching_blocks():
+        start = max(block.b - block.a, 0)
+        score = fuzz.ratio(shorter, longer[start : start + len(shorter)])
+        if score > 99.5:
+            return 100
+        best = max(best, score)
+    return round(best)
 
 
 class ChemistryFuzzyTestMatchParams(BaseModel):
@@ -99,6 +156,13 @@ class ChemistryFuzzyTestMatchParams(BaseModel):
         1, description="Maximum matches to return per test"
     )
 
+    # Performance
+    exhaustive_pair_limit: int = Field(
+        25_000_000,
+        description="Score every source/target pair up to this many pairs; "
+        "larger inputs are pruned with a blocking index",
+    )
+
 
 class ChemistryFuzzyTestMatchResult(BaseModel):
     """Result of fuzzy chemistry test matching."""
@@ -118,12 +182,12 @@ class ChemistryFuzzyTestMatchResult(BaseModel):
 class TestNameNormalizer:
     """Normalize chemistry test names for matching."""
 
-    def __init__(self) -> None:
-        """Initialize normalizer with caching."""
-        self._cache: Dict[str, str] = {}
+    # The cached methods are static so their caches key on the name alone
+    # and are shared by every instance
 
-    @lru_cache(maxsize=1000)
-    def normalize_test_name(self, test_name: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=100_000)
+    def normalize_test_name(test_name: str) -> str:
         """Apply comprehensive normalization with caching."""
         if not test_name or pd.isna(test_name):
             return ""
@@ -137,7 +201,7 @@ class TestNameNormalizer:
             return ""
 
         # Remove vendor prefixes
-        normalized = self._remove_vendor_prefixes(normalized)
+        normalized = TestNameNormalizer._remove_vendor_prefixes(normalized)
 
         # Standardize punctuation
         normalized = re.sub(r"[,;:]", " ", normalized)
@@ -145,14 +209,15 @@ class TestNameNormalizer:
         normalized = re.sub(r"\s+", " ", normalized)
 
         # Remove specimen types
-        normalized = self._remove_specimen_types(normalized)
+        normalized = TestNameNormalizer._remove_specimen_types(normalized)
 
         # Standardize units
-        normalized = self._standardize_units(normalized)
+        normalized = TestNameNormalizer._standardize_units(normalized)
 
         return normalized.strip()
 
-    def _remove_vendor_prefixes(self, name: str) -> str:
+    @staticmethod
+    def _remove_vendor_prefixes(name: str) -> str:
         """Remove vendor-specific prefixes."""
         prefixes = [
             r"^lc\s*\d*\s*",  # LabCorp
@@ -166,7 +231,8 @@ class TestNameNormalizer:
             name = re.sub(prefix, "", name, flags=re.IGNORECASE)
         return name
 
-    def _remove_specimen_types(self, name: str) -> str:
+    @staticmethod
+    def _remove_specimen_types(name: str) -> str:
         """Remove specimen type indicators."""
         specimens = [
             "24 hour urine",  # Put longer patterns first
@@ -198,7 +264,8 @@ class TestNameNormalizer:
 
         return name
 
-    def _standardize_units(self, name: str) -> str:
+    @staticmethod
+    def _standardize_units(name: str) -> str:
         """Standardize measurement units."""
         unit_mappings = {
             r"\bmg/dl\b": "mg/dL",
@@ -307,8 +374,9 @@ class AbbreviationExpander:
         ["albumin/globulin ratio", "a/g ratio", "a/g"],
     ]
 
-    @lru_cache(maxsize=500)
-    def expand_abbreviation(self, text: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=100_000)
+    def expand_abbreviation(text: str) -> str:
         """Expand known abbreviations in text."""
         if not text:
             return text
@@ -319,20 +387,21 @@ class AbbreviationExpander:
         for word in words:
             # Clean up word (remove punctuation at end)
             clean_word = re.sub(r"[^\w]$", "", word)
-            if clean_word in self.ABBREVIATIONS:
-                expanded.append(self.ABBREVIATIONS[clean_word])
+            if clean_word in AbbreviationExpander.ABBREVIATIONS:
+                expanded.append(AbbreviationExpander.ABBREVIATIONS[clean_word])
             else:
                 expanded.append(word)
 
         return " ".join(expanded)
 
-    @lru_cache(maxsize=500)
-    def get_synonyms(self, test_name: str) -> List[str]:
+    @staticmethod
+    @lru_cache(maxsize=100_000)
+    def get_synonyms(test_name: str) -> List[str]:
         """Get all synonyms for a test name."""
         test_name_lower = test_name.lower().strip()
         synonyms = [test_name]
 
-        for group in self.SYNONYM_GROUPS:
+        for group in AbbreviationExpander.SYNONYM_GROUPS:
             group_lower = [s.lower() for s in group]
             if test_name_lower in group_lower:
                 synonyms.extend(group)
@@ -460,8 +529,9 @@ class TestPanelExpander:
         "thyroid function tests": ["tsh", "free t4", "free t3"],
     }
 
-    @lru_cache(maxsize=100)
-    def expand_if_panel(self, test_name: str) -> List[str]:
+    @staticmethod
+    @lru_cache(maxsize=10_000)
+    def expand_if_panel(test_name: str) -> List[str]:
         """Expand test panel to components if applicable."""
         if not test_name:
             return [test_name]
@@ -469,7 +539,7 @@ class TestPanelExpander:
         test_lower = test_name.lower().strip()
 
         # Check if it's a known panel
-        for panel_name, components in self.TEST_PANELS.items():
+        for panel_name, components in TestPanelExpander.TEST_PANELS.items():
             if panel_name == test_lower or panel_name in test_lower:
                 return components.copy()  # Return copy to avoid mutation
 
@@ -554,12 +624,12 @@ class MultiAlgorithmMatcher:
 
     def _token_sort_match(self, source: str, target: str) -> Tuple[bool, float]:
         """Token sort ratio matching (handles word order)."""
-        score = fuzz.token_sort_ratio(source, target) / 100.0
+        score = _token_sort_ratio(source, target) / 100.0
         return score >= 0.75, score
 
     def _partial_match(self, source: str, target: str) -> Tuple[bool, float]:
         """Partial string matching."""
-        score = fuzz.partial_ratio(source, target) / 100.0
+        score = _partial_ratio(source, target) / 100.0
         return score >= 0.80, score
 
     def _abbreviation_match(self, source: str, target: str) -> Tuple[bool, float]:
@@ -578,7 +648,7 @@ class MultiAlgorithmMatcher:
         best_score = 0.0
         for s, t in combinations:
             if s and t:  # Make sure neither is empty
-                score = fuzz.ratio(s, t) / 100.0
+                score = _ratio(s, t) / 100.0
                 best_score = max(best_score, score)
 
         return best_score >= 0.75, best_score
@@ -603,7 +673,7 @@ class MultiAlgorithmMatcher:
             if len(source) > 2 and len(target) > 2:
                 # Check if first letters match and there's reasonable similarity
                 if source[0] == target[0]:
-                    score = fuzz.ratio(source, target) / 100.0
+                    score = _ratio(source, target) / 100.0
                     if score >= 0.6:  # Lower threshold for phonetic
                         return True, 0.7  # Lower confidence for phonetic
         except Exception:
@@ -612,6 +682,364 @@ class MultiAlgorithmMatcher:
         return False, 0.0
 
 
+# Per-algorithm acceptance rules of MultiAlgorithmMatcher, for block scoring
+RATIO_MATCH_THRESHOLDS = {"token_sort": 0.75, "partial": 0.80, "abbreviation": 0.75}
+SYNONYM_SCORE = 0.9
+PHONETIC_SCORE = 0.7
+PHONETIC_RATIO = 0.6
+
+# Source rows scored together; bounds the size of the score matrices
+SCORE_BLOCK_CELLS = 2_000_000
+
+
+def _score_cutoff(cutoff: float) -> float:
+    """Lowest unrounded 0-100 score that can round up to ``cutoff`` (0-1)."""
+    return max(0.0, cutoff * 100.0 - 0.5 - 1e-6)
+
+
+def _ratio_matrix(
+    queries: Sequence[str], choices: Sequence[str], cutoff: float = 0.0
+) -> np.ndarray:
+    """
+    Rounded ratios of every query against every choice, scaled to 0-1.
+
+    Scores that cannot round up to ``cutoff`` may be reported as 0, which
+    lets rapidfuzz skip those pairs; scores that can are exact.
+    """
+    if HAS_RAPIDFUZZ:
+        scores = rf_process.cdist(
+            queries,
+            choices,
+            scorer=fuzz.ratio,
+            dtype=np.float64,
+            workers=-1,
+            score_cutoff=_score_cutoff(cutoff),
+        )
+    else:
+        scores = np.array(
+            [[fuzz.ratio(q, c) for c in choices] for q in queries], dtype=np.float64
+        ).reshape(len(queries), len(choices))
+    return np.round(scores) / 100.0
+
+
+def _shared_characters(queries: Sequence[str], choices: Sequence[str]) -> np.ndarray:
+    """Size of the character multiset intersection of every query/choice pair."""
+    alphabet = {c: i for i, c in enumerate(sorted(set("".join(queries)) & set("".join(choices))))}
+
+    def counts(texts: Sequence[str]) -> np.ndarray:
+        table = np.zeros((len(texts), len(alphabet)), dtype=np.int16)
+        for row, text in enumerate(texts):
+            for char in text:
+                column = alphabet.get(char)
+                if column is not None:
+                    table[row, column] += 1
+        return table
+
+    query_counts, choice_counts = counts(queries), counts(choices)
+    shared = np.zeros((len(queries), len(choices)), dtype=np.int16)
+    for column in range(len(alphabet)):
+        shared += np.minimum(query_counts[:, column, None], choice_counts[None, :, column])
+    return shared
+
+
+@dataclass
+class PreparedTests:
+    """Test names with their matching forms, computed once per side."""
+
+    names: List[str]
+    normalized: List[str]
+    expanded: List[str]
+    token_sorted: List[str]
+    synonym_keys: List[FrozenSet[str]]
+    loinc_codes: List[FrozenSet[str]]
+
+    @classmethod
+    def from_names(
+        cls, names: Sequence[str], loinc_codes: Optional[Dict[str, FrozenSet[str]]] = None
+    ) -> "PreparedTests":
+        """Prepare names; names that normalize to nothing can never match and are dropped."""
+        prepared = cls([], [], [], [], [], [])
+        for name in names:
+            normalized = TestNameNormalizer.normalize_test_name(name)
+            if not name or not normalized:
+                continue
+            prepared.names.append(name)
+            prepared.normalized.append(normalized)
+            prepared.expanded.append(AbbreviationExpander.expand_abbreviation(normalized))
+            prepared.token_sorted.append(_token_sort_form(normalized))
+            prepared.synonym_keys.append(
+                frozenset(s.lower() for s in AbbreviationExpander.get_synonyms(name))
+            )
+            prepared.loinc_codes.append((loinc_codes or {}).get(name, frozenset()))
+        return prepared
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class ChemistryTestIndex:
+    """Target tests prepared for matching blocks of source tests."""
+
+    def __init__(self, targets: PreparedTests, exhaustive_pair_limit: int = 25_000_000):
+        self.targets = targets
+        self.exhaustive_pair_limit = exhaustive_pair_limit
+        self._normalized_ids = self._postings([[n] for n in targets.normalized])
+        self._synonym_ids = self._postings(targets.synonym_keys)
+        self._loinc_ids = self._postings(targets.loinc_codes)
+        self._first_chars = np.array([n[0] for n in targets.normalized], dtype=object)
+        self._phonetic_lengths = np.array([len(n) > 2 for n in targets.normalized], dtype=bool)
+        self._fuzzy_index: Optional[FuzzyIndex] = None
+
+    @staticmethod
+    def _postings(keys_per_test: Sequence[Any]) -> Dict[str, np.ndarray]:
+        postings: Dict[str, List[int]] = {}
+        for test_id, keys in enumerate(keys_per_test):
+            for key in keys:
+                postings.setdefault(key, []).append(test_id)
+        return {key: np.asarray(ids, dtype=np.int64) for key, ids in postings.items()}
+
+    def best_matches(
+        self,
+        sources: PreparedTests,
+        algorithms: Sequence[str],
+        threshold: float,
+        stop_at_perfect: bool = True,
+    ) -> List[Optional[Tuple[int, float, str]]]:
+        """
+        Best target for each source test, as the pairwise loop would pick it.
+
+        Targets are visited in order and replace the current best only when
+        they score higher; with ``stop_at_perfect`` the first score >= 0.99
+        ends the search.
+
+        Returns:
+            (target position, score, algorithm) or None per source test
+        """
+        if not len(sources) or not len(self.targets):
+            return [None] * len(sources)
+
+        if len(sources) * len(self.targets) <= self.exhaustive_pair_limit:
+            all_targets = np.arange(len(self.targets))
+            rows = max(1, SCORE_BLOCK_CELLS // len(self.targets))
+            results: List[Optional[Tuple[int, float, str]]] = []
+            for start in range(0, len(sources), rows):
+                source_ids = np.arange(start, min(start + rows, len(sources)))
+                results.extend(
+                    self._best_in_block(
+                        sources, source_ids, all_targets, algorithms, threshold, stop_at_perfect
+                    )
+                )
+            return results
+
+        return [
+            self._best_in_block(
+                sources,
+                np.array([source_id]),
+                self._candidates(sources, source_id),
+                algorithms,
+                threshold,
+                stop_at_perfect,
+            )[0]
+            for source_id in range(len(sources))
+        ]
+
+    def _candidates(self, sources: PreparedTests, source_id: int) -> np.ndarray:
+        """Blocking: targets sharing a name, synonym, LOINC code or n-grams."""
+        if self._fuzzy_index is None:
+            ids = list(range(len(self.targets)))
+            self._fuzzy_index = FuzzyIndex(
+                self.targets.normalized + self.targets.expanded,
+                payloads=ids + ids,
+                exhaustive_limit=0,
+            )
+        blocks = [
+            self._normalized_ids.get(sources.normalized[source_id], []),
+            *(self._synonym_ids.get(key, []) for key in sources.synonym_keys[source_id]),
+            *(self._loinc_ids.get(code, []) for code in sources.loinc_codes[source_id]),
+            self._fuzzy_index.candidates(sources.normalized[source_id]),
+            self._fuzzy_index.candidates(sources.expanded[source_id]),
+        ]
+        return np.unique(np.concatenate([np.asarray(b, dtype=np.int64) for b in blocks]))
+
+    def _best_in_block(
+        self,
+        sources: PreparedTests,
+        source_ids: np.ndarray,
+        target_ids: np.ndarray,
+        algorithms: Sequence[str],
+        threshold: float,
+        stop_at_perfect: bool,
+    ) -> List[Optional[Tuple[int, float, str]]]:
+        """Score a block with the first matching algorithm per pair and pick per row."""
+        if not len(target_ids):
+            return [None] * len(source_ids)
+
+        shape = (len(source_ids), len(target_ids))
+        scores = np.zeros(shape)
+        methods = np.full(shape, -1, dtype=np.int16)
+        pending = np.ones(shape, dtype=bool)
+        block = _ScoreBlock(self, sources, source_ids, target_ids, algorithms, threshold)
+
+        columns = np.arange(len(target_ids))
+        for position, algorithm in enumerate(algorithms):
+            matched, algorithm_scores = block.scores(algorithm, pending)
+            accepted = pending & matched & (algorithm_scores >= threshold)
+            scores = np.where(accepted, algorithm_scores, scores)
+            methods[accepted] = position
+            pending &= ~accepted
+            if stop_at_perfect:
+                # The search stops at a perfect target; later ones never count
+                perfect = (methods >= 0) & (scores >= 0.99)
+                rows = np.flatnonzero(perfect.any(axis=1))
+                first = perfect[rows].argmax(axis=1)
+                pending[rows] &= columns[None, :] < first[:, None]
+            if not pending.any():
+                break
+
+        results: List[Optional[Tuple[int, float, str]]] = []
+        for row in range(len(source_ids)):
+            hits = np.flatnonzero(methods[row] >= 0)
+            if not len(hits):
+                results.append(None)
+                continue
+            row_scores = scores[row, hits]
+            perfect = np.flatnonzero(row_scores >= 0.99) if stop_at_perfect else []
+            best = perfect[0] if len(perfect) else int(np.argmax(row_scores))
+            column = hits[best]
+            results.append(
+                (
+                    int(target_ids[column]),
+                    float(scores[row, column]),
+                    algorithms[methods[row, column]],
+                )
+            )
+        return results
+
+
+class _ScoreBlock:
+    """Lazily computed algorithm scores for one source x target block."""
+
+    def __init__(
+        self,
+        index: ChemistryTestIndex,
+        sources: PreparedTests,
+        source_ids: np.ndarray,
+        target_ids: np.ndarray,
+        algorithms: Sequence[str],
+        threshold: float,
+    ):
+        self.index = index
+        self.sources = sources
+        self.source_ids = source_ids
+        self.target_ids = target_ids
+        self.threshold = threshold
+        self.source_norm = [sources.normalized[i] for i in source_ids]
+        self.target_norm = [index.targets.normalized[i] for i in target_ids]
+        # The plain ratio is shared by abbreviation and phonetic matching
+        self._ratio_cutoff = min(
+            (self._cutoff(a) for a in algorithms if a in ("abbreviation", "phonetic")),
+            default=0.0,
+        )
+        self._ratio: Optional[np.ndarray] = None
+
+    def _cutoff(self, algorithm: str) -> float:
+        """Lowest score that can still be accepted for ``algorithm``."""
+        if algorithm == "phonetic":
+            return PHONETIC_RATIO
+        return max(RATIO_MATCH_THRESHOLDS[algorithm], self.threshold)
+
+    def _plain_ratio(self) -> np.ndarray:
+        if self._ratio is None:
+            self._ratio = _ratio_matrix(self.source_norm, self.target_norm, self._ratio_cutoff)
+        return self._ratio
+
+    def _partial_scores(self, cutoff: float, pending: np.ndarray) -> np.ndarray:
+        """
+        Partial ratios of the pairs that can reach ``cutoff``.
+
+        A partial ratio compares the shorter string (length m) with windows
+        of the longer one; an unrounded c needs at least c*m/(2-c) characters
+        in common, so pairs sharing fewer are skipped without scoring.
+        """
+        reachable = _score_cutoff(cutoff) / 100.0
+        source_lengths = np.array([len(n) for n in self.source_norm])
+        target_lengths = np.array([len(n) for n in self.target_norm])
+        shorter = np.minimum(source_lengths[:, None], target_lengths[None, :])
+        possible = _shared_characters(self.source_norm, self.target_norm) >= (
+            reachable * shorter / (2.0 - reachable) - 1e-9
+        )
+        rows, columns = np.nonzero(possible & pending)
+        scores = np.zeros(possible.shape)
+        if len(rows):
+            scores[rows, columns] = [
+                _partial_ratio(self.source_norm[r], self.target_norm[c]) / 100.0
+                for r, c in zip(rows, columns)
+            ]
+        return scores
+
+    def _hits(self, postings: Dict[str, np.ndarray], keys_per_row: Sequence[Any]) -> np.ndarray:
+        """Pairs where the source shares a posting key with the target."""
+        hits = np.zeros((len(self.source_ids), len(self.target_ids)), dtype=bool)
+        for row, keys in enumerate(keys_per_row):
+            for key in keys:
+                ids = postings.get(key)
+                if ids is None:
+                    continue
+                # Block columns are sorted target ids
+                columns = np.searchsorted(self.target_ids, ids)
+                inside = columns < len(self.target_ids)
+                inside[inside] = self.target_ids[columns[inside]] == ids[inside]
+                hits[row, columns[inside]] = True
+        return hits
+
+    def scores(self, algorithm: str, pending: np.ndarray) -> Tuple[np.ndarray, Any]:
+        """(matched mask, scores) of one algorithm over the block.
+
+        Scores are only guaranteed for ``pending`` pairs.
+        """
+        if algorithm == "exact":
+            equal = self._hits(self.index._normalized_ids, [[n] for n in self.source_norm])
+            return equal, 1.0
+        if algorithm == "token_sort":
+            source_sorted = [self.sources.token_sorted[i] for i in self.source_ids]
+            target_sorted = [self.index.targets.token_sorted[i] for i in self.target_ids]
+            scores = _ratio_matrix(source_sorted, target_sorted, self._cutoff(algorithm))
+        elif algorithm == "partial":
+            scores = self._partial_scores(self._cutoff(algorithm), pending)
+        elif algorithm == "abbreviation":
+            # Best of (source, target) with either side abbreviation-expanded
+            source_expanded = [self.sources.expanded[i] for i in self.source_ids]
+            target_expanded = [self.index.targets.expanded[i] for i in self.target_ids]
+            cutoff = self._cutoff(algorithm)
+            scores = np.maximum.reduce(
+                [
+                    self._plain_ratio(),
+                    _ratio_matrix(source_expanded, self.target_norm, cutoff),
+                    _ratio_matrix(self.source_norm, target_expanded, cutoff),
+                    _ratio_matrix(source_expanded, target_expanded, cutoff),
+                ]
+            )
+        elif algorithm == "synonym":
+            shared = self._hits(
+                self.index._synonym_ids, [self.sources.synonym_keys[i] for i in self.source_ids]
+            )
+            return shared, SYNONYM_SCORE
+        elif algorithm == "phonetic":
+            first_chars = np.array([n[0] for n in self.source_norm], dtype=object)
+            long_enough = np.array([len(n) > 2 for n in self.source_norm], dtype=bool)
+            similar = (
+                (first_chars[:, None] == self.index._first_chars[self.target_ids][None, :])
+                & long_enough[:, None]
+                & self.index._phonetic_lengths[self.target_ids][None, :]
+                & (self._plain_ratio() >= PHONETIC_RATIO)
+            )
+            return similar, PHONETIC_SCORE
+        else:
+            shape = (len(self.source_ids), len(self.target_ids))
+            return np.zeros(shape, dtype=bool), 0.0
+        return scores >= RATIO_MATCH_THRESHOLDS[algorithm], scores
+
+
 @register_action("CHEMISTRY_FUZZY_TEST_MATCH")
 class ChemistryFuzzyTestMatchAction(
     TypedStrategyAction[ChemistryFuzzyTestMatchParams, ChemistryFuzzyTestMatchResult]
@@ -748,10 +1176,6 @@ class ChemistryFuzzyTestMatchAction(
     ) -> pd.DataFrame:
         """Perform fuzzy matching on entire datasets."""
 
-        # Initialize components
-        matcher = MultiAlgorithmMatcher()
-        panel_expander = TestPanelExpander()
-
         # Get unique test names
         source_tests = (
             source_df[params.source_test_column].dropna().astype(str).unique()
@@ -764,55 +1188,58 @@ class ChemistryFuzzyTestMatchAction(
         if params.handle_panels:
             expanded_source = []
             for test in source_tests:
-                expanded = panel_expander.expand_if_panel(test)
+                expanded = TestPanelExpander.expand_if_panel(test)
                 expanded_source.extend(expanded)
-            source_tests = list(set(expanded_source))  # type: ignore[assignment]
+            source_tests = list(dict.fromkeys(expanded_source))  # type: ignore[assignment]
+
+        sources = PreparedTests.from_names(
+            source_tests, self._loinc_codes(source_df, params.source_test_column, params.source_loinc_column)
+        )
+        targets = PreparedTests.from_names(
+            target_tests, self._loinc_codes(target_df, params.target_test_column, params.target_loinc_column)
+        )
+        index = ChemistryTestIndex(targets, params.exhaustive_pair_limit)
+        best = index.best_matches(
+            sources,
+            params.algorithms,
+            params.match_threshold,
+            stop_at_perfect=params.max_matches_per_test == 1,
+        )
 
         # Build match results
         matches = []
-
-        for source_test in source_tests:
-            if not source_test or pd.isna(source_test):
+        for source_test, match in zip(sources.names, best):
+            if match is None:
                 continue
+            target_id, best_score, best_method = match
+            if best_score < params.match_threshold:
+                continue
+            match_record = {
+                "source_test": source_test,
+                "target_test": targets.names[target_id],
+                "similarity_score": best_score,
+                "match_method": best_method,
+            }
 
-            best_match = None
-            best_score = 0.0
-            best_method = "none"
-
-            for target_test in target_tests:
-                if not target_test or pd.isna(target_test):
-                    continue
-
-                is_match, score, method = matcher.match_tests(
-                    str(source_test),
-                    str(target_test),
-                    params.algorithms,
-                    params.match_threshold,
-                )
-
-                if is_match and score > best_score:
-                    best_match = target_test
-                    best_score = score
-                    best_method = method
-
-                    # If we want only one match per test and this is perfect, break
-                    if params.max_matches_per_test == 1 and score >= 0.99:
-                        break
-
-            if best_match and best_score >= params.match_threshold:
-                match_record = {
-                    "source_test": source_test,
-                    "target_test": best_match,
-                    "similarity_score": best_score,
-                    "match_method": best_method,
-                }
-
-                # Add optional columns based on params
-                if params.include_similarity_score:
-                    match_record["similarity_score"] = best_score
-                if params.include_match_method:
-                    match_record["match_method"] = best_method
+            # Add optional columns based on params
+            if params.include_similarity_score:
+                match_record["similarity_score"] = best_score
+            if params.include_match_method:
+                match_record["match_method"] = best_method
 
-                matches.append(match_record)
+            matches.append(match_record)
 
         return pd.DataFrame(matches)
+
+    @staticmethod
+    def _loinc_codes(
+        df: pd.DataFrame, test_column: str, loinc_column: Optional[str]
+    ) -> Dict[str, FrozenSet[str]]:
+        """LOINC codes recorded for each test name, used as a blocking key."""
+        if not loinc_column or loinc_column not in df.columns:
+            return {}
+        pairs = df[[test_column, loinc_column]].dropna().astype(str)
+        return {
+            name: frozenset(codes)
+            for name, codes in pairs.groupby(test_column)[loinc_column]
+        }
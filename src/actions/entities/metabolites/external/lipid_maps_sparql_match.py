@@ -10,20 +10,20 @@ import asyncio
 import logging
 import time
 from typing import Dict, List, Any, Optional, Tuple
-from functools import lru_cache
-import re
-import json
 from pathlib import Path
 import hashlib
 
+import aiohttp
 import pandas as pd
-import requests
 from pydantic import BaseModel, Field, validator
 
 from actions.typed_base import TypedStrategyAction
 from actions.registry import register_action
+from core.infrastructure.action_pool import shared_resources
 from core.standards.base_models import ActionParamsBase
 from core.standards.context_handler import UniversalContext
+from integrations.clients.cache_backends import CacheBackend, LRUCache, SQLiteCache
+from integrations.clients.http_session import shared_session_pool
 
 logger = logging.getLogger(__name__)
 
@@ -46,12 +46,13 @@ class LipidMapsSparqlParams(ActionParamsBase):
     query_strategy: str = Field("tiered", description="Query strategy: exact, fuzzy, or tiered")
     batch_size: int = Field(10, ge=1, le=20, description="Metabolites per batch query")
     timeout_seconds: int = Field(3, ge=1, le=30, description="Query timeout in seconds")
-    max_retries: int = Field(2, ge=0, le=5, description="Retry attempts")
+    max_retries: int = Field(2, ge=0, le=5, description="Retry attempts for connection errors and 429/5xx responses")
+    max_concurrent_queries: int = Field(4, ge=1, le=16, description="Maximum SPARQL queries in flight")
     
     # Performance controls
     cache_results: bool = Field(True, description="Cache successful matches")
     cache_ttl_hours: int = Field(24, ge=1, description="Cache time-to-live")
-    cache_dir: Optional[str] = Field("/tmp/lipid_maps_cache", description="Cache directory")
+    cache_dir: Optional[str] = Field("/tmp/lipid_maps_cache", description="Cache directory (in-memory cache if unset)")
     
     # Filtering
     filter_lipids_only: bool = Field(True, description="Pre-filter by pathway")
@@ -109,14 +110,14 @@ class LipidMapsSparqlMatch(TypedStrategyAction[LipidMapsSparqlParams, LipidMapsS
     - Aggressive timeout management (3s default)
     - Feature flag control for easy disable
     - Comprehensive error handling
-    - Result caching to reduce queries
-    - Batch query optimization when beneficial
+    - Result caching shared across steps and runs (TTL, on disk under cache_dir)
+    - Exact matching of many names per round trip, with non-blocking
+      queries on a pooled connection and bounded concurrency
     """
     
     def __init__(self):
-        """Initialize the action with cache."""
+        """Initialize the action."""
         super().__init__()
-        self._cache = {}
         self._query_times = []
     
     def get_params_model(self) -> type[LipidMapsSparqlParams]:
@@ -129,8 +130,13 @@ class LipidMapsSparqlMatch(TypedStrategyAction[LipidMapsSparqlParams, LipidMapsS
     
     def _escape_sparql_string(self, value: str) -> str:
         """Escape string for safe SPARQL query inclusion."""
-        # Escape quotes and backslashes
-        escaped = value.replace('\\', '\\\\').replace('"', '\\"')
+        # Escape quotes, backslashes and line breaks
+        escaped = (
+            value.replace('\\', '\\\\')
+            .replace('"', '\\"')
+            .replace('\n', '\\n')
+            .replace('\r', '\\r')
+        )
         return escaped
     
     def _generate_exact_query(self, metabolite_name: str) -> str:
@@ -170,92 +176,101 @@ class LipidMapsSparqlMatch(TypedStrategyAction[LipidMapsSparqlParams, LipidMapsS
         return query
     
     def _generate_batch_query(self, metabolites: List[str], query_type: str = "exact") -> str:
-        """Generate batch query with UNION clauses."""
-        union_parts = []
-        
-        for metabolite in metabolites:
-            escaped_name = self._escape_sparql_string(metabolite)
-            
-            if query_type == "exact":
-                filter_clause = f'FILTER(LCASE(STR(?label)) = LCASE("{escaped_name}"))'
-            else:  # fuzzy
-                core_name = metabolite.split('(')[0].strip()
-                escaped_name = self._escape_sparql_string(core_name)
-                filter_clause = f'FILTER(CONTAINS(LCASE(STR(?label)), LCASE("{escaped_name}")))'
-            
-            union_parts.append(f"""
-            {{
-                ?lipid rdfs:label ?label .
-                {filter_clause}
-                OPTIONAL {{ ?lipid chebi:inchikey ?inchikey }}
-                OPTIONAL {{ ?lipid chebi:formula ?formula }}
-            }}
-            """)
+        """
+        Generate one query for many names using a VALUES block.
+
+        Each binding carries the lower-cased input name in ``?name``, so
+        results are attributed without re-matching labels. Fuzzy batches
+        return every containing label; callers pick per name.
+        """
+        if query_type == "exact":
+            values = [metabolite.lower() for metabolite in metabolites]
+            filter_clause = 'FILTER(LCASE(STR(?label)) = ?name)'
+            limit = len(metabolites) * 2
+        else:  # fuzzy
+            values = [metabolite.split('(')[0].strip().lower() for metabolite in metabolites]
+            filter_clause = 'FILTER(CONTAINS(LCASE(STR(?label)), ?name))'
+            limit = len(metabolites) * 5
+        values_block = " ".join(f'"{self._escape_sparql_string(v)}"' for v in values)
         
         query = f"""
         PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
         PREFIX chebi: <http://purl.obolibrary.org/obo/chebi/>
         
-        SELECT ?lipid ?label ?inchikey ?formula WHERE {{
-            {" UNION ".join(union_parts)}
-        }} LIMIT {len(metabolites) * 2}
+        SELECT ?name ?lipid ?label ?inchikey ?formula WHERE {{
+            VALUES ?name {{ {values_block} }}
+            ?lipid rdfs:label ?label .
+            {filter_clause}
+            OPTIONAL {{ ?lipid chebi:inchikey ?inchikey }}
+            OPTIONAL {{ ?lipid chebi:formula ?formula }}
+        }} LIMIT {limit}
         """
         return query
     
-    def _execute_sparql_query(self, query: str, timeout: int) -> Tuple[Dict, float]:
+    async def _execute_sparql_query(
+        self, query: str, params: LipidMapsSparqlParams
+    ) -> Tuple[Dict, float]:
         """
-        Execute a SPARQL query with timeout management.
+        Execute a SPARQL query on the pooled session with timeout management.
         
         Returns:
-            Tuple of (results_dict, elapsed_time)
+            Tuple of (results_dict, elapsed_time); failures return
+            ``{"error": ...}`` ("timeout" for timeouts)
         """
         headers = {
             "Content-Type": "application/sparql-query",
             "Accept": "application/sparql-results+json"
         }
+        timeout = aiohttp.ClientTimeout(total=params.timeout_seconds)
+        session = shared_session_pool("lipid_maps").session()
         
         start_time = time.time()
-        try:
-            response = requests.post(
-                "https://lipidmaps.org/sparql",
-                data=query.encode('utf-8'),
-                headers=headers,
-                timeout=timeout
-            )
-            elapsed = time.time() - start_time
-            
-            if response.status_code == 200:
-                return response.json(), elapsed
-            else:
-                logger.warning(f"SPARQL query failed with status {response.status_code}")
-                return {"error": f"Status {response.status_code}"}, elapsed
-                
-        except requests.Timeout:
-            elapsed = time.time() - start_time
-            logger.warning(f"SPARQL query timed out after {elapsed:.2f}s")
-            return {"error": "timeout"}, elapsed
-            
-        except Exception as e:
-            elapsed = time.time() - start_time
-            logger.error(f"SPARQL query error: {e}")
-            return {"error": str(e)}, elapsed
+        error = "unknown"
+        for attempt in range(params.max_retries + 1):
+            try:
+                async with session.post(
+                    params.endpoint_url,
+                    data=query.encode('utf-8'),
+                    headers=headers,
+                    timeout=timeout,
+                ) as response:
+                    if response.status == 200:
+                        # SPARQL JSON has its own content type
+                        return await response.json(content_type=None), time.time() - start_time
+                    error = f"Status {response.status}"
+                    if response.status != 429 and response.status < 500:
+                        break
+            except asyncio.TimeoutError:
+                elapsed = time.time() - start_time
+                logger.warning(f"SPARQL query timed out after {elapsed:.2f}s")
+                return {"error": "timeout"}, elapsed
+            except aiohttp.ClientError as e:
+                error = str(e)
+            except Exception as e:
+                logger.error(f"SPARQL query error: {e}")
+                return {"error": str(e)}, time.time() - start_time
+            if attempt < params.max_retries:
+                await asyncio.sleep(0.1 * 2 ** attempt)
+        
+        logger.warning(f"SPARQL query failed: {error}")
+        return {"error": error}, time.time() - start_time
     
     def _get_cache_key(self, metabolite_name: str) -> str:
         """Generate cache key for metabolite."""
         return hashlib.md5(metabolite_name.lower().encode()).hexdigest()
     
-    def _get_from_cache(self, metabolite_name: str) -> Optional[Dict]:
-        """Get cached result if available."""
-        if not self._cache:
-            return None
-        
-        cache_key = self._get_cache_key(metabolite_name)
-        return self._cache.get(cache_key)
-    
-    def _save_to_cache(self, metabolite_name: str, result: Dict):
-        """Save result to cache."""
-        cache_key = self._get_cache_key(metabolite_name)
-        self._cache[cache_key] = result
+    def _result_cache(self, params: LipidMapsSparqlParams) -> CacheBackend:
+        """Match cache shared by every instance of the action."""
+        ttl = params.cache_ttl_hours * 3600
+        if params.cache_dir:
+            path = (Path(params.cache_dir) / "lipid_maps_sparql.sqlite").resolve()
+            return shared_resources.get_or_create(
+                ("lipid_maps_sparql_cache", str(path), ttl),
+                lambda: SQLiteCache(path, namespace="lipid_maps_sparql", ttl=ttl),
+            )
+        return shared_resources.get_or_create(
+            ("lipid_maps_sparql_cache", None, ttl), lambda: LRUCache(100_000, ttl=ttl)
+        )
     
     def _calculate_confidence_score(self, match_type: str) -> float:
         """Calculate confidence score based on match type."""
@@ -346,117 +361,114 @@ class LipidMapsSparqlMatch(TypedStrategyAction[LipidMapsSparqlParams, LipidMapsS
             # Process metabolites
             matched = []
             still_unmapped = []
-            queries_executed = 0
-            timeouts = 0
-            sparql_errors = 0
+            counters = {"queries": 0, "timeouts": 0, "errors": 0}
             cache_hits = 0
             
             # Track statistics
             self._query_times = []
+            semaphore = asyncio.Semaphore(params.max_concurrent_queries)
             
-            # Process in batches
-            for i in range(0, len(unmapped), params.batch_size):
-                batch = unmapped[i:i + params.batch_size]
-                batch_matched = []
-                batch_unmapped = []
-                
-                # Try batch query first
-                if len(batch) > 1:
-                    batch_names = [m.get(params.name_column, "") for m in batch]
-                    batch_query = self._generate_batch_query(batch_names, "exact")
-                    
-                    result, elapsed = self._execute_sparql_query(batch_query, params.timeout_seconds)
-                    queries_executed += 1
-                    self._query_times.append(elapsed)
-                    
-                    if "error" in result:
-                        if result["error"] == "timeout":
-                            timeouts += 1
-                        else:
-                            sparql_errors += 1
-                        # Fall back to individual queries
-                        logger.warning("Batch query failed, falling back to individual queries")
+            async def run_query(query: str) -> Optional[Dict]:
+                async with semaphore:
+                    result, elapsed = await self._execute_sparql_query(query, params)
+                counters["queries"] += 1
+                self._query_times.append(elapsed)
+                if "error" in result:
+                    if result["error"] == "timeout":
+                        counters["timeouts"] += 1
                     else:
-                        # Process batch results
-                        bindings = result.get("results", {}).get("bindings", [])
-                        matched_names = set()
-                        
-                        for binding in bindings:
-                            label = binding.get("label", {}).get("value", "").lower()
-                            # Find which metabolite this matches
-                            for metabolite in batch:
-                                name = metabolite.get(params.name_column, "").lower()
-                                if name == label and name not in matched_names:
-                                    match = self._process_sparql_result(
-                                        {"results": {"bindings": [binding]}},
-                                        metabolite,
-                                        "exact"
-                                    )
-                                    if match:
-                                        batch_matched.append(match)
-                                        matched_names.add(name)
-                                    break
-                        
-                        # Unmapped from batch
-                        for metabolite in batch:
-                            name = metabolite.get(params.name_column, "").lower()
-                            if name not in matched_names:
-                                batch_unmapped.append(metabolite)
-                
-                # Process individually if batch failed or single item
-                if not batch_matched and batch_unmapped == batch:
-                    for metabolite in batch:
-                        name = metabolite.get(params.name_column, "")
-                        if not name:
-                            still_unmapped.append(metabolite)
-                            continue
-                        
-                        # Check cache first
-                        cached = self._get_from_cache(name)
-                        if cached:
-                            cache_hits += 1
-                            batch_matched.append({**metabolite, **cached})
-                            continue
-                        
-                        # Try exact match
-                        query = self._generate_exact_query(name)
-                        result, elapsed = self._execute_sparql_query(query, params.timeout_seconds)
-                        queries_executed += 1
-                        self._query_times.append(elapsed)
-                        
-                        if "error" in result:
-                            if result["error"] == "timeout":
-                                timeouts += 1
-                            else:
-                                sparql_errors += 1
-                            batch_unmapped.append(metabolite)
-                            continue
-                        
-                        match = self._process_sparql_result(result, metabolite, "exact")
-                        
-                        # If no exact match, try fuzzy
-                        if not match and params.query_strategy in ["fuzzy", "tiered"]:
-                            query = self._generate_fuzzy_query(name)
-                            result, elapsed = self._execute_sparql_query(query, params.timeout_seconds)
-                            queries_executed += 1
-                            self._query_times.append(elapsed)
-                            
-                            if "error" not in result:
-                                match = self._process_sparql_result(result, metabolite, "fuzzy")
-                        
-                        if match:
-                            batch_matched.append(match)
-                            # Cache the match
-                            if params.cache_results:
-                                self._save_to_cache(name, {
-                                    k: v for k, v in match.items()
-                                    if k not in metabolite.keys()
-                                })
-                        else:
-                            batch_unmapped.append(metabolite)
-                
-                matched.extend(batch_matched)
-                still_unmapped.extend(batch_unmapped)
+                        counters["errors"] += 1
+                    return None
+                return result
+            
+            # Distinct names, keyed case-insensitively
+            names: Dict[str, str] = {}
+            for metabolite in unmapped:
+                name = metabolite.get(params.name_column, "")
+                if isinstance(name, str) and name:
+                    names.setdefault(name.lower(), name)
+            
+            # Check cache first
+            cache = self._result_cache(params)
+            cached: Dict[str, Dict] = {}
+            if params.cache_results and names:
+                stored = await asyncio.to_thread(
+                    cache.get_many, [self._get_cache_key(key) for key in names]
+                )
+                cached = {
+                    key: stored[self._get_cache_key(key)]
+                    for key in names if self._get_cache_key(key) in stored
+                }
+            pending = [key for key in names if key not in cached]
+            
+            # Exact matches, many names per round trip
+            found: Dict[str, Tuple[Dict, str]] = {}
+            batches = [
+                pending[i:i + params.batch_size]
+                for i in range(0, len(pending), params.batch_size)
+            ]
+            batch_results = await asyncio.gather(*(
+                run_query(self._generate_batch_query([names[key] for key in batch], "exact"))
+                for batch in batches
+            ))
+            failed_batches = set()
+            for batch, result in zip(batches, batch_results):
+                if result is None:
+                    # Fall back to individual queries
+                    logger.warning("Batch query failed, falling back to individual queries")
+                    failed_batches.update(batch)
+                    continue
+                in_batch = set(batch)
+                for binding in result.get("results", {}).get("bindings", []):
+                    key = binding.get("name", binding.get("label", {})).get("value", "").lower()
+                    if key in in_batch and key not in found:
+                        found[key] = (binding, "exact")
+            
+            async def resolve_individually(key: str) -> None:
+                name = names[key]
+                if key in failed_batches:
+                    result = await run_query(self._generate_exact_query(name))
+                    if result is None:
+                        return
+                    bindings = result.get("results", {}).get("bindings", [])
+                    if bindings:
+                        found[key] = (bindings[0], "exact")
+                        return
+                # If no exact match, try fuzzy
+                if params.query_strategy in ["fuzzy", "tiered"]:
+                    result = await run_query(self._generate_fuzzy_query(name))
+                    bindings = (result or {}).get("results", {}).get("bindings", [])
+                    if bindings:
+                        found[key] = (bindings[0], "fuzzy")
+            
+            await asyncio.gather(*(
+                resolve_individually(key) for key in pending if key not in found
+            ))
+            
+            # Match fields per name; cache the new matches
+            match_fields: Dict[str, Dict] = {
+                key: self._process_sparql_result({"results": {"bindings": [binding]}}, {}, match_type)
+                for key, (binding, match_type) in found.items()
+            }
+            if params.cache_results and match_fields:
+                await asyncio.to_thread(cache.put_many, {
+                    self._get_cache_key(key): fields for key, fields in match_fields.items()
+                })
+            
+            for metabolite in unmapped:
+                name = metabolite.get(params.name_column, "")
+                key = name.lower() if isinstance(name, str) else ""
+                if key in cached:
+                    cache_hits += 1
+                    matched.append({**metabolite, **cached[key]})
+                elif key in match_fields:
+                    matched.append({**metabolite, **match_fields[key]})
+                else:
+                    still_unmapped.append(metabolite)
+            
+            queries_executed = counters["queries"]
+            timeouts = counters["timeouts"]
+            sparql_errors = counters["errors"]
             
             # Store results directly in datasets dict
             datasets[params.output_key] = pd.DataFrame(matched)
@@ -6,25 +6,31 @@ caching, rate limiting, and full type safety for biomapper progressive mapping.
 
 Based on historical implementation at commit 54f25c7 with significant improvements:
 - Async/await support for concurrent processing
-- LRU caching for frequently accessed metabolites  
-- Rate limiting (5 requests/second) with exponential backoff
+- Response caching keyed by (endpoint, payload): in-process LRU with TTL and,
+  with ``cache_path``, a persistent SQLite cache; entries are scoped by the
+  RaMP source versions so a database update invalidates them
+- Token-bucket rate limiting (5 requests/second) with exponential backoff;
+  batches run concurrently within the limit
 - Comprehensive type hints and error handling
 - Integration with biomapper standards and patterns
 """
 
 import asyncio
+import hashlib
 import logging
-import time
 from collections import defaultdict
 from dataclasses import dataclass, field
 from enum import Enum
-from functools import lru_cache
 from typing import Any, Dict, List, Optional, Set, Tuple
 import json
 
 import aiohttp
 from pydantic import BaseModel, Field
 
+from core.infrastructure.action_pool import shared_resources
+from integrations.clients.cache_backends import CacheBackend, LRUCache, SQLiteCache
+from integrations.clients.rate_limit import TokenBucket
+
 logger = logging.getLogger(__name__)
 
 
@@ -52,10 +58,13 @@ class RaMPConfig:
     base_url: str = "https://rampdb.nih.gov/api"
     timeout: int = 30
     max_requests_per_second: float = 5.0  # Conservative rate limiting
+    max_concurrent_requests: int = 4  # Batches in flight
     max_retries: int = 3
     backoff_factor: float = 1.5
     cache_size: int = 1000  # LRU cache size
     cache_ttl: int = 3600   # Cache TTL in seconds (1 hour)
+    cache_path: Optional[str] = None  # SQLite file for the persistent cache
+    persistent_cache_ttl: Optional[int] = 7 * 24 * 3600  # Persistent TTL in seconds
 
 
 @dataclass
@@ -93,9 +102,20 @@ class RaMPClientModern:
         """
         self.config = config or RaMPConfig()
         self.session: Optional[aiohttp.ClientSession] = None
-        self._last_request_time = 0.0
+        self._rate_limiter = TokenBucket(self.config.max_requests_per_second)
         self._request_count = 0
         
+        # Responses are shared by clients of the same API in this process
+        self._memory_cache: CacheBackend = shared_resources.get_or_create(
+            ("ramp_response_cache", self.config.base_url, self.config.cache_size, self.config.cache_ttl),
+            lambda: LRUCache(self.config.cache_size, ttl=self.config.cache_ttl),
+        )
+        self._persistent_cache: Optional[CacheBackend] = None
+        self._source_version: Optional[str] = None
+        self._version_lock = asyncio.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        
         logger.info(f"Initialized RaMPClient with rate limit: {self.config.max_requests_per_second} req/sec")
     
     async def __aenter__(self) -> 'RaMPClientModern':
@@ -125,17 +145,10 @@ class RaMPClientModern:
             self.session = None
     
     async def _rate_limit(self) -> None:
-        """Implement rate limiting with 5 requests per second max"""
-        current_time = time.time()
-        time_since_last = current_time - self._last_request_time
-        min_interval = 1.0 / self.config.max_requests_per_second
-        
-        if time_since_last < min_interval:
-            sleep_time = min_interval - time_since_last
-            logger.debug(f"Rate limiting: sleeping {sleep_time:.3f}s")
-            await asyncio.sleep(sleep_time)
-        
-        self._last_request_time = time.time()
+        """Wait for a request token (max_requests_per_second on average)"""
+        waited = await self._rate_limiter.acquire()
+        if waited:
+            logger.debug(f"Rate limiting: waited {waited:.3f}s")
         self._request_count += 1
     
     async def _make_request_with_retry(
@@ -188,19 +201,90 @@ class RaMPClientModern:
         
         raise RaMPAPIError("Unexpected retry loop exit")
     
-    @lru_cache(maxsize=1000)
-    def _get_cached_id_types(self) -> str:
-        """Cached ID types - expensive operation"""
-        # Cache key for asyncio compatibility
-        return "id_types_cache_key"
+    @staticmethod
+    def _cache_key(method: str, endpoint: str, payload: Any) -> str:
+        """Cache key for a request (or a per-name result)"""
+        encoded = json.dumps([method, endpoint, payload], sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+    
+    def _set_source_version(self, versions: Any) -> None:
+        """Scope cached responses to the RaMP source versions"""
+        encoded = json.dumps(versions, sort_keys=True, default=str)
+        version = hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+        if version == self._source_version:
+            return
+        self._source_version = version
+        if self.config.cache_path:
+            # Opening under a new version prunes entries of older ones
+            self._persistent_cache = shared_resources.get_or_create(
+                ("ramp_persistent_cache", self.config.cache_path, version),
+                lambda: SQLiteCache(
+                    self.config.cache_path,
+                    namespace="ramp",
+                    version=version,
+                    ttl=self.config.persistent_cache_ttl,
+                ),
+            )
+    
+    async def _ensure_cache_version(self) -> None:
+        """Fetch the source versions once, before the cache is used"""
+        async with self._version_lock:
+            if self._source_version is not None:
+                return
+            try:
+                await self.get_source_versions()
+            except RaMPAPIError as e:
+                # Unknown versions: memory cache only, nothing persisted
+                logger.warning(f"RaMP source versions unavailable, persistent cache disabled: {e}")
+                self._source_version = "unknown"
+    
+    async def _cache_get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Cached values for keys (memory first, then the persistent cache)"""
+        await self._ensure_cache_version()
+        prefix = f"{self._source_version}:"
+        found = {
+            key[len(prefix):]: value
+            for key, value in self._memory_cache.get_many([prefix + key for key in keys]).items()
+        }
+        missing = [key for key in keys if key not in found]
+        if missing and self._persistent_cache is not None:
+            stored = await asyncio.to_thread(self._persistent_cache.get_many, missing)
+            self._memory_cache.put_many({prefix + key: value for key, value in stored.items()})
+            found.update(stored)
+        self._cache_hits += len(found)
+        self._cache_misses += len(keys) - len(found)
+        return found
+    
+    async def _cache_put_many(self, items: Dict[str, Any]) -> None:
+        """Store values in the memory and persistent caches"""
+        if not items:
+            return
+        prefix = f"{self._source_version}:"
+        self._memory_cache.put_many({prefix + key: value for key, value in items.items()})
+        if self._persistent_cache is not None:
+            await asyncio.to_thread(self._persistent_cache.put_many, items)
+    
+    async def _cached_request(self, method: str, endpoint: str, payload: Any = None) -> Dict[str, Any]:
+        """Request through the response cache"""
+        key = self._cache_key(method, endpoint, payload)
+        cached = await self._cache_get_many([key])
+        if key in cached:
+            return cached[key]
+        
+        kwargs = {"json": payload} if payload is not None else {}
+        data = await self._make_request_with_retry(method, endpoint, **kwargs)
+        await self._cache_put_many({key: data})
+        return data
     
     async def get_source_versions(self) -> Dict[str, Any]:
-        """Get RaMP source database versions
+        """Get RaMP source database versions (never cached; they key the cache)
         
         Returns:
             Dict containing version information
         """
-        return await self._make_request_with_retry("GET", "source-versions")
+        versions = await self._make_request_with_retry("GET", "source-versions")
+        self._set_source_version(versions)
+        return versions
     
     async def get_id_types(self) -> Dict[str, Any]:
         """Get valid RaMP database prefixes (cached)
@@ -208,9 +292,7 @@ class RaMPClientModern:
         Returns:
             Dict containing valid ID prefixes
         """
-        # Simple caching for ID types (rarely change)
-        cache_key = self._get_cached_id_types()
-        return await self._make_request_with_retry("GET", "id-types")
+        return await self._cached_request("GET", "id-types")
     
     async def get_pathways_from_analytes(self, analytes: List[str]) -> Dict[str, Any]:
         """Get pathways for metabolites with batch processing
@@ -229,7 +311,7 @@ class RaMPClientModern:
         logger.debug(f"Sample analytes: {analytes[:3]}...")
         
         payload = {"analytes": analytes}
-        result = await self._make_request_with_retry("POST", "pathways-from-analytes", json=payload)
+        result = await self._cached_request("POST", "pathways-from-analytes", payload)
         
         logger.info(f"RaMP returned pathways for {result.get('numFoundIds', 0)} metabolites")
         return result
@@ -247,7 +329,7 @@ class RaMPClientModern:
             return {"result": []}
             
         payload = {"metabolites": metabolites}
-        return await self._make_request_with_retry("POST", "chemical-classes", json=payload)
+        return await self._cached_request("POST", "chemical-classes", payload)
     
     async def get_ontologies_from_metabolites(
         self, 
@@ -267,7 +349,7 @@ class RaMPClientModern:
             return {"result": []}
             
         payload = {"metabolite": metabolites, "namesOrIds": names_or_ids}
-        return await self._make_request_with_retry("POST", "ontologies-from-metabolites", json=payload)
+        return await self._cached_request("POST", "ontologies-from-metabolites", payload)
     
     async def batch_metabolite_lookup(
         self, 
@@ -276,6 +358,9 @@ class RaMPClientModern:
     ) -> List[MetaboliteMatch]:
         """High-level batch metabolite lookup for biomapper integration
         
+        Results are cached per name, so only names without a cached result
+        are sent; their batches run concurrently within the rate limit.
+        
         Args:
             metabolite_names: List of metabolite names to look up
             batch_size: Number of metabolites per API call
@@ -287,31 +372,88 @@ class RaMPClientModern:
             return []
         
         logger.info(f"Starting RaMP batch lookup for {len(metabolite_names)} metabolites")
-        matches = []
+        
+        unique_names = list(dict.fromkeys(metabolite_names))
+        keys = {
+            name: self._cache_key("NAME", "ontologies-from-metabolites", name)
+            for name in unique_names
+        }
+        cached = await self._cache_get_many(list(keys.values()))
+        items_by_name: Dict[str, List[Dict[str, Any]]] = {
+            name: cached[keys[name]] for name in unique_names if keys[name] in cached
+        }
+        pending = [name for name in unique_names if name not in items_by_name]
+        logger.debug(f"RaMP cache: {len(items_by_name)} cached, {len(pending)} to fetch")
         
         # Process in batches to respect rate limits
-        for i in range(0, len(metabolite_names), batch_size):
-            batch = metabolite_names[i:i + batch_size]
-            logger.debug(f"Processing batch {i//batch_size + 1}: {len(batch)} metabolites")
-            
-            try:
-                # Use names-based search for most flexibility
-                ontology_result = await self.get_ontologies_from_metabolites(batch, "names")
-                
-                # Process results
-                for result_item in ontology_result.get("result", []):
-                    if self._is_valid_match(result_item):
-                        match = self._create_metabolite_match(result_item)
-                        matches.append(match)
-                        logger.debug(f"Found match: {match.query_name} -> {match.matched_name}")
-                
-            except RaMPAPIError as e:
-                logger.warning(f"Batch {i//batch_size + 1} failed: {e}")
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        semaphore = asyncio.Semaphore(self.config.max_concurrent_requests)
+        
+        async def lookup_batch(index: int, batch: List[str]) -> Optional[Dict[str, Any]]:
+            logger.debug(f"Processing batch {index + 1}: {len(batch)} metabolites")
+            async with semaphore:
+                try:
+                    # Use names-based search for most flexibility
+                    return await self._make_request_with_retry(
+                        "POST",
+                        "ontologies-from-metabolites",
+                        json={"metabolite": batch, "namesOrIds": "names"},
+                    )
+                except RaMPAPIError as e:
+                    logger.warning(f"Batch {index + 1} failed: {e}")
+                    return None
+        
+        results = await asyncio.gather(
+            *(lookup_batch(index, batch) for index, batch in enumerate(batches))
+        )
+        
+        # Split responses per name, matching inputId case- and
+        # whitespace-insensitively. Names without results are cached as
+        # empty, unless their batch had results that could not be attributed
+        # (those may belong to them).
+        unattributed: List[Dict[str, Any]] = []
+        fetched: Dict[str, Any] = {}
+        for batch, ontology_result in zip(batches, results):
+            if ontology_result is None:
                 continue
+            grouped: Dict[str, List[Dict[str, Any]]] = {name: [] for name in batch}
+            by_input_id: Dict[str, List[List[Dict[str, Any]]]] = {}
+            for name in batch:
+                by_input_id.setdefault(self._normalize_input_id(name), []).append(grouped[name])
+            batch_unattributed = 0
+            for result_item in ontology_result.get("result", []):
+                groups = by_input_id.get(
+                    self._normalize_input_id(result_item.get("inputId") or "")
+                )
+                if groups is None:
+                    unattributed.append(result_item)
+                    batch_unattributed += 1
+                for group in groups or ():
+                    group.append(result_item)
+            for name, items in grouped.items():
+                items_by_name[name] = items
+                if items or not batch_unattributed:
+                    fetched[keys[name]] = items
+        await self._cache_put_many(fetched)
+        
+        # Process results
+        matches = []
+        for result_item in [
+            item for name in metabolite_names for item in items_by_name.get(name, [])
+        ] + unattributed:
+            if self._is_valid_match(result_item):
+                match = self._create_metabolite_match(result_item)
+                matches.append(match)
+                logger.debug(f"Found match: {match.query_name} -> {match.matched_name}")
         
         logger.info(f"RaMP batch lookup completed: {len(matches)} matches found")
         return matches
     
+    @staticmethod
+    def _normalize_input_id(name: str) -> str:
+        """Normalize a metabolite name for matching RaMP ``inputId`` values."""
+        return " ".join(str(name).split()).casefold()
+
     def _is_valid_match(self, result_item: Dict[str, Any]) -> bool:
         """Validate if a RaMP result is a good match
         
@@ -434,8 +576,11 @@ class RaMPClientModern:
         return {
             "total_requests": self._request_count,
             "cache_info": {
-                "hits": getattr(self._get_cached_id_types, "cache_info", lambda: {})().hits if hasattr(self._get_cached_id_types, "cache_info") else 0,
-                "misses": getattr(self._get_cached_id_types, "cache_info", lambda: {})().misses if hasattr(self._get_cached_id_types, "cache_info") else 0,
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "size": len(self._memory_cache),
+                "persistent": self._persistent_cache is not None,
+                "source_version": self._source_version,
             },
             "config": {
                 "base_url": self.config.base_url,
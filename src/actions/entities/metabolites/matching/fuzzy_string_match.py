@@ -3,18 +3,21 @@ Fast algorithmic string-based fuzzy matching for metabolite names (Stage 2).
 Uses existing biomapper fuzzy patterns - NO LLM API calls, follows existing code.
 """
 
+import hashlib
+import json
 import logging
 import time
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 import pandas as pd
 from pydantic import BaseModel, Field
 
 # Use existing biomapper pattern - same imports as nightingale_nmr_match.py
-from fuzzywuzzy import fuzz, process  # type: ignore[import-untyped]
+from fuzzywuzzy import fuzz  # type: ignore[import-untyped]
 
 from actions.typed_base import TypedStrategyAction
 from actions.registry import register_action
+from actions.algorithms.fuzzy_matching.fuzzy_index import FuzzyIndex
 
 logger = logging.getLogger(__name__)
 
@@ -116,9 +119,30 @@ class MetaboliteFuzzyStringMatch(TypedStrategyAction[MetaboliteFuzzyStringMatchP
     """
     Fast algorithmic string-based fuzzy matching for metabolite names (Stage 2).
     
-    Uses fuzzywuzzy with process.extractOne like existing biomapper actions.
+    Scores token-sort ratios through a FuzzyIndex over the reference names;
+    the index is kept on the (pooled) action instance and rebuilt only when
+    the reference names or records change.
     NO LLM API calls - pure algorithmic matching following nightingale_nmr_match pattern.
     """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._index_cache: Optional[Tuple[str, FuzzyIndex]] = None
+
+    def _get_index(self, names: List[str], records: List[Dict[str, Any]]) -> FuzzyIndex:
+        """Return the index for ``names``, reusing the last one if unchanged.
+
+        The key covers the records as well: the index hands them back as
+        match payloads, so equal names with other records need a new index.
+        """
+        digest = hashlib.sha256()
+        digest.update("\x1f".join(names).encode())
+        digest.update(json.dumps(records, sort_keys=True, default=str).encode())
+        key = digest.hexdigest()
+        cached = getattr(self, "_index_cache", None)
+        if cached is None or cached[0] != key:
+            self._index_cache = (key, FuzzyIndex(names, records))
+        return self._index_cache[1]
     
     def get_params_model(self) -> type[MetaboliteFuzzyStringMatchParams]:
         """Return the params model class.""" 
@@ -200,16 +224,16 @@ class MetaboliteFuzzyStringMatch(TypedStrategyAction[MetaboliteFuzzyStringMatchP
                     message="No reference metabolites available"
                 )
             
-            # Extract reference names - simple list like nightingale pattern
+            # Extract reference names; records sharing a cleaned name are all kept
             reference_names = []
-            reference_lookup = {}
+            reference_records = []
             for ref in reference:
                 name = ref.get('name', '') or ref.get('description', '')
                 if name:
                     clean_name = _clean_metabolite_name(name)
                     if clean_name:
                         reference_names.append(clean_name)
-                        reference_lookup[clean_name] = ref
+                        reference_records.append(ref)
             
             if not reference_names:
                 logger.warning("No valid reference names found")
@@ -224,57 +248,48 @@ class MetaboliteFuzzyStringMatch(TypedStrategyAction[MetaboliteFuzzyStringMatchP
                 )
             
             logger.info(f"Stage 2 Fuzzy Matching: {len(stage2_candidates)} metabolites vs {len(reference_names)} references")
-            
-            # Process matches using existing pattern from nightingale_nmr_match.py
+
+            index = self._get_index(reference_names, reference_records)
+
             matches = []
             still_unmapped = []
-            
+            queries = []
             for metabolite in stage2_candidates:
                 query_name = metabolite.get('name', '')
-                if not query_name:
+                clean_query = _clean_metabolite_name(query_name) if query_name else ""
+                if clean_query:
+                    queries.append((metabolite, clean_query))
+                else:
                     still_unmapped.append(metabolite)
-                    continue
-                
-                # Clean query name
-                clean_query = _clean_metabolite_name(query_name)
-                if not clean_query:
+
+            # Scores are reported as integers like fuzzywuzzy, so allow
+            # scores that round up to the threshold
+            best_matches = index.best_matches(
+                [clean_query for _, clean_query in queries],
+                score_cutoff=max(0.0, params.fuzzy_threshold - 0.5),
+            )
+
+            for (metabolite, _), best_match in zip(queries, best_matches):
+                similarity_score = round(best_match.score) if best_match else 0
+                if not best_match or similarity_score < params.fuzzy_threshold:
                     still_unmapped.append(metabolite)
                     continue
-                
-                # Use process.extractOne like existing code
-                try:
-                    best_match = process.extractOne(
-                        clean_query,
-                        reference_names,
-                        scorer=fuzz.token_sort_ratio,
-                    )
-                    
-                    if best_match and best_match[1] >= params.fuzzy_threshold:
-                        # Get reference data
-                        matched_name = best_match[0]
-                        similarity_score = best_match[1]
-                        ref_data = reference_lookup.get(matched_name, {})
-                        
-                        # Create match record
-                        match_record = {
-                            **metabolite,
-                            'matched_name': ref_data.get('name', matched_name),
-                            'matched_id': ref_data.get('id', ''),
-                            'matched_description': ref_data.get('description', ''),
-                            'match_confidence': similarity_score / 100.0,  # Convert to 0-1
-                            'match_method': 'fuzzy_token_sort_ratio',
-                            'match_source': params.reference_key,
-                            'fuzzy_score': similarity_score
-                        }
-                        
-                        matches.append(match_record)
-                        logger.debug(f"Matched '{query_name}' -> '{matched_name}' (score: {similarity_score})")
-                    else:
-                        still_unmapped.append(metabolite)
-                        
-                except Exception as e:
-                    logger.warning(f"Fuzzy matching error for '{query_name}': {e}")
-                    still_unmapped.append(metabolite)
+
+                ref_data = best_match.payloads[0]
+                match_record = {
+                    **metabolite,
+                    'matched_name': ref_data.get('name', best_match.key),
+                    'matched_id': ref_data.get('id', ''),
+                    'matched_ids': [ref.get('id', '') for ref in best_match.payloads],
+                    'matched_description': ref_data.get('description', ''),
+                    'match_confidence': similarity_score / 100.0,  # Convert to 0-1
+                    'match_method': 'fuzzy_token_sort_ratio',
+                    'match_source': params.reference_key,
+                    'fuzzy_score': similarity_score
+                }
+
+                matches.append(match_record)
+                logger.debug(f"Matched '{metabolite.get('name')}' -> '{best_match.key}' (score: {similarity_score})")
             
             # Store results
             datasets[params.output_key] = matches
@@ -5,6 +5,7 @@ This action leverages pre-computed HMDB embeddings stored in Qdrant to find simi
 based on semantic similarity of names and descriptions.
 """
 
+import asyncio
 import logging
 import os
 from pathlib import Path
@@ -16,6 +17,9 @@ from pydantic import BaseModel, Field, validator
 
 from actions.typed_base import TypedStrategyAction
 from actions.registry import register_action
+from core.infrastructure.action_pool import shared_resources
+from core.infrastructure.embedding_store import EmbeddingStore
+from core.standards.dataset_handle import as_dataframe
 
 logger = logging.getLogger(__name__)
 
@@ -71,6 +75,10 @@ class HMDBVectorMatchParams(BaseModel):
         "sentence-transformers/all-MiniLM-L6-v2",
         description="FastEmbed model name"
     )
+    embedding_cache_dir: Optional[str] = Field(
+        default_factory=lambda: os.getenv("SEMANTIC_MATCH_CACHE_DIR"),
+        description="Directory of the shared on-disk embedding store (disabled if unset)"
+    )
     
     # LLM validation (optional)
     enable_llm_validation: bool = Field(
@@ -85,11 +93,17 @@ class HMDBVectorMatchParams(BaseModel):
         20,
         description="Maximum LLM calls to control costs"
     )
+    llm_concurrency: int = Field(
+        5,
+        ge=1,
+        description="Maximum LLM validation requests in flight"
+    )
     
     # Performance
     batch_size: int = Field(
         32,
-        description="Batch size for embedding generation"
+        ge=1,
+        description="Batch size for embedding generation and vector search"
     )
     
     # Backward compatibility
@@ -146,9 +160,9 @@ class HMDBVectorMatchAction(TypedStrategyAction[HMDBVectorMatchParams, HMDBVecto
     
     Features:
     - FastEmbed for efficient embedding generation
-    - Qdrant vector database for similarity search
-    - Optional LLM validation for high-confidence matches
-    - Batch processing for performance
+    - Qdrant vector database for similarity search, one request per batch
+    - Embedding of the next batch overlaps the search of the current one
+    - Optional concurrent LLM validation for high-confidence matches
     - Standard parameter naming compliance
     """
     
@@ -159,6 +173,22 @@ class HMDBVectorMatchAction(TypedStrategyAction[HMDBVectorMatchParams, HMDBVecto
         self.embedding_model = None
         self.openai_client = None
     
+    async def warmup(self) -> None:
+        """Open the default Qdrant storage and load the default embedding model."""
+        defaults = HMDBVectorMatchParams(input_key="", output_key="")
+        if not Path(defaults.qdrant_path).exists():
+            # Don't let QdrantClient create empty storage at the default path
+            logger.info(f"Skipping HMDB warmup: {defaults.qdrant_path} not found")
+            return
+        self._initialize_qdrant(defaults)
+        self._initialize_embedding_model(defaults)
+    
+    async def close(self) -> None:
+        """Drop references to shared clients; the pool closes them."""
+        self.qdrant_client = None
+        self.embedding_model = None
+        self.openai_client = None
+    
     def get_params_model(self) -> type[HMDBVectorMatchParams]:
         """Return the params model class."""
         return HMDBVectorMatchParams
@@ -173,8 +203,12 @@ class HMDBVectorMatchAction(TypedStrategyAction[HMDBVectorMatchParams, HMDBVecto
             try:
                 from qdrant_client import QdrantClient
                 
-                # Connect to local Qdrant storage
-                self.qdrant_client = QdrantClient(path=params.qdrant_path)
+                # Connect to local Qdrant storage (opened once per process;
+                # local storage cannot be opened twice concurrently anyway)
+                self.qdrant_client = shared_resources.get_or_create(
+                    ("qdrant", params.qdrant_path),
+                    lambda: QdrantClient(path=params.qdrant_path),
+                )
                 
                 # Verify collection exists
                 collections = self.qdrant_client.get_collections()
@@ -200,8 +234,11 @@ class HMDBVectorMatchAction(TypedStrategyAction[HMDBVectorMatchParams, HMDBVecto
             try:
                 from fastembed import TextEmbedding
                 
-                # Initialize FastEmbed model
-                self.embedding_model = TextEmbedding(model_name=params.embedding_model)
+                # Initialize FastEmbed model (loaded once per process)
+                self.embedding_model = shared_resources.get_or_create(
+                    ("fastembed", params.embedding_model),
+                    lambda: TextEmbedding(model_name=params.embedding_model),
+                )
                 logger.info(f"Initialized FastEmbed model: {params.embedding_model}")
                 
             except ImportError:
@@ -230,20 +267,30 @@ class HMDBVectorMatchAction(TypedStrategyAction[HMDBVectorMatchParams, HMDBVecto
     def _generate_embeddings(
         self,
         texts: List[str],
-        batch_size: int
+        batch_size: int,
+        store: Optional[EmbeddingStore] = None
     ) -> List[List[float]]:
-        """Generate embeddings for metabolite names using FastEmbed."""
-        embeddings = []
+        """
+        Generate embeddings for metabolite names using FastEmbed.
+
+        With a ``store``, only texts missing from it are embedded and the new
+        vectors are added to it.
+        """
+        embeddings: List[Any] = store.get_many(texts) if store is not None else [None] * len(texts)
+        missing = list(dict.fromkeys(t for t, emb in zip(texts, embeddings) if emb is None))
+        generated: Dict[str, Any] = {}
         
         # Process in batches
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
+        for i in range(0, len(missing), batch_size):
+            batch = missing[i:i + batch_size]
             
             # Generate embeddings
             batch_embeddings = list(self.embedding_model.embed(batch))
-            embeddings.extend(batch_embeddings)
+            generated.update(zip(batch, batch_embeddings))
+            if store is not None:
+                store.put_many(batch, batch_embeddings)
         
-        return embeddings
+        return [generated[t] if emb is None else emb for t, emb in zip(texts, embeddings)]
     
     def _search_similar_metabolites(
         self,
@@ -253,23 +300,110 @@ class HMDBVectorMatchAction(TypedStrategyAction[HMDBVectorMatchParams, HMDBVecto
         threshold: float
     ) -> List[Tuple[Dict[str, Any], float]]:
         """Search for similar metabolites in Qdrant."""
-        from qdrant_client.models import PointStruct
-        
-        # Search in Qdrant
-        search_result = self.qdrant_client.search(
-            collection_name=collection_name,
-            query_vector=query_embedding,
-            limit=top_k,
-            score_threshold=threshold
-        )
+        return self._search_similar_metabolites_batch(
+            [query_embedding], collection_name, top_k, threshold
+        )[0]
+    
+    def _search_similar_metabolites_batch(
+        self,
+        query_embeddings: List[List[float]],
+        collection_name: str,
+        top_k: int,
+        threshold: float
+    ) -> List[List[Tuple[Dict[str, Any], float]]]:
+        """Search Qdrant for a batch of query embeddings in one request."""
+        if hasattr(self.qdrant_client, "query_batch_points"):
+            from qdrant_client.models import QueryRequest
+            
+            responses = self.qdrant_client.query_batch_points(
+                collection_name=collection_name,
+                requests=[
+                    QueryRequest(
+                        query=list(map(float, embedding)),
+                        limit=top_k,
+                        score_threshold=threshold,
+                        with_payload=True,
+                    )
+                    for embedding in query_embeddings
+                ],
+            )
+            hit_lists = [response.points for response in responses]
+        else:
+            # qdrant-client < 1.10
+            from qdrant_client.models import SearchRequest
+            
+            hit_lists = self.qdrant_client.search_batch(
+                collection_name=collection_name,
+                requests=[
+                    SearchRequest(
+                        vector=list(map(float, embedding)),
+                        limit=top_k,
+                        score_threshold=threshold,
+                        with_payload=True,
+                    )
+                    for embedding in query_embeddings
+                ],
+            )
         
         # Extract results
         results = []
-        for hit in search_result:
-            payload = hit.payload if hasattr(hit, 'payload') else {}
-            score = hit.score if hasattr(hit, 'score') else 0.0
-            results.append((payload, float(score)))
+        for hits in hit_lists:
+            results.append([
+                (getattr(hit, 'payload', None) or {}, float(getattr(hit, 'score', 0.0)))
+                for hit in hits
+            ])
+        return results
+    
+    async def _embed_and_search(
+        self,
+        names: List[str],
+        params: HMDBVectorMatchParams
+    ) -> List[List[Tuple[Dict[str, Any], float]]]:
+        """
+        Embed and search ``names`` batch by batch.
+
+        A producer embeds batches in a worker thread while the consumer
+        searches the previous batch, so embedding and search overlap.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+        done = object()
+        store = (
+            EmbeddingStore.for_model(params.embedding_cache_dir, f"fastembed-{params.embedding_model}")
+            if params.embedding_cache_dir else None
+        )
         
+        async def produce() -> None:
+            try:
+                for start in range(0, len(names), params.batch_size):
+                    batch = names[start:start + params.batch_size]
+                    embeddings = await asyncio.to_thread(
+                        self._generate_embeddings, batch, params.batch_size, store
+                    )
+                    await queue.put(embeddings)
+                await queue.put(done)
+            except Exception as e:
+                await queue.put(e)
+        
+        producer = asyncio.create_task(produce())
+        results: List[List[Tuple[Dict[str, Any], float]]] = []
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                results.extend(await asyncio.to_thread(
+                    self._search_similar_metabolites_batch,
+                    item,
+                    params.collection_name,
+                    params.top_k,
+                    params.threshold
+                ))
+        finally:
+            if not producer.done():
+                producer.cancel()
+                await asyncio.gather(producer, return_exceptions=True)
         return results
     
     async def _validate_with_llm(
@@ -304,7 +438,9 @@ Are these the same metabolite? Respond with:
 Format: YES|0.95|Both refer to the same glucose metabolite."""
         
         try:
-            response = self.openai_client.chat.completions.create(
+            # The client is synchronous; keep the event loop free
+            response = await asyncio.to_thread(
+                self.openai_client.chat.completions.create,
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are a biochemistry expert."},
@@ -382,7 +518,9 @@ Format: YES|0.95|Both refer to the same glucose metabolite."""
             
             # Get unmapped metabolites
             unmapped = datasets.get(params.input_key)
-            if unmapped is None or (hasattr(unmapped, 'empty') and unmapped.empty):
+            if unmapped is not None:
+                unmapped = as_dataframe(unmapped, copy=False)
+            if unmapped is None or unmapped.empty:
                 return HMDBVectorMatchResult(
                     success=True,
                     message="No unmapped metabolites to process",
@@ -394,21 +532,40 @@ Format: YES|0.95|Both refer to the same glucose metabolite."""
                 )
             
             # Extract metabolite names
-            metabolite_names = unmapped[params.identifier_column].tolist()
+            metabolite_names = unmapped[params.identifier_column].astype(str).tolist()
             logger.info(f"Stage 4: Processing {len(metabolite_names)} unmapped metabolites")
             
-            # Generate embeddings for unmapped metabolites
-            logger.info("Generating embeddings for unmapped metabolites...")
-            query_embeddings = self._generate_embeddings(
-                metabolite_names,
-                params.batch_size
-            )
+            # Embed and search in overlapping batches
+            logger.info("Generating embeddings and searching HMDB vectors...")
+            all_candidates = await self._embed_and_search(metabolite_names, params)
+            
+            # Optional LLM validation of the first max_llm_calls candidates,
+            # run concurrently
+            validations: Dict[int, Tuple[bool, float, str]] = {}
+            if params.enable_llm_validation:
+                to_validate = [
+                    idx for idx, candidates in enumerate(all_candidates) if candidates
+                ][:params.max_llm_calls]
+                semaphore = asyncio.Semaphore(params.llm_concurrency)
+                
+                async def validate(idx: int) -> Tuple[bool, float, str]:
+                    best_candidate, best_score = all_candidates[idx][0]
+                    async with semaphore:
+                        return await self._validate_with_llm(
+                            metabolite_names[idx],
+                            best_candidate.get('name', ''),
+                            best_candidate,
+                            best_score,
+                            params.llm_confidence_threshold
+                        )
+                
+                outcomes = await asyncio.gather(*(validate(idx) for idx in to_validate))
+                validations = dict(zip(to_validate, outcomes))
+            llm_calls = len(validations)
             
-            # Search for similar metabolites
             matched = []
             still_unmatched = []
             total_similarity = 0.0
-            llm_calls = 0
             confidence_dist = {
                 "high_0.9+": 0,
                 "medium_0.8-0.9": 0,
@@ -416,15 +573,7 @@ Format: YES|0.95|Both refer to the same glucose metabolite."""
                 "vector_only": 0
             }
             
-            for idx, (name, embedding) in enumerate(zip(metabolite_names, query_embeddings)):
-                # Search in Qdrant
-                candidates = self._search_similar_metabolites(
-                    embedding,
-                    params.collection_name,
-                    params.top_k,
-                    params.threshold
-                )
-                
+            for idx, candidates in enumerate(all_candidates):
                 if not candidates:
                     still_unmatched.append(unmapped.iloc[idx].to_dict())
                     continue
@@ -432,17 +581,8 @@ Format: YES|0.95|Both refer to the same glucose metabolite."""
                 # Get best candidate
                 best_candidate, best_score = candidates[0]
                 
-                # Optional LLM validation
-                if params.enable_llm_validation and llm_calls < params.max_llm_calls:
-                    is_valid, llm_confidence, reasoning = await self._validate_with_llm(
-                        name,
-                        best_candidate.get('name', ''),
-                        best_candidate,
-                        best_score,
-                        params.llm_confidence_threshold
-                    )
-                    llm_calls += 1
-                    
+                if idx in validations:
+                    is_valid, llm_confidence, reasoning = validations[idx]
                     if not is_valid:
                         still_unmatched.append(unmapped.iloc[idx].to_dict())
                         continue
@@ -2,7 +2,18 @@
 
 import logging
 import re
-from typing import Dict, Any, Optional, List, TypedDict
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypedDict,
+)
 
 import pandas as pd
 from pydantic import BaseModel, Field
@@ -10,6 +21,7 @@ from fuzzywuzzy import fuzz, process  # type: ignore[import-untyped]
 
 from actions.typed_base import TypedStrategyAction
 from actions.registry import register_action
+from core.standards.dataset_handle import DatasetHandle, as_dataframe
 from core.models.execution_context import StrategyExecutionContext
 
 logger = logging.getLogger(__name__)
@@ -277,16 +289,80 @@ class NightingaleReference:
         return abbreviations
 
 
+@lru_cache(maxsize=8)
+def _abbreviation_regex(
+    abbreviations: Tuple[Tuple[str, str], ...]
+) -> Tuple["re.Pattern[str]", Dict[str, str]]:
+    """Compile one alternation over all abbreviations (longest first)."""
+    expansions: Dict[str, str] = {}
+    for abbr, full in abbreviations:
+        expansions.setdefault(abbr.lower(), full)
+    alternation = "|".join(
+        re.escape(abbr) for abbr in sorted(expansions, key=len, reverse=True)
+    )
+    return re.compile(r"\b(?:" + alternation + r")\b", re.IGNORECASE), expansions
+
+
+class _ReferenceIndex:
+    """Normalized names of one reference frame, built once per frame."""
+
+    def __init__(self, reference_df: pd.DataFrame, clean: Callable[[str], str]):
+        self.reference_df = reference_df
+        self.records: List[Dict[str, Any]] = []
+        # Lower-cased name -> first reference row
+        self.exact: Dict[str, int] = {}
+        # Cleaned name -> first reference row, in reference order
+        self.cleaned: Dict[str, int] = {}
+        if not reference_df.empty:
+            self.records = reference_df.to_dict("records")
+            for row, name in enumerate(reference_df["nightingale_name"]):
+                if isinstance(name, str):
+                    self.exact.setdefault(name.lower(), row)
+                    self.cleaned.setdefault(clean(name), row)
+        self.cleaned_choices = list(self.cleaned)
+
+
 class NightingaleMatcher:
     """Match Nightingale biomarkers to standard identifiers."""
 
     def __init__(self) -> None:
         self.abbreviations: Dict[str, str] = {}
+        self._index: Optional[Tuple[Tuple[Tuple[str, str], ...], _ReferenceIndex]] = None
+        self._pattern_index: Optional[
+            Tuple[Tuple[Tuple[str, str], ...], Dict[str, str]]
+        ] = None
 
     def load_abbreviations(self) -> Dict[str, str]:
         """Load and return abbreviations."""
         return NightingaleReference("", use_cache=False).load_abbreviations()
 
+    def _abbreviation_key(self) -> Tuple[Tuple[str, str], ...]:
+        # Load abbreviations if not loaded
+        if not self.abbreviations:
+            self.abbreviations = self.load_abbreviations()
+        return tuple(self.abbreviations.items())
+
+    def _reference_index(self, reference_df: pd.DataFrame) -> _ReferenceIndex:
+        """Index for ``reference_df``, rebuilt only when the frame changes."""
+        key = self._abbreviation_key()
+        if (
+            self._index is None
+            or self._index[0] != key
+            or self._index[1].reference_df is not reference_df
+        ):
+            self._index = (key, _ReferenceIndex(reference_df, self._clean_biomarker_name))
+        return self._index[1]
+
+    def _cleaned_patterns(self) -> Dict[str, str]:
+        """Cleaned built-in pattern name -> first pattern name."""
+        key = self._abbreviation_key()
+        if self._pattern_index is None or self._pattern_index[0] != key:
+            cleaned: Dict[str, str] = {}
+            for pattern_name in NIGHTINGALE_PATTERNS:
+                cleaned.setdefault(self._clean_biomarker_name(pattern_name), pattern_name)
+            self._pattern_index = (key, cleaned)
+        return self._pattern_index[1]
+
     def match_biomarker(
         self,
         biomarker_name: Optional[str],
@@ -294,93 +370,92 @@ class NightingaleMatcher:
         threshold: float = 0.85,
     ) -> Optional[Dict[str, Any]]:
         """Match single biomarker to reference."""
+        return self.match_biomarkers([biomarker_name], reference_df, threshold)[0]
 
-        # Handle invalid input
-        if biomarker_name is None or pd.isna(biomarker_name):
-            return None
-
-        # Convert to string and strip
-        biomarker_name = str(biomarker_name).strip()
-        if not biomarker_name:
-            return None
+    def match_biomarkers(
+        self,
+        biomarker_names: Iterable[Any],
+        reference_df: pd.DataFrame,
+        threshold: float = 0.85,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Match many biomarkers to reference.
 
-        # Try exact match first in reference dataframe
-        if not reference_df.empty:
-            exact_match = reference_df[
-                reference_df["nightingale_name"].str.lower() == biomarker_name.lower()
-            ]
-
-            if not exact_match.empty:
-                return self._format_match_result(exact_match.iloc[0], confidence=1.0)
-
-        # Try exact match in built-in patterns
-        if biomarker_name in NIGHTINGALE_PATTERNS:
-            pattern_info = NIGHTINGALE_PATTERNS[biomarker_name]
-            return {
-                "nightingale_name": biomarker_name,
-                "hmdb_id": pattern_info["hmdb"],
-                "loinc_code": pattern_info["loinc"],
-                "description": pattern_info["description"],
-                "category": pattern_info["category"],
-                "unit": pattern_info["unit"],
-                "confidence": 1.0,
-            }
+        Each distinct name is resolved once: exact reference names, built-in
+        patterns and lipoprotein patterns are matched column-wise, and only
+        the remaining names are fuzzy matched against the cached index.
 
-        # Try pattern matching for lipoproteins
+        Returns:
+            One match (or None) per input name, as ``match_biomarker`` would
+        """
+        # Handle invalid input
+        names = pd.Series(list(biomarker_names), dtype=object)
+        stripped = names[names.notna()].astype(str).str.strip()
+        pending = pd.Series(pd.unique(stripped[stripped != ""]), dtype=object)
+        resolved: Dict[str, Optional[Dict[str, Any]]] = {}
+        index = self._reference_index(reference_df)
+
+        # Exact match first in reference dataframe
+        if index.exact and len(pending):
+            rows = pending.str.lower().map(index.exact)
+            hit = rows.notna()
+            for name, row in zip(pending[hit], rows[hit].astype(int)):
+                resolved[name] = self._format_match_result(index.records[row], confidence=1.0)
+            pending = pending[~hit]
+
+        # Exact match in built-in patterns
+        hit = pending.isin(list(NIGHTINGALE_PATTERNS))
+        for name in pending[hit]:
+            resolved[name] = self._format_pattern_result(name, confidence=1.0)
+        pending = pending[~hit]
+
+        # Pattern matching for lipoproteins, first matching pattern wins
         for pattern, description in LIPOPROTEIN_PATTERNS.items():
-            if re.match(pattern, biomarker_name):
-                return self._handle_lipoprotein_pattern(
-                    biomarker_name, pattern, description
+            if pending.empty:
+                break
+            hit = pending.str.match(pattern).astype(bool)
+            for name in pending[hit]:
+                resolved[name] = self._handle_lipoprotein_pattern(
+                    name, pattern, description
                 )
+            pending = pending[~hit]
+
+        for name in pending:
+            resolved[name] = self._fuzzy_match(name, index, threshold)
 
-        # Clean the biomarker name for fuzzy matching
+        return [
+            resolved.get(name) for name in names.map(
+                lambda n: None if n is None or pd.isna(n) else str(n).strip()
+            )
+        ]
+
+    def _fuzzy_match(
+        self, biomarker_name: str, index: _ReferenceIndex, threshold: float
+    ) -> Optional[Dict[str, Any]]:
+        """Fuzzy match a cleaned name against the reference, then the patterns."""
         clean_name = self._clean_biomarker_name(biomarker_name)
 
         # Try fuzzy matching against reference dataframe
-        if not reference_df.empty:
-            # First try matching with cleaned name
-            choices = reference_df["nightingale_name"].tolist()
+        if index.cleaned_choices:
             best_match = process.extractOne(
-                clean_name,
-                [self._clean_biomarker_name(c) for c in choices],
-                scorer=fuzz.token_sort_ratio,
+                clean_name, index.cleaned_choices, scorer=fuzz.token_sort_ratio
             )
-
             if best_match and best_match[1] >= threshold * 100:
-                # Find the original row
-                matched_idx = [self._clean_biomarker_name(c) for c in choices].index(
-                    best_match[0]
-                )
-                matched_row = reference_df.iloc[matched_idx]
                 return self._format_match_result(
-                    matched_row, confidence=best_match[1] / 100
+                    index.records[index.cleaned[best_match[0]]],
+                    confidence=best_match[1] / 100,
                 )
 
         # Try fuzzy matching against built-in patterns
-        pattern_names = list(NIGHTINGALE_PATTERNS.keys())
-        if pattern_names:
+        cleaned_patterns = self._cleaned_patterns()
+        if cleaned_patterns:
             best_match = process.extractOne(
-                clean_name,
-                [self._clean_biomarker_name(p) for p in pattern_names],
-                scorer=fuzz.token_sort_ratio,
+                clean_name, list(cleaned_patterns), scorer=fuzz.token_sort_ratio
             )
-
             if best_match and best_match[1] >= threshold * 100:
-                # Find the original pattern
-                matched_idx = [
-                    self._clean_biomarker_name(p) for p in pattern_names
-                ].index(best_match[0])
-                pattern_name = pattern_names[matched_idx]
-                pattern_info = NIGHTINGALE_PATTERNS[pattern_name]
-                return {
-                    "nightingale_name": pattern_name,
-                    "hmdb_id": pattern_info["hmdb"],
-                    "loinc_code": pattern_info["loinc"],
-                    "description": pattern_info["description"],
-                    "category": pattern_info["category"],
-                    "unit": pattern_info["unit"],
-                    "confidence": best_match[1] / 100,
-                }
+                return self._format_pattern_result(
+                    cleaned_patterns[best_match[0]], confidence=best_match[1] / 100
+                )
 
         return None
 
@@ -389,20 +464,30 @@ class NightingaleMatcher:
         # Remove underscores
         name = name.replace("_", " ")
 
-        # Load abbreviations if not loaded
-        if not self.abbreviations:
-            self.abbreviations = self.load_abbreviations()
-
-        # Expand abbreviations
-        for abbr, full in self.abbreviations.items():
-            # Use word boundaries for exact matching
-            name = re.sub(
-                r"\b" + re.escape(abbr) + r"\b", full, name, flags=re.IGNORECASE
-            )
+        # Expand abbreviations in one pass, matching whole words only
+        key = self._abbreviation_key()
+        if key:
+            pattern, expansions = _abbreviation_regex(key)
+            name = pattern.sub(lambda m: expansions[m.group(0).lower()], name)
 
         return name.strip().lower()
 
-    def _format_match_result(self, row: pd.Series, confidence: float) -> Dict[str, Any]:
+    def _format_pattern_result(self, pattern_name: str, confidence: float) -> Dict[str, Any]:
+        """Format match result from a built-in pattern."""
+        pattern_info = NIGHTINGALE_PATTERNS[pattern_name]
+        return {
+            "nightingale_name": pattern_name,
+            "hmdb_id": pattern_info["hmdb"],
+            "loinc_code": pattern_info["loinc"],
+            "description": pattern_info["description"],
+            "category": pattern_info["category"],
+            "unit": pattern_info["unit"],
+            "confidence": confidence,
+        }
+
+    def _format_match_result(
+        self, row: Mapping[str, Any], confidence: float
+    ) -> Dict[str, Any]:
         """Format match result from reference row."""
         return {
             "nightingale_name": row.get("nightingale_name", ""),
@@ -532,49 +617,53 @@ class NightingaleNmrMatchAction(
         if params.use_abbreviations:
             matcher.abbreviations = matcher.load_abbreviations()
 
-        # Process each biomarker
-        results = []
-        for idx, row in df.iterrows():
-            biomarker_name = row.get(params.biomarker_column)
+        if params.biomarker_column not in df.columns:
+            return pd.DataFrame()
+        names = df[params.biomarker_column]
+        rows = df[names.notna() & (names != "")]
 
-            if pd.isna(biomarker_name) or biomarker_name == "":
-                continue
+        # Match all biomarkers at once
+        matches = matcher.match_biomarkers(
+            rows[params.biomarker_column], reference_df, params.match_threshold
+        )
+        keep = [match is not None for match in matches]
+        if not any(keep):
+            return pd.DataFrame()
+        rows = rows[keep]
+        matched = [match for match in matches if match is not None]
+
+        # Build result columns
+        result = pd.DataFrame(
+            {
+                "original_biomarker": rows[params.biomarker_column].to_numpy(),
+                "matched_name": [m.get("nightingale_name") for m in matched],
+                "confidence": [m.get("confidence") for m in matched],
+            }
+        )
 
-            # Match biomarker
-            match_result = matcher.match_biomarker(
-                biomarker_name, reference_df, params.match_threshold
-            )
+        # Add identifiers based on target format
+        fields = []
+        if params.target_format in ["hmdb", "both"]:
+            fields.append("hmdb_id")
+        if params.target_format in ["loinc", "both"]:
+            fields.append("loinc_code")
+
+        # Add metadata if requested
+        if params.add_metadata:
+            fields.append("description")
+        if params.include_categories:
+            fields.append("category")
+        if params.include_units:
+            fields.append("unit")
+        for field in fields:
+            result[field] = pd.Series([m.get(field) for m in matched], dtype=object)
+
+        # Add original data columns
+        for col in df.columns:
+            if col != params.biomarker_column and col not in result.columns:
+                result[col] = rows[col].to_numpy()
 
-            if match_result:
-                # Build result row
-                result_row = {
-                    "original_biomarker": biomarker_name,
-                    "matched_name": match_result.get("nightingale_name"),
-                    "confidence": match_result.get("confidence"),
-                }
-
-                # Add identifiers based on target format
-                if params.target_format in ["hmdb", "both"]:
-                    result_row["hmdb_id"] = match_result.get("hmdb_id")
-                if params.target_format in ["loinc", "both"]:
-                    result_row["loinc_code"] = match_result.get("loinc_code")
-
-                # Add metadata if requested
-                if params.add_metadata:
-                    result_row["description"] = match_result.get("description")
-                if params.include_categories:
-                    result_row["category"] = match_result.get("category")
-                if params.include_units:
-                    result_row["unit"] = match_result.get("unit")
-
-                # Add original data columns
-                for col in df.columns:
-                    if col != params.biomarker_column and col not in result_row:
-                        result_row[col] = row[col]
-
-                results.append(result_row)
-
-        return pd.DataFrame(results) if results else pd.DataFrame()
+        return result
 
     async def execute_typed(
         self,
@@ -596,10 +685,8 @@ class NightingaleNmrMatchAction(
         input_data = datasets[params.input_key]
 
         # Convert to DataFrame if needed
-        if isinstance(input_data, list):
-            df = pd.DataFrame(input_data)
-        elif isinstance(input_data, pd.DataFrame):
-            df = input_data.copy()
+        if isinstance(input_data, (list, DatasetHandle, pd.DataFrame)):
+            df = as_dataframe(input_data)
         else:
             df = pd.DataFrame([input_data])
 
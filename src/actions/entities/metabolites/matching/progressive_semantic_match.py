@@ -228,6 +228,7 @@ class ProgressiveSemanticMatch(TypedStrategyAction[ProgressiveSemanticMatchParam
                 embedding_similarity_threshold=params.embedding_similarity_threshold,
                 max_llm_calls=params.max_llm_calls,
                 include_reasoning=True,  # Important for validation
+                cache_dir=params.cache_dir,
                 output_key=params.output_key + "_semantic",
                 unmatched_key=params.output_key + "_semantic_unmapped"
             )
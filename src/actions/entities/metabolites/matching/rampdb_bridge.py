@@ -14,6 +14,7 @@ Performance Targets:
 
 import asyncio
 import logging
+import os
 import time
 from typing import Any, Dict, List, Optional
 
@@ -66,6 +67,14 @@ class MetaboliteRampdbBridgeParams(BaseModel):
         30, ge=5, le=120,
         description="API timeout in seconds"
     )
+    max_concurrent_requests: int = Field(
+        4, ge=1, le=16,
+        description="RampDB batches in flight"
+    )
+    cache_path: Optional[str] = Field(
+        default_factory=lambda: os.getenv("BIOMAPPER_MAPPING_CACHE_PATH"),
+        description="SQLite file caching RampDB responses across runs"
+    )
     
     # Cost and performance controls
     max_cost_estimate: float = Field(
@@ -111,7 +120,9 @@ class MetaboliteRampdbBridge(TypedStrategyAction[MetaboliteRampdbBridgeParams, M
     through pathway and ontology-based matching.
     
     Key Features:
-    - Async batch processing with rate limiting
+    - Concurrent batch processing with token-bucket rate limiting
+    - Response cache (persistent with cache_path), so repeated cohorts only
+      query new names
     - Conservative confidence thresholds for biological accuracy  
     - Cost estimation and controls
     - Comprehensive error handling and fallbacks
@@ -194,8 +205,10 @@ class MetaboliteRampdbBridge(TypedStrategyAction[MetaboliteRampdbBridgeParams, M
                 base_url="https://rampdb.nih.gov/api",
                 timeout=params.api_timeout,
                 max_requests_per_second=params.max_requests_per_second,
+                max_concurrent_requests=params.max_concurrent_requests,
                 max_retries=3,
-                backoff_factor=1.5
+                backoff_factor=1.5,
+                cache_path=params.cache_path
             )
             
             # Execute RampDB matching
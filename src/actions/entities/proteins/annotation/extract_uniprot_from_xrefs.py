@@ -4,15 +4,22 @@ PROTEIN_EXTRACT_UNIPROT_FROM_XREFS action for extracting UniProt accession IDs f
 This action extracts UniProt accession IDs from compound xrefs fields commonly found 
 in KG2c and SPOKE protein datasets. It handles multiple IDs, isoforms, and various 
 output formats according to user preferences.
+
+The xrefs column is scanned once, column-wise: ``str.findall`` with a pattern
+that only matches valid accessions (with or without their isoform suffix)
+yields the ID lists, ``explode`` yields every ID with the position of its row,
+and first IDs, expanded rows and statistics are derived from the per-row counts.
 """
 
 import re
+import numpy as np
 import pandas as pd
 from typing import Any, Dict, List, Literal
 from pydantic import BaseModel, Field, validator
 
 from actions.registry import register_action
 from actions.typed_base import TypedStrategyAction
+from core.standards.dataset_handle import DatasetHandle, as_dataframe, is_tabular
 
 
 class ExtractUniProtFromXrefsResult(BaseModel):
@@ -81,6 +88,10 @@ class ProteinExtractUniProtFromXrefsAction(
 
     # UniProt regex pattern - captures base ID and optional isoform suffix
     UNIPROT_PATTERN = re.compile(r"UniProtKB:([A-Z0-9]+(?:-\d+)?)")
+    # Matches of UNIPROT_PATTERN that pass _is_valid_uniprot_id, with and
+    # without their isoform suffix; a base of other length matches nowhere
+    VALID_ISOFORM_PATTERN = re.compile(r"UniProtKB:([A-Z0-9]{6,10}(?![A-Z0-9])(?:-\d+)?)")
+    VALID_BASE_PATTERN = re.compile(r"UniProtKB:([A-Z0-9]{6,10})(?![A-Z0-9])")
 
     def get_params_model(self) -> type[ExtractUniProtFromXrefsParams]:
         """Return the parameters model for this action."""
@@ -135,67 +146,64 @@ class ProteinExtractUniProtFromXrefsAction(
         if params.input_key not in ctx["datasets"]:
             raise KeyError(f"Dataset key '{params.input_key}' not found in context")
 
-        # Get dataset - handle both DataFrame and list of dicts
+        # Get dataset - handle DatasetHandle, DataFrame and list of dicts
         dataset = ctx["datasets"][params.input_key]
-        if isinstance(dataset, pd.DataFrame):
-            df = dataset.copy()
-        elif isinstance(dataset, list):
-            # Convert list of dicts to DataFrame
-            df = pd.DataFrame(dataset)
+        if is_tabular(dataset):
+            df = as_dataframe(dataset)
         else:
             raise TypeError(f"Dataset must be DataFrame or list of dicts, got {type(dataset)}")
 
         if params.xrefs_column not in df.columns:
             raise KeyError(f"Column '{params.xrefs_column}' not found in dataset")
 
-        # Extract UniProt IDs from xrefs
-        df[params.output_column] = df[params.xrefs_column].apply(
-            lambda x: self._extract_uniprot_ids(x, params.keep_isoforms)
-        )
-        
-        # Debug: Check extraction results
-        total_with_ids = df[df[params.output_column].apply(lambda x: len(x) > 0 if isinstance(x, list) else False)].shape[0]
-        self.logger.info(f"Extracted UniProt IDs from {total_with_ids}/{len(df)} rows")
-        
-        # Debug: Check how many rows have multiple IDs
-        multi_id_rows = df[df[params.output_column].apply(lambda x: isinstance(x, list) and len(x) > 1)]
+        # Extract UniProt IDs from xrefs, then one entry per ID in row order
+        id_lists = self._extract_id_lists(df[params.xrefs_column], params.keep_isoforms)
+        ids = id_lists.explode().dropna()
+        counts = np.bincount(ids.index.to_numpy(dtype=np.int64), minlength=len(df))
+        has_ids = counts > 0
+        self.logger.info(f"Extracted UniProt IDs from {int(has_ids.sum())}/{len(df)} rows")
+
+        multi_id_rows = np.flatnonzero(counts > 1)
         self.logger.info(f"Rows with multiple UniProt IDs: {len(multi_id_rows)}")
         if len(multi_id_rows) > 0:
-            sample = multi_id_rows.head(3)[params.output_column].tolist()
-            self.logger.info(f"Sample multiple IDs: {sample[:3]}")
+            sample = id_lists.loc[multi_id_rows[:3]].tolist()
+            self.logger.info(f"Sample multiple IDs: {sample}")
 
         # Handle multiple IDs according to user preference
         if params.handle_multiple == "first":
-            df[params.output_column] = df[params.output_column].apply(
-                lambda ids: ids[0] if ids else None
-            )
+            first_ids = np.full(len(df), None, dtype=object)
+            first_ids[has_ids] = ids[~ids.index.duplicated()].to_numpy()
+            df[params.output_column] = first_ids
+            rows_with_uniprot = int(has_ids.sum())
         elif params.handle_multiple == "expand_rows":
             self.logger.info(f"Expanding rows for multiple IDs. Original rows: {len(df)}")
-            df = self._expand_rows_for_multiple_ids(df, params.output_column)
+            df = self._expand_rows_for_multiple_ids(df, params.output_column, ids, counts)
             self.logger.info(f"After expansion: {len(df)} rows")
-        # For "list" mode, keep as-is (already lists)
+            rows_with_uniprot = len(ids)
+        else:
+            lists = np.empty(len(df), dtype=object)
+            lists[id_lists.index.to_numpy()] = id_lists.to_numpy()
+            if not params.drop_na:
+                # Rows without any UniProtKB entry get an empty list
+                for row in np.flatnonzero(pd.isna(lists)):
+                    lists[row] = []
+            df[params.output_column] = lists
+            rows_with_uniprot = int(has_ids.sum())
 
         # Drop rows with no UniProt IDs if requested
         if params.drop_na:
             if params.handle_multiple == "list":
-                df = df[df[params.output_column].apply(len) > 0]
+                df = df[has_ids]
             else:  # first or expand_rows modes
                 df = df[df[params.output_column].notna()]
 
         # Update context - either use output_key or modify in-place
         output_key = params.output_key if params.output_key else params.input_key
-        # Store as list of dicts for consistency with LoadDatasetIdentifiersAction
-        ctx["datasets"][output_key] = df.to_dict("records")
+        # Store as a columnar dataset handle, like LoadDatasetIdentifiersAction
+        ctx["datasets"][output_key] = DatasetHandle(df)
 
         # Update statistics
         total_rows = len(df)
-        rows_with_uniprot = len(
-            df[
-                df[params.output_column].apply(
-                    lambda x: len(x) > 0 if isinstance(x, list) else pd.notna(x)
-                )
-            ]
-        )
 
         stats = {
             "total_rows_processed": total_rows,
@@ -221,6 +229,29 @@ class ProteinExtractUniProtFromXrefsAction(
             },
         )
 
+    def _extract_id_lists(self, xrefs: pd.Series, keep_isoforms: bool) -> pd.Series:
+        """
+        Extract the valid UniProt IDs from every xrefs value at once.
+
+        Args:
+            xrefs: Column of pipe-separated xrefs strings
+            keep_isoforms: Whether to keep isoform suffixes
+
+        Returns:
+            Lists of IDs for the rows mentioning UniProtKB, indexed by row position
+        """
+        values = xrefs.reset_index(drop=True)
+        if pd.api.types.infer_dtype(values, skipna=True) != "string":
+            # Only string values hold xrefs
+            values = values[[isinstance(value, str) for value in values]]
+        values = values.astype(object)
+        # Most xrefs carry no UniProt entry; only the rest are scanned
+        values = values[values.str.contains("UniProtKB:", regex=False, na=False)]
+        pattern = self.VALID_ISOFORM_PATTERN if keep_isoforms else self.VALID_BASE_PATTERN
+        id_lists = values.str.findall(pattern).astype(object)
+        id_lists.index = id_lists.index.astype(np.int64)
+        return id_lists
+
     def _extract_uniprot_ids(self, xrefs_str: str, keep_isoforms: bool) -> List[str]:
         """
         Extract UniProt IDs from a single xrefs string.
@@ -280,31 +311,26 @@ class ProteinExtractUniProtFromXrefsAction(
             return bool(re.match(base_pattern, uniprot_id))
 
     def _expand_rows_for_multiple_ids(
-        self, df: pd.DataFrame, id_column: str
+        self, df: pd.DataFrame, id_column: str, ids: pd.Series, counts: np.ndarray
     ) -> pd.DataFrame:
         """
         Expand rows with multiple UniProt IDs into separate rows.
 
+        Equivalent to exploding per-row ID lists, without building the lists.
+
         Args:
             df: DataFrame to process
-            id_column: Name of column containing UniProt ID lists
+            id_column: Name of the output column for the IDs
+            ids: IDs in row order, indexed by the position of their row
+            counts: Number of IDs per row of df
 
         Returns:
             DataFrame with expanded rows
         """
-        expanded_rows = []
-
-        for idx, row in df.iterrows():
-            ids = row[id_column]
-            if isinstance(ids, list) and len(ids) > 0:
-                for uniprot_id in ids:
-                    new_row = row.copy()
-                    new_row[id_column] = uniprot_id
-                    expanded_rows.append(new_row)
-            else:
-                # Keep rows with no IDs as-is (will be filtered if drop_na=True)
-                new_row = row.copy()
-                new_row[id_column] = None if not ids else ids
-                expanded_rows.append(new_row)
-
-        return pd.DataFrame(expanded_rows).reset_index(drop=True)
+        # Keep rows with no IDs as-is (will be filtered if drop_na=True)
+        positions = np.repeat(np.arange(len(df)), np.maximum(counts, 1))
+        expanded = df.take(positions).reset_index(drop=True)
+        column = np.full(len(positions), None, dtype=object)
+        column[counts[positions] > 0] = ids.to_numpy(dtype=object)
+        expanded[id_column] = column
+        return expanded
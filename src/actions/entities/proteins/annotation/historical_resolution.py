@@ -6,19 +6,35 @@ This action uses the UniProt REST API to resolve:
 3. Obsolete/deleted accessions
 
 Integrates with the progressive mapping framework for Stage 3 resolution.
+
+Resolutions are kept in a local accession history table (see
+``integrations.clients.accession_history``), optionally loaded from UniProt
+sec_ac/delac dumps; only accessions missing from it are sent to the API, and
+all resolutions are applied to the dataset with one merge.
 """
 
 import logging
+import os
 from typing import Dict, List, Any, Optional
+import numpy as np
 import pandas as pd
 from pydantic import BaseModel, Field
 
 from actions.typed_base import TypedStrategyAction
 from actions.registry import register_action
 from core.standards.context_handler import UniversalContext
+from core.standards.dataset_handle import DatasetHandle, as_dataframe
+from integrations.clients.accession_history import (
+    HISTORY_COLUMNS,
+    AccessionHistoryTable,
+    results_frame,
+)
 
 logger = logging.getLogger(__name__)
 
+# Confidence for resolutions without a configurable score
+OTHER_RESOLUTION_CONFIDENCE = 0.80
+
 
 class ProteinHistoricalResolutionParams(BaseModel):
     """Parameters for PROTEIN_HISTORICAL_RESOLUTION action."""
@@ -42,6 +58,22 @@ class ProteinHistoricalResolutionParams(BaseModel):
     batch_size: int = Field(default=50, description="Batch size for API calls")
     max_retries: int = Field(default=3, description="Maximum retries for failed API calls")
     bypass_cache: bool = Field(default=False, description="Bypass cache for fresh lookups")
+    cache_path: Optional[str] = Field(
+        default_factory=lambda: os.getenv("BIOMAPPER_MAPPING_CACHE_PATH"),
+        description="SQLite file persisting resolutions across runs (in-memory only if unset)"
+    )
+    history_path: Optional[str] = Field(
+        default_factory=lambda: os.getenv("BIOMAPPER_UNIPROT_HISTORY_PATH"),
+        description="SQLite file holding the accession history table (in-memory only if unset)"
+    )
+    history_dumps: List[str] = Field(
+        default_factory=list,
+        description="UniProt sec_ac.txt / delac_*.txt dumps to load into the history table "
+        "(skipped if unchanged since they were loaded)"
+    )
+    offline: bool = Field(
+        default=False, description="Resolve from the history table only, without API calls"
+    )
     add_resolution_log: bool = Field(default=True, description="Add columns showing resolution details")
     
     # Debug options
@@ -90,15 +122,12 @@ class ProteinHistoricalResolutionAction(
             
             input_data = datasets[params.input_key]
             
-            # Convert to DataFrame
-            if isinstance(input_data, list):
-                input_df = pd.DataFrame(input_data)
-            else:
-                input_df = input_data
+            # Convert to DataFrame (read-only, rows are copied into the output)
+            input_df = as_dataframe(input_data, copy=False)
             
             if input_df.empty:
                 logger.info("No unmapped proteins to resolve")
-                datasets[params.output_key] = input_df
+                datasets[params.output_key] = DatasetHandle(input_df)
                 ctx.set("datasets", datasets)
                 return ActionResult(
                     success=True,
@@ -113,103 +142,49 @@ class ProteinHistoricalResolutionAction(
             if params.debug_mode:
                 logger.debug(f"IDs to resolve: {unique_ids}")
             
-            # Import the historical resolver client
-            from integrations.clients.uniprot_historical_resolver_client import (
-                UniProtHistoricalResolverClient
-            )
-            
-            # Initialize client
-            client = UniProtHistoricalResolverClient()
-            
-            # Resolve identifiers
-            resolution_config = {"bypass_cache": params.bypass_cache} if params.bypass_cache else None
-            resolution_results = await client.map_identifiers(unique_ids, config=resolution_config)
-            
-            # Process results
-            resolved_rows = []
+            # Resolve from the history table first, then the API for the rest
+            history = AccessionHistoryTable(params.history_path)
+            try:
+                for dump in params.history_dumps:
+                    loaded = history.load_dump(dump)
+                    if loaded is None:
+                        logger.info(f"UniProt dump {dump} is unchanged since it was loaded")
+                    else:
+                        logger.info(f"Loaded {loaded} accessions from UniProt dump {dump}")
+
+                if params.bypass_cache:
+                    known = pd.DataFrame(columns=HISTORY_COLUMNS)
+                else:
+                    known = history.lookup(i for i in unique_ids if isinstance(i, str))
+                known_ids = set(known["accession"])
+                missing_ids = [i for i in unique_ids if i not in known_ids]
+                logger.info(
+                    f"{len(known_ids)} proteins resolved from the history table, "
+                    f"{len(missing_ids)} not in it"
+                )
+
+                resolved_frames = [known]
+                if missing_ids and not params.offline:
+                    resolution_results = await self._resolve_remote(missing_ids, params)
+                    history.add_results(resolution_results)
+                    resolved_frames.append(results_frame(resolution_results))
+            finally:
+                history.close()
+
+            resolutions = pd.concat(resolved_frames, ignore_index=True)
+            if params.debug_mode:
+                logger.debug(f"Resolutions: {resolutions.to_dict('records')}")
+
+            output_df, stats = self._apply_resolutions(input_df, resolutions, params)
             stats = {
                 "total_input": len(unique_ids),
-                "resolved_primary": 0,
-                "resolved_secondary": 0,
-                "resolved_demerged": 0,
-                "unresolved_obsolete": 0,
-                "errors": 0
+                **stats,
+                "from_history": len(known_ids),
+                "from_api": 0 if params.offline else len(missing_ids),
             }
-            
-            for _, row in input_df.iterrows():
-                protein_id = row[params.id_column]
-                
-                if pd.isna(protein_id) or protein_id not in resolution_results:
-                    # Keep unresolved row as-is
-                    resolved_rows.append(row.to_dict())
-                    continue
-                
-                primary_ids, metadata = resolution_results[protein_id]
-                
-                if primary_ids:
-                    # Successfully resolved
-                    if metadata == "primary":
-                        # Already was primary (shouldn't happen for unmapped)
-                        stats["resolved_primary"] += 1
-                        confidence = params.confidence_scores.get("primary", 1.0)
-                        resolution_type = "primary"
-                    elif metadata.startswith("secondary:"):
-                        # Secondary accession resolved to primary
-                        stats["resolved_secondary"] += 1
-                        confidence = params.confidence_scores.get("secondary", 0.90)
-                        resolution_type = "secondary"
-                    elif metadata == "demerged":
-                        # Demerged ID (maps to multiple primaries)
-                        stats["resolved_demerged"] += 1
-                        confidence = params.confidence_scores.get("demerged", 0.85)
-                        resolution_type = "demerged"
-                    else:
-                        # Other resolution type
-                        confidence = 0.80
-                        resolution_type = "other"
-                    
-                    # Create row(s) for resolved ID(s)
-                    for primary_id in primary_ids:
-                        resolved_row = row.to_dict()
-                        
-                        # Store original ID if adding resolution log
-                        if params.add_resolution_log:
-                            resolved_row[f"{params.id_column}_original"] = protein_id
-                            resolved_row[f"{params.id_column}_resolution_type"] = resolution_type
-                            resolved_row[f"{params.id_column}_resolution_metadata"] = metadata
-                        
-                        # Update with resolved ID
-                        resolved_row[params.id_column] = primary_id
-                        resolved_row["confidence_score"] = confidence
-                        resolved_row["match_type"] = "historical"
-                        resolved_row["mapping_stage"] = 3
-                        
-                        resolved_rows.append(resolved_row)
-                    
-                    if params.debug_mode:
-                        logger.debug(f"Resolved {protein_id} → {primary_ids} ({metadata})")
-                        
-                else:
-                    # Could not resolve (obsolete or error)
-                    if metadata == "obsolete":
-                        stats["unresolved_obsolete"] += 1
-                    elif metadata.startswith("error:"):
-                        stats["errors"] += 1
-                    
-                    # Keep unresolved row
-                    unresolved_row = row.to_dict()
-                    if params.add_resolution_log:
-                        unresolved_row[f"{params.id_column}_resolution_metadata"] = metadata
-                    resolved_rows.append(unresolved_row)
-                    
-                    if params.debug_mode:
-                        logger.debug(f"Could not resolve {protein_id}: {metadata}")
-            
-            # Create output DataFrame
-            output_df = pd.DataFrame(resolved_rows)
-            
+
             # Store results
-            datasets[params.output_key] = output_df.to_dict("records")
+            datasets[params.output_key] = DatasetHandle(output_df)
             ctx.set("datasets", datasets)
             
             # Update statistics
@@ -255,4 +230,125 @@ class ProteinHistoricalResolutionAction(
             return ActionResult(
                 success=False,
                 error=str(e)
-            )
\ No newline at end of file
+            )
+
+    async def _resolve_remote(
+        self, ids: List[str], params: ProteinHistoricalResolutionParams
+    ) -> Dict[str, Any]:
+        """Resolve identifiers through the UniProt historical resolver client."""
+        # Import the historical resolver client
+        from integrations.clients.uniprot_historical_resolver_client import (
+            UniProtHistoricalResolverClient
+        )
+
+        # Initialize client
+        client_config: Dict[str, Any] = {"batch_size": params.batch_size}
+        if params.cache_path:
+            client_config["cache_path"] = params.cache_path
+        client = UniProtHistoricalResolverClient(config=client_config)
+
+        # Resolve identifiers
+        resolution_config = {"bypass_cache": params.bypass_cache} if params.bypass_cache else None
+        try:
+            return await client.map_identifiers(ids, config=resolution_config)
+        finally:
+            await client.close()
+
+    def _apply_resolutions(
+        self,
+        input_df: pd.DataFrame,
+        resolutions: pd.DataFrame,
+        params: ProteinHistoricalResolutionParams,
+    ) -> tuple[pd.DataFrame, Dict[str, int]]:
+        """
+        Apply history rows to the input rows with one merge.
+
+        Each resolved row is repeated once per primary ID; rows without a
+        resolution are kept as they are.
+
+        Args:
+            input_df: Input dataset
+            resolutions: History rows (HISTORY_COLUMNS) of the input IDs
+            params: Action parameters
+
+        Returns:
+            Output DataFrame and per-row resolution counts
+        """
+        id_column = params.id_column
+        rows = pd.DataFrame(
+            {
+                "accession": input_df[id_column].to_numpy(dtype=object),
+                "_row": np.arange(len(input_df)),
+            }
+        )
+        merged = rows.merge(
+            resolutions.astype(object), on="accession", how="left", sort=False
+        )
+        output_df = input_df.take(merged["_row"].to_numpy()).reset_index(drop=True)
+
+        metadata = merged["metadata"].fillna("").astype(str)
+        resolved = merged["primary_id"].notna().to_numpy()
+        kinds = np.select(
+            [
+                resolved & (metadata == "primary"),
+                resolved & metadata.str.startswith("secondary:"),
+                resolved & (metadata == "demerged"),
+                resolved,
+                metadata == "obsolete",
+                metadata.str.startswith("error:"),
+            ],
+            ["primary", "secondary", "demerged", "other", "obsolete", "error"],
+            default="",
+        )
+
+        # Statistics count input rows, not the rows they expand into
+        counts = pd.Series(kinds[~merged["_row"].duplicated().to_numpy()]).value_counts()
+        stats = {
+            "resolved_primary": int(counts.get("primary", 0)),
+            "resolved_secondary": int(counts.get("secondary", 0)),
+            "resolved_demerged": int(counts.get("demerged", 0)),
+            "unresolved_obsolete": int(counts.get("obsolete", 0)),
+            "errors": int(counts.get("error", 0)),
+        }
+
+        confidence_by_type = {
+            "primary": params.confidence_scores.get("primary", 1.0),
+            "secondary": params.confidence_scores.get("secondary", 0.90),
+            "demerged": params.confidence_scores.get("demerged", 0.85),
+        }
+        resolution_types = pd.Series(kinds)
+        if params.add_resolution_log:
+            _assign_where(output_df, f"{id_column}_original", merged["accession"], resolved)
+            _assign_where(output_df, f"{id_column}_resolution_type", resolution_types, resolved)
+            _assign_where(
+                output_df,
+                f"{id_column}_resolution_metadata",
+                merged["metadata"],
+                merged["metadata"].notna().to_numpy(),
+            )
+        _assign_where(output_df, id_column, merged["primary_id"], resolved)
+        _assign_where(
+            output_df,
+            "confidence_score",
+            resolution_types.map(confidence_by_type).fillna(OTHER_RESOLUTION_CONFIDENCE),
+            resolved,
+        )
+        _assign_where(output_df, "match_type", "historical", resolved)
+        _assign_where(output_df, "mapping_stage", 3, resolved)
+        return output_df, stats
+
+
+def _assign_where(frame: pd.DataFrame, column: str, values: Any, rows: np.ndarray) -> None:
+    """Set ``column`` to ``values`` on ``rows``; other rows keep their value.
+
+    The column is only added when some row sets it, with missing values
+    elsewhere, as when the frame is built from row dicts.
+    """
+    if not rows.any():
+        return
+    if isinstance(values, pd.Series):
+        values = values.to_numpy()
+    if column in frame.columns:
+        frame[column] = frame[column].mask(rows, values)
+    else:
+        frame[column] = pd.Series(values, index=frame.index).where(rows)
@@ -6,18 +6,36 @@ This action normalizes UniProt accession identifiers by:
 3. Removing version suffixes (.1, .2, etc.)
 4. Handling isoform suffixes (-1, -2, etc.)
 5. Validating UniProt format
+
+Columns are normalized as a whole: plain accessions (alphanumeric ASCII)
+only need case folding and validation; values with separators are parsed
+once per distinct value with a single combined prefix pattern. Non-ASCII
+values take the per-value path, whose regex and ``str.isdigit`` semantics
+differ outside ASCII.
 """
 import re
 import logging
 from typing import Dict, List, Any, Optional
+import numpy as np
 import pandas as pd
 from pydantic import BaseModel, Field
 
 from actions.typed_base import TypedStrategyAction
 from actions.registry import register_action
+from core.standards.dataset_handle import (
+    ChunkedDataset,
+    DatasetHandle,
+    as_dataframe,
+    is_tabular,
+)
 
 logger = logging.getLogger(__name__)
 
+# Flags for the normalization steps applied to a value
+PREFIX_STRIPPED = 1
+VERSION_REMOVED = 2
+ISOFORM_HANDLED = 4
+
 
 class ProteinNormalizeAccessionsParams(BaseModel):
     """Parameters for PROTEIN_NORMALIZE_ACCESSIONS action."""
@@ -50,6 +68,50 @@ class ActionResult(BaseModel):
     data: Dict[str, Any] = Field(default_factory=dict)
 
 
+def _empty_stats() -> Dict[str, int]:
+    return {
+        "total_processed": 0,
+        "case_normalized": 0,
+        "prefixes_stripped": 0,
+        "versions_removed": 0,
+        "isoforms_handled": 0,
+        "validation_failures": 0,
+    }
+
+
+def _is_repetitive(values: np.ndarray, sample_size: int = 10_000) -> bool:
+    """Whether a random sample of values holds more than 1% duplicates.
+
+    Unique columns would pay for factorizing without saving any work; a
+    sample of n values drawn from d distinct ones collides about n**2 / 2d
+    times, so the check fires from roughly 50 rows per distinct value.
+    """
+    if len(values) <= sample_size:
+        return False
+    rng = np.random.default_rng(0)
+    sample = values[rng.choice(len(values), sample_size, replace=False)]
+    return len(set(sample)) < 0.99 * sample_size
+
+
+class _ChunkNormalizer:
+    """Per-chunk normalization transform that accumulates statistics."""
+
+    def __init__(self, action: Any, params: Any, stats: Dict[str, int]):
+        self.action = action
+        self.params = params
+        self.stats = stats
+
+    def reset(self) -> None:
+        """Zero the statistics at the start of each pass over the stream."""
+        self.stats.update(_empty_stats())
+
+    def __call__(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        chunk, chunk_stats = self.action._normalize_frame(chunk.copy(), self.params)
+        for key, value in chunk_stats.items():
+            self.stats[key] += value
+        return chunk
+
+
 @register_action("PROTEIN_NORMALIZE_ACCESSIONS")
 class ProteinNormalizeAccessionsAction(
     TypedStrategyAction[ProteinNormalizeAccessionsParams, ActionResult]
@@ -82,6 +144,12 @@ class ProteinNormalizeAccessionsAction(
         re.compile(r"^\|([A-Z0-9]+)\|.*$"),  # Edge case: |P12345|...
     ]
 
+    # PREFIX_PATTERNS as one alternation, for uppercased ASCII values; only
+    # the group of the matching form participates
+    COMBINED_PREFIX_PATTERN = re.compile(
+        r"(?:SP|TR)\|([A-Z0-9]+)(?:\|.*)?$|UNIPROT:([A-Z0-9]+)$|\|([A-Z0-9]+)\|.*$"
+    )
+
     async def execute_typed(  # type: ignore[override]
         self, params: ProteinNormalizeAccessionsParams, context: Any, **kwargs
     ) -> ActionResult:
@@ -124,13 +192,12 @@ class ProteinNormalizeAccessionsAction(
         if params.input_key not in ctx["datasets"]:
             raise KeyError(f"Input dataset '{params.input_key}' not found in context")
 
-        # Get dataset - handle both DataFrame and list of dicts
+        # Get dataset - handle DatasetHandle, DataFrame and list of dicts
         dataset = ctx["datasets"][params.input_key]
-        if isinstance(dataset, pd.DataFrame):
-            input_df = dataset.copy()
-        elif isinstance(dataset, list):
-            # Convert list of dicts to DataFrame
-            input_df = pd.DataFrame(dataset)
+        if isinstance(dataset, ChunkedDataset):
+            return self._normalize_stream(dataset, params, ctx)
+        if is_tabular(dataset):
+            input_df = as_dataframe(dataset)
         else:
             return ActionResult(
                 success=False,
@@ -144,15 +211,39 @@ class ProteinNormalizeAccessionsAction(
         if missing_columns:
             raise KeyError(f"Columns not found in dataset: {missing_columns}")
 
+        input_df, stats = self._normalize_frame(input_df, params)
+
+        # Store results in context as a columnar dataset handle
+        ctx["datasets"][params.output_key] = DatasetHandle(input_df)
+
+        # Update context statistics
+        if "normalization_stats" not in ctx["statistics"]:
+            ctx["statistics"]["normalization_stats"] = {}
+        ctx["statistics"]["normalization_stats"].update(stats)
+
+        logger.info(f"Normalization complete. Statistics: {stats}")
+
+        return ActionResult(
+            success=True,
+            message=f"Normalized {stats['total_processed']} values across {len(params.id_columns)} columns",
+            data={
+                "output_key": params.output_key,
+                "statistics": stats,
+                "processed_columns": params.id_columns,
+                "provenance": {
+                    "action": "PROTEIN_NORMALIZE_ACCESSIONS",
+                    "timestamp": pd.Timestamp.now().isoformat(),
+                    "details": stats,
+                }
+            }
+        )
+
+    def _normalize_frame(
+        self, input_df: pd.DataFrame, params: ProteinNormalizeAccessionsParams
+    ) -> tuple[pd.DataFrame, Dict[str, int]]:
+        """Normalize the ID columns of one frame in place."""
         # Track normalization statistics
-        stats = {
-            "total_processed": 0,
-            "case_normalized": 0,
-            "prefixes_stripped": 0,
-            "versions_removed": 0,
-            "isoforms_handled": 0,
-            "validation_failures": 0,
-        }
+        stats = _empty_stats()
 
         # Process each specified column
         for col in params.id_columns:
@@ -180,27 +271,48 @@ class ProteinNormalizeAccessionsAction(
             for key, value in col_stats.items():
                 stats[key] += value
 
-        # Store results in context as list of dicts for consistency
-        ctx["datasets"][params.output_key] = input_df.to_dict("records")
+        return input_df, stats
 
-        # Update context statistics
-        if "normalization_stats" not in ctx["statistics"]:
-            ctx["statistics"]["normalization_stats"] = {}
-        ctx["statistics"]["normalization_stats"].update(stats)
+    def _normalize_stream(
+        self,
+        dataset: ChunkedDataset,
+        params: ProteinNormalizeAccessionsParams,
+        ctx: Dict[str, Any],
+    ) -> ActionResult:
+        """Add normalization as a per-chunk transform of a streamed dataset.
 
-        logger.info(f"Normalization complete. Statistics: {stats}")
+        Statistics in ``ctx["statistics"]["normalization_stats"]`` are
+        accumulated while the stream is consumed (e.g. by EXPORT_DATASET).
+        """
+        missing_columns = [
+            col for col in params.id_columns if col not in dataset.columns
+        ]
+        if missing_columns:
+            raise KeyError(f"Columns not found in dataset: {missing_columns}")
+
+        stats = ctx["statistics"].setdefault("normalization_stats", {})
+        stats.update(_empty_stats())
+        ctx["datasets"][params.output_key] = dataset.map_chunks(
+            _ChunkNormalizer(self, params, stats)
+        )
+
+        logger.info("Normalization deferred to stream consumption")
 
         return ActionResult(
             success=True,
-            message=f"Normalized {stats['total_processed']} values across {len(params.id_columns)} columns",
+            message=(
+                f"Normalizing {len(params.id_columns)} columns of streamed dataset "
+                f"'{params.input_key}'"
+            ),
             data={
                 "output_key": params.output_key,
                 "statistics": stats,
                 "processed_columns": params.id_columns,
+                "streaming": True,
                 "provenance": {
                     "action": "PROTEIN_NORMALIZE_ACCESSIONS",
                     "timestamp": pd.Timestamp.now().isoformat(),
-                    "details": stats,
+                    "details": {"streaming": True},
                 }
             }
         )
@@ -213,29 +325,151 @@ class ProteinNormalizeAccessionsAction(
         validate_format: bool,
     ) -> tuple[pd.Series, Dict[str, int]]:
         """Normalize a single column of UniProt identifiers."""
-        stats = {
-            "total_processed": 0,
-            "case_normalized": 0,
-            "prefixes_stripped": 0,
-            "versions_removed": 0,
-            "isoforms_handled": 0,
-            "validation_failures": 0,
-        }
+        stats = _empty_stats()
+        stats["total_processed"] = len(series)
+
+        values = series.to_numpy(dtype=object)
+        result = values.copy()
+        # Empty/null values are kept as they are
+        present = np.flatnonzero(~pd.isna(values) & (values != ""))
+        if not len(present):
+            return pd.Series(result, index=series.index), stats
+
+        texts = values[present]
+        if pd.api.types.infer_dtype(texts, skipna=False) != "string":
+            texts = np.array(
+                [value if isinstance(value, str) else str(value) for value in texts],
+                dtype=object,
+            )
 
-        normalized_values = []
+        # Columns with many repeated accessions are normalized per distinct value
+        codes = None
+        if _is_repetitive(texts):
+            codes, texts = pd.factorize(texts)
+        normalized, case_changed, steps, valid = self._normalize_values(
+            texts, strip_isoforms, strip_versions, validate_format
+        )
+        if codes is not None:
+            texts, normalized = texts[codes], normalized[codes]
+            case_changed, steps = case_changed[codes], steps[codes]
+            valid = valid[codes] if valid is not None else None
+
+        stats["case_normalized"] = int(np.count_nonzero(case_changed))
+        stats["prefixes_stripped"] = int(np.count_nonzero(steps & PREFIX_STRIPPED))
+        stats["versions_removed"] = int(np.count_nonzero(steps & VERSION_REMOVED))
+        stats["isoforms_handled"] = int(np.count_nonzero(steps & ISOFORM_HANDLED))
+        if valid is not None:
+            invalid = np.flatnonzero(~valid)
+            stats["validation_failures"] = len(invalid)
+            if len(invalid):
+                examples = ", ".join(f"{texts[i]} -> {normalized[i]}" for i in invalid[:5])
+                logger.warning(
+                    f"Invalid UniProt format after normalization for {len(invalid)} "
+                    f"values in column '{series.name}' (e.g. {examples})"
+                )
+
+        result[present] = normalized
+        return pd.Series(result, index=series.index), stats
+
+    def _normalize_values(
+        self,
+        texts: np.ndarray,
+        strip_isoforms: bool,
+        strip_versions: bool,
+        validate_format: bool,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """
+        Normalize an array of non-empty strings.
 
-        for value in series:
-            stats["total_processed"] += 1
-            normalized, item_stats = self._normalize_single_value_with_stats(
-                value, strip_isoforms, strip_versions, validate_format
+        Returns:
+            Normalized values, case-changed mask, step flags per value and
+            the validity mask (None when validation is disabled)
+        """
+        # Step 1: Normalize case
+        upper = np.array(list(map(str.upper, texts)), dtype=object)
+        case_changed = texts != upper
+
+        # Plain accessions have no prefix, version or isoform to strip
+        normalized = upper.copy()
+        steps = np.zeros(len(upper), dtype=np.uint8)
+        plain = np.fromiter(map(str.isalnum, upper), dtype=bool, count=len(upper))
+        plain &= np.fromiter(map(str.isascii, upper), dtype=bool, count=len(upper))
+        separated = np.flatnonzero(~plain)
+        if len(separated):
+            # Steps 2-4 once per distinct value
+            to_parse = upper[separated]
+            memo, memo_steps = self._normalize_separated(
+                dict.fromkeys(to_parse), strip_isoforms, strip_versions
+            )
+            normalized[separated] = list(map(memo.__getitem__, to_parse))
+            steps[separated] = np.fromiter(
+                map(memo_steps.__getitem__, to_parse), dtype=np.uint8, count=len(to_parse)
             )
-            normalized_values.append(normalized)
 
-            # Update statistics
-            for key, count in item_stats.items():
-                stats[key] += count
+        # Step 5: Validate format if enabled
+        valid = None
+        if validate_format:
+            valid = np.fromiter(
+                map(bool, map(self.UNIPROT_PATTERN.match, normalized)),
+                dtype=bool,
+                count=len(normalized),
+            )
+        return normalized, case_changed, steps, valid
+
+    def _normalize_separated(
+        self, values: Dict[str, None], strip_isoforms: bool, strip_versions: bool
+    ) -> tuple[Dict[str, str], Dict[str, int]]:
+        """Strip prefixes, versions and isoforms of distinct uppercased values.
 
-        return pd.Series(normalized_values, index=series.index), stats
+        Returns:
+            value -> normalized value, and value -> flags of the steps applied
+        """
+        match_prefix = self.COMBINED_PREFIX_PATTERN.match
+        memo: Dict[str, str] = {}
+        memo_steps: Dict[str, int] = {}
+        for value in values:
+            if not value.isascii() or "\n" in value:
+                memo[value], memo_steps[value] = self._normalize_steps(
+                    value, strip_isoforms, strip_versions
+                )
+                continue
+
+            match = match_prefix(value)
+            if match:
+                # Accessions extracted from a prefix have no suffixes
+                memo[value] = match.group(match.lastindex)
+                memo_steps[value] = PREFIX_STRIPPED
+                continue
+
+            normalized = value
+            steps = 0
+            if strip_versions:
+                head, dot, tail = normalized.rpartition(".")
+                if dot and (not tail or tail.isdigit()):
+                    normalized = head
+                    steps |= VERSION_REMOVED
+            if strip_isoforms:
+                head, dash, tail = normalized.rpartition("-")
+                if dash and (not tail or tail.isdigit()):
+                    normalized = head
+                    steps |= ISOFORM_HANDLED
+            memo[value] = normalized
+            memo_steps[value] = steps
+        return memo, memo_steps
+
+    def _normalize_steps(
+        self, value: str, strip_isoforms: bool, strip_versions: bool
+    ) -> tuple[str, int]:
+        """Steps 2-4 for one uppercased value (per-value reference path)."""
+        stripped = self._strip_prefixes(value)
+        versioned = self._strip_versions(stripped) if strip_versions else stripped
+        normalized = self._strip_isoforms(versioned, strip_isoforms)
+        steps = (
+            (PREFIX_STRIPPED if stripped != value else 0)
+            | (VERSION_REMOVED if versioned != stripped else 0)
+            | (ISOFORM_HANDLED if normalized != versioned else 0)
+        )
+        return normalized, steps
 
     def _normalize_single_value_with_stats(
         self,
@@ -1,16 +1,19 @@
 """Export dataset action for saving results to various formats."""
 from typing import Any
 from pathlib import Path
-import pandas as pd
 from pydantic import Field
 from core.standards import ActionParamsBase, FlexibleBaseModel
 
 from actions.typed_base import TypedStrategyAction
 from actions.registry import register_action
 from core.standards.context_handler import UniversalContext
+from core.standards.dataset_handle import ChunkedDataset, as_dataframe
 # Don't use the complex ActionResult from models
 # from core.models.action_results import ActionResult
 
+# Formats EXPORT_DATASET can write without materializing a ChunkedDataset
+STREAMING_FORMATS = ("tsv", "csv", "json")
+
 
 class ExportDatasetParams(ActionParamsBase):
     """Parameters for EXPORT_DATASET action."""
@@ -62,21 +65,22 @@ class ExportDatasetAction(TypedStrategyAction[ExportDatasetParams, ActionResult]
 
             data = datasets[params.input_key]
 
-            # Convert to DataFrame if needed
-            if isinstance(data, pd.DataFrame):
-                df = data
-            elif isinstance(data, list):
-                # List of dicts from other actions
-                df = pd.DataFrame(data)
-            else:
-                df = pd.DataFrame(data)
+            output_path = Path(params.output_path)
+
+            # Streams are written chunk by chunk where the format allows it
+            if isinstance(data, ChunkedDataset) and params.format in STREAMING_FORMATS:
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                row_count = self._export_stream(data, params, output_path)
+                return self._record_output(ctx, params, output_path, row_count)
+
+            # Convert to DataFrame if needed (read-only, no copy)
+            df = as_dataframe(data, copy=False)
 
             # Filter columns if specified
             if params.columns:
                 df = df[params.columns]
 
             # Export based on format
-            output_path = Path(params.output_path)
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
             if params.format == "tsv":
@@ -92,35 +96,77 @@ class ExportDatasetAction(TypedStrategyAction[ExportDatasetParams, ActionResult]
                     success=False, error=f"Unsupported format: {params.format}"
                 )
 
-            # Update context with output file info - preserve existing files
-            output_files = ctx.get("output_files", {})
-            
-            # Debug logging
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.info(f"EXPORT_DATASET: Current output_files type: {type(output_files)}")
-            
-            # Preserve existing format - don't force conversion
-            if isinstance(output_files, list):
-                # Keep as list, just append the new file
-                logger.info(f"EXPORT_DATASET: Preserving list format with {len(output_files)} existing files")
-                output_files.append(str(output_path))
-                logger.info(f"EXPORT_DATASET: Added new file, now {len(output_files)} total files")
-            elif isinstance(output_files, dict):
-                # Keep as dict, add new entry
-                output_files[params.input_key] = str(output_path)
-                logger.info(f"EXPORT_DATASET: Added to existing dict, now {len(output_files)} files")
-            else:
-                # Initialize as dict only if no existing format
-                output_files = {params.input_key: str(output_path)}
-                logger.info(f"EXPORT_DATASET: Initialized as dict with 1 file")
-            
-            ctx.set("output_files", output_files)
-
-            return ActionResult(
-                success=True,
-                data={"exported_path": str(output_path), "row_count": len(df)},
-            )
+            return self._record_output(ctx, params, output_path, len(df))
 
         except Exception as e:
             return ActionResult(success=False, error=f"Export failed: {str(e)}")
+
+    def _export_stream(
+        self, data: ChunkedDataset, params: ExportDatasetParams, output_path: Path
+    ) -> int:
+        """Write a streamed dataset one chunk at a time; returns the row count."""
+        row_count = 0
+        with open(output_path, "w", newline="", encoding="utf-8") as f:
+            if params.format == "json":
+                f.write("[")
+            first = True
+            for chunk in data.iter_chunks():
+                if params.columns:
+                    chunk = chunk[params.columns]
+                if params.format == "json":
+                    if chunk.empty:
+                        continue
+                    # Splice each chunk's records into one top-level array
+                    records = chunk.to_json(orient="records")[1:-1]
+                    f.write(records if first else "," + records)
+                else:
+                    chunk.to_csv(
+                        f,
+                        sep="\t" if params.format == "tsv" else ",",
+                        index=False,
+                        header=first,
+                    )
+                first = False
+                row_count += len(chunk)
+            if params.format == "json":
+                f.write("]")
+        return row_count
+
+    def _record_output(
+        self,
+        ctx: UniversalContext,
+        params: ExportDatasetParams,
+        output_path: Path,
+        row_count: int,
+    ) -> ActionResult:
+        """Register the exported file in the context and build the result."""
+        # Update context with output file info - preserve existing files
+        output_files = ctx.get("output_files", {})
+        
+        # Debug logging
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.info(f"EXPORT_DATASET: Current output_files type: {type(output_files)}")
+        
+        # Preserve existing format - don't force conversion
+        if isinstance(output_files, list):
+            # Keep as list, just append the new file
+            logger.info(f"EXPORT_DATASET: Preserving list format with {len(output_files)} existing files")
+            output_files.append(str(output_path))
+            logger.info(f"EXPORT_DATASET: Added new file, now {len(output_files)} total files")
+        elif isinstance(output_files, dict):
+            # Keep as dict, add new entry
+            output_files[params.input_key] = str(output_path)
+            logger.info(f"EXPORT_DATASET: Added to existing dict, now {len(output_files)} files")
+        else:
+            # Initialize as dict only if no existing format
+            output_files = {params.input_key: str(output_path)}
+            logger.info(f"EXPORT_DATASET: Initialized as dict with 1 file")
+        
+        ctx.set("output_files", output_files)
+
+        return ActionResult(
+            success=True,
+            data={"exported_path": str(output_path), "row_count": row_count},
+        )
+
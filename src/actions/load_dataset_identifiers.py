@@ -12,6 +12,7 @@ from actions.typed_base import (
     StandardActionResult,
 )
 from actions.registry import register_action
+from core.standards.dataset_handle import ChunkedDataset, DatasetHandle
 # StrategyExecutionContext not used in MVP mode
 
 logger = logging.getLogger(__name__)
@@ -53,6 +54,16 @@ class LoadDatasetIdentifiersParams(BaseModel):
         True, description="Remove rows where identifier column is empty"
     )
 
+    # Streaming
+    chunk_size: Optional[int] = Field(
+        None,
+        gt=0,
+        description=(
+            "Stream the file in chunks of this many rows instead of loading it "
+            "whole; stores a ChunkedDataset for chunk-aware downstream actions"
+        ),
+    )
+
 
 @register_action("LOAD_DATASET_IDENTIFIERS")
 class LoadDatasetIdentifiersAction(
@@ -67,6 +78,7 @@ class LoadDatasetIdentifiersAction(
     - Filters rows based on regex patterns
     - Handles empty identifiers
     - Adds metadata columns for traceability
+    - Optionally streams large files in chunks (``chunk_size``)
     """
 
     def get_params_model(self) -> type[LoadDatasetIdentifiersParams]:
@@ -120,100 +132,26 @@ class LoadDatasetIdentifiersAction(
 
             # Read file using BiologicalFileLoader for robustness
             from core.standards import BiologicalFileLoader
+
+            if params.chunk_size:
+                return self._load_streaming(params, file_path, file_type, ctx)
             
-            if file_type == "tsv":
-                df = BiologicalFileLoader.load_tsv(
-                    file_path, 
-                    auto_detect=True,
-                    validate=True
-                )
-            else:
-                df = BiologicalFileLoader.load_csv(
-                    file_path,
-                    auto_detect=True,
-                    validate=True
-                )
+            # auto_load reuses the parsed-frame cache for large reference files
+            df = BiologicalFileLoader.auto_load(
+                file_path,
+                file_type=file_type,
+                auto_detect=True,
+                validate=True
+            )
 
             logger.debug(f"Loaded {len(df)} rows from {file_path}")
 
             # Track original row count for metadata
             original_row_count = len(df)
+            df = self._prepare_frame(df, params, file_path, row_offset=0)
 
-            # Add row number before any filtering
-            df["_row_number"] = range(2, len(df) + 2)  # 1-based, accounting for header
-
-            # Validate identifier column exists
-            if params.identifier_column not in df.columns:
-                available_cols = list(df.columns)
-                raise ValueError(
-                    f"Column '{params.identifier_column}' not found in file. "
-                    f"Available columns: {available_cols}"
-                )
-
-            # Apply filtering if specified
-            if params.filter_column and params.filter_values:
-                logger.info(f"Applying filter on column '{params.filter_column}'")
-
-                if params.filter_column not in df.columns:
-                    raise ValueError(
-                        f"Filter column '{params.filter_column}' not found"
-                    )
-
-                # Compile regex patterns
-                patterns = [re.compile(pattern) for pattern in params.filter_values]
-
-                # Apply filter
-                def matches_any_pattern(value: Any) -> bool:
-                    if pd.isna(value):
-                        return False
-                    str_value = str(value)
-                    return any(pattern.search(str_value) for pattern in patterns)
-
-                mask = df[params.filter_column].apply(matches_any_pattern)
-
-                if params.filter_mode == "exclude":
-                    mask = ~mask
-
-                df = df[mask].copy()
-                logger.info(f"Filtered from {original_row_count} to {len(df)} rows")
-
-            # Strip prefix if specified
-            if params.strip_prefix:
-                logger.info(
-                    f"Stripping prefix '{params.strip_prefix}' from column '{params.identifier_column}'"
-                )
-
-                # Preserve original values
-                df[f"{params.identifier_column}_original"] = df[
-                    params.identifier_column
-                ].copy()
-
-                # Strip prefix
-                df[params.identifier_column] = (
-                    df[params.identifier_column]
-                    .astype(str)
-                    .str.replace(params.strip_prefix, "", regex=False)
-                )
-
-            # Drop empty identifiers if requested
-            if params.drop_empty_ids:
-                # Count before dropping
-                before_drop = len(df)
-
-                # Drop rows where identifier is empty, NaN, or just whitespace
-                df = df[df[params.identifier_column].notna()]
-                df = df[df[params.identifier_column].astype(str).str.strip() != ""]
-
-                if before_drop != len(df):
-                    logger.info(
-                        f"Dropped {before_drop - len(df)} rows with empty identifiers"
-                    )
-
-            # Add source file metadata
-            df["_source_file"] = str(file_path.absolute())
-
-            # Convert to list of dictionaries for storage
-            dataset = df.to_dict("records")
+            # Store columnar; legacy consumers get a lazy list-of-dict view
+            dataset = DatasetHandle(df)
 
             # Store dataset in context - handle both dict and StrategyExecutionContext
             if isinstance(ctx, dict):
@@ -256,9 +194,9 @@ class LoadDatasetIdentifiersAction(
 
             return StandardActionResult(
                 input_identifiers=[],  # No input identifiers for this action
-                output_identifiers=[
-                    str(row[params.identifier_column]) for row in dataset
-                ],
+                output_identifiers=dataset.column(params.identifier_column)
+                .astype(str)
+                .tolist(),
                 output_ontology_type="unknown",  # We don't know the type from just a CSV
                 provenance=[
                     {
@@ -279,3 +217,182 @@ class LoadDatasetIdentifiersAction(
         except Exception as e:
             logger.error(f"Failed to load dataset: {str(e)}")
             raise
+
+    def _prepare_frame(
+        self,
+        df: pd.DataFrame,
+        params: LoadDatasetIdentifiersParams,
+        file_path: Path,
+        row_offset: int,
+    ) -> pd.DataFrame:
+        """Number, validate, filter and clean one frame (whole file or chunk).
+
+        Args:
+            df: Rows as read from the file
+            params: Action parameters
+            file_path: Source file
+            row_offset: Number of data rows preceding ``df`` in the file
+        """
+        original_row_count = len(df)
+
+        # Add row number before any filtering
+        # 1-based, accounting for header
+        df["_row_number"] = range(row_offset + 2, row_offset + len(df) + 2)
+
+        # Validate identifier column exists
+        if params.identifier_column not in df.columns:
+            available_cols = list(df.columns)
+            raise ValueError(
+                f"Column '{params.identifier_column}' not found in file. "
+                f"Available columns: {available_cols}"
+            )
+
+        # Apply filtering if specified
+        if params.filter_column and params.filter_values:
+            logger.info(f"Applying filter on column '{params.filter_column}'")
+
+            if params.filter_column not in df.columns:
+                raise ValueError(
+                    f"Filter column '{params.filter_column}' not found"
+                )
+
+            # Compile regex patterns
+            patterns = [re.compile(pattern) for pattern in params.filter_values]
+
+            # Apply filter
+            def matches_any_pattern(value: Any) -> bool:
+                if pd.isna(value):
+                    return False
+                str_value = str(value)
+                return any(pattern.search(str_value) for pattern in patterns)
+
+            mask = df[params.filter_column].apply(matches_any_pattern)
+
+            if params.filter_mode == "exclude":
+                mask = ~mask
+
+            df = df[mask].copy()
+            logger.info(f"Filtered from {original_row_count} to {len(df)} rows")
+
+        # Strip prefix if specified
+        if params.strip_prefix:
+            logger.info(
+                f"Stripping prefix '{params.strip_prefix}' from column '{params.identifier_column}'"
+            )
+
+            # Preserve original values
+            df[f"{params.identifier_column}_original"] = df[
+                params.identifier_column
+            ].copy()
+
+            # Strip prefix
+            df[params.identifier_column] = (
+                df[params.identifier_column]
+                .astype(str)
+                .str.replace(params.strip_prefix, "", regex=False)
+            )
+
+        # Drop empty identifiers if requested
+        if params.drop_empty_ids:
+            # Count before dropping
+            before_drop = len(df)
+
+            # Drop rows where identifier is empty, NaN, or just whitespace
+            df = df[df[params.identifier_column].notna()]
+            df = df[df[params.identifier_column].astype(str).str.strip() != ""]
+
+            if before_drop != len(df):
+                logger.info(
+                    f"Dropped {before_drop - len(df)} rows with empty identifiers"
+                )
+
+        # Add source file metadata
+        df["_source_file"] = str(file_path.absolute())
+        return df
+
+    def _load_streaming(
+        self,
+        params: LoadDatasetIdentifiersParams,
+        file_path: Path,
+        file_type: str,
+        ctx: Any,
+    ) -> StandardActionResult:
+        """Store the file as a ChunkedDataset instead of loading it whole."""
+        from core.standards import BiologicalFileLoader
+
+        def read_chunks():
+            offset = 0
+            for chunk in BiologicalFileLoader.load_chunked(
+                file_path, chunk_size=params.chunk_size, file_type=file_type
+            ):
+                rows = len(chunk)
+                yield self._prepare_frame(chunk, params, file_path, row_offset=offset)
+                offset += rows
+
+        # Read the header (and one row) up front: surfaces missing columns at
+        # load time and gives the stream its column names without a pass
+        first_rows = BiologicalFileLoader.load_chunked(
+            file_path, chunk_size=1, file_type=file_type
+        )
+        try:
+            header = next(first_rows, None)
+        finally:
+            first_rows.close()
+        columns = (
+            list(self._prepare_frame(header, params, file_path, row_offset=0).columns)
+            if header is not None
+            else []
+        )
+        dataset = ChunkedDataset(read_chunks, columns=columns)
+
+        if isinstance(ctx, dict):
+            ctx["datasets"][params.output_key] = dataset
+        else:
+            datasets = ctx.get_action_data("datasets", {})
+            datasets[params.output_key] = dataset
+            ctx.set_action_data("datasets", datasets)
+
+        metadata = {
+            "source_file": str(file_path.absolute()),
+            "row_count": None,  # Unknown until the stream is consumed
+            "identifier_column": params.identifier_column,
+            "columns": columns,
+            "filtered": bool(params.filter_column and params.filter_values),
+            "prefix_stripped": bool(params.strip_prefix),
+            "chunk_size": params.chunk_size,
+        }
+        if isinstance(ctx, dict):
+            ctx["metadata"][params.output_key] = metadata
+        else:
+            metadata_dict = ctx.get_action_data("metadata", {})
+            metadata_dict[params.output_key] = metadata
+            ctx.set_action_data("metadata", metadata_dict)
+
+        logger.info(
+            f"Streaming {file_path} into context key '{params.output_key}' "
+            f"in chunks of {params.chunk_size} rows"
+        )
+
+        # Identifiers stay in the stream; materializing them would defeat
+        # bounded-memory loading
+        return StandardActionResult(
+            input_identifiers=[],
+            output_identifiers=[],
+            output_ontology_type="unknown",
+            provenance=[
+                {
+                    "action": "LOAD_DATASET_IDENTIFIERS",
+                    "file": str(file_path.absolute()),
+                    "streaming": True,
+                    "chunk_size": params.chunk_size,
+                    "identifier_column": params.identifier_column,
+                }
+            ],
+            details={
+                "rows_loaded": None,
+                "streaming": True,
+                "output_key": params.output_key,
+                "identifier_column": params.identifier_column,
+                "file_path": str(file_path.absolute()),
+            },
+        )
@@ -11,6 +11,7 @@ from actions.typed_base import (
 )
 from actions.registry import register_action
 from core.standards.context_handler import UniversalContext
+from core.standards.dataset_handle import DatasetHandle, as_dataframe, is_empty, is_tabular
 
 logger = logging.getLogger(__name__)
 
@@ -253,11 +254,8 @@ class MergeDatasetsAction(
             # Convert to DataFrames for easier merging
             dfs_with_keys = []
             for key, dataset in datasets_to_merge:
-                if isinstance(dataset, list) and len(dataset) > 0:
-                    df = pd.DataFrame(dataset)
-                    dfs_with_keys.append((key, df))
-                elif isinstance(dataset, pd.DataFrame):
-                    dfs_with_keys.append((key, dataset))
+                if is_tabular(dataset) and not is_empty(dataset):
+                    dfs_with_keys.append((key, as_dataframe(dataset)))
                 else:
                     logger.warning(f"Dataset '{key}' is empty or invalid type")
 
@@ -497,8 +495,8 @@ class MergeDatasetsAction(
                     f"not found in merged dataset"
                 )
 
-            # Convert back to list of dicts
-            merged_data = merged_df.to_dict("records")
+            # Store columnar; legacy consumers get a lazy records view
+            merged_data = DatasetHandle(merged_df.reset_index(drop=True))
 
             # Store in context
             datasets_store[params.output_key] = merged_data
@@ -20,6 +20,7 @@ import warnings
 from actions.typed_base import TypedStrategyAction
 from actions.registry import register_action
 from core.standards.context_handler import UniversalContext
+from core.standards.dataset_handle import DatasetHandle, as_dataframe
 from actions.utils.llm_providers import AnthropicProvider, LLMResponse, LLMUsageMetrics
 
 logger = logging.getLogger(__name__)
@@ -165,6 +166,8 @@ class GenerateLLMAnalysis(TypedStrategyAction[GenerateLLMAnalysisParams, ActionR
             if mapping_data is None:
                 logger.warning(f"No mapping results found at key '{params.mapping_results_key}'")
                 mapping_df = pd.DataFrame()
+            elif isinstance(mapping_data, DatasetHandle):
+                mapping_df = as_dataframe(mapping_data, copy=False)
             elif isinstance(mapping_data, list):
                 # Convert list of dicts to DataFrame
                 mapping_df = pd.DataFrame(mapping_data) if mapping_data else pd.DataFrame()
@@ -966,6 +969,8 @@ The following patterns represent the most common mapping failures:
             # Convert to DataFrame if needed
             if mapping_data is None:
                 mapping_df = pd.DataFrame()
+            elif isinstance(mapping_data, DatasetHandle):
+                mapping_df = as_dataframe(mapping_data, copy=False)
             elif isinstance(mapping_data, list):
                 mapping_df = pd.DataFrame(mapping_data) if mapping_data else pd.DataFrame()
             elif isinstance(mapping_data, pd.DataFrame):
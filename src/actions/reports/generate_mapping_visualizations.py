@@ -22,6 +22,7 @@ import seaborn as sns
 from actions.typed_base import TypedStrategyAction
 from actions.registry import register_action
 from core.standards.context_handler import UniversalContext
+from core.standards.dataset_handle import DatasetHandle, as_dataframe
 
 logger = logging.getLogger(__name__)
 
@@ -160,6 +161,8 @@ class GenerateMappingVisualizations(TypedStrategyAction[GenerateMappingVisualiza
                 )
             
             # Convert to DataFrame if needed (handle both list of dicts and DataFrame)
+            if isinstance(input_data, DatasetHandle):
+                input_data = as_dataframe(input_data, copy=False)
             if isinstance(input_data, list):
                 if len(input_data) == 0:
                     return ActionResult(
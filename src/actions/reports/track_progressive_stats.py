@@ -15,6 +15,8 @@ from datetime import datetime
 from actions.typed_base import TypedStrategyAction
 from actions.registry import register_action
 from core.standards.context_handler import UniversalContext
+from core.standards.dataset_handle import DatasetHandle, as_dataframe
+from core.standards.id_set import InternedIdSet
 
 logger = logging.getLogger(__name__)
 
@@ -107,7 +109,9 @@ class TrackProgressiveStats(TypedStrategyAction[TrackProgressiveStatsParams, Act
                 )
             
             # Convert to DataFrame if needed
-            if isinstance(stage_data, list):
+            if isinstance(stage_data, DatasetHandle):
+                stage_df = as_dataframe(stage_data, copy=False)
+            elif isinstance(stage_data, list):
                 if len(stage_data) == 0:
                     logger.warning(f"Stage {params.stage_id}: Empty dataset")
                     stage_df = pd.DataFrame()
@@ -135,7 +139,7 @@ class TrackProgressiveStats(TypedStrategyAction[TrackProgressiveStatsParams, Act
                     'final_match_rate': 0.0,
                     'input_statistics': input_stats,  # NEW: Preserve input statistics
                     'unique_tracking': {
-                        'all_unique_ids': set(),
+                        'all_unique_ids': InternedIdSet(),
                         'total_unique_entities': 0,
                         'by_stage': {}
                     }
@@ -163,7 +167,7 @@ class TrackProgressiveStats(TypedStrategyAction[TrackProgressiveStatsParams, Act
             # Ensure unique_tracking exists (for backward compatibility)
             if 'unique_tracking' not in progressive_stats:
                 progressive_stats['unique_tracking'] = {
-                    'all_unique_ids': set(),
+                    'all_unique_ids': InternedIdSet(),
                     'total_unique_entities': 0,
                     'by_stage': {}
                 }
@@ -177,6 +181,14 @@ class TrackProgressiveStats(TypedStrategyAction[TrackProgressiveStatsParams, Act
             expansion_factor = 1.0
             
             if params.track_unique_entities and params.entity_id_column in stage_df.columns:
+                # Stage IDs are interned into the vocabulary of the cumulative set,
+                # so new and cumulative counts are set operations on integer codes
+                all_previous_ids = progressive_stats['unique_tracking'].get('all_unique_ids')
+                if not isinstance(all_previous_ids, InternedIdSet):
+                    # Stats stored by older versions hold a list or set of IDs
+                    all_previous_ids = InternedIdSet(all_previous_ids or ())
+                vocabulary = all_previous_ids.vocabulary
+                
                 # Check if we have composite entity tracking
                 if "_composite_entity_id" in stage_df.columns:
                     # Count composite entities as single units
@@ -189,10 +201,14 @@ class TrackProgressiveStats(TypedStrategyAction[TrackProgressiveStatsParams, Act
                     logger.info(f"Stage {params.stage_id}: Using composite-aware counting - {composite_entities} composites + {simple_entities} simple = {unique_entities} total entities")
                     
                     # Get unique IDs for tracking (still track individual components for matching)
-                    stage_unique_ids = set(stage_df[params.entity_id_column].dropna().unique())
+                    stage_unique_ids = InternedIdSet(
+                        stage_df[params.entity_id_column].dropna().unique(), vocabulary
+                    )
                 else:
                     # Standard counting (no composite tracking)
-                    stage_unique_ids = set(stage_df[params.entity_id_column].dropna().unique())
+                    stage_unique_ids = InternedIdSet(
+                        stage_df[params.entity_id_column].dropna().unique(), vocabulary
+                    )
                     unique_entities = len(stage_unique_ids)
                     logger.info(f"Stage {params.stage_id}: Using standard counting - {unique_entities} unique entities (no composite tracking columns found)")
                 
@@ -206,28 +222,21 @@ class TrackProgressiveStats(TypedStrategyAction[TrackProgressiveStatsParams, Act
                         'unique_entities': unique_entities,
                         'new_unique_entities': 0,  # Baseline contributes 0 matches
                         'is_baseline': True,
-                        'stage_unique_ids': list(stage_unique_ids)[:10]  # Store sample for debugging
+                        'stage_unique_ids': stage_unique_ids.to_list(limit=10)  # Store sample for debugging
                     }
                 else:
                     # Normal matching stage: Track new matches
-                    # Calculate new unique entities not seen in previous MATCHING stages
-                    # Convert to set if it was stored as list
-                    all_previous_ids_raw = progressive_stats['unique_tracking'].get('all_unique_ids', [])
-                    if isinstance(all_previous_ids_raw, list):
-                        all_previous_ids = set(all_previous_ids_raw)
-                    else:
-                        all_previous_ids = all_previous_ids_raw
-                    new_unique_ids = stage_unique_ids - all_previous_ids
-                    new_unique_entities = len(new_unique_ids)
+                    # New unique entities are those not seen in previous MATCHING stages
+                    all_unique_ids = all_previous_ids | stage_unique_ids
+                    new_unique_entities = len(all_unique_ids) - len(all_previous_ids)
                     
-                    # Update tracking (convert set to list for serialization)
-                    all_previous_ids.update(stage_unique_ids)
-                    progressive_stats['unique_tracking']['all_unique_ids'] = list(all_previous_ids)
-                    progressive_stats['unique_tracking']['total_unique_entities'] = len(all_previous_ids)
+                    # Update tracking (the interned set pickles as codes plus vocabulary)
+                    progressive_stats['unique_tracking']['all_unique_ids'] = all_unique_ids
+                    progressive_stats['unique_tracking']['total_unique_entities'] = len(all_unique_ids)
                     progressive_stats['unique_tracking']['by_stage'][str(params.stage_id)] = {
                         'unique_entities': unique_entities,
                         'new_unique_entities': new_unique_entities,
-                        'stage_unique_ids': list(stage_unique_ids)[:10]  # Store sample for debugging
+                        'stage_unique_ids': stage_unique_ids.to_list(limit=10)  # Store sample for debugging
                     }
             
             if params.is_baseline_stage:
@@ -291,8 +300,8 @@ class TrackProgressiveStats(TypedStrategyAction[TrackProgressiveStatsParams, Act
                 if params.previous_stages_key:
                     previous_data = datasets.get(params.previous_stages_key)
                     if previous_data:
-                        if isinstance(previous_data, list):
-                            previous_df = pd.DataFrame(previous_data) if previous_data else pd.DataFrame()
+                        if isinstance(previous_data, (list, DatasetHandle)):
+                            previous_df = as_dataframe(previous_data, copy=False)
                         else:
                             previous_df = previous_data
                         
@@ -1,23 +1,33 @@
 """Semantic metabolite matching using embeddings and LLM validation."""
 
+import asyncio
 import hashlib
 import json
 import logging
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
 
 import numpy as np
 from pydantic import BaseModel, Field
-from sklearn.metrics.pairwise import cosine_similarity
 
+from actions.algorithms.fuzzy_matching.vector_index import VectorIndex
 from actions.registry import register_action
 from actions.typed_base import (
     TypedStrategyAction,
 )
+from core.infrastructure.embedding_store import EmbeddingStore
 
 logger = logging.getLogger(__name__)
 
+# Output sizes of common OpenAI embedding models, used for the zero vectors of
+# failed requests when no embedding of the model has been seen yet
+EMBEDDING_DIMENSIONS = {
+    "text-embedding-ada-002": 1536,
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+}
+
 
 class SemanticMetaboliteMatchParams(BaseModel):
     """Parameters for semantic metabolite matching."""
@@ -45,58 +55,108 @@ class SemanticMetaboliteMatchParams(BaseModel):
     embedding_similarity_threshold: float = Field(
         0.85, description="Minimum embedding similarity for LLM validation"
     )
-    batch_size: int = Field(10, description="Batch size for embedding generation")
+    batch_size: int = Field(
+        100, ge=1, description="Texts per embedding request"
+    )
+    embedding_concurrency: int = Field(
+        4, ge=1, description="Maximum embedding requests in flight"
+    )
+    top_k: int = Field(5, ge=1, description="Candidates validated per metabolite")
+    reference_index_path: Optional[str] = Field(
+        None,
+        description="Reference embedding matrix (.npy); memory-mapped if present, "
+        "written after embedding otherwise",
+    )
+    ann_index: str = Field(
+        "auto", description="Approximate index for large references: auto, hnsw, ivf, none"
+    )
+    ann_min_references: int = Field(
+        50_000, ge=1, description="Minimum references before 'auto' uses an approximate index"
+    )
+    cache_dir: Optional[str] = Field(
+        None,
+        description="Embedding cache directory; defaults to $SEMANTIC_MATCH_CACHE_DIR, "
+        "in memory if neither is set",
+    )
     output_key: str = Field(..., description="Key for matched results")
     unmatched_key: Optional[str] = Field(None, description="Key for final unmatched")
 
 
 class EmbeddingCache:
-    """Simple cache for embeddings to avoid duplicate API calls."""
+    """Cache for embeddings to avoid duplicate API calls.
 
-    def __init__(self, cache_dir: Optional[str] = None):
+    With a ``cache_dir`` vectors live in the process-shared
+    ``EmbeddingStore`` under ``<cache_dir>/<namespace>``, one namespace per
+    embedding model; per-vector JSON
+    files written by earlier versions are still read and migrated into the
+    store on first use. Without one, vectors are kept in memory only.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, namespace: str = "default"):
         """Initialize the embedding cache."""
-        self.memory_cache: Dict[str, List[float]] = {}
+        self.namespace = namespace
+        self.memory_cache: Dict[str, Sequence[float]] = {}
         self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.store: Optional[EmbeddingStore] = None
         if self.cache_dir:
             self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.store = EmbeddingStore.for_model(self.cache_dir, namespace)
+
+    @property
+    def dimension(self) -> Optional[int]:
+        """Length of the cached vectors, if any are cached."""
+        if self.store is not None:
+            return self.store.dim
+        return next((len(v) for v in self.memory_cache.values()), None)
+
+    def _read_legacy(self, text: str) -> Optional[List[float]]:
+        """Read (and migrate) a vector from a per-text JSON file."""
+        cache_key = hashlib.md5(text.encode()).hexdigest()
+        cache_file = self.cache_dir / f"{cache_key}.json"
+        if not cache_file.exists():
+            return None
+        try:
+            with open(cache_file, "r") as f:
+                embedding = json.load(f)
+            self.store.put(text, embedding)
+            return embedding
+        except Exception as e:
+            logger.warning(f"Failed to load cached embedding: {e}")
+            return None
 
     def get(self, text: str) -> Optional[List[float]]:
         """Get embedding from cache."""
-        cache_key = hashlib.md5(text.encode()).hexdigest()
+        [embedding] = self.get_many([text])
+        return embedding.tolist() if isinstance(embedding, np.ndarray) else embedding
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[Sequence[float]]]:
+        """Get embeddings for ``texts``; store hits are float32 arrays."""
+        if self.store is None:
+            return [self.memory_cache.get(text) for text in texts]
+        embeddings: List[Optional[Sequence[float]]] = list(self.store.get_many(texts))
+        for i, text in enumerate(texts):
+            if embeddings[i] is None:
+                embeddings[i] = self._read_legacy(text)
+        return embeddings
 
-        # Check memory cache first
-        if cache_key in self.memory_cache:
-            return self.memory_cache[cache_key]
+    def __contains__(self, text: str) -> bool:
+        if self.store is None:
+            return text in self.memory_cache
+        return text in self.store
 
-        # Check disk cache
-        if self.cache_dir:
-            cache_file = self.cache_dir / f"{cache_key}.json"
-            if cache_file.exists():
-                try:
-                    with open(cache_file, "r") as f:
-                        embedding = json.load(f)
-                        self.memory_cache[cache_key] = embedding
-                        return embedding
-                except Exception as e:
-                    logger.warning(f"Failed to load cached embedding: {e}")
-
-        return None
-
-    def set(self, text: str, embedding: List[float]) -> None:
+    def set(self, text: str, embedding: Sequence[float]) -> None:
         """Store embedding in cache."""
-        cache_key = hashlib.md5(text.encode()).hexdigest()
-
-        # Store in memory
-        self.memory_cache[cache_key] = embedding
+        self.set_many([text], [embedding])
 
-        # Store on disk
-        if self.cache_dir:
-            cache_file = self.cache_dir / f"{cache_key}.json"
-            try:
-                with open(cache_file, "w") as f:
-                    json.dump(embedding, f)
-            except Exception as e:
-                logger.warning(f"Failed to cache embedding: {e}")
+    def set_many(self, texts: Sequence[str], embeddings: Sequence[Sequence[float]]) -> None:
+        """Store several embeddings with one append."""
+        if self.store is None:
+            self.memory_cache.update(zip(texts, embeddings))
+            return
+        try:
+            self.store.put_many(texts, embeddings)
+        except Exception as e:
+            logger.warning(f"Failed to cache embeddings: {e}")
 
 
 class SemanticMatchResult(BaseModel):
@@ -119,6 +179,7 @@ class SemanticMetaboliteMatchAction(
         super().__init__(db_session)
         self.embedding_cache = None
         self.openai_client = None
+        self.embedding_concurrency = 4
 
     def get_params_model(self) -> type[SemanticMetaboliteMatchParams]:
         """Get the Pydantic model for action parameters."""
@@ -128,8 +189,15 @@ class SemanticMetaboliteMatchAction(
         """Get the Pydantic model for action results."""
         return SemanticMatchResult
 
-    def _initialize_clients(self) -> None:
-        """Initialize OpenAI client and embedding cache."""
+    def _initialize_clients(
+        self, embedding_model: Optional[str] = None, cache_dir: Optional[str] = None
+    ) -> None:
+        """Initialize OpenAI client and the embedding cache of this run.
+
+        The client is created once per instance. The cache is resolved on
+        every call, since a pooled instance serves runs with different
+        models and cache directories.
+        """
         if self.openai_client is None:
             try:
                 import openai
@@ -140,15 +208,22 @@ class SemanticMetaboliteMatchAction(
 
                 self.openai_client = openai.OpenAI(api_key=api_key)
 
-                # Initialize cache
-                cache_dir = os.getenv("SEMANTIC_MATCH_CACHE_DIR")
-                self.embedding_cache = EmbeddingCache(cache_dir)
-
             except ImportError:
                 raise ImportError(
                     "OpenAI library not found. Please install with: pip install openai"
                 )
 
+        # Vectors of different models must never mix: one cache namespace each
+        namespace = embedding_model or "default"
+        cache_dir = cache_dir or os.getenv("SEMANTIC_MATCH_CACHE_DIR")
+        cache_path = Path(cache_dir) if cache_dir else None
+        if (
+            self.embedding_cache is None
+            or self.embedding_cache.namespace != namespace
+            or self.embedding_cache.cache_dir != cache_path
+        ):
+            self.embedding_cache = EmbeddingCache(cache_dir, namespace=namespace)
+
     def _create_context_string(
         self, metabolite: Dict[str, Any], fields: List[str], dataset_name: str
     ) -> str:
@@ -182,34 +257,80 @@ class SemanticMetaboliteMatchAction(
         return " | ".join(context_parts)
 
     async def _generate_embeddings(
-        self, texts: List[str], model: str
-    ) -> List[List[float]]:
-        """Generate embeddings using OpenAI API."""
-        embeddings = []
-
-        for text in texts:
-            # Check cache first
-            cached = self.embedding_cache.get(text)
-            if cached is not None:
-                embeddings.append(cached)
-                continue
-
-            try:
-                # Generate embedding
-                response = self.openai_client.embeddings.create(input=text, model=model)
-                embedding = response.data[0].embedding
-
-                # Cache the result
-                self.embedding_cache.set(text, embedding)
-                embeddings.append(embedding)
-
-            except Exception as e:
-                logger.error(f"Failed to generate embedding: {e}")
-                # Return zero vector on failure
-                embeddings.append([0.0] * 1536)  # Default ada-002 dimension
+        self,
+        texts: List[str],
+        model: str,
+        batch_size: int = 100,
+        concurrency: int = 4,
+        failed: Optional[Set[int]] = None,
+    ) -> List[Sequence[float]]:
+        """
+        Generate embeddings using OpenAI API.
+
+        Cached texts are served from the cache; the rest are deduplicated and
+        sent as multi-input requests of ``batch_size`` texts, at most
+        ``concurrency`` requests in flight. Positions that fell back to a zero
+        vector are added to ``failed``.
+        """
+        cached = self.embedding_cache.get_many(texts)
+        missing = list(dict.fromkeys(t for t, emb in zip(texts, cached) if emb is None))
+        generated: Dict[str, Sequence[float]] = {}
+
+        if missing:
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def embed_batch(batch: List[str]) -> None:
+                async with semaphore:
+                    try:
+                        response = await asyncio.to_thread(
+                            self.openai_client.embeddings.create, input=batch, model=model
+                        )
+                        vectors = [item.embedding for item in response.data]
+                        if len(vectors) != len(batch):
+                            raise ValueError(
+                                f"Expected {len(batch)} embeddings, got {len(vectors)}"
+                            )
+                    except Exception as e:
+                        logger.error(f"Failed to generate embedding: {e}")
+                        return
+                    # Cache the result
+                    self.embedding_cache.set_many(batch, vectors)
+                    generated.update(zip(batch, vectors))
+
+            await asyncio.gather(
+                *(
+                    embed_batch(missing[i : i + batch_size])
+                    for i in range(0, len(missing), batch_size)
+                )
+            )
 
+        embeddings: List[Sequence[float]] = []
+        zero_vector: Optional[List[float]] = None
+        for position, (text, embedding) in enumerate(zip(texts, cached)):
+            if embedding is None:
+                embedding = generated.get(text)
+            if embedding is None:
+                # Zero vector on failure, sized like the model's other vectors
+                if zero_vector is None:
+                    zero_vector = [0.0] * self._embedding_dimension(model, cached, generated)
+                embedding = zero_vector
+                if failed is not None:
+                    failed.add(position)
+            embeddings.append(embedding)
         return embeddings
 
+    def _embedding_dimension(
+        self,
+        model: str,
+        cached: Sequence[Optional[Sequence[float]]],
+        generated: Dict[str, Sequence[float]],
+    ) -> int:
+        """Dimension of ``model``'s embeddings, from the vectors seen so far."""
+        for embedding in list(generated.values()) + list(cached):
+            if embedding is not None:
+                return len(embedding)
+        return self.embedding_cache.dimension or EMBEDDING_DIMENSIONS.get(model, 1536)
+
     async def _generate_embeddings_batch(
         self,
         metabolites: List[Dict[str, Any]],
@@ -217,19 +338,24 @@ class SemanticMetaboliteMatchAction(
         dataset_name: str,
         model: str,
         batch_size: int,
-    ) -> Dict[int, List[float]]:
-        """Generate embeddings for a list of metabolites in batches."""
+        failed: Optional[Set[int]] = None,
+    ) -> Dict[int, Sequence[float]]:
+        """Generate embeddings for a list of metabolites in batches.
+
+        Indices whose embedding failed (zero vectors) are added to ``failed``.
+        """
         # Create context strings
         contexts = [
             self._create_context_string(m, fields, dataset_name) for m in metabolites
         ]
 
-        # Process in batches
-        all_embeddings = []
-        for i in range(0, len(contexts), batch_size):
-            batch = contexts[i : i + batch_size]
-            batch_embeddings = await self._generate_embeddings(batch, model)
-            all_embeddings.extend(batch_embeddings)
+        all_embeddings = await self._generate_embeddings(
+            contexts,
+            model,
+            batch_size=batch_size,
+            concurrency=self.embedding_concurrency,
+            failed=failed,
+        )
 
         # Return as dict with indices
         return {i: emb for i, emb in enumerate(all_embeddings)}
@@ -237,26 +363,88 @@ class SemanticMetaboliteMatchAction(
     def _find_candidates(
         self,
         source_embedding: List[float],
-        reference_embeddings: Dict[int, List[float]],
+        reference_embeddings: Union[Dict[int, List[float]], VectorIndex],
         threshold: float,
         top_k: int = 5,
     ) -> List[Tuple[int, float]]:
         """Find top-k most similar reference metabolites."""
-        # Convert to numpy arrays
-        source_vec = np.array(source_embedding).reshape(1, -1)
-
-        similarities = []
-        for ref_idx, ref_embedding in reference_embeddings.items():
-            ref_vec = np.array(ref_embedding).reshape(1, -1)
+        if not isinstance(reference_embeddings, VectorIndex):
+            reference_embeddings = VectorIndex(reference_embeddings, ann="none")
+        return reference_embeddings.search(
+            [source_embedding], top_k=top_k, threshold=threshold
+        )[0]
 
-            # Calculate cosine similarity
-            similarity = cosine_similarity(source_vec, ref_vec)[0, 0]
+    async def _build_reference_index(
+        self,
+        reference: List[Dict[str, Any]],
+        fields: List[str],
+        params: SemanticMetaboliteMatchParams,
+    ) -> VectorIndex:
+        """Embed reference metabolites into a VectorIndex, reusing a saved matrix.
+
+        A saved matrix is reused only if the digest of the reference texts
+        and the embedding model recorded next to it (``<path>.meta.json``)
+        match the current run. A matrix with failed (zero) embeddings is
+        used for this run but not saved.
+        """
+        index_options = {
+            "ann": params.ann_index,
+            "ann_min_size": params.ann_min_references,
+        }
+        path = params.reference_index_path
+        meta = {
+            "model": params.embedding_model,
+            "reference_digest": self._reference_digest(reference, fields, params),
+        }
+        meta_path = Path(f"{path}.meta.json") if path else None
+        if path and Path(path).exists():
+            try:
+                saved_meta = json.loads(meta_path.read_text())
+            except (OSError, ValueError):
+                saved_meta = None
+            if saved_meta == meta:
+                index = VectorIndex.load(path, mmap=True, **index_options)
+                logger.info(f"Loaded {len(index)} reference embeddings from {path}")
+                return index
+            logger.warning(
+                f"Reference index {path} was built for other references or another "
+                f"embedding model; re-embedding"
+            )
 
-            if similarity >= threshold:
-                similarities.append((ref_idx, float(similarity)))
+        logger.info("Generating embeddings for reference metabolites...")
+        failed: Set[int] = set()
+        reference_embeddings = await self._generate_embeddings_batch(
+            reference,
+            fields,
+            params.reference_map,
+            params.embedding_model,
+            params.batch_size,
+            failed=failed,
+        )
+        index = VectorIndex(reference_embeddings, **index_options)
+        if path and failed:
+            logger.warning(
+                f"{len(failed)} reference embeddings failed; not saving the "
+                f"reference index to {path}"
+            )
+        elif path:
+            index.save(path)
+            meta_path.write_text(json.dumps(meta))
+        return index
 
-        # Return top-k sorted by similarity
-        return sorted(similarities, key=lambda x: x[1], reverse=True)[:top_k]
+    def _reference_digest(
+        self,
+        reference: List[Dict[str, Any]],
+        fields: List[str],
+        params: SemanticMetaboliteMatchParams,
+    ) -> str:
+        """Digest of the ordered reference texts that get embedded."""
+        digest = hashlib.sha256()
+        for metabolite in reference:
+            text = self._create_context_string(metabolite, fields, params.reference_map)
+            digest.update(text.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
 
     def _extract_additional_info(self, metabolite: Dict[str, Any]) -> str:
         """Extract additional context information from metabolite."""
@@ -371,7 +559,8 @@ Format: YES|0.95|These are both referring to total cholesterol measurements."""
     ) -> SemanticMatchResult:
         """Execute semantic metabolite matching with embeddings and LLM validation."""
         # Initialize clients
-        self._initialize_clients()
+        self._initialize_clients(params.embedding_model, params.cache_dir)
+        self.embedding_concurrency = params.embedding_concurrency
 
         # Load datasets
         datasets = context.get("datasets", {})
@@ -415,16 +604,28 @@ Format: YES|0.95|These are both referring to total cholesterol measurements."""
             params.batch_size,
         )
 
-        logger.info("Generating embeddings for reference metabolites...")
-        reference_embeddings = await self._generate_embeddings_batch(
-            reference,
-            reference_fields,
-            params.reference_map,
-            params.embedding_model,
-            params.batch_size,
+        reference_index = await self._build_reference_index(
+            reference, reference_fields, params
+        )
+
+        # Top-k candidates for every source with a usable embedding at once
+        valid_sources = [
+            idx
+            for idx, emb in source_embeddings.items()
+            if emb is not None and np.any(emb)
+        ]
+        candidates_by_source = dict(
+            zip(
+                valid_sources,
+                reference_index.search(
+                    [source_embeddings[idx] for idx in valid_sources],
+                    top_k=params.top_k,
+                    threshold=params.embedding_similarity_threshold,
+                ),
+            )
         )
 
-        # Find candidates and validate with LLM
+        # Validate candidates with LLM
         matches = []
         still_unmatched = []
         llm_calls = 0
@@ -435,21 +636,12 @@ Format: YES|0.95|These are both referring to total cholesterol measurements."""
                 still_unmatched.append(source_metabolite)
                 continue
 
-            # Get source embedding
-            source_emb = source_embeddings.get(source_idx)
-            if source_emb is None or all(v == 0 for v in source_emb):
+            candidates = candidates_by_source.get(source_idx)
+            if candidates is None:
                 logger.warning(f"No valid embedding for metabolite {source_idx}")
                 still_unmatched.append(source_metabolite)
                 continue
 
-            # Find candidates
-            candidates = self._find_candidates(
-                source_emb,
-                reference_embeddings,
-                params.embedding_similarity_threshold,
-                top_k=5,
-            )
-
             matched = False
             for ref_idx, similarity in candidates:
                 candidate = reference[ref_idx]
@@ -505,7 +697,7 @@ Format: YES|0.95|These are both referring to total cholesterol measurements."""
                         self._create_context_string(m, unmatched_fields, "")
                         for m in unmatched
                     ]
-                    if self.embedding_cache.get(text) is not None
+                    if text in self.embedding_cache
                 ),
             },
         )
@@ -100,6 +100,18 @@ class TypedStrategyAction(Generic[TParams, TResult], ABC):  # Simplified for val
             Typed result object
         """
 
+    async def warmup(self) -> None:
+        """
+        Load heavy resources ahead of the first execution.
+
+        Called once by the action pool when the service is warmed up.
+        Actions are instantiated once per process, so anything loaded here
+        is reused by every later run.
+        """
+
+    async def close(self) -> None:
+        """Release resources held by the action when the pool shuts down."""
+
     async def execute(
         self,
         current_identifiers: List[str],
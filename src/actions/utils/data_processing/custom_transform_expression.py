@@ -6,15 +6,24 @@ using Python expressions or callable functions, providing maximum flexibility fo
 data processing operations.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional
+import asyncio
 import pandas as pd
-import numpy as np
 from pydantic import BaseModel, Field
 import logging
 
 from actions.typed_base import TypedStrategyAction
 from actions.registry import register_action
 from core.standards.context_handler import UniversalContext
+from core.standards.dataset_handle import DatasetHandle, as_dataframe, is_tabular
+from .expression_engine import (
+    RESTRICTED_GLOBALS,
+    SAFE_NAMESPACE,
+    NotVectorizable,
+    compile_expression,
+    evaluate_column,
+    evaluate_rows,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -56,7 +65,7 @@ class CustomTransformExpressionParams(BaseModel):
     )
     parallel: bool = Field(
         True,
-        description="Whether to apply transformations in parallel (currently unused)",
+        description="Run transformations on independent columns concurrently",
     )
 
 
@@ -75,6 +84,8 @@ class CustomTransformExpressionAction(
     - Error handling with configurable behavior (keep_original, null, raise)
     - Creation of new columns while preserving originals
     - Safe evaluation with restricted namespace for security
+    - Column-wise (vectorized) evaluation of common expression shapes, with
+      compiled per-row evaluation as the fallback (see expression_engine)
 
     Examples:
         Simple uppercase transformation:
@@ -128,12 +139,10 @@ class CustomTransformExpressionAction(
             input_data = datasets[params.input_key]
 
             # Convert to DataFrame if needed
-            if isinstance(input_data, dict) and "data" in input_data:
-                df = pd.DataFrame(input_data["data"])
-            elif isinstance(input_data, pd.DataFrame):
-                df = input_data.copy()
-            elif isinstance(input_data, list):
-                df = pd.DataFrame(input_data)
+            if is_tabular(input_data) or (
+                isinstance(input_data, dict) and "data" in input_data
+            ):
+                df = as_dataframe(input_data)
             else:
                 error_msg = f"Unsupported input type: {type(input_data)}"
                 logger.error(error_msg)
@@ -147,33 +156,62 @@ class CustomTransformExpressionAction(
                 f"Applying {len(params.transformations)} transformations to {len(df)} rows"
             )
 
-            # Apply each transformation
+            # Apply transformations wave by wave; independent ones run concurrently
             transformations_applied = 0
-            for i, transform in enumerate(params.transformations):
-                try:
-                    df = await self._apply_transformation(df, transform)
+            if params.parallel:
+                waves = self._plan_waves(params.transformations, df.columns)
+            else:
+                waves = [[i] for i in range(len(params.transformations))]
+
+            for wave in waves:
+                if len(wave) > 1:
+                    outcomes = await asyncio.gather(
+                        *(
+                            asyncio.to_thread(
+                                self._compute_transformation,
+                                df,
+                                params.transformations[i],
+                            )
+                            for i in wave
+                        ),
+                        return_exceptions=True,
+                    )
+                else:
+                    try:
+                        outcomes = [
+                            self._compute_transformation(
+                                df, params.transformations[wave[0]]
+                            )
+                        ]
+                    except Exception as e:
+                        outcomes = [e]
+
+                for i, outcome in zip(wave, outcomes):
+                    transform = params.transformations[i]
+                    if isinstance(outcome, Exception):
+                        error_msg = f"Transformation {i+1} failed on column '{transform.column}': {str(outcome)}"
+                        if transform.on_error == "raise":
+                            logger.error(error_msg)
+                            return ActionResult(
+                                success=False,
+                                error=error_msg,
+                                data={
+                                    "column": transform.column,
+                                    "expression": transform.expression,
+                                },
+                            )
+                        else:
+                            logger.warning(error_msg)
+                            # Continue with other transformations
+                            continue
+                    df = self._commit_transformation(df, transform, outcome)
                     transformations_applied += 1
                     logger.debug(f"Applied transformation {i+1}: {transform.column}")
-                except Exception as e:
-                    error_msg = f"Transformation {i+1} failed on column '{transform.column}': {str(e)}"
-                    if transform.on_error == "raise":
-                        logger.error(error_msg)
-                        return ActionResult(
-                            success=False,
-                            error=error_msg,
-                            data={
-                                "column": transform.column,
-                                "expression": transform.expression,
-                            },
-                        )
-                    else:
-                        logger.warning(error_msg)
-                        # Continue with other transformations
 
-            # Store result in context - convert to list of dicts for consistency
+            # Store result in context as a columnar dataset handle
             datasets = ctx.get_datasets()
             logger.info(f"Storing dataset '{params.output_key}' with {len(df)} rows")
-            datasets[params.output_key] = df.to_dict('records')
+            datasets[params.output_key] = DatasetHandle(df)
             ctx.set("datasets", datasets)
             
             # Debug: verify it's actually stored
@@ -211,54 +249,20 @@ class CustomTransformExpressionAction(
                 success=False, error=error_msg, data={"input_key": params.input_key}
             )
 
-    async def _apply_transformation(
+    def _compute_transformation(
         self, df: pd.DataFrame, transform: TransformationSpec
-    ) -> pd.DataFrame:
-        """Apply a single transformation to a DataFrame column using Python expression."""
+    ) -> Dict[str, Any]:
+        """
+        Compute the column assignments for one transformation without mutating ``df``.
 
-        # Create safe namespace for evaluation FIRST (before using it)
-        # Include commonly needed functions and modules
-        safe_namespace = {
-            # Built-in functions
-            "str": str,
-            "int": int,
-            "float": float,
-            "bool": bool,
-            "len": len,
-            "abs": abs,
-            "round": round,
-            "min": min,
-            "max": max,
-            "sum": sum,
-            "any": any,
-            "all": all,
-            "sorted": sorted,
-            "reversed": reversed,
-            "enumerate": enumerate,
-            "zip": zip,
-            "range": range,
-            "list": list,
-            "dict": dict,
-            "set": set,
-            "tuple": tuple,
-            # String methods (for convenience)
-            "upper": str.upper,
-            "lower": str.lower,
-            "strip": str.strip,
-            "split": str.split,
-            "replace": str.replace,
-            "startswith": str.startswith,
-            "endswith": str.endswith,
-            # Modules
-            "np": np,
-            "pd": pd,
-            # Lambda support
-            "lambda": lambda: None,  # Placeholder, actual lambdas work in eval
-        }
+        Returns:
+            Column name -> values, in the order they are assigned
+        """
+        assignments: Dict[str, Any] = {}
 
         # Check if column exists
         is_new_column = transform.column not in df.columns
-        
+
         if is_new_column:
             # If we have an expression, this is likely creating a new column
             if transform.expression:
@@ -270,68 +274,39 @@ class CustomTransformExpressionAction(
                 if 'value' not in transform.expression and 'df' not in transform.expression:
                     # This is a constant expression - evaluate it once
                     try:
-                        result = eval(transform.expression, {"__builtins__": {}}, safe_namespace)
-                        df[transform.column] = result
+                        result = eval(
+                            compile_expression(transform.expression),
+                            RESTRICTED_GLOBALS,
+                            dict(SAFE_NAMESPACE),
+                        )
                         logger.debug(f"Set new column '{transform.column}' to constant value: {result}")
-                        return df  # Skip the apply since we already set the value
+                        return {transform.column: result}  # Skip the apply
                     except Exception as e:
                         logger.debug(f"Could not evaluate as constant: {e}")
-                
+
                 # Initialize column with None for value-dependent expressions
-                df[transform.column] = None
+                assignments[transform.column] = None
+                source = pd.Series(None, index=df.index, dtype=object)
             else:
                 logger.warning(
                     f"Column '{transform.column}' not found and no expression provided. Skipping transformation."
                 )
-                return df
+                return assignments
+        else:
+            source = df[transform.column]
 
         # Determine target column name
         target_column = transform.new_column or transform.column
 
-        def transform_value(value: Any) -> Any:
-            """Apply expression to a single value."""
-            if pd.isna(value):
-                # For null values, check if expression handles them
-                if (
-                    "if value" in transform.expression
-                    or "if not value" in transform.expression
-                ):
-                    # Expression has null handling, let it proceed
-                    pass
-                else:
-                    # No null handling in expression, return NaN
-                    return np.nan
-
-            try:
-                # Add value to namespace
-                local_namespace = {"value": value}
-                local_namespace.update(safe_namespace)
-
-                # Evaluate expression with restricted builtins for safety
-                result = eval(
-                    transform.expression, {"__builtins__": {}}, local_namespace
-                )
-                return result
-
-            except Exception:
-                if transform.on_error == "raise":
-                    raise
-                elif transform.on_error == "null":
-                    return np.nan
-                else:  # keep_original
-                    return value
-
         # Apply transformation to column
         try:
-            df[target_column] = df[transform.column].apply(transform_value)
-
-            # Drop original column if requested and it's different from target
-            if (
-                transform.drop_original
-                and transform.new_column
-                and transform.column != target_column
-            ):
-                df = df.drop(columns=[transform.column])
+            try:
+                values = evaluate_column(transform.expression, source)
+                logger.debug(f"Vectorized expression: {transform.expression[:50]}")
+            except NotVectorizable as e:
+                logger.debug(f"Evaluating per row ({e}): {transform.expression[:50]}")
+                values = evaluate_rows(transform.expression, source, transform.on_error)
+            assignments[target_column] = values
 
             logger.debug(
                 f"Transformed column '{transform.column}' -> '{target_column}' using expression: {transform.expression[:50]}..."
@@ -343,10 +318,72 @@ class CustomTransformExpressionAction(
                 raise ValueError(error_msg)
             else:
                 logger.warning(error_msg)
-                # Return DataFrame unchanged if not raising
+                # Leave the column unchanged if not raising
 
+        return assignments
+
+    @staticmethod
+    def _commit_transformation(
+        df: pd.DataFrame, transform: TransformationSpec, assignments: Dict[str, Any]
+    ) -> pd.DataFrame:
+        """Write computed assignments into ``df``."""
+        for column, values in assignments.items():
+            df[column] = values
+
+        # Drop original column if requested and it's different from target
+        target_column = transform.new_column or transform.column
+        if (
+            target_column in assignments
+            and transform.drop_original
+            and transform.new_column
+            and transform.column != target_column
+        ):
+            df = df.drop(columns=[transform.column])
         return df
 
+    async def _apply_transformation(
+        self, df: pd.DataFrame, transform: TransformationSpec
+    ) -> pd.DataFrame:
+        """Apply a single transformation to a DataFrame column using Python expression."""
+        assignments = self._compute_transformation(df, transform)
+        return self._commit_transformation(df, transform, assignments)
+
+    @staticmethod
+    def _plan_waves(
+        transformations: List[TransformationSpec], columns: Iterable[str]
+    ) -> List[List[int]]:
+        """
+        Group consecutive transformations that touch disjoint columns.
+
+        A transformation starts a new wave when it reads a column written
+        earlier in the current wave, or writes a column the wave already
+        reads or writes. Within a wave every transformation sees the same
+        input, so results equal sequential application.
+        """
+        existing = set(columns)
+        waves: List[List[int]] = []
+        current: List[int] = []
+        reads: set = set()
+        writes: set = set()
+        for i, transform in enumerate(transformations):
+            target = transform.new_column or transform.column
+            touched = {target}
+            if transform.column not in existing or transform.drop_original:
+                # The source column is created or dropped as well
+                touched.add(transform.column)
+            if current and (transform.column in writes or touched & (reads | writes)):
+                waves.append(current)
+                current, reads, writes = [], set(), set()
+            current.append(i)
+            reads.add(transform.column)
+            writes |= touched
+            existing.add(target)
+            if transform.drop_original and transform.column != target:
+                existing.discard(transform.column)
+        if current:
+            waves.append(current)
+        return waves
+
 
 # Also register with the original name expected by strategies
 @register_action("CUSTOM_TRANSFORM")
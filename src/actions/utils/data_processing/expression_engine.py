@@ -0,0 +1,483 @@
+"""
+Compiled and column-wise evaluation of CUSTOM_TRANSFORM expressions.
+
+CUSTOM_TRANSFORM expressions are written for a single cell (``value``).
+Evaluating the source string with ``eval`` for every row re-parses it and
+rebuilds the namespace per cell. This module instead:
+
+- compiles each expression once, cached by source text (``compile_expression``),
+- translates common expression shapes into pandas/NumPy column operations
+  (``evaluate_column``): string methods, slicing and ``split(...)[i]``,
+  ``str``/``int``/``float``/``len``/``abs`` conversions, NumPy ufuncs,
+  arithmetic and comparisons with constants, ``in`` tests and
+  ``a if cond else b`` chains,
+- evaluates everything else row by row with the cached code object
+  (``evaluate_rows``).
+
+The column translation is conservative: it only accepts constructs whose
+result is identical to per-row evaluation and raises ``NotVectorizable``
+otherwise, including when any row would fail. Callers then fall back to
+``evaluate_rows``, which applies the ``on_error`` policy cell by cell.
+"""
+
+import ast
+import logging
+from functools import lru_cache
+from types import CodeType
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Names available to expressions; evaluated with empty __builtins__
+SAFE_NAMESPACE = {
+    # Built-in functions
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": bool,
+    "len": len,
+    "abs": abs,
+    "round": round,
+    "min": min,
+    "max": max,
+    "sum": sum,
+    "any": any,
+    "all": all,
+    "sorted": sorted,
+    "reversed": reversed,
+    "enumerate": enumerate,
+    "zip": zip,
+    "range": range,
+    "list": list,
+    "dict": dict,
+    "set": set,
+    "tuple": tuple,
+    # String methods (for convenience)
+    "upper": str.upper,
+    "lower": str.lower,
+    "strip": str.strip,
+    "split": str.split,
+    "replace": str.replace,
+    "startswith": str.startswith,
+    "endswith": str.endswith,
+    # Modules
+    "np": np,
+    "pd": pd,
+    # Lambda support
+    "lambda": lambda: None,  # Placeholder, actual lambdas work in eval
+}
+
+RESTRICTED_GLOBALS = {"__builtins__": {}}
+
+# str methods mapped onto the pandas .str accessor
+_STR_METHODS = {
+    "upper", "lower", "strip", "lstrip", "rstrip", "title", "capitalize",
+    "swapcase", "replace", "startswith", "endswith", "isdigit", "isalpha",
+    "isalnum", "isnumeric", "isdecimal", "isspace", "islower", "isupper",
+}
+_NUMPY_UFUNCS = {"log", "log10", "log2", "log1p", "exp", "sqrt"}
+_SCALAR_TYPES = (str, int, float, bool, type(None), np.generic)
+
+
+class NotVectorizable(Exception):
+    """Expression or input cannot be evaluated column-wise with identical results."""
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(expression: str) -> CodeType:
+    """Compile an expression once per distinct source text."""
+    return compile(expression, "<transform>", "eval")
+
+
+@lru_cache(maxsize=1024)
+def _parse(expression: str) -> Optional[ast.Expression]:
+    try:
+        return ast.parse(expression, mode="eval")
+    except SyntaxError:
+        return None
+
+
+def handles_nulls(expression: str) -> bool:
+    """Whether the expression is expected to handle null values itself."""
+    return "if value" in expression or "if not value" in expression
+
+
+def _uses_value(node: ast.AST) -> bool:
+    return any(
+        isinstance(child, ast.Name) and child.id == "value" for child in ast.walk(node)
+    )
+
+
+def _kind(series: pd.Series) -> str:
+    """Classify a column for the operations it supports."""
+    kind = series.dtype.kind
+    if kind == "b":
+        return "bool"
+    if kind in "iu":
+        return "int"
+    if kind == "f":
+        return "float"
+    if kind == "O" and pd.api.types.infer_dtype(series, skipna=False) == "string":
+        return "str"
+    return "other"
+
+
+def _assemble(index: pd.Index, parts: list) -> pd.Series:
+    """Combine (mask, value) parts into one column with apply-style dtype inference."""
+    out = np.empty(len(index), dtype=object)
+    for mask, value in parts:
+        if isinstance(value, pd.Series):
+            out[mask] = value.to_numpy(dtype=object)
+        elif isinstance(value, _SCALAR_TYPES):
+            out[mask] = value
+        else:
+            raise NotVectorizable(f"non-scalar result {type(value).__name__}")
+    return pd.Series(out, index=index).infer_objects()
+
+
+class _ColumnEvaluator:
+    """Evaluate an expression AST against a column bound to ``value``."""
+
+    def evaluate(self, node: ast.AST, value: pd.Series) -> Any:
+        """Return a Series aligned with ``value`` or a constant."""
+        if not _uses_value(node):
+            return self._constant(node)
+        if isinstance(node, ast.Name):
+            return value
+        if isinstance(node, ast.IfExp):
+            return self._if_expression(node, value)
+        if isinstance(node, ast.Call):
+            return self._call(node, value)
+        if isinstance(node, ast.Subscript):
+            return self._subscript(node, value)
+        if isinstance(node, ast.BinOp):
+            return self._binary(node, value)
+        if isinstance(node, ast.Compare):
+            return self._compare(node, value)
+        if isinstance(node, ast.UnaryOp):
+            if isinstance(node.op, ast.Not):
+                return ~self.truth(node.operand, value)
+            if isinstance(node.op, ast.USub):
+                operand = self._series(node.operand, value)
+                if _kind(operand) in ("int", "float"):
+                    return -operand
+        raise NotVectorizable(ast.dump(node)[:80])
+
+    def truth(self, node: ast.AST, value: pd.Series) -> pd.Series:
+        """Boolean Series with the Python truthiness of ``node`` per row."""
+        if isinstance(node, ast.BoolOp):
+            results = [self.truth(operand, value) for operand in node.values]
+            combined = results[0]
+            for result in results[1:]:
+                combined = (combined & result) if isinstance(node.op, ast.And) else (combined | result)
+            return combined
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return ~self.truth(node.operand, value)
+
+        result = self.evaluate(node, value)
+        if not isinstance(result, pd.Series):
+            return pd.Series(bool(result), index=value.index)
+        kind = _kind(result)
+        if kind == "bool":
+            return result
+        if kind in ("int", "float"):
+            # NaN is truthy, as in Python
+            return result != 0
+        if kind == "str":
+            return result.str.len() > 0
+        raise NotVectorizable("truth value of mixed column")
+
+    def _constant(self, node: ast.AST) -> Any:
+        """Evaluate a value-independent sub-expression once."""
+        code = compile(ast.Expression(body=node), "<transform>", "eval")
+        result = eval(code, RESTRICTED_GLOBALS, dict(SAFE_NAMESPACE))
+        items = result if isinstance(result, (tuple, list, set, frozenset)) else (result,)
+        if not all(isinstance(item, _SCALAR_TYPES) for item in items):
+            raise NotVectorizable(f"unsupported constant {type(result).__name__}")
+        return result
+
+    def _series(self, node: ast.AST, value: pd.Series) -> pd.Series:
+        result = self.evaluate(node, value)
+        if not isinstance(result, pd.Series):
+            raise NotVectorizable("expected column")
+        return result
+
+    def _str_series(self, node: ast.AST, value: pd.Series) -> pd.Series:
+        result = self._series(node, value)
+        if _kind(result) != "str":
+            raise NotVectorizable("string method on non-string column")
+        return result
+
+    def _constant_args(self, node: ast.Call) -> list:
+        if node.keywords or any(_uses_value(arg) for arg in node.args):
+            raise NotVectorizable("non-constant arguments")
+        return [self._constant(arg) for arg in node.args]
+
+    def _if_expression(self, node: ast.IfExp, value: pd.Series) -> pd.Series:
+        # Each branch only sees the rows that select it, as in per-row eval
+        mask = self.truth(node.test, value).to_numpy(dtype=bool)
+        parts = []
+        for branch, branch_mask in ((node.body, mask), (node.orelse, ~mask)):
+            if branch_mask.any():
+                parts.append((branch_mask, self.evaluate(branch, value[branch_mask])))
+        return _assemble(value.index, parts)
+
+    def _call(self, node: ast.Call, value: pd.Series) -> Any:
+        func = node.func
+        if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == "np":
+            if func.attr not in _NUMPY_UFUNCS or len(node.args) != 1 or node.keywords:
+                raise NotVectorizable(f"np.{func.attr}")
+            operand = self._series(node.args[0], value)
+            if _kind(operand) not in ("int", "float"):
+                raise NotVectorizable("ufunc on non-numeric column")
+            return getattr(np, func.attr)(operand.astype(float))
+
+        if isinstance(func, ast.Attribute):
+            if func.attr not in _STR_METHODS:
+                raise NotVectorizable(f".{func.attr}()")
+            target = self._str_series(func.value, value)
+            args = self._constant_args(node)
+            if func.attr in ("startswith", "endswith"):
+                prefixes = args[0] if len(args) == 1 and isinstance(args[0], tuple) else args
+                if len(args) != 1 or not all(isinstance(p, str) for p in prefixes):
+                    raise NotVectorizable(f"{func.attr} arguments")
+                return getattr(target.str, func.attr)(args[0])
+            if not all(isinstance(arg, str) for arg in args):
+                raise NotVectorizable("non-string method arguments")
+            if func.attr == "replace":
+                if len(args) != 2 or not args[0]:
+                    raise NotVectorizable("replace arguments")
+                return target.str.replace(args[0], args[1], regex=False)
+            if func.attr in ("strip", "lstrip", "rstrip"):
+                if len(args) > 1:
+                    raise NotVectorizable("strip arguments")
+                return getattr(target.str, func.attr)(*args)
+            if args:
+                raise NotVectorizable(f".{func.attr}() arguments")
+            return getattr(target.str, func.attr)()
+
+        if isinstance(func, ast.Name) and len(node.args) == 1 and not node.keywords:
+            operand = self._series(node.args[0], value)
+            kind = _kind(operand)
+            if func.id == "str" and kind in ("str", "int"):
+                return operand if kind == "str" else operand.astype(str)
+            if func.id == "float" and kind in ("str", "int", "float"):
+                # Object -> float casts call float() per element
+                return operand.astype(float)
+            if func.id == "int":
+                if kind == "int":
+                    return operand
+                if kind == "float":
+                    if not np.isfinite(operand.to_numpy()).all():
+                        raise NotVectorizable("int() of non-finite float")
+                    return operand.astype(np.int64)
+                if kind == "str":
+                    return operand.astype(np.int64)
+            if func.id == "len" and kind == "str":
+                return operand.str.len()
+            if func.id == "abs" and kind in ("int", "float"):
+                return operand.abs()
+        raise NotVectorizable("unsupported call")
+
+    def _subscript(self, node: ast.Subscript, value: pd.Series) -> pd.Series:
+        if _uses_value(node.slice):
+            raise NotVectorizable("value-dependent index")
+        container = node.value
+        if isinstance(node.slice, ast.Slice):
+            target = self._str_series(container, value)
+            bounds = [
+                None if part is None else self._constant(part)
+                for part in (node.slice.lower, node.slice.upper, node.slice.step)
+            ]
+            if not all(bound is None or type(bound) is int for bound in bounds):
+                raise NotVectorizable("non-integer slice")
+            return target.str.slice(*bounds)
+
+        position = self._constant(node.slice)
+        if type(position) is not int:
+            raise NotVectorizable("non-integer index")
+        if (
+            isinstance(container, ast.Call)
+            and isinstance(container.func, ast.Attribute)
+            and container.func.attr == "split"
+        ):
+            target = self._str_series(container.func.value, value)
+            args = self._constant_args(container)
+            if len(args) > 1 or not all(arg is None or isinstance(arg, str) for arg in args):
+                raise NotVectorizable("split arguments")
+            separator = args[0] if args else None
+            # One pass without intermediate list columns; IndexError -> fallback
+            if separator and position == 0:
+                picked = [text.partition(separator)[0] for text in target]
+            elif separator and position == -1:
+                picked = [text.rpartition(separator)[2] for text in target]
+            elif position >= 0:
+                picked = [text.split(separator, position + 1)[position] for text in target]
+            else:
+                picked = [text.split(separator)[position] for text in target]
+            return pd.Series(picked, index=target.index, dtype=object)
+
+        result = self._str_series(container, value).str.get(position)
+        if result.isna().any():
+            # Out-of-range index: per-row evaluation raises IndexError
+            raise NotVectorizable("index out of range")
+        return result
+
+    def _binary(self, node: ast.BinOp, value: pd.Series) -> pd.Series:
+        left = self.evaluate(node.left, value)
+        right = self.evaluate(node.right, value)
+        kinds = {self._operand_kind(left), self._operand_kind(right)}
+        numeric = kinds <= {"int", "float"}
+
+        if isinstance(node.op, ast.Add) and (numeric or kinds == {"str"}):
+            return left + right
+        if isinstance(node.op, (ast.Sub, ast.Mult)) and numeric:
+            return left - right if isinstance(node.op, ast.Sub) else left * right
+        if isinstance(node.op, ast.Div) and numeric:
+            divisor = right.to_numpy() if isinstance(right, pd.Series) else np.asarray(right)
+            if (divisor == 0).any():
+                # Python raises ZeroDivisionError where NumPy returns inf
+                raise NotVectorizable("division by zero")
+            return left / right
+        raise NotVectorizable(f"{type(node.op).__name__} on {sorted(kinds)}")
+
+    def _compare(self, node: ast.Compare, value: pd.Series) -> pd.Series:
+        if len(node.ops) != 1:
+            raise NotVectorizable("chained comparison")
+        op = node.ops[0]
+        left = self.evaluate(node.left, value)
+        right = self.evaluate(node.comparators[0], value)
+
+        if isinstance(op, (ast.In, ast.NotIn)):
+            if isinstance(left, str) and isinstance(right, pd.Series) and _kind(right) == "str":
+                result = right.str.contains(left, regex=False)
+            elif isinstance(left, pd.Series) and isinstance(right, (tuple, list, set, frozenset)):
+                if _kind(left) not in ("str", "int", "float"):
+                    raise NotVectorizable("membership on mixed column")
+                result = left.isin(list(right))
+            else:
+                raise NotVectorizable("membership test")
+            return ~result if isinstance(op, ast.NotIn) else result
+
+        kinds = {self._operand_kind(left), self._operand_kind(right)}
+        if isinstance(op, (ast.Eq, ast.NotEq)):
+            if "other" in kinds:
+                raise NotVectorizable("equality on mixed column")
+            return (left == right) if isinstance(op, ast.Eq) else (left != right)
+        if isinstance(op, (ast.Lt, ast.LtE, ast.Gt, ast.GtE)):
+            if not (kinds <= {"int", "float"} or kinds == {"str"}):
+                raise NotVectorizable(f"ordering on {sorted(kinds)}")
+            if isinstance(op, ast.Lt):
+                return left < right
+            if isinstance(op, ast.LtE):
+                return left <= right
+            if isinstance(op, ast.Gt):
+                return left > right
+            return left >= right
+        raise NotVectorizable(type(op).__name__)
+
+    @staticmethod
+    def _operand_kind(operand: Any) -> str:
+        if isinstance(operand, pd.Series):
+            return _kind(operand)
+        if isinstance(operand, bool) or operand is None:
+            return "other"
+        if isinstance(operand, (int, np.integer)):
+            return "int"
+        if isinstance(operand, (float, np.floating)):
+            return "float"
+        if isinstance(operand, str):
+            return "str"
+        return "other"
+
+
+_evaluator = _ColumnEvaluator()
+
+
+def evaluate_column(expression: str, column: pd.Series) -> pd.Series:
+    """
+    Evaluate ``expression`` over a whole column at once.
+
+    Null cells yield NaN unless the expression handles nulls itself, in
+    which case columns containing nulls are left to per-row evaluation.
+
+    Args:
+        expression: Expression over ``value``
+        column: Input column
+
+    Returns:
+        Result column aligned with ``column``
+
+    Raises:
+        NotVectorizable: The expression or data needs per-row evaluation
+    """
+    tree = _parse(expression)
+    if tree is None:
+        raise NotVectorizable("syntax error")
+
+    nulls = column.isna().to_numpy(dtype=bool)
+    if nulls.any() and handles_nulls(expression):
+        raise NotVectorizable("expression handles nulls")
+
+    present = ~nulls
+    parts: list = [(nulls, np.nan)] if nulls.any() else []
+    if present.any():
+        try:
+            result = _evaluator.evaluate(tree.body, column[present])
+        except NotVectorizable:
+            raise
+        except Exception as e:
+            # Some row would fail; per-row evaluation applies on_error
+            raise NotVectorizable(f"{type(e).__name__}: {e}") from e
+        if isinstance(result, pd.Series) and not nulls.any():
+            return result
+        parts.append((present, result))
+    return _assemble(column.index, parts)
+
+
+def evaluate_rows(expression: str, column: pd.Series, on_error: str) -> pd.Series:
+    """
+    Evaluate ``expression`` cell by cell with the cached code object.
+
+    Args:
+        expression: Expression over ``value``
+        column: Input column
+        on_error: keep_original, null or raise
+
+    Returns:
+        Result column aligned with ``column``
+    """
+    try:
+        code: Optional[CodeType] = compile_expression(expression)
+        compile_error: Optional[SyntaxError] = None
+    except SyntaxError as e:
+        # Surface syntax errors per cell so on_error applies as for runtime errors
+        code, compile_error = None, e
+
+    null_safe = handles_nulls(expression)
+    # One namespace per column; only 'value' changes between cells
+    namespace = dict(SAFE_NAMESPACE)
+
+    def transform_value(value: Any) -> Any:
+        """Apply expression to a single value."""
+        if not null_safe and pd.isna(value):
+            # No null handling in expression, return NaN
+            return np.nan
+
+        try:
+            if code is None:
+                raise compile_error  # type: ignore[misc]
+            namespace["value"] = value
+            return eval(code, RESTRICTED_GLOBALS, namespace)
+        except Exception:
+            if on_error == "raise":
+                raise
+            elif on_error == "null":
+                return np.nan
+            else:  # keep_original
+                return value
+
+    return column.apply(transform_value)
@@ -7,6 +7,12 @@ import pandas as pd
 
 from actions.registry import register_action
 from actions.base import BaseStrategyAction
+from core.standards.dataset_handle import (
+    ChunkedDataset,
+    DatasetHandle,
+    as_dataframe,
+    is_tabular,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -189,6 +195,27 @@ class FilterDatasetAction(BaseStrategyAction):
                 result_mask = result_mask | mask
             return result_mask
 
+    def _filter_stream(
+        self, dataset: ChunkedDataset, params: FilterDatasetParams
+    ) -> ChunkedDataset:
+        """Add the filter as a per-chunk transform of a streamed dataset."""
+        # Validate columns up front; chunk transforms only run on consumption
+        columns = set(dataset.columns)
+        for condition in params.filter_conditions:
+            if condition.column not in columns:
+                raise ValueError(f"Column '{condition.column}' not found in dataset")
+
+        def filter_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+            mask = self.apply_multiple_conditions(
+                chunk, params.filter_conditions, params.logic_operator
+            )
+            if params.keep_or_remove == "remove":
+                mask = ~mask
+            return chunk[mask]
+
+        self.logger.info("Filtering streamed dataset chunk by chunk")
+        return dataset.map_chunks(filter_chunk)
+
     async def execute_typed(
         self,
         current_identifiers: List[str],
@@ -217,55 +244,29 @@ class FilterDatasetAction(BaseStrategyAction):
             # Get input dataset
             input_dataset = datasets_store[params.input_key]
 
-            # Convert to DataFrame if needed
-            if isinstance(input_dataset, list):
-                if not input_dataset:  # Empty list
-                    filtered_data = []
-                    input_rows = 0
-                    self.logger.info("Processing empty dataset")
-                else:
-                    df = pd.DataFrame(input_dataset)
-                    input_rows = len(df)
-                    self.logger.info(f"Processing {input_rows} rows for filtering")
-
-                    # Apply filtering conditions
-                    filter_mask = self.apply_multiple_conditions(
-                        df, params.filter_conditions, params.logic_operator
-                    )
-
-                    # Apply keep vs remove logic
-                    if params.keep_or_remove == "remove":
-                        filter_mask = ~filter_mask
-
-                    # Filter the dataset
-                    filtered_df = df[filter_mask]
-                    filtered_data = filtered_df.to_dict("records")
-
-                    self.logger.info(f"Filtered to {len(filtered_data)} rows")
-            elif isinstance(input_dataset, pd.DataFrame):
-                df = input_dataset
+            # Streams are filtered lazily, one chunk at a time
+            if isinstance(input_dataset, ChunkedDataset):
+                filtered_data = self._filter_stream(input_dataset, params)
+                input_rows = None
+            # Convert to DataFrame if needed (read-only, filtering builds a new frame)
+            elif is_tabular(input_dataset) and len(input_dataset) > 0:
+                df = as_dataframe(input_dataset, copy=False)
                 input_rows = len(df)
+                self.logger.info(f"Processing {input_rows} rows for filtering")
 
-                if input_rows == 0:  # Empty DataFrame
-                    filtered_data = []
-                    self.logger.info("Processing empty DataFrame")
-                else:
-                    self.logger.info(f"Processing {input_rows} rows for filtering")
-
-                    # Apply filtering conditions
-                    filter_mask = self.apply_multiple_conditions(
-                        df, params.filter_conditions, params.logic_operator
-                    )
+                # Apply filtering conditions
+                filter_mask = self.apply_multiple_conditions(
+                    df, params.filter_conditions, params.logic_operator
+                )
 
-                    # Apply keep vs remove logic
-                    if params.keep_or_remove == "remove":
-                        filter_mask = ~filter_mask
+                # Apply keep vs remove logic
+                if params.keep_or_remove == "remove":
+                    filter_mask = ~filter_mask
 
-                    # Filter the dataset
-                    filtered_df = df[filter_mask]
-                    filtered_data = filtered_df.to_dict("records")
+                # Filter the dataset
+                filtered_data = DatasetHandle(df[filter_mask])
 
-                    self.logger.info(f"Filtered to {len(filtered_data)} rows")
+                self.logger.info(f"Filtered to {len(filtered_data)} rows")
             else:
                 # Empty or invalid dataset
                 filtered_data = []
@@ -283,8 +284,11 @@ class FilterDatasetAction(BaseStrategyAction):
                 # Dict-style context
                 context["datasets"] = datasets_store
 
-            # Calculate statistics
-            output_rows = len(filtered_data) if filtered_data else 0
+            # Calculate statistics (unknown for streams until consumed)
+            if isinstance(filtered_data, ChunkedDataset):
+                output_rows = None
+            else:
+                output_rows = len(filtered_data) if filtered_data else 0
 
             # Create detailed message and statistics
             if params.add_filter_log:
@@ -305,6 +309,9 @@ class FilterDatasetAction(BaseStrategyAction):
                 success_msg = f"Successfully filtered dataset '{params.input_key}' to '{params.output_key}' with {output_rows} rows"
                 detailed_stats = {"output_rows": output_rows}
 
+            if isinstance(filtered_data, ChunkedDataset):
+                detailed_stats["streaming"] = True
+
             self.logger.info(success_msg)
 
             return ActionResult(
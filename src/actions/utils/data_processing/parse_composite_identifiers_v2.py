@@ -1,15 +1,40 @@
-"""Parse composite identifiers into separate rows."""
+"""Parse composite identifiers into separate rows.
+
+The identifier column is split once, column-wise: one combined separator
+regex with ``str.split`` and ``explode`` yields every component with the
+position of its row, and expansion, composite counts and statistics are
+all derived from that single parse.
+"""
 
 import logging
+import re
+from dataclasses import dataclass
 from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field
+import numpy as np
 import pandas as pd
 
 from actions.typed_base import TypedStrategyAction
 from actions.registry import register_action
+from core.standards.dataset_handle import DatasetHandle, as_dataframe
 
 logger = logging.getLogger(__name__)
 
+# Simple UniProt validation - 6-10 alphanumeric characters
+UNIPROT_COMPONENT_PATTERN = r"^[A-Z][0-9][A-Z0-9]{3,8}$"
+
+
+@dataclass
+class _ParsedIdentifiers:
+    """Identifier column split into components, aligned by row position."""
+
+    present: np.ndarray  # non-empty identifier per row
+    text: pd.Series  # str() of the present identifiers, indexed by row position
+    components: pd.Series  # final components, indexed by row position
+    raw_counts: np.ndarray  # components per row before trimming/validation
+    counts: np.ndarray  # components per row after trimming/validation
+    contains: Dict[str, np.ndarray]  # present rows containing each separator
+
 
 class ParseCompositeIdentifiersParams(BaseModel):
     """Parameters for parsing composite identifiers."""
@@ -131,7 +156,7 @@ class ParseCompositeIdentifiersAction(
                 )
 
             # Convert to DataFrame for easier processing
-            df = pd.DataFrame(input_data)
+            df = as_dataframe(input_data)
 
             # Check if field exists
             if params.id_field not in df.columns:
@@ -148,12 +173,13 @@ class ParseCompositeIdentifiersAction(
             logger.info(f"Input dataset has {len(df)} rows with columns: {list(df.columns)}")
             
             # Process the data
-            expanded_df = self._expand_composite_ids(df, params, separators)
+            parsed = self._parse_identifiers(df, params, separators)
+            expanded_df = self._expand_composite_ids(df, params, separators, parsed)
 
             # Calculate statistics
             rows_processed = len(df)
             rows_expanded = len(expanded_df)
-            composite_count = self._count_composites(df, params, separators)
+            composite_count = self._count_composites(df, params, separators, parsed)
             expansion_factor = (
                 rows_expanded / rows_processed if rows_processed > 0 else 1.0
             )
@@ -162,23 +188,20 @@ class ParseCompositeIdentifiersAction(
             logger.info(f"Found {composite_count} composite IDs, expanded to {rows_expanded} rows")
             if composite_count > 0:
                 # Show sample of composite IDs
-                composite_samples = []
-                for _, row in df.iterrows():
-                    id_val = row[params.id_field]
-                    if pd.notna(id_val) and any(sep in str(id_val) for sep in separators):
-                        composite_samples.append(str(id_val))
-                        if len(composite_samples) >= 5:
-                            break
+                with_separator = np.logical_or.reduce(list(parsed.contains.values()))
+                composite_samples = parsed.text[with_separator].head(5).tolist()
                 logger.info(f"Sample composite IDs: {composite_samples}")
             
             logger.info(f"Output dataset columns: {list(expanded_df.columns)}")
 
             # Track statistics (always track for test compatibility)
-            self._track_statistics_universal(ctx, df, expanded_df, params, composite_count, separators)
+            self._track_statistics_universal(
+                ctx, df, expanded_df, params, composite_count, separators, parsed
+            )
 
             # Store result using UniversalContext
             datasets = ctx.get_datasets()
-            datasets[output_key] = expanded_df.to_dict("records")
+            datasets[output_key] = DatasetHandle(expanded_df)
             ctx.set("datasets", datasets)
 
             logger.info(
@@ -246,70 +269,158 @@ class ParseCompositeIdentifiersAction(
         
         return separators
     
-    def _expand_composite_ids(
+    @staticmethod
+    def _separator_pattern(separators: List[str]) -> Optional["re.Pattern[str]"]:
+        """
+        One regex splitting on every separator, when that is equivalent to
+        splitting by each separator in turn.
+
+        That holds when no two separators share a character, so their
+        occurrences can never overlap; otherwise None.
+        """
+        separators = list(dict.fromkeys(separators))
+        if not all(separators):
+            return None
+        seen: set = set()
+        for separator in separators:
+            if seen & set(separator):
+                return None
+            seen |= set(separator)
+        return re.compile("|".join(map(re.escape, separators)))
+
+    def _parse_identifiers(
         self, df: pd.DataFrame, params: ParseCompositeIdentifiersParams, separators: List[str]
+    ) -> _ParsedIdentifiers:
+        """Split the identifier column once, for expansion and statistics."""
+        values = df[params.id_field].reset_index(drop=True)
+        present = (values.notna() & (values != "")).to_numpy(dtype=bool)
+        text = values[present].astype(str)
+
+        contains = {
+            separator: text.str.contains(separator, regex=False).to_numpy(dtype=bool)
+            for separator in separators
+        }
+        # Only identifiers containing a separator need splitting
+        to_split = text[np.logical_or.reduce(list(contains.values()))]
+        pattern = self._separator_pattern(separators)
+        if pattern is not None:
+            parts = to_split.str.split(pattern, regex=True)
+        else:
+            parts = to_split.map(lambda value: self._split_by_separators(value, separators))
+        components = pd.concat(
+            [parts.explode(), text.drop(to_split.index)]
+        ).sort_index(kind="stable")
+        # Empty strings are dropped before trimming, as in _split_by_separators
+        components = components[components.notna() & (components != "")]
+        raw_counts = np.bincount(components.index, minlength=len(values))
+
+        if params.trim_whitespace:
+            components = components.str.strip()
+        if params.validate_format and params.entity_type == "uniprot":
+            components = components[components.str.match(UNIPROT_COMPONENT_PATTERN)]
+        counts = np.bincount(components.index, minlength=len(values))
+        return _ParsedIdentifiers(present, text, components, raw_counts, counts, contains)
+
+    def _expand_composite_ids(
+        self,
+        df: pd.DataFrame,
+        params: ParseCompositeIdentifiersParams,
+        separators: List[str],
+        parsed: Optional[_ParsedIdentifiers] = None,
     ) -> pd.DataFrame:
         """Expand rows with composite identifiers."""
-        expanded_rows = []
-
-        for idx, row in df.iterrows():
-            id_value = row[params.id_field]
-
-            # Handle empty/null values
-            if pd.isna(id_value) or id_value == "":
-                if not params.skip_empty:
-                    expanded_rows.append(row.to_dict())
-                continue
-
-            # Parse composite IDs
-            id_str = str(id_value)
-            components = self._split_by_separators(id_str, separators)
-
-            if params.trim_whitespace:
-                components = [c.strip() for c in components]
-            
-            # Validate format if requested
-            if params.validate_format and params.entity_type == "uniprot":
-                # Simple UniProt validation - 6-10 alphanumeric characters
-                import re
-                uniprot_pattern = re.compile(r'^[A-Z][0-9][A-Z0-9]{3,8}$')
-                components = [c for c in components if uniprot_pattern.match(c)]
-                if not components:
-                    continue  # Skip if no valid components
-
-            # Create a row for each component
-            if len(components) > 1:
-                # Composite ID - expand
-                entity_weight = 1.0 / len(components) if params.track_entity_identity else 1.0
-                for component in components:
-                    row_dict = row.to_dict()
-                    row_dict[params.id_field] = component
-                    if params.preserve_original:
-                        row_dict[f"_original_{params.id_field}"] = id_str
-                    row_dict["_expansion_count"] = len(components)
-                    if params.preserve_order:
-                        row_dict["_original_index"] = idx
-                    # Track composite entity identity
-                    if params.track_entity_identity:
-                        row_dict["_composite_entity_id"] = id_str
-                        row_dict["_entity_weight"] = entity_weight
-                        row_dict["_is_composite_component"] = True
-                    expanded_rows.append(row_dict)
-            else:
-                # Single ID - keep as is
-                row_dict = row.to_dict()
-                if params.preserve_order:
-                    row_dict["_original_index"] = idx
-                if params.preserve_original and components:
-                    row_dict[f"_original_{params.id_field}"] = id_str
-                # Mark as non-composite for entity tracking
-                if params.track_entity_identity:
-                    row_dict["_composite_entity_id"] = None
-                    row_dict["_entity_weight"] = 1.0
-                    row_dict["_is_composite_component"] = False
-                expanded_rows.append(row_dict)
-
-        return pd.DataFrame(expanded_rows)
+        if parsed is None:
+            parsed = self._parse_identifiers(df, params, separators)
+        id_field = params.id_field
+        present, counts = parsed.present, parsed.counts
+
+        # Kinds of output row; empty ids are kept as they are
+        composite = present & (counts > 1)
+        if params.validate_format and params.entity_type == "uniprot":
+            # Skip if no valid components
+            single = present & (counts == 1)
+        else:
+            single = present & (counts <= 1)
+        kept_empty = ~present & (not params.skip_empty)
+
+        repeats = np.where(composite, counts, (single | kept_empty).astype(np.int64))
+        positions = np.repeat(np.arange(len(df)), repeats)
+        if not len(positions):
+            return pd.DataFrame()
+
+        expanded = df.take(positions).reset_index(drop=True)
+        out_composite = composite[positions]
+        out_single = single[positions]
+        out_present = present[positions]
+
+        new_columns: Dict[str, tuple] = {}
+        if out_composite.any():
+            ids = expanded[id_field].to_numpy(dtype=object, copy=True)
+            ids[out_composite] = parsed.components[composite[parsed.components.index]].to_numpy()
+            expanded[id_field] = ids
+
+        text = np.full(len(df), None, dtype=object)
+        text[present] = parsed.text.to_numpy(dtype=object)
+        out_text = text[positions]
+        if params.preserve_original:
+            # Singles without any component keep no original value
+            has_components = out_composite | (out_single & (counts[positions] > 0))
+            new_columns[f"_original_{id_field}"] = (out_text, has_components)
+        new_columns["_expansion_count"] = (counts[positions], out_composite)
+        if params.preserve_order:
+            new_columns["_original_index"] = (df.index.to_numpy()[positions], out_present)
+        if params.track_entity_identity:
+            new_columns["_composite_entity_id"] = (
+                np.where(out_composite, out_text, None),
+                out_present,
+            )
+            weights = 1.0 / np.maximum(counts[positions], 1)
+            new_columns["_entity_weight"] = (np.where(out_composite, weights, 1.0), out_present)
+            new_columns["_is_composite_component"] = (out_composite, out_present)
+
+        for name, (values, rows) in new_columns.items():
+            # Rows that do not set a column keep any existing value
+            existing = expanded[name] if name in expanded.columns else None
+            expanded[name] = _records_column(values, rows, existing)
+        columns = self._record_column_order(
+            df, params, out_composite, out_single, out_present, counts[positions]
+        )
+        return expanded[columns]
+
+    @staticmethod
+    def _record_column_order(
+        df: pd.DataFrame,
+        params: ParseCompositeIdentifiersParams,
+        out_composite: np.ndarray,
+        out_single: np.ndarray,
+        out_present: np.ndarray,
+        out_counts: np.ndarray,
+    ) -> List[str]:
+        """Columns in order of first appearance, as when built from row dicts."""
+        id_field = params.id_field
+        original = [f"_original_{id_field}"] if params.preserve_original else []
+        order = ["_original_index"] if params.preserve_order else []
+        tracking = (
+            ["_composite_entity_id", "_entity_weight", "_is_composite_component"]
+            if params.track_entity_identity
+            else []
+        )
+        kinds = np.select(
+            [out_composite, out_single & (out_counts > 0), out_present],
+            [0, 1, 2],
+            default=3,
+        )
+        keys_by_kind = {
+            0: original + ["_expansion_count"] + order + tracking,
+            1: order + original + tracking,
+            2: order + tracking,
+            3: [],
+        }
+        _, first_rows = np.unique(kinds, return_index=True)
+        columns = list(df.columns)
+        for kind in kinds[np.sort(first_rows)]:
+            columns.extend(key for key in keys_by_kind[int(kind)] if key not in columns)
+        return columns
 
     def _split_by_separators(self, text: str, separators: List[str]) -> List[str]:
         """Split text by multiple separators."""
@@ -327,20 +438,16 @@ class ParseCompositeIdentifiersAction(
         return [p for p in parts if p]
 
     def _count_composites(
-        self, df: pd.DataFrame, params: ParseCompositeIdentifiersParams, separators: List[str]
+        self,
+        df: pd.DataFrame,
+        params: ParseCompositeIdentifiersParams,
+        separators: List[str],
+        parsed: Optional[_ParsedIdentifiers] = None,
     ) -> int:
         """Count rows with composite identifiers."""
-        count = 0
-
-        for _, row in df.iterrows():
-            id_value = row[params.id_field]
-            if pd.notna(id_value) and id_value != "":
-                id_str = str(id_value)
-                components = self._split_by_separators(id_str, separators)
-                if len(components) > 1:
-                    count += 1
-
-        return count
+        if parsed is None:
+            parsed = self._parse_identifiers(df, params, separators)
+        return int(np.count_nonzero(parsed.raw_counts > 1))
 
     def _track_statistics_universal(
         self,
@@ -350,22 +457,20 @@ class ParseCompositeIdentifiersAction(
         params: ParseCompositeIdentifiersParams,
         composite_count: int,
         separators: List[str],
+        parsed: Optional[_ParsedIdentifiers] = None,
     ):
         """Track expansion statistics in context using UniversalContext."""
+        if parsed is None:
+            parsed = self._parse_identifiers(original_df, params, separators)
+
         # Calculate max components
-        max_components = 1
+        max_components = max(1, int(parsed.raw_counts.max(initial=0)))
+
+        # Track which separators were actually used
         patterns_used = {}
-        
-        for _, row in original_df.iterrows():
-            id_value = row[params.id_field]
-            if pd.notna(id_value) and id_value != "":
-                components = self._split_by_separators(str(id_value), separators)
-                max_components = max(max_components, len(components))
-                
-                # Track which separators were actually used
-                for sep in separators:
-                    if sep in str(id_value):
-                        patterns_used[sep] = patterns_used.get(sep, 0) + 1
+        for sep, rows in parsed.contains.items():
+            if rows.any():
+                patterns_used[sep] = int(np.count_nonzero(rows))
 
         # Store statistics using UniversalContext
         statistics = ctx.get_statistics()
@@ -414,6 +519,24 @@ class ParseCompositeIdentifiersAction(
         ctx = UniversalContext.wrap(context)
         self._track_statistics_universal(ctx, original_df, expanded_df, params, composite_count, separators)
 
+def _records_column(
+    values: np.ndarray, present: np.ndarray, existing: Optional[pd.Series] = None
+) -> pd.Series:
+    """Column with missing (or ``existing``) values where ``present`` is False.
+
+    Dtypes follow pandas' inference for row dicts lacking the key: integer
+    columns with gaps become float, boolean ones object.
+    """
+    column = pd.Series(values)
+    if present.all():
+        return column
+    column = column.where(present, existing if existing is not None else np.nan)
+    if column.dtype == object and column.isna().all():
+        # Only None/NaN: inferred as float like an absent key
+        column = column.astype(float)
+    return column
+
+
 # Export compatibility functions for testing
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
@@ -4,13 +4,13 @@ This action identifies entities that didn't get matched in a previous stage.
 """
 
 from typing import Dict, Any, Optional, List
-import pandas as pd
 import logging
 from pydantic import BaseModel, Field
 
 from actions.typed_base import TypedStrategyAction
 from actions.registry import register_action
 from core.standards.context_handler import UniversalContext
+from core.standards.dataset_handle import DatasetHandle, as_dataframe
 
 logger = logging.getLogger(__name__)
 
@@ -77,8 +77,8 @@ class FilterUnmatchedAction(TypedStrategyAction[FilterUnmatchedParams, ActionRes
                 )
             
             # Convert to DataFrame if needed
-            if isinstance(all_entities, list):
-                all_df = pd.DataFrame(all_entities)
+            if isinstance(all_entities, (list, DatasetHandle)):
+                all_df = as_dataframe(all_entities, copy=False)
             else:
                 all_df = all_entities
             
@@ -89,8 +89,8 @@ class FilterUnmatchedAction(TypedStrategyAction[FilterUnmatchedParams, ActionRes
                 unmatched_df = all_df.copy()
             else:
                 # Convert to DataFrame if needed
-                if isinstance(matched_entities, list):
-                    matched_df = pd.DataFrame(matched_entities)
+                if isinstance(matched_entities, (list, DatasetHandle)):
+                    matched_df = as_dataframe(matched_entities, copy=False)
                 else:
                     matched_df = matched_entities
                 
@@ -82,6 +82,12 @@ async def startup_event():
         )
         raise
 
+    # Load heavy action resources (models, static indices) once per process;
+    # actions still load lazily if warmup fails
+    try:
+        await app.state.mapper_service.strategy_service.warmup()
+    except Exception as e:
+        logger.warning(f"Action warmup failed: {e}")
 
 
 @app.on_event("shutdown")
@@ -89,6 +95,10 @@ async def shutdown_event():
     """Cleanup on application shutdown."""
     logger.info("API shutting down...")
 
+    mapper_service = getattr(app.state, "mapper_service", None)
+    if mapper_service is not None:
+        await mapper_service.strategy_service.close()
+
 
 
 
@@ -1,6 +1,7 @@
 """Simple v2 strategy execution routes without database dependencies."""
 
 import logging
+import re
 import uuid
 from pathlib import Path
 from typing import Any, Dict, Optional, Union
@@ -8,7 +9,9 @@ from typing import Any, Dict, Optional, Union
 from fastapi import APIRouter, BackgroundTasks, HTTPException
 from pydantic import BaseModel, Field
 
+from src.api.core.config import settings
 from src.core.minimal_strategy_service import MinimalStrategyService
+from src.core.standards.dataset_handle import DatasetHandle
 
 logger = logging.getLogger(__name__)
 
@@ -53,9 +56,12 @@ jobs: Dict[str, Dict[str, Any]] = {}
 
 
 async def run_strategy_async(
-    job_id: str, strategy_name: str, parameters: Dict[str, Any]
+    job_id: str,
+    strategy_name: str,
+    parameters: Dict[str, Any],
+    checkpoint_dir: Optional[Path] = None,
 ):
-    """Run strategy asynchronously."""
+    """Run strategy asynchronously, resuming from step checkpoints if enabled."""
     try:
         # Update job status
         jobs[job_id]["status"] = "running"
@@ -70,9 +76,16 @@ async def run_strategy_async(
         context = {"parameters": parameters} if parameters else None
         logger.debug(f"Calling execute_strategy with context: {context}")
         
-        result = await service.execute_strategy(
-            strategy_name=strategy_name, context=context
-        )
+        if checkpoint_dir is not None:
+            result = await service.execute_strategy(
+                strategy_name=strategy_name,
+                context=context,
+                checkpoint_dir=str(checkpoint_dir),
+            )
+        else:
+            result = await service.execute_strategy(
+                strategy_name=strategy_name, context=context
+            )
         
         logger.info(f"Strategy '{strategy_name}' execution completed (job_id: {job_id})")
         logger.debug(f"Result keys: {list(result.keys()) if result else 'None'}")
@@ -132,9 +145,15 @@ async def execute_strategy(
         else:
             logger.info(f"Found strategy '{strategy_name}' in loaded strategies")
 
-        # Execute in background
+        # Execute in background; checkpoints are content-addressed, so one
+        # directory per strategy lets reruns resume earlier jobs' work
+        checkpoint_dir = (
+            settings.CHECKPOINT_DIR / "strategies" / re.sub(r"[^\w-]", "_", strategy_name)
+            if request.options.checkpoint_enabled
+            else None
+        )
         background_tasks.add_task(
-            run_strategy_async, job_id, strategy_name, request.parameters
+            run_strategy_async, job_id, strategy_name, request.parameters, checkpoint_dir
         )
 
         return V2StrategyExecutionResponse(
@@ -184,7 +203,10 @@ async def get_job_results(job_id: str):
         if "datasets" in result:
             datasets_summary = {}
             for key, value in result["datasets"].items():
-                if hasattr(value, "to_dict"):
+                if isinstance(value, DatasetHandle):
+                    # Same first-rows preview as list-of-dict datasets
+                    datasets_summary[key] = value.dataframe.head(100).to_dict("records")
+                elif hasattr(value, "to_dict"):
                     # For DataFrames, just return row count
                     datasets_summary[key] = {"_row_count": len(value)}
                 elif isinstance(value, list):
@@ -0,0 +1,230 @@
+"""Process-scoped action instances and shared heavy resources.
+
+``MinimalStrategyService`` used to instantiate every action for every step of
+every run, so actions holding expensive state (Qdrant storage, FastEmbed
+models, static lookup indices) reloaded it each time. The ``ActionPool``
+keeps one instance per action class for the lifetime of the process, and
+``SharedResources`` lets actions share heavy objects across instances.
+"""
+
+import inspect
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Type,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def _call_hook(target: Any, hook_name: str) -> None:
+    """Call an optional sync or async lifecycle hook on ``target``."""
+    hook = getattr(target, hook_name, None)
+    if not callable(hook):
+        return
+    result = hook()
+    if inspect.isawaitable(result):
+        await result
+
+
+class SharedResources:
+    """Registry of heavy resources shared by all action instances.
+
+    Resources are created on first request by a factory and reused for
+    every later request with the same key. Keys should include everything
+    that makes a resource distinct (e.g. ``("qdrant", path)``).
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._resources: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Return the resource for ``key``, creating it with ``factory`` if needed.
+
+        Args:
+            key: Hashable resource key
+            factory: Zero-argument callable that builds the resource
+
+        Returns:
+            The shared resource
+        """
+        with self._lock:
+            if key in self._resources:
+                return self._resources[key]
+        # Build outside the lock: factories may be slow (model loads)
+        resource = factory()
+        with self._lock:
+            # Another thread may have won the race; keep the first one
+            return self._resources.setdefault(key, resource)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the resource for ``key`` without creating it."""
+        return self._resources.get(key, default)
+
+    def discard(self, key: Hashable) -> None:
+        """Forget a resource (e.g. after its source changed)."""
+        with self._lock:
+            self._resources.pop(key, None)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Whether a resource exists for ``key``."""
+        return key in self._resources
+
+    def __len__(self) -> int:
+        """Number of live resources."""
+        return len(self._resources)
+
+    async def close(self) -> None:
+        """Close every resource that exposes ``close()`` and clear the registry."""
+        with self._lock:
+            resources = list(self._resources.items())
+            self._resources.clear()
+        for key, resource in resources:
+            try:
+                await _call_hook(resource, "close")
+            except Exception as e:
+                logger.warning(f"Failed to close shared resource {key!r}: {e}")
+
+
+# Process-wide registry used by actions
+shared_resources = SharedResources()
+
+
+class ActionPool:
+    """Instantiate-once pool of strategy actions.
+
+    One primary instance is kept per action class. When steps run
+    concurrently, ``lease`` hands out extra instances of the same class so
+    that per-run state on ``self`` is never shared between two running
+    steps; extras are kept for reuse. Actions may define optional
+    ``warmup()`` and ``close()`` hooks (sync or async); ``warmup`` runs when
+    the pool is warmed up explicitly (e.g. at server startup) and ``close``
+    runs when the pool is closed.
+    """
+
+    _default: Optional["ActionPool"] = None
+
+    def __init__(self, resources: Optional[SharedResources] = None) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            resources: Shared resource registry closed together with the pool
+        """
+        self.resources = resources if resources is not None else shared_resources
+        self._instances: Dict[Type, Any] = {}
+        self._idle: Dict[Type, List[Any]] = {}
+        self._leased: set = set()
+        self._extras: List[Any] = []
+        self._warmed: set = set()
+
+    @classmethod
+    def default(cls) -> "ActionPool":
+        """Return the process-wide pool shared by all strategy services."""
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    def get(self, action_class: Type) -> Any:
+        """
+        Return the pooled instance of ``action_class``, creating it if needed.
+
+        Args:
+            action_class: Registered action class
+
+        Returns:
+            The shared action instance
+        """
+        instance = self._instances.get(action_class)
+        if instance is None:
+            instance = action_class()
+            self._instances[action_class] = instance
+            logger.debug(f"Instantiated pooled action {action_class.__name__}")
+        return instance
+
+    @asynccontextmanager
+    async def lease(self, action_class: Type) -> AsyncIterator[Any]:
+        """
+        Borrow an instance of ``action_class`` for the duration of one step.
+
+        The primary instance is handed out when it is free; otherwise an
+        idle extra instance is reused or a new one is created.
+
+        Args:
+            action_class: Registered action class
+
+        Yields:
+            An action instance not in use by any other step
+        """
+        primary = self.get(action_class)
+        idle = self._idle.setdefault(action_class, [])
+        if id(primary) not in self._leased:
+            instance = primary
+        elif idle:
+            instance = idle.pop()
+        else:
+            instance = action_class()
+            self._extras.append(instance)
+            logger.debug(f"Instantiated extra pooled action {action_class.__name__}")
+        self._leased.add(id(instance))
+        try:
+            yield instance
+        finally:
+            self._leased.discard(id(instance))
+            if instance is not primary and self._instances.get(action_class) is primary:
+                idle.append(instance)
+
+    async def warmup(self, action_classes: Iterable[Type]) -> None:
+        """
+        Instantiate and warm up actions ahead of the first strategy run.
+
+        Each instance's ``warmup`` hook runs at most once per pool lifetime.
+        Failures are logged and do not prevent the action from being used.
+
+        Args:
+            action_classes: Action classes to prepare
+        """
+        for action_class in action_classes:
+            if action_class in self._warmed:
+                continue
+            try:
+                await _call_hook(self.get(action_class), "warmup")
+            except Exception as e:
+                logger.warning(f"Warmup failed for {action_class.__name__}: {e}")
+            self._warmed.add(action_class)
+
+    def __contains__(self, action_class: Type) -> bool:
+        """Whether an instance of ``action_class`` is pooled."""
+        return action_class in self._instances
+
+    def __len__(self) -> int:
+        """Number of pooled instances."""
+        return len(self._instances)
+
+    async def close(self) -> None:
+        """Run ``close`` hooks, drop all instances and release shared resources."""
+        instances = list(self._instances.values()) + self._extras
+        self._instances.clear()
+        self._idle.clear()
+        self._extras = []
+        self._warmed.clear()
+        for instance in instances:
+            try:
+                await _call_hook(instance, "close")
+            except Exception as e:
+                logger.warning(
+                    f"Failed to close action {type(instance).__name__}: {e}"
+                )
+        await self.resources.close()
@@ -0,0 +1,220 @@
+"""Append-only on-disk store of embedding vectors.
+
+Embedding caches used to write one JSON file per vector, which means
+hundreds of thousands of small files and slow float parsing on every read.
+An ``EmbeddingStore`` packs all vectors of one namespace (one embedding
+model) into a single float32 file that is memory-mapped for reads::
+
+    <directory>/meta.json           {"dim": <vector length>, "generation": <n>}
+    <directory>/vectors.<n>.f32     float32 rows, appended
+    <directory>/keys.<n>.bin        16-byte text digests, one per row, appended
+
+The digest -> row index is rebuilt from the keys file on open. Writing a
+text again appends a new row and leaves the old one stale; ``compact``
+writes the live rows as the next generation and switches ``meta.json`` to
+it atomically. A crash between the two appends of a write is repaired on
+the next open by truncating both files to the shorter one.
+
+Appends are serialized by an in-process lock, so every component of a
+process should use the same instance (``EmbeddingStore.shared``); the
+files are not safe for concurrent writers in different processes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from core.infrastructure.action_pool import shared_resources
+
+logger = logging.getLogger(__name__)
+
+DIGEST_SIZE = 16
+
+
+def text_digest(text: str) -> bytes:
+    """Fixed-size key for a text."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=DIGEST_SIZE).digest()
+
+
+class EmbeddingStore:
+    """Memory-mapped float32 embedding store keyed by text."""
+
+    def __init__(self, directory: Union[str, Path]):
+        """
+        Open or create a store.
+
+        Args:
+            directory: Store directory; created if missing
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._meta_path = self.directory / "meta.json"
+        self._lock = threading.Lock()
+        self._index: Dict[bytes, int] = {}
+        self._rows = 0
+        self._mapped: Optional[np.ndarray] = None
+        self.dim: Optional[int] = None
+        self.generation = 0
+
+        if self._meta_path.exists():
+            meta = json.loads(self._meta_path.read_text())
+            self.dim = int(meta["dim"])
+            self.generation = int(meta.get("generation", 0))
+            self._open()
+
+    @classmethod
+    def shared(cls, directory: Union[str, Path]) -> "EmbeddingStore":
+        """Process-wide store instance for ``directory``."""
+        path = Path(directory).resolve()
+        return shared_resources.get_or_create(("embedding_store", str(path)), lambda: cls(path))
+
+    @classmethod
+    def for_model(cls, root: Union[str, Path], model: str) -> "EmbeddingStore":
+        """Shared store for one embedding model under ``root``."""
+        namespace = re.sub(r"[^A-Za-z0-9._-]+", "_", model).strip("_") or "default"
+        return cls.shared(Path(root) / namespace)
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.directory / f"vectors.{self.generation}.f32"
+
+    @property
+    def _keys_path(self) -> Path:
+        return self.directory / f"keys.{self.generation}.bin"
+
+    def _write_meta(self) -> None:
+        tmp = self._meta_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps({"dim": self.dim, "generation": self.generation}))
+        os.replace(tmp, self._meta_path)
+
+    def _open(self) -> None:
+        """Rebuild the index, repairing a torn append if needed."""
+        row_bytes = 4 * self.dim
+        key_rows = self._keys_path.stat().st_size // DIGEST_SIZE if self._keys_path.exists() else 0
+        vector_rows = (
+            self._vectors_path.stat().st_size // row_bytes if self._vectors_path.exists() else 0
+        )
+        rows = min(key_rows, vector_rows)
+        for path, size in ((self._keys_path, rows * DIGEST_SIZE), (self._vectors_path, rows * row_bytes)):
+            if path.exists() and path.stat().st_size != size:
+                logger.warning(f"Truncating {path} to {rows} complete rows")
+                os.truncate(path, size)
+
+        keys = self._keys_path.read_bytes() if rows else b""
+        self._index = {
+            keys[offset : offset + DIGEST_SIZE]: row
+            for row, offset in enumerate(range(0, len(keys), DIGEST_SIZE))
+        }
+        self._rows = rows
+        self._mapped = None
+
+    def _vectors(self) -> np.ndarray:
+        """Memory map covering every appended row."""
+        if self._mapped is None or len(self._mapped) < self._rows:
+            self._mapped = np.memmap(
+                self._vectors_path, dtype=np.float32, mode="r", shape=(self._rows, self.dim)
+            )
+        return self._mapped
+
+    def __len__(self) -> int:
+        """Number of distinct texts stored."""
+        return len(self._index)
+
+    def __contains__(self, text: str) -> bool:
+        return text_digest(text) in self._index
+
+    @property
+    def stale_rows(self) -> int:
+        """Rows superseded by a later write; reclaimed by ``compact``."""
+        return self._rows - len(self._index)
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """Vector for ``text`` (a read-only float32 view) or None."""
+        return self.get_many([text])[0]
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Vectors for ``texts`` in order; None where missing."""
+        digests = [text_digest(text) for text in texts]
+        with self._lock:
+            rows = [self._index.get(digest) for digest in digests]
+            if all(row is None for row in rows):
+                return [None] * len(texts)
+            vectors = self._vectors()
+        return [None if row is None else vectors[row] for row in rows]
+
+    def put(self, text: str, vector: Sequence[float]) -> None:
+        """Store one vector."""
+        self.put_many([text], [vector])
+
+    def put_many(self, texts: Sequence[str], vectors: Iterable[Sequence[float]]) -> None:
+        """
+        Append vectors for ``texts``.
+
+        Args:
+            texts: Texts the vectors were computed from
+            vectors: One vector per text, all of the store's dimension
+        """
+        if len(texts) == 0:
+            return
+        matrix = np.asarray(list(vectors), dtype=np.float32)
+        if matrix.ndim != 2 or len(matrix) != len(texts):
+            raise ValueError("put_many needs one vector per text")
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = int(matrix.shape[1])
+                self._write_meta()
+            elif matrix.shape[1] != self.dim:
+                raise ValueError(
+                    f"Vector dimension {matrix.shape[1]} does not match store dimension {self.dim}"
+                )
+
+            digests = [text_digest(text) for text in texts]
+            # Vectors before keys: a torn write leaves at most trailing
+            # vector bytes without a key, which _open truncates
+            with open(self._vectors_path, "ab") as f:
+                f.write(np.ascontiguousarray(matrix).tobytes())
+            with open(self._keys_path, "ab") as f:
+                f.write(b"".join(digests))
+
+            for offset, digest in enumerate(digests):
+                self._index[digest] = self._rows + offset
+            self._rows += len(digests)
+
+    def compact(self) -> int:
+        """
+        Rewrite the store keeping only the latest row per text.
+
+        Returns:
+            Number of stale rows removed
+        """
+        with self._lock:
+            stale = self._rows - len(self._index)
+            if stale == 0 or self.dim is None:
+                return 0
+
+            digests = list(self._index)
+            rows = np.fromiter(self._index.values(), dtype=np.int64, count=len(digests))
+            live = np.asarray(self._vectors()[rows])
+
+            old_paths = (self._vectors_path, self._keys_path)
+            self.generation += 1
+            # Readers keep using the old generation until meta.json switches
+            self._vectors_path.write_bytes(live.tobytes())
+            self._keys_path.write_bytes(b"".join(digests))
+            self._write_meta()
+            for path in old_paths:
+                path.unlink(missing_ok=True)
+
+            self._index = {digest: row for row, digest in enumerate(digests)}
+            self._rows = len(digests)
+            self._mapped = None
+            logger.info(f"Compacted embedding store {self.directory}: {stale} stale rows removed")
+            return stale
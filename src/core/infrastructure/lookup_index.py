@@ -0,0 +1,314 @@
+"""Memory-mapped string lookup tables for static reference data.
+
+Static reference indices (e.g. LIPID MAPS names) used to be JSON files of
+nested dicts that were parsed completely into Python objects before the
+first lookup. A ``LookupIndex`` stores the same content as flat arrays in a
+single binary file that is memory-mapped on open, so opening costs one
+header read regardless of size and pages are loaded on demand::
+
+    magic (8 bytes) | header length (uint64) | header JSON | arrays
+
+Arrays start on 8-byte boundaries; the header lists their offsets, dtypes
+and lengths. An index holds:
+
+- records: one row per record id with string fields (``field``),
+- tables: key -> record row maps (``lookup``), stored as sorted 64-bit key
+  hashes with the row per hash and the key bytes to verify hits.
+
+Lookups take whole columns: keys are deduplicated, hashed once each and
+resolved with one ``searchsorted`` per table.
+"""
+
+import hashlib
+import json
+import math
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b"BMLKIDX1"
+ALIGNMENT = 8
+
+
+def key_hash(key: str) -> int:
+    """64-bit hash of a key, stable across processes."""
+    return int.from_bytes(
+        hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+def _as_text(value: Any) -> str:
+    """Field value as stored: missing values become empty strings."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    return value if isinstance(value, str) else str(value)
+
+
+class StringColumn:
+    """Strings packed as UTF-8 bytes with an offsets array."""
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray):
+        self.offsets = offsets
+        self.data = data
+        self._buffer = memoryview(data)
+
+    @classmethod
+    def from_strings(cls, values: Sequence[str]) -> "StringColumn":
+        encoded = [value.encode("utf-8") for value in values]
+        total = sum(len(value) for value in encoded)
+        offsets = np.zeros(len(encoded) + 1, dtype=np.uint32 if total < 2**32 else np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        return cls(offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def raw(self, row: int) -> bytes:
+        return self._buffer[int(self.offsets[row]) : int(self.offsets[row + 1])].tobytes()
+
+    def __getitem__(self, row: int) -> str:
+        return self.raw(row).decode("utf-8")
+
+    def take(self, rows: Iterable[int]) -> List[str]:
+        """Strings at ``rows``; rows < 0 give empty strings."""
+        rows = np.asarray(list(rows) if not isinstance(rows, np.ndarray) else rows, dtype=np.int64)
+        valid = rows >= 0
+        starts = np.where(valid, self.offsets[np.where(valid, rows, 0)], 0).tolist()
+        ends = np.where(valid, self.offsets[np.where(valid, rows + 1, 0)], 0).tolist()
+        buffer = self._buffer
+        return [
+            str(buffer[start:end], "utf-8") if start != end else ""
+            for start, end in zip(starts, ends)
+        ]
+
+
+class _HashTable:
+    """Sorted key hashes with the record row and key of each entry."""
+
+    def __init__(self, hashes: np.ndarray, rows: np.ndarray, keys: StringColumn):
+        self.hashes = hashes
+        self.rows = rows
+        self.keys = keys
+
+    @classmethod
+    def build(cls, mapping: Mapping[str, int]) -> "_HashTable":
+        keys = list(mapping)
+        hashes = np.fromiter((key_hash(key) for key in keys), dtype=np.uint64, count=len(keys))
+        order = np.argsort(hashes, kind="stable")
+        rows = np.fromiter((mapping[key] for key in keys), dtype=np.int32, count=len(keys))
+        return cls(
+            hashes[order], rows[order], StringColumn.from_strings([keys[i] for i in order])
+        )
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def lookup(self, keys: Sequence[str]) -> np.ndarray:
+        """Record row per distinct key, -1 where missing."""
+        hashes = np.fromiter((key_hash(key) for key in keys), dtype=np.uint64, count=len(keys))
+        found = np.full(len(keys), -1, dtype=np.int64)
+        if not len(self.hashes):
+            return found
+        positions = np.searchsorted(self.hashes, hashes)
+        clipped = np.minimum(positions, len(self.hashes) - 1)
+        candidates = np.flatnonzero(self.hashes[clipped] == hashes)
+        stored = self.keys.take(positions[candidates])
+        # Verify the key itself; colliding hashes are adjacent after sorting
+        for i, key in zip(candidates.tolist(), stored):
+            if key == keys[i]:
+                found[i] = self.rows[positions[i]]
+                continue
+            position = positions[i] + 1
+            while position < len(self.hashes) and self.hashes[position] == hashes[i]:
+                if self.keys[position] == keys[i]:
+                    found[i] = self.rows[position]
+                    break
+                position += 1
+        return found
+
+
+class LookupIndex:
+    """Read-only key -> record tables, built in memory or memory-mapped from disk."""
+
+    def __init__(
+        self,
+        ids: StringColumn,
+        fields: Dict[str, StringColumn],
+        tables: Dict[str, _HashTable],
+        meta: Optional[Dict[str, Any]] = None,
+    ):
+        self.ids = ids
+        self.fields = fields
+        self.tables = tables
+        self.meta = meta or {}
+
+    @classmethod
+    def build(
+        cls,
+        tables: Mapping[str, Mapping[str, str]],
+        records: Mapping[str, Mapping[str, Any]],
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> "LookupIndex":
+        """
+        Build an index in memory.
+
+        Args:
+            tables: Table name -> {key: record id}
+            records: Record id -> {field: value}; ids referenced by a table
+                but missing here get empty fields
+            meta: JSON-serializable metadata saved with the index
+        """
+        ids = list(records)
+        row_of = {record_id: row for row, record_id in enumerate(ids)}
+        for mapping in tables.values():
+            for record_id in mapping.values():
+                if record_id not in row_of:
+                    row_of[record_id] = len(ids)
+                    ids.append(record_id)
+
+        field_names = list(dict.fromkeys(name for record in records.values() for name in record))
+        fields = {
+            name: StringColumn.from_strings(
+                [_as_text(records.get(record_id, {}).get(name)) for record_id in ids]
+            )
+            for name in field_names
+        }
+        hash_tables = {
+            name: _HashTable.build({key: row_of[record_id] for key, record_id in mapping.items()})
+            for name, mapping in tables.items()
+        }
+        return cls(StringColumn.from_strings(ids), fields, hash_tables, meta)
+
+    # Persistence
+    def _arrays(self) -> List[Tuple[str, np.ndarray]]:
+        arrays = [("ids.offsets", self.ids.offsets), ("ids.data", self.ids.data)]
+        for name, column in self.fields.items():
+            arrays += [(f"field.{name}.offsets", column.offsets), (f"field.{name}.data", column.data)]
+        for name, table in self.tables.items():
+            arrays += [
+                (f"table.{name}.hashes", table.hashes),
+                (f"table.{name}.rows", table.rows),
+                (f"table.{name}.keys.offsets", table.keys.offsets),
+                (f"table.{name}.keys.data", table.keys.data),
+            ]
+        return arrays
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the index as one binary file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = [(name, np.ascontiguousarray(array)) for name, array in self._arrays()]
+
+        layout: Dict[str, List[Any]] = {}
+        offset = 0
+        for name, array in arrays:
+            layout[name] = [offset, array.dtype.str, len(array)]
+            offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+        header = json.dumps(
+            {
+                "arrays": layout,
+                "fields": list(self.fields),
+                "tables": list(self.tables),
+                "meta": self.meta,
+            }
+        ).encode("utf-8")
+        header += b" " * (-len(header) % ALIGNMENT)
+
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(MAGIC)
+            f.write(np.uint64(len(header)).tobytes())
+            f.write(header)
+            for _, array in arrays:
+                f.write(array.tobytes())
+                f.write(b"\0" * (-array.nbytes % ALIGNMENT))
+        tmp.replace(path)
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> "LookupIndex":
+        """Memory-map an index written by ``save``."""
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a lookup index")
+            header_length = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+            header = json.loads(f.read(header_length))
+        base = len(MAGIC) + 8 + header_length
+        # Plain ndarray view of the map: slicing a memmap subclass is slow
+        mapped = np.memmap(path, dtype=np.uint8, mode="r").view(np.ndarray)
+
+        def array(name: str) -> np.ndarray:
+            offset, dtype, length = header["arrays"][name]
+            dtype = np.dtype(dtype)
+            start = base + offset
+            return mapped[start : start + length * dtype.itemsize].view(dtype)
+
+        def column(prefix: str) -> StringColumn:
+            return StringColumn(array(f"{prefix}.offsets"), array(f"{prefix}.data"))
+
+        return cls(
+            column("ids"),
+            {name: column(f"field.{name}") for name in header["fields"]},
+            {
+                name: _HashTable(
+                    array(f"table.{name}.hashes"),
+                    array(f"table.{name}.rows"),
+                    column(f"table.{name}.keys"),
+                )
+                for name in header["tables"]
+            },
+            header.get("meta"),
+        )
+
+    # Lookup
+    def __len__(self) -> int:
+        """Number of records."""
+        return len(self.ids)
+
+    def table_size(self, table: str) -> int:
+        return len(self.tables[table]) if table in self.tables else 0
+
+    def lookup(self, table: str, keys: Iterable[str]) -> np.ndarray:
+        """
+        Resolve a column of keys.
+
+        Returns:
+            Record row per key (-1 where missing or the table does not exist)
+        """
+        codes, distinct = pd.factorize(pd.Index(list(keys), dtype=object))
+        if table not in self.tables or not len(distinct):
+            return np.full(len(codes), -1, dtype=np.int64)
+        rows = self.tables[table].lookup(list(distinct))
+        return np.where(codes >= 0, rows[codes], -1)
+
+    def record_ids(self, rows: Iterable[int]) -> List[str]:
+        return self.ids.take(rows)
+
+    def field(self, name: str, rows: Iterable[int]) -> List[str]:
+        """Field values at ``rows`` (empty strings for unknown fields)."""
+        rows = list(rows)
+        if name not in self.fields:
+            return [""] * len(rows)
+        return self.fields[name].take(rows)
+
+
+def index_from_static_json(
+    indices: Mapping[str, Any],
+    meta: Optional[Dict[str, Any]] = None,
+    records_key: str = "lipid_data",
+) -> LookupIndex:
+    """
+    Build a lookup index from the JSON index layout.
+
+    Args:
+        indices: Name tables (key -> record id) plus the full records under
+            ``records_key`` (record id -> field dict)
+        meta: Optional metadata stored in the header
+        records_key: Entry of ``indices`` holding the records
+
+    Returns:
+        The built index
+    """
+    tables = {name: table for name, table in indices.items() if name != records_key}
+    return LookupIndex.build(tables, indices.get(records_key, {}), meta=meta)
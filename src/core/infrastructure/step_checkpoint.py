@@ -0,0 +1,321 @@
+"""Content-addressed step checkpoints for resuming strategy runs.
+
+After each step the executor snapshots the context (``datasets``,
+``statistics`` and the other top-level keys) under a key derived from the
+step's action type, resolved params, referenced input files and the key of
+the previous step. Because keys chain, a rerun can skip every step up to the
+last checkpoint whose key still matches and resume from the first step whose
+params, inputs or predecessors changed.
+
+Layout::
+
+    <directory>/steps/<step_key>.pkl   manifest: non-dataset state + dataset digests
+    <directory>/blobs/<digest>.pkl     one pickled dataset, shared between steps
+
+Datasets are stored once per content digest, so a 20-step run that only
+touches one dataset per step writes each unchanged dataset once. ``prune``
+(run by the executor after each checkpointed run) drops manifests not used
+for ``max_age`` seconds and every blob no remaining manifest references, so
+the directory does not grow without bound across runs. Files are pickles,
+so only point the store at directories the service itself owns.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, Optional, Set, Tuple, Union
+
+from core.standards.dataset_handle import DatasetHandle
+
+logger = logging.getLogger(__name__)
+
+# Context keys holding live objects that must not be snapshotted
+EXCLUDED_KEYS = frozenset({"debug_tracer"})
+
+PICKLE_PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+# Manifests not written or resumed from for this long are pruned (seconds)
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+
+
+def _stable_json(value: Any) -> str:
+    """Deterministic JSON for hashing params."""
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def _file_fingerprints(params: Any) -> Iterable[Tuple[str, int, int]]:
+    """Yield (path, size, mtime) for every param value naming an existing file."""
+    if isinstance(params, dict):
+        for value in params.values():
+            yield from _file_fingerprints(value)
+    elif isinstance(params, (list, tuple)):
+        for value in params:
+            yield from _file_fingerprints(value)
+    elif isinstance(params, str) and params and len(params) < 4096:
+        try:
+            path = Path(params)
+            if path.is_file():
+                stat = path.stat()
+                yield str(path.resolve()), stat.st_size, stat.st_mtime_ns
+        except (OSError, ValueError):
+            return
+
+
+class StepCheckpointStore:
+    """Directory-backed store of step checkpoints.
+
+    One store instance should be used per strategy run: it remembers which
+    ``DatasetHandle`` objects it has already written so unchanged datasets
+    are not re-serialized after every step.
+    """
+
+    def __init__(
+        self, directory: Union[str, Path], max_age: Optional[float] = DEFAULT_MAX_AGE
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Checkpoint root; created if missing
+            max_age: Seconds after which an unused checkpoint is pruned
+                (never if None)
+        """
+        self.directory = Path(directory)
+        self.max_age = max_age
+        self._steps_dir = self.directory / "steps"
+        self._blobs_dir = self.directory / "blobs"
+        self._steps_dir.mkdir(parents=True, exist_ok=True)
+        self._blobs_dir.mkdir(parents=True, exist_ok=True)
+        # id(handle) -> (handle, digest); the reference keeps ids unique
+        self._written: Dict[int, Tuple[DatasetHandle, str]] = {}
+
+    # Keys
+    @staticmethod
+    def run_key(strategy_name: str, input_identifiers: Optional[Iterable[str]]) -> str:
+        """
+        Root key for a run: strategy name and initial identifiers.
+
+        Strategy parameters are not part of the root key; they reach each
+        step key through its resolved params and condition, so changing one
+        parameter only invalidates the steps that use it.
+        """
+        digest = hashlib.sha256()
+        digest.update(strategy_name.encode())
+        digest.update(_stable_json(list(input_identifiers or [])).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def step_key(
+        previous_key: str,
+        step: Mapping[str, Any],
+        action_params: Any,
+        condition: Optional[str] = None,
+    ) -> str:
+        """
+        Key of the context after ``step``.
+
+        Args:
+            previous_key: Key of the preceding step (or the run key)
+            step: Step definition (name, action type)
+            action_params: Resolved action params
+            condition: Resolved step condition, if any
+
+        Returns:
+            Hex digest identifying the step's output state
+        """
+        action = step.get("action", {}) or {}
+        digest = hashlib.sha256()
+        digest.update(previous_key.encode())
+        digest.update(
+            _stable_json(
+                {
+                    "name": step.get("name"),
+                    "type": action.get("type"),
+                    "condition": condition,
+                    "params": action_params,
+                }
+            ).encode()
+        )
+        for fingerprint in sorted(_file_fingerprints(action_params)):
+            digest.update(_stable_json(fingerprint).encode())
+        return digest.hexdigest()
+
+    # Storage
+    def _manifest_path(self, key: str) -> Path:
+        return self._steps_dir / f"{key}.pkl"
+
+    def _blob_path(self, digest: str) -> Path:
+        return self._blobs_dir / f"{digest}.pkl"
+
+    @staticmethod
+    def _atomic_write(path: Path, payload: bytes) -> None:
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def _write_blob(self, value: Any) -> str:
+        """Pickle a dataset once per content digest and return the digest."""
+        if isinstance(value, DatasetHandle):
+            cached = self._written.get(id(value))
+            if cached is not None and cached[0] is value:
+                return cached[1]
+        payload = pickle.dumps(value, protocol=PICKLE_PROTOCOL)
+        digest = hashlib.sha256(payload).hexdigest()
+        path = self._blob_path(digest)
+        if not path.exists():
+            self._atomic_write(path, payload)
+        if isinstance(value, DatasetHandle):
+            self._written[id(value)] = (value, digest)
+        return digest
+
+    def has(self, key: str) -> bool:
+        """Whether a checkpoint exists for ``key``."""
+        return self._manifest_path(key).exists()
+
+    def save(self, key: str, step_name: str, context: Mapping[str, Any]) -> None:
+        """
+        Snapshot ``context`` under ``key``.
+
+        Keys whose values cannot be pickled are skipped with a debug log;
+        restoring such a checkpoint leaves those keys untouched. If a dataset
+        cannot be pickled (e.g. a ``ChunkedDataset`` stream) no checkpoint is
+        written, so a rerun resumes from an earlier step instead.
+
+        Args:
+            key: Step key from ``step_key``
+            step_name: Name of the completed step (informational)
+            context: Execution context after the step
+        """
+        datasets = context.get("datasets", {}) or {}
+        try:
+            dataset_digests = {
+                name: self._write_blob(value) for name, value in datasets.items()
+            }
+        except Exception as e:
+            logger.info(f"Not checkpointing step '{step_name}': {e}")
+            return
+
+        state: Dict[str, Any] = {}
+        for name, value in context.items():
+            if name == "datasets" or name in EXCLUDED_KEYS:
+                continue
+            try:
+                state[name] = pickle.dumps(value, protocol=PICKLE_PROTOCOL)
+            except Exception as e:
+                logger.debug(f"Not checkpointing context key '{name}': {e}")
+
+        manifest = {
+            "step": step_name,
+            "created": time.time(),
+            "datasets": dataset_digests,
+            "state": state,
+        }
+        self._atomic_write(
+            self._manifest_path(key), pickle.dumps(manifest, protocol=PICKLE_PROTOCOL)
+        )
+
+    def load(self, key: str) -> Dict[str, Any]:
+        """
+        Load the context snapshot stored under ``key``.
+
+        Args:
+            key: Step key
+
+        Returns:
+            Context mapping with ``datasets`` and the other saved keys
+        """
+        path = self._manifest_path(key)
+        with open(path, "rb") as f:
+            manifest = pickle.load(f)
+        # Resuming counts as use: keep the checkpoint from aging out
+        os.utime(path)
+
+        datasets = {}
+        for name, digest in manifest["datasets"].items():
+            with open(self._blob_path(digest), "rb") as f:
+                value = pickle.load(f)
+            if isinstance(value, DatasetHandle):
+                self._written[id(value)] = (value, digest)
+            datasets[name] = value
+
+        snapshot = {name: pickle.loads(blob) for name, blob in manifest["state"].items()}
+        snapshot["datasets"] = datasets
+        return snapshot
+
+    # Cleanup
+    def clear(self, keys: Optional[Iterable[str]] = None) -> int:
+        """
+        Remove checkpoints and the blobs only they referenced.
+
+        Args:
+            keys: Step keys to remove (every checkpoint if None)
+
+        Returns:
+            Number of blobs removed
+        """
+        paths = (
+            self._steps_dir.glob("*.pkl")
+            if keys is None
+            else (self._manifest_path(key) for key in keys)
+        )
+        for path in list(paths):
+            path.unlink(missing_ok=True)
+        return self._prune_blobs()
+
+    def prune(self) -> int:
+        """
+        Remove checkpoints unused for ``max_age`` and unreferenced blobs.
+
+        Returns:
+            Number of blobs removed
+        """
+        if self.max_age is not None:
+            cutoff = time.time() - self.max_age
+            for path in self._steps_dir.glob("*.pkl"):
+                try:
+                    if path.stat().st_mtime < cutoff:
+                        path.unlink()
+                except FileNotFoundError:
+                    continue
+        return self._prune_blobs()
+
+    def _referenced_digests(self) -> Set[str]:
+        """Blob digests referenced by the stored manifests."""
+        digests: Set[str] = set()
+        for path in self._steps_dir.glob("*.pkl"):
+            try:
+                with open(path, "rb") as f:
+                    digests.update(pickle.load(f)["datasets"].values())
+            except Exception as e:
+                logger.warning(f"Removing unreadable checkpoint {path.name}: {e}")
+                path.unlink(missing_ok=True)
+        return digests
+
+    def _prune_blobs(self) -> int:
+        """Delete blobs no manifest references."""
+        referenced = self._referenced_digests()
+        removed = 0
+        for path in self._blobs_dir.glob("*.pkl"):
+            if path.stem not in referenced:
+                path.unlink(missing_ok=True)
+                removed += 1
+        # Forget handles whose blobs are gone so they are written again
+        self._written = {
+            key: (handle, digest)
+            for key, (handle, digest) in self._written.items()
+            if digest in referenced
+        }
+        if removed:
+            logger.info(f"Pruned {removed} unreferenced checkpoint blobs")
+        return removed
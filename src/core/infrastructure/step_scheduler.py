@@ -0,0 +1,287 @@
+"""Dependency-graph scheduling of strategy steps.
+
+Steps are normally run strictly in YAML order. A strategy can opt into
+concurrent execution with an ``execution`` block::
+
+    execution:
+      parallel: true
+      max_concurrency: 4
+
+or by giving steps explicit ``depends_on`` lists. Dependencies are inferred
+from the dataset keys each step reads and writes (``input_key``,
+``output_key``, ...) and from the shared context entries its action is
+known to update in place (``progressive_stats``, ``statistics``, ...). A
+step whose keys cannot be determined is treated as a barrier: it waits for
+every earlier step and every later step waits for it.
+
+Top-level context updates taken from step results (``current_identifiers``,
+provenance, other result keys) go through an ``OrderedResultMerger`` so they
+are applied in YAML order, whichever step finishes first.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Step parameters naming datasets the step creates or overwrites
+OUTPUT_KEY_PARAMS = frozenset(
+    {
+        "output_key",
+        "output_keys",
+        "output_dataset",
+        "unmatched_key",
+        "final_unmapped_key",
+        "matched_key",
+        "output_context_key",
+    }
+)
+
+# Shared context entries (outside ``datasets``) that actions read, modify
+# and write back. Two steps touching the same entry never run concurrently,
+# so updates are not lost and are applied in YAML order.
+PROGRESSIVE_STATS = "progressive_stats"
+STATISTICS = "statistics"
+OUTPUT_FILES = "output_files"
+CURRENT_IDENTIFIERS = "current_identifiers"
+
+ACTION_CONTEXT_KEYS: Dict[str, FrozenSet[str]] = {
+    "TRACK_PROGRESSIVE_STATS": frozenset({PROGRESSIVE_STATS}),
+    "GENERATE_LLM_ANALYSIS": frozenset({PROGRESSIVE_STATS, OUTPUT_FILES}),
+    "GENERATE_MAPPING_VISUALIZATIONS": frozenset(
+        {PROGRESSIVE_STATS, STATISTICS, OUTPUT_FILES}
+    ),
+    "EXPORT_DATASET": frozenset({OUTPUT_FILES}),
+    "SYNC_TO_GOOGLE_DRIVE_V2": frozenset({OUTPUT_FILES}),
+    "SYNC_TO_GOOGLE_DRIVE_V3": frozenset({OUTPUT_FILES}),
+    "LOAD_DATASET_IDENTIFIERS": frozenset({CURRENT_IDENTIFIERS}),
+    "FILTER_DATASET": frozenset({CURRENT_IDENTIFIERS}),
+    **{
+        action_type: frozenset({STATISTICS})
+        for action_type in (
+            "MERGE_DATASETS",
+            "METABOLITE_FUZZY_STRING_MATCH",
+            "PROGRESSIVE_SEMANTIC_MATCH",
+            "METABOLITE_RAMPDB_BRIDGE",
+            "NIGHTINGALE_NMR_MATCH",
+            "HMDB_VECTOR_MATCH",
+            "METABOLITE_NIGHTINGALE_BRIDGE",
+            "LIPID_MAPS_STATIC_MATCH",
+            "LIPID_MAPS_SPARQL_MATCH",
+            "CHEMISTRY_FUZZY_TEST_MATCH",
+            "PROTEIN_HISTORICAL_RESOLUTION",
+            "PROTEIN_EXTRACT_UNIPROT_FROM_XREFS",
+            "PROTEIN_NORMALIZE_ACCESSIONS",
+            "CUSTOM_TRANSFORM_EXPRESSION",
+            "CUSTOM_TRANSFORM",
+            "PARSE_COMPOSITE_IDENTIFIERS",
+        )
+    },
+}
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+class StepDependencyError(ValueError):
+    """Raised when explicit step dependencies are invalid."""
+
+
+class OrderedResultMerger:
+    """
+    Apply per-step context merges in YAML order.
+
+    Each step commits exactly once, with its merge callable or None (skipped
+    step, empty result). A commit is applied as soon as every earlier step
+    has committed, so the context ends up as if the steps ran sequentially.
+    """
+
+    def __init__(self, steps: List[Dict[str, Any]]):
+        self._positions = {id(step): index for index, step in enumerate(steps)}
+        self._committed: Dict[int, Optional[Callable[[], None]]] = {}
+        self._next = 0
+
+    def commit(self, step: Dict[str, Any], merge: Optional[Callable[[], None]]) -> None:
+        """Queue ``step``'s merge and apply every merge that is now in order."""
+        self._committed[self._positions[id(step)]] = merge
+        while self._next in self._committed:
+            ready = self._committed.pop(self._next)
+            self._next += 1
+            if ready is not None:
+                ready()
+
+
+@dataclass
+class StepNode:
+    """A strategy step with its dataset keys, context entries and dependencies."""
+
+    index: int
+    name: str
+    step: Dict[str, Any]
+    reads: Set[str] = field(default_factory=set)
+    writes: Set[str] = field(default_factory=set)
+    context_keys: FrozenSet[str] = frozenset()
+    depends_on: Set[str] = field(default_factory=set)
+    barrier: bool = False
+
+
+def _key_values(value: Any) -> List[str]:
+    """Return dataset key names held by a parameter value."""
+    if isinstance(value, str):
+        return [value] if value and "${" not in value else []
+    if isinstance(value, (list, tuple)):
+        return [v for v in value if isinstance(v, str) and v and "${" not in v]
+    return []
+
+
+def step_dataset_keys(params: Dict[str, Any]) -> tuple[Set[str], Set[str]]:
+    """
+    Split the dataset keys referenced by step params into reads and writes.
+
+    Any parameter ending in ``_key`` or ``_keys`` (plus ``output_dataset``
+    and ``dataset_key``) names a dataset; known output parameters are
+    writes, everything else is a read.
+
+    Args:
+        params: Resolved action params
+
+    Returns:
+        Tuple of (read keys, written keys)
+    """
+    reads: Set[str] = set()
+    writes: Set[str] = set()
+    for name, value in params.items():
+        if not (
+            name.endswith("_key") or name.endswith("_keys") or name == "output_dataset"
+        ):
+            continue
+        keys = _key_values(value)
+        if name in OUTPUT_KEY_PARAMS:
+            writes.update(keys)
+        else:
+            reads.update(keys)
+    return reads, writes
+
+
+def build_step_graph(
+    steps: List[Dict[str, Any]],
+    resolve_params: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+) -> List[StepNode]:
+    """
+    Build the dependency graph for a list of strategy steps.
+
+    Explicit ``depends_on`` lists are used as given. Otherwise a step depends
+    on every earlier step it conflicts with: it reads a key the earlier step
+    writes, writes a key the earlier step reads or writes, both update the
+    same shared context entry (``ACTION_CONTEXT_KEYS``), or either of them is
+    a barrier.
+
+    Args:
+        steps: Strategy steps in YAML order
+        resolve_params: Optional callable substituting ``${...}`` placeholders
+
+    Returns:
+        Nodes in YAML order
+
+    Raises:
+        StepDependencyError: Duplicate step names, unknown or forward
+            ``depends_on`` references
+    """
+    nodes: List[StepNode] = []
+    names: Set[str] = set()
+    for index, step in enumerate(steps):
+        name = step.get("name") or f"step_{index}"
+        if name in names:
+            raise StepDependencyError(f"Duplicate step name '{name}'")
+        names.add(name)
+
+        action = step.get("action", {})
+        params = action.get("params", {}) or {}
+        if resolve_params is not None:
+            params = resolve_params(params)
+        reads, writes = step_dataset_keys(params)
+        node = StepNode(
+            index=index,
+            name=name,
+            step=step,
+            reads=reads,
+            writes=writes,
+            context_keys=ACTION_CONTEXT_KEYS.get(action.get("type"), frozenset()),
+            barrier=not (reads or writes),
+        )
+
+        explicit = step.get("depends_on")
+        if explicit is not None:
+            if isinstance(explicit, str):
+                explicit = [explicit]
+            earlier = {n.name for n in nodes}
+            for dependency in explicit:
+                if dependency not in earlier:
+                    raise StepDependencyError(
+                        f"Step '{name}' depends on unknown or later step '{dependency}'"
+                    )
+            node.depends_on = set(explicit)
+            node.barrier = False
+        else:
+            for other in nodes:
+                if (
+                    node.barrier
+                    or other.barrier
+                    or node.reads & other.writes
+                    or node.writes & (other.reads | other.writes)
+                    or node.context_keys & other.context_keys
+                ):
+                    node.depends_on.add(other.name)
+        nodes.append(node)
+    return nodes
+
+
+async def run_step_graph(
+    nodes: List[StepNode],
+    run_step: Callable[[Dict[str, Any]], Awaitable[Any]],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> None:
+    """
+    Run steps as soon as their dependencies finish, at most
+    ``max_concurrency`` at a time.
+
+    The first failing step cancels all running steps and its exception is
+    re-raised, matching sequential execution.
+
+    Args:
+        nodes: Graph from ``build_step_graph``
+        run_step: Coroutine function executing one step dict
+        max_concurrency: Maximum number of steps running at once
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    pending: Dict[str, StepNode] = {node.name: node for node in nodes}
+    done: Set[str] = set()
+    running: Dict[asyncio.Task, str] = {}
+
+    async def _run(node: StepNode) -> None:
+        async with semaphore:
+            await run_step(node.step)
+
+    try:
+        while pending or running:
+            # Start every step whose dependencies are satisfied, in YAML order
+            ready = [
+                node for node in pending.values() if node.depends_on <= done
+            ]
+            for node in ready:
+                del pending[node.name]
+                running[asyncio.create_task(_run(node))] = node.name
+
+            finished, _ = await asyncio.wait(
+                running, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in finished:
+                name = running.pop(task)
+                task.result()  # Re-raise step failure
+                done.add(name)
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
@@ -1,5 +1,6 @@
 """Minimal YAML strategy execution service."""
 import logging
+from functools import partial
 from pathlib import Path
 from typing import Dict, Any, List, Optional, cast
 import yaml
@@ -18,8 +19,17 @@ from .models.execution_context import (
     ProvenanceRecord,
 )
 from .infrastructure.parameter_resolver import ParameterResolver
+from .infrastructure.action_pool import ActionPool
+from .infrastructure.step_checkpoint import StepCheckpointStore
+from .infrastructure.step_scheduler import (
+    DEFAULT_MAX_CONCURRENCY,
+    OrderedResultMerger,
+    build_step_graph,
+    run_step_graph,
+)
 from .standards.debug_tracer import DebugTracer
 from .standards.known_issues import KnownIssuesRegistry
+from core.standards.dataset_handle import DatasetHandle
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -28,12 +38,57 @@ logger = logging.getLogger(__name__)
 class MinimalStrategyService:
     """Minimal service for executing YAML strategies."""
 
-    def __init__(self, strategies_dir: str):
-        """Initialize with strategies directory."""
+    def __init__(
+        self,
+        strategies_dir: str,
+        action_pool: Optional[ActionPool] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ):
+        """
+        Initialize with strategies directory.
+
+        Args:
+            strategies_dir: Directory containing YAML strategies
+            action_pool: Pool of action instances; defaults to the
+                process-wide pool so per-job services share loaded resources
+            max_concurrency: Default limit on concurrently running steps for
+                strategies scheduled as a dependency graph
+        """
         self.strategies_dir = Path(strategies_dir)
         self.strategies = self._load_strategies()
         self.action_registry = self._build_action_registry()
         self.parameter_resolver = ParameterResolver(base_dir=str(self.strategies_dir))
+        self.action_pool = action_pool if action_pool is not None else ActionPool.default()
+        self.max_concurrency = max_concurrency
+
+    async def warmup(self, action_types: Optional[List[str]] = None) -> None:
+        """
+        Instantiate and warm up pooled actions before the first strategy run.
+
+        Args:
+            action_types: Action names to warm up; defaults to every action
+                used by the loaded strategies
+        """
+        if action_types is None:
+            action_types = sorted(
+                {
+                    step.get("action", {}).get("type")
+                    for strategy in self.strategies.values()
+                    for step in strategy.get("steps", []) or []
+                    if isinstance(step, dict)
+                }
+                - {None}
+            )
+        action_classes = [
+            self.action_registry[name]
+            for name in action_types
+            if name in self.action_registry
+        ]
+        await self.action_pool.warmup(action_classes)
+
+    async def close(self) -> None:
+        """Close pooled actions and release shared resources."""
+        await self.action_pool.close()
 
     def _load_strategies(self) -> Dict[str, Dict[str, Any]]:
         """Load all YAML strategies from directory and subdirectories."""
@@ -125,6 +180,10 @@ class MinimalStrategyService:
     ) -> tuple[Dict[str, Any], Optional[StrategyExecutionContext]]:
         """Create both dict and Pydantic contexts for dual support.
 
+        The Pydantic context's ``custom_action_data`` is the dict context
+        itself, so both action styles read and write one shared mapping and
+        nothing has to be copied between steps.
+
         Returns:
             Tuple of (dict_context, pydantic_context)
         """
@@ -178,8 +237,10 @@ class MinimalStrategyService:
                 ontology_type=cast(Any, mapped_type),
                 step_results={},
                 provenance=cleaned_provenance,
-                custom_action_data=execution_context.copy(),
             )
+            # Plain assignment (no validate_assignment) keeps the same object
+            # instead of a validated copy
+            pydantic_context.custom_action_data = dict_context
 
             logger.debug(f"Created Pydantic context with ontology type: {mapped_type}")
             return dict_context, pydantic_context
@@ -193,75 +254,27 @@ class MinimalStrategyService:
         dict_context: Dict[str, Any],
         pydantic_context: Optional[StrategyExecutionContext],
     ):
-        """Synchronize changes between dict and Pydantic contexts."""
+        """Re-link the Pydantic context to the shared dict context.
+
+        Both contexts normally share one mapping, so this is a no-op. It only
+        does work if an action replaced ``custom_action_data`` wholesale, in
+        which case keys written to the replacement are folded back into the
+        dict context before re-linking.
+        """
         if pydantic_context is None:
             return
 
-        try:
-            # Enhanced logging for progressive_stats tracking
-            if "progressive_stats" in dict_context:
-                logger.debug(f"Progressive stats in dict_context: {dict_context.get('progressive_stats', {})}")
-            if pydantic_context and "progressive_stats" in pydantic_context.custom_action_data:
-                logger.debug(f"Progressive stats in pydantic custom_action_data: {pydantic_context.custom_action_data.get('progressive_stats', {})}")
-            
-            # Update dict from Pydantic custom_action_data
-            for key, value in pydantic_context.custom_action_data.items():
-                dict_context[key] = value
-
-            # Update Pydantic from dict (all keys except system ones)
-            system_keys = [
-                "initial_identifier",
-                "current_identifier",
-                "step_results",
-                "provenance",
-                "current_identifiers",
-                "current_ontology_type",
-            ]
-            for key, value in dict_context.items():
-                if key not in system_keys:
-                    pydantic_context.set_action_data(key, value)
-
-            # Special handling for datasets - ensure it's in both contexts
-            # Datasets can be at top level or in custom_action_data
-            dict_datasets = dict_context.get("datasets", {})
-            dict_custom_datasets = dict_context.get("custom_action_data", {}).get(
-                "datasets", {}
-            )
-            pydantic_datasets = pydantic_context.get_action_data("datasets", {})
-
-            # Merge all datasets
-            all_datasets = {}
-            all_datasets.update(dict_datasets)
-            all_datasets.update(dict_custom_datasets)
-            all_datasets.update(pydantic_datasets)
-
-            # Sync to both contexts
-            if all_datasets:
-                pydantic_context.set_action_data("datasets", all_datasets)
-                dict_context["datasets"] = all_datasets
-                if "custom_action_data" not in dict_context:
-                    dict_context["custom_action_data"] = {}
-                dict_context["custom_action_data"]["datasets"] = all_datasets
-
-            logger.debug(
-                f"Context sync completed. Dict keys: {list(dict_context.keys())}"
-            )
-            logger.debug(
-                f"Dict datasets: {list(dict_context.get('datasets', {}).keys()) if 'datasets' in dict_context else 'no datasets'}"
-            )
-            logger.debug(
-                f"Pydantic custom_action_data keys: {list(pydantic_context.custom_action_data.keys())}"
-            )
-            pydantic_datasets = pydantic_context.get_action_data("datasets", {})
-            logger.debug(
-                f"Pydantic datasets after sync: {list(pydantic_datasets.keys()) if pydantic_datasets else 'no datasets'}"
-            )
-
-        except Exception as e:
-            logger.debug(f"Context sync failed: {e}")
-            import traceback
+        custom_data = pydantic_context.custom_action_data
+        if custom_data is dict_context:
+            return
 
-            logger.debug(traceback.format_exc())
+        logger.debug("Pydantic custom_action_data was replaced; re-linking contexts")
+        for key, value in custom_data.items():
+            if key == "datasets" and isinstance(value, dict):
+                dict_context.setdefault("datasets", {}).update(value)
+            else:
+                dict_context[key] = value
+        pydantic_context.custom_action_data = dict_context
 
     def _determine_context_preference(self, action_class) -> str:
         """Determine if action prefers dict or Pydantic context.
@@ -344,133 +357,62 @@ class MinimalStrategyService:
             # Default to executing if evaluation fails (backward compatibility)
             return True
     
-    async def execute_strategy(
+    async def _execute_step(
         self,
-        strategy_name: str,
-        source_endpoint_name: str = "",
-        target_endpoint_name: str = "",
-        input_identifiers: List[str] = None,
-        context: Optional[Dict[str, Any]] = None,
-        debug_config: Optional[Dict[str, Any]] = None,
-    ) -> Dict[str, Any]:
-        """Execute a named strategy with dual context support and optional debugging.
-        
-        Args:
-            strategy_name: Name of the strategy to execute
-            source_endpoint_name: Source endpoint name
-            target_endpoint_name: Target endpoint name
-            input_identifiers: Initial identifiers to process
-            context: Optional execution context overrides
-            debug_config: Optional debug configuration with:
-                - trace_identifiers: List[str] - Identifiers to trace through pipeline
-                - save_trace: str - Path to save trace log
-                - check_known_issues: bool - Check for known issues
+        step: Dict[str, Any],
+        parameters: Dict[str, Any],
+        metadata: Dict[str, Any],
+        dict_context: Dict[str, Any],
+        pydantic_context: Optional[StrategyExecutionContext],
+        tracer: Optional[DebugTracer],
+        dummy_endpoint: Any,
+        merger: Optional[OrderedResultMerger] = None,
+    ) -> None:
+        """Execute a single strategy step and merge its results into the context.
+
+        With a ``merger`` (concurrent steps), the top-level context updates
+        from the result are applied in YAML order rather than on completion.
         """
-
-        if strategy_name not in self.strategies:
-            raise ValueError(f"Strategy '{strategy_name}' not found")
-
-        strategy = self.strategies[strategy_name]
+        step_name = step.get("name", "unnamed")
         
-        # Initialize debug tracer if configured
-        tracer = None
-        if debug_config:
-            trace_ids = debug_config.get('trace_identifiers', [])
-            if trace_ids:
-                tracer = DebugTracer(set(trace_ids))
-                logger.info(f"Debug tracing enabled for identifiers: {trace_ids}")
-            
-            # Check for known issues
-            if debug_config.get('check_known_issues', False):
-                for identifier in trace_ids:
-                    issue = KnownIssuesRegistry.check_identifier(identifier)
-                    if issue:
-                        logger.warning(f"⚠️ Known issue for {identifier}: {issue.description}")
-                        if issue.workaround:
-                            logger.info(f"💡 Workaround: {issue.workaround}")
-
-        # Merge default parameters with context overrides
-        parameters = strategy.get("parameters", {}).copy()
-        if context and "parameters" in context:
-            parameters.update(context["parameters"])
-
-        # Initialize execution context as a dict
-        execution_context = {
-            "current_identifiers": input_identifiers or [],
-            "source_endpoint_name": source_endpoint_name,
-            "target_endpoint_name": target_endpoint_name,
-            "current_ontology_type": "protein",  # Default for our MVP
-            "datasets": {},
-            "statistics": {},
-            "output_files": {},
-            "custom_action_data": {},
-            "provenance": [],
-            "debug_tracer": tracer,  # Add tracer to context
-        }
-
-        # Create dual contexts
-        dict_context, pydantic_context = self._create_dual_context(execution_context)
-
-        # Dummy endpoints for MVP
-        dummy_endpoint = type(
-            "Endpoint",
-            (),
-            {
-                "id": 1,
-                "name": "dummy",
-                "description": "Dummy endpoint for MVP",
-                "type": "file",
-            },
-        )()
-
-        logger.info(
-            f"Executing strategy '{strategy_name}' with {len(strategy.get('steps', []))} steps"
+        # Check step condition before execution
+        condition = step.get("condition")
+        if condition:
+            if not self._evaluate_condition(condition, parameters, metadata):
+                logger.info(f"Skipping step '{step_name}' - condition not met: {condition}")
+                if merger is not None:
+                    merger.commit(step, None)
+                return
+            else:
+                logger.debug(f"Step '{step_name}' condition met: {condition}")
+        
+        action_config = step.get("action", {})
+        action_type = action_config.get("type")
+        # Substitute parameters in action params
+        raw_params = action_config.get("params", {})
+        action_params = self._substitute_parameters(
+            raw_params, parameters, metadata
         )
 
-        # Get metadata from strategy config for substitution
-        metadata = strategy.get("metadata", {})
-
-        # Execute each step with smart context selection
-        for step in strategy.get("steps", []):
-            step_name = step.get("name", "unnamed")
-            
-            # Check step condition before execution
-            condition = step.get("condition")
-            if condition:
-                if not self._evaluate_condition(condition, parameters, metadata):
-                    logger.info(f"Skipping step '{step_name}' - condition not met: {condition}")
-                    continue
-                else:
-                    logger.debug(f"Step '{step_name}' condition met: {condition}")
-            
-            action_config = step.get("action", {})
-            action_type = action_config.get("type")
-            # Substitute parameters in action params
-            raw_params = action_config.get("params", {})
-            action_params = self._substitute_parameters(
-                raw_params, parameters, metadata
-            )
-
-            logger.info(f"Executing step '{step_name}' with action '{action_type}'")
-            
-            # Debug trace step start
-            if tracer:
-                for identifier in dict_context.get("current_identifiers", []):
-                    if identifier in tracer.trace_identifiers:
-                        tracer.trace(
-                            identifier,
-                            action_type,
-                            "step_start",
-                            {"step_name": step_name, "params": action_params}
-                        )
-
-            if action_type not in self.action_registry:
-                raise ValueError(f"Unknown action type: {action_type}")
+        logger.info(f"Executing step '{step_name}' with action '{action_type}'")
+        
+        # Debug trace step start
+        if tracer:
+            for identifier in dict_context.get("current_identifiers", []):
+                if identifier in tracer.trace_identifiers:
+                    tracer.trace(
+                        identifier,
+                        action_type,
+                        "step_start",
+                        {"step_name": step_name, "params": action_params}
+                    )
 
-            # Create action
-            action_class = self.action_registry[action_type]
-            action = action_class()
+        if action_type not in self.action_registry:
+            raise ValueError(f"Unknown action type: {action_type}")
 
+        # Borrow a pooled instance not used by any concurrently running step
+        action_class = self.action_registry[action_type]
+        async with self.action_pool.lease(action_class) as action:
             # Determine preferred context type
             context_preference = self._determine_context_preference(action_class)
 
@@ -481,13 +423,8 @@ class MinimalStrategyService:
                 if context_preference == "pydantic" and pydantic_context:
                     try:
                         logger.debug(f"Trying {action_type} with Pydantic context")
-                        # Ensure data is synced before execution
-                        self._sync_contexts(dict_context, pydantic_context)
-
-                        # Debug: check context contents before action
-                        datasets = pydantic_context.get_action_data("datasets", {})
                         logger.debug(
-                            f"Datasets available before {action_type}: {list(datasets.keys())}"
+                            f"Datasets available before {action_type}: {list(dict_context.get('datasets', {}).keys())}"
                         )
 
                         result_dict = await action.execute(
@@ -503,7 +440,7 @@ class MinimalStrategyService:
                         logger.debug(
                             f"Successfully executed {action_type} with Pydantic context"
                         )
-                        # Sync contexts after successful execution
+                        # O(1) unless the action replaced custom_action_data
                         self._sync_contexts(dict_context, pydantic_context)
 
                     except (ValidationError, AttributeError, TypeError) as e:
@@ -525,27 +462,16 @@ class MinimalStrategyService:
                         target_endpoint=dummy_endpoint,
                         context=dict_context,
                     )
-                    
+                
                     logger.debug(f"Result dict keys from {action_type}: {list(result_dict.keys()) if result_dict else 'None'}")
                     if result_dict and "details" in result_dict:
                         logger.debug(f"Result details keys from {action_type}: {list(result_dict['details'].keys())}")
 
-                    # Try to sync back to Pydantic if it exists
-                    if pydantic_context:
-                        try:
-                            # Update custom_action_data from dict changes
-                            for key, value in dict_context.items():
-                                if key not in [
-                                    "current_identifiers",
-                                    "current_ontology_type",
-                                ]:
-                                    pydantic_context.set_action_data(key, value)
-                        except Exception as e:
-                            logger.debug(
-                                f"Failed to sync dict changes to Pydantic: {e}"
-                            )
 
-                # Update context with results
+                # Update context with results. Datasets are merged right away
+                # (dependent steps read them); top-level entries such as
+                # current_identifiers go through the merger in YAML order.
+                merge_result = None
                 if result_dict:
                     # CRITICAL: Ensure datasets persist between steps
                     # This is the fix for context preservation issue
@@ -553,68 +479,30 @@ class MinimalStrategyService:
                         if "datasets" not in dict_context:
                             dict_context["datasets"] = {}
                         dict_context["datasets"].update(result_dict["datasets"])
-                    
+                
                     # Enhanced logging for progressive_stats tracking
                     if step.get("name", "").startswith("tag_") or "match" in step.get("name", ""):
                         # This might be a matching stage - check for data
                         datasets = dict_context.get("datasets", {})
                         for key, data in datasets.items():
                             if key in ["direct_match_tagged", "composite_match_tagged", "final_merged"]:
-                                if isinstance(data, list) and len(data) > 0:
+                                if isinstance(data, DatasetHandle) and len(data) > 0:
+                                    # Count matches on the column, no row materialization
+                                    df = data.dataframe
+                                    matched = (
+                                        int((df["confidence_score"].fillna(0) > 0).sum())
+                                        if "confidence_score" in df.columns
+                                        else 0
+                                    )
+                                    logger.info(f"Stage {step.get('name')}: Dataset '{key}' has {len(data)} items, {matched} matched")
+                                elif isinstance(data, list) and len(data) > 0:
                                     # Count matches
                                     matched = sum(1 for item in data if item.get("confidence_score", 0) > 0)
                                     logger.info(f"Stage {step.get('name')}: Dataset '{key}' has {len(data)} items, {matched} matched")
-                    
-                    # Update standard fields in dict context
-                    if "output_identifiers" in result_dict:
-                        dict_context["current_identifiers"] = result_dict[
-                            "output_identifiers"
-                        ]
-                    if "output_ontology_type" in result_dict:
-                        dict_context["current_ontology_type"] = result_dict[
-                            "output_ontology_type"
-                        ]
-
-                    # Merge provenance
-                    if "provenance" in result_dict and result_dict["provenance"]:
-                        if "provenance" not in dict_context:
-                            dict_context["provenance"] = []
-
-                        # Ensure provenance is a list
-                        if isinstance(dict_context["provenance"], list):
-                            dict_context["provenance"].extend(result_dict["provenance"])
-                        else:
-                            # Convert dict provenance to list
-                            dict_context["provenance"] = result_dict["provenance"]
-
-                        # Also add to Pydantic if available
-                        if pydantic_context:
-                            try:
-                                for prov_item in result_dict["provenance"]:
-                                    if isinstance(prov_item, dict):
-                                        prov_record = ProvenanceRecord(
-                                            source=prov_item.get("source", action_type),
-                                            timestamp=prov_item.get(
-                                                "timestamp", datetime.now()
-                                            ),
-                                            action=prov_item.get("action", action_type),
-                                            details=prov_item.get("details", {}),
-                                        )
-                                        pydantic_context.provenance.append(prov_record)
-                            except Exception as e:
-                                logger.debug(
-                                    f"Failed to sync provenance to Pydantic: {e}"
-                                )
-
-                    # Merge other result data
-                    for key, value in result_dict.items():
-                        if key not in [
-                            "output_identifiers",
-                            "output_ontology_type",
-                            "provenance",
-                        ]:
-                            dict_context[key] = value
-                    
+
+                    if "datasets" in result_dict:
+                        dict_context["datasets"] = result_dict["datasets"]
+
                     # CRITICAL FIX: Also check details for datasets
                     if "details" in result_dict and isinstance(result_dict["details"], dict):
                         if "datasets" in result_dict["details"]:
@@ -622,7 +510,7 @@ class MinimalStrategyService:
                                 dict_context["datasets"] = {}
                             dict_context["datasets"].update(result_dict["details"]["datasets"])
                             logger.debug(f"Updated datasets from action result details: {list(dict_context['datasets'].keys())}")
-                        
+                    
                         # Also merge data dict if present
                         if "data" in result_dict["details"] and isinstance(result_dict["details"]["data"], dict):
                             if "datasets" in result_dict["details"]["data"]:
@@ -631,28 +519,85 @@ class MinimalStrategyService:
                                 dict_context["datasets"].update(result_dict["details"]["data"]["datasets"])
                                 logger.debug(f"Updated datasets from action result data: {list(dict_context['datasets'].keys())}")
 
-                    logger.debug(f"Step '{step_name}' completed successfully")
-                    logger.debug(f"Context datasets after step: {list(dict_context.get('datasets', {}).keys())}")
-                    
-                    # Debug trace step completion
-                    if tracer:
-                        for identifier in dict_context.get("current_identifiers", []):
-                            if identifier in tracer.trace_identifiers:
-                                tracer.trace(
-                                    identifier,
-                                    action_type,
-                                    "step_complete",
-                                    {
-                                        "step_name": step_name,
-                                        "output_count": len(dict_context.get("current_identifiers", [])),
-                                        "datasets": list(dict_context.get("datasets", {}).keys())
-                                    }
-                                )
+                    def merge_result() -> None:
+                        # Update standard fields in dict context
+                        if "output_identifiers" in result_dict:
+                            dict_context["current_identifiers"] = result_dict[
+                                "output_identifiers"
+                            ]
+                        if "output_ontology_type" in result_dict:
+                            dict_context["current_ontology_type"] = result_dict[
+                                "output_ontology_type"
+                            ]
+
+                        # Merge provenance
+                        if "provenance" in result_dict and result_dict["provenance"]:
+                            if "provenance" not in dict_context:
+                                dict_context["provenance"] = []
+
+                            # Ensure provenance is a list
+                            if isinstance(dict_context["provenance"], list):
+                                dict_context["provenance"].extend(result_dict["provenance"])
+                            else:
+                                # Convert dict provenance to list
+                                dict_context["provenance"] = result_dict["provenance"]
+
+                            # Also add to Pydantic if available
+                            if pydantic_context:
+                                try:
+                                    for prov_item in result_dict["provenance"]:
+                                        if isinstance(prov_item, dict):
+                                            prov_record = ProvenanceRecord(
+                                                source=prov_item.get("source", action_type),
+                                                timestamp=prov_item.get(
+                                                    "timestamp", datetime.now()
+                                                ),
+                                                action=prov_item.get("action", action_type),
+                                                details=prov_item.get("details", {}),
+                                            )
+                                            pydantic_context.provenance.append(prov_record)
+                                except Exception as e:
+                                    logger.debug(
+                                        f"Failed to sync provenance to Pydantic: {e}"
+                                    )
+
+                        # Merge other result data
+                        for key, value in result_dict.items():
+                            if key not in [
+                                "output_identifiers",
+                                "output_ontology_type",
+                                "provenance",
+                                "datasets",
+                            ]:
+                                dict_context[key] = value
+
+                        logger.debug(f"Step '{step_name}' completed successfully")
+                        logger.debug(f"Context datasets after step: {list(dict_context.get('datasets', {}).keys())}")
+                
+                        # Debug trace step completion
+                        if tracer:
+                            for identifier in dict_context.get("current_identifiers", []):
+                                if identifier in tracer.trace_identifiers:
+                                    tracer.trace(
+                                        identifier,
+                                        action_type,
+                                        "step_complete",
+                                        {
+                                            "step_name": step_name,
+                                            "output_count": len(dict_context.get("current_identifiers", [])),
+                                            "datasets": list(dict_context.get("datasets", {}).keys())
+                                        }
+                                    )
+
+                if merger is not None:
+                    merger.commit(step, merge_result)
+                elif merge_result is not None:
+                    merge_result()
 
             except Exception as e:
                 logger.error(f"Action '{action_type}' failed: {str(e)}")
                 logger.error(f"Context preference was: {context_preference}")
-                
+            
                 # Debug trace step failure
                 if tracer:
                     for identifier in dict_context.get("current_identifiers", []):
@@ -665,6 +610,206 @@ class MinimalStrategyService:
                             )
                 raise
 
+    async def _run_with_checkpoints(
+        self,
+        store: StepCheckpointStore,
+        strategy_name: str,
+        steps: List[Dict[str, Any]],
+        input_identifiers: Optional[List[str]],
+        parameters: Dict[str, Any],
+        metadata: Dict[str, Any],
+        dict_context: Dict[str, Any],
+        run_step: Any,
+    ) -> None:
+        """Run steps sequentially, resuming from and writing step checkpoints."""
+        # Chain keys so each one covers its step and everything before it
+        keys = []
+        key = store.run_key(strategy_name, input_identifiers)
+        for step in steps:
+            params = self._substitute_parameters(
+                step.get("action", {}).get("params", {}), parameters, metadata
+            )
+            condition = self._substitute_parameters(
+                step.get("condition"), parameters, metadata
+            )
+            key = store.step_key(key, step, params, condition)
+            keys.append(key)
+
+        resume_from = 0
+        for index in range(len(keys) - 1, -1, -1):
+            if store.has(keys[index]):
+                try:
+                    snapshot = store.load(keys[index])
+                except Exception as e:
+                    logger.warning(f"Ignoring unreadable checkpoint {keys[index]}: {e}")
+                    continue
+                # Update in place: the Pydantic context shares this mapping
+                dict_context.update(snapshot)
+                resume_from = index + 1
+                logger.info(
+                    f"Resuming '{strategy_name}' from checkpoint after step "
+                    f"'{steps[index].get('name', index)}' ({resume_from}/{len(steps)} steps skipped)"
+                )
+                break
+
+        try:
+            for index in range(resume_from, len(steps)):
+                await run_step(steps[index])
+                try:
+                    store.save(keys[index], steps[index].get("name", "unnamed"), dict_context)
+                except Exception as e:
+                    logger.warning(f"Failed to checkpoint step {index}: {e}")
+        finally:
+            # Drop stale checkpoints and blobs no checkpoint references
+            try:
+                store.prune()
+            except Exception as e:
+                logger.warning(f"Failed to prune checkpoints: {e}")
+
+    async def execute_strategy(
+        self,
+        strategy_name: str,
+        source_endpoint_name: str = "",
+        target_endpoint_name: str = "",
+        input_identifiers: List[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+        debug_config: Optional[Dict[str, Any]] = None,
+        checkpoint_dir: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Execute a named strategy with dual context support and optional debugging.
+
+        Steps run in YAML order unless the strategy sets ``execution.parallel``
+        or uses ``depends_on``; then independent steps run concurrently (see
+        ``core.infrastructure.step_scheduler``).
+        
+        Args:
+            strategy_name: Name of the strategy to execute
+            source_endpoint_name: Source endpoint name
+            target_endpoint_name: Target endpoint name
+            input_identifiers: Initial identifiers to process
+            context: Optional execution context overrides
+            debug_config: Optional debug configuration with:
+                - trace_identifiers: List[str] - Identifiers to trace through pipeline
+                - save_trace: str - Path to save trace log
+                - check_known_issues: bool - Check for known issues
+            checkpoint_dir: Optional directory for step checkpoints. Completed
+                steps are snapshotted there, and a rerun with unchanged
+                params and inputs resumes after the last matching step.
+        """
+
+        if strategy_name not in self.strategies:
+            raise ValueError(f"Strategy '{strategy_name}' not found")
+
+        strategy = self.strategies[strategy_name]
+        
+        # Initialize debug tracer if configured
+        tracer = None
+        if debug_config:
+            trace_ids = debug_config.get('trace_identifiers', [])
+            if trace_ids:
+                tracer = DebugTracer(set(trace_ids))
+                logger.info(f"Debug tracing enabled for identifiers: {trace_ids}")
+            
+            # Check for known issues
+            if debug_config.get('check_known_issues', False):
+                for identifier in trace_ids:
+                    issue = KnownIssuesRegistry.check_identifier(identifier)
+                    if issue:
+                        logger.warning(f"⚠️ Known issue for {identifier}: {issue.description}")
+                        if issue.workaround:
+                            logger.info(f"💡 Workaround: {issue.workaround}")
+
+        # Merge default parameters with context overrides
+        parameters = strategy.get("parameters", {}).copy()
+        if context and "parameters" in context:
+            parameters.update(context["parameters"])
+
+        # Initialize execution context as a dict
+        execution_context = {
+            "current_identifiers": input_identifiers or [],
+            "source_endpoint_name": source_endpoint_name,
+            "target_endpoint_name": target_endpoint_name,
+            "current_ontology_type": "protein",  # Default for our MVP
+            "datasets": {},
+            "statistics": {},
+            "output_files": {},
+            "custom_action_data": {},
+            "provenance": [],
+            "debug_tracer": tracer,  # Add tracer to context
+        }
+
+        # Create dual contexts
+        dict_context, pydantic_context = self._create_dual_context(execution_context)
+
+        # Dummy endpoints for MVP
+        dummy_endpoint = type(
+            "Endpoint",
+            (),
+            {
+                "id": 1,
+                "name": "dummy",
+                "description": "Dummy endpoint for MVP",
+                "type": "file",
+            },
+        )()
+
+        logger.info(
+            f"Executing strategy '{strategy_name}' with {len(strategy.get('steps', []))} steps"
+        )
+
+        # Get metadata from strategy config for substitution
+        metadata = strategy.get("metadata", {})
+
+        # Execute each step with smart context selection
+        steps = strategy.get("steps", [])
+        execution = strategy.get("execution", {}) or {}
+        # Explicit depends_on opts into graph scheduling unless disabled
+        parallel = execution.get("parallel", any("depends_on" in s for s in steps))
+        run_step = partial(
+            self._execute_step,
+            parameters=parameters,
+            metadata=metadata,
+            dict_context=dict_context,
+            pydantic_context=pydantic_context,
+            tracer=tracer,
+            dummy_endpoint=dummy_endpoint,
+            merger=OrderedResultMerger(steps) if parallel else None,
+        )
+
+        if parallel:
+            # Run independent steps concurrently
+            nodes = build_step_graph(
+                steps,
+                resolve_params=lambda p: self._substitute_parameters(
+                    p, parameters, metadata
+                ),
+            )
+            max_concurrency = execution.get("max_concurrency", self.max_concurrency)
+            logger.info(
+                f"Scheduling {len(nodes)} steps as a dependency graph "
+                f"(max_concurrency={max_concurrency})"
+            )
+            if checkpoint_dir:
+                logger.warning(
+                    "Step checkpoints are only supported for sequential strategies; "
+                    "ignoring checkpoint_dir"
+                )
+            await run_step_graph(nodes, run_step, max_concurrency=max_concurrency)
+        elif checkpoint_dir:
+            await self._run_with_checkpoints(
+                StepCheckpointStore(checkpoint_dir),
+                strategy_name,
+                steps,
+                input_identifiers,
+                parameters,
+                metadata,
+                dict_context,
+                run_step,
+            )
+        else:
+            for step in steps:
+                await run_step(step)
+
         logger.info(f"Strategy '{strategy_name}' completed successfully")
         
         # Save debug trace if configured
@@ -8,6 +8,14 @@ from .base_models import (
 )
 from .file_loader import BiologicalFileLoader
 from .context_handler import UniversalContext
+from .dataset_handle import (
+    ChunkedDataset,
+    DatasetHandle,
+    as_dataframe,
+    as_dataset_handle,
+    is_empty,
+)
+from .id_set import IdVocabulary, InternedIdSet
 from .api_validator import APIMethodValidator
 
 __all__ = [
@@ -18,5 +26,12 @@ __all__ = [
     'FlexibleBaseModel',
     'BiologicalFileLoader',
     'UniversalContext',
+    'DatasetHandle',
+    'as_dataframe',
+    'as_dataset_handle',
+    'is_empty',
+    'ChunkedDataset',
+    'IdVocabulary',
+    'InternedIdSet',
     'APIMethodValidator',
 ]
\ No newline at end of file
@@ -0,0 +1,312 @@
+"""Columnar dataset handle for passing tabular data between strategy steps.
+
+Actions historically stored ``context["datasets"][key]`` as
+``df.to_dict("records")`` and the next action rebuilt a DataFrame from that
+list. ``DatasetHandle`` keeps the DataFrame itself in the context and only
+builds the list-of-dict view when a legacy action actually iterates rows.
+"""
+
+import logging
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+
+# Optional dependency for Arrow interop
+try:
+    import pyarrow as pa
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+logger = logging.getLogger(__name__)
+
+
+class DatasetHandle(Sequence):
+    """Pandas-backed dataset with a lazy list-of-dict view.
+
+    The wrapped DataFrame always has a default ``RangeIndex`` and is treated
+    as immutable: columnar consumers read it through ``as_dataframe`` and
+    store a new handle for their output. Legacy
+    consumers can keep using the handle like the old list of records
+    (``len``, indexing, iteration, ``==`` against a list); the records are
+    materialized once on first row access and cached.
+    """
+
+    __slots__ = ("_df", "_records")
+
+    def __init__(
+        self,
+        data: Union[pd.DataFrame, List[Dict[str, Any]], "DatasetHandle", None] = None,
+    ):
+        """
+        Wrap tabular data.
+
+        Args:
+            data: DataFrame (wrapped without copying), list of records, or
+                another handle (shares its DataFrame)
+        """
+        if isinstance(data, DatasetHandle):
+            df = data._df
+        elif isinstance(data, pd.DataFrame):
+            # Records never carried the index; keep positional row access
+            # identical to a DataFrame rebuilt from records.
+            if data.index.equals(pd.RangeIndex(len(data))):
+                df = data
+            else:
+                df = data.reset_index(drop=True)
+        elif data is None:
+            df = pd.DataFrame()
+        else:
+            df = pd.DataFrame(list(data))
+        self._df: pd.DataFrame = df
+        self._records: Optional[List[Dict[str, Any]]] = None
+
+    # Columnar access
+    @property
+    def dataframe(self) -> pd.DataFrame:
+        """The underlying DataFrame (shared, do not mutate in place)."""
+        return self._df
+
+    @property
+    def columns(self) -> List[str]:
+        """Column names of the dataset."""
+        return list(self._df.columns)
+
+    @property
+    def shape(self) -> tuple:
+        """Shape of the underlying DataFrame."""
+        return self._df.shape
+
+    @property
+    def empty(self) -> bool:
+        """Whether the dataset has no rows."""
+        return len(self._df) == 0
+
+    def to_dataframe(self, copy: bool = True) -> pd.DataFrame:
+        """
+        Return the dataset as a DataFrame.
+
+        Args:
+            copy: Return a copy that the caller may modify freely
+
+        Returns:
+            DataFrame view or copy of the dataset
+        """
+        return self._df.copy() if copy else self._df
+
+    def to_arrow(self) -> Any:
+        """Return the dataset as a ``pyarrow.Table`` (requires pyarrow)."""
+        if not HAS_PYARROW:
+            raise ImportError("pyarrow is required for DatasetHandle.to_arrow()")
+        return pa.Table.from_pandas(self._df, preserve_index=False)
+
+    def column(self, name: str) -> pd.Series:
+        """Return a single column as a Series."""
+        return self._df[name]
+
+    # Legacy list-of-dict view
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Return the rows as a list of dicts (cached after first call)."""
+        if self._records is None:
+            self._records = self._df.to_dict("records")
+        return self._records
+
+    def to_dict(self, orient: str = "records") -> Any:
+        """DataFrame-compatible ``to_dict``; ``records`` uses the cached view."""
+        if orient == "records":
+            return self.to_records()
+        return self._df.to_dict(orient)
+
+    def __len__(self) -> int:
+        """Number of rows."""
+        return len(self._df)
+
+    def __getitem__(self, index: Any) -> Any:
+        """Row (as dict) or slice of rows (as list of dicts)."""
+        return self.to_records()[index]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Iterate rows as dicts."""
+        return iter(self.to_records())
+
+    def __eq__(self, other: object) -> bool:
+        """Compare against another handle, a DataFrame or a list of records."""
+        if isinstance(other, DatasetHandle):
+            return self._df.equals(other._df)
+        if isinstance(other, pd.DataFrame):
+            return self._df.equals(other)
+        if isinstance(other, list):
+            return self.to_records() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __reduce__(self) -> tuple:
+        """Pickle only the DataFrame, not the cached records view."""
+        return (DatasetHandle, (self._df,))
+
+    def copy(self) -> "DatasetHandle":
+        """Return a handle over a copy of the DataFrame."""
+        return DatasetHandle(self._df.copy())
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"DatasetHandle(rows={len(self._df)}, columns={self.columns})"
+
+
+class ChunkedDataset:
+    """Lazily evaluated dataset processed one DataFrame chunk at a time.
+
+    Produced by LOAD_DATASET_IDENTIFIERS in streaming mode (``chunk_size``).
+    Chunk-aware actions add per-chunk transforms with ``map_chunks`` instead
+    of materializing the data, and sinks such as EXPORT_DATASET iterate
+    ``iter_chunks`` so peak memory stays at roughly one chunk. Each
+    iteration re-reads the source, so transforms must be pure functions of
+    their chunk. A transform may define ``reset()``, called at the start of
+    every pass (e.g. to zero per-pass statistics).
+
+    Column names are known without a pass: the loader passes them from its
+    header read, and transforms keep them unless ``map_chunks`` is told
+    otherwise. Consumers that need the whole table call ``as_dataframe``,
+    which concatenates all chunks; ``is_empty`` checks for rows without a
+    full pass.
+    """
+
+    __slots__ = ("_source", "_transforms", "_columns")
+
+    def __init__(
+        self,
+        source: Callable[[], Iterable[pd.DataFrame]],
+        transforms: Tuple[Callable[[pd.DataFrame], pd.DataFrame], ...] = (),
+        columns: Optional[Sequence[str]] = None,
+    ):
+        """
+        Wrap a chunk source.
+
+        Args:
+            source: Zero-argument callable returning a fresh chunk iterator
+            transforms: Per-chunk transforms applied in order
+            columns: Column names of the transformed chunks, if known
+                (otherwise taken from the first source chunk on first use)
+        """
+        self._source = source
+        self._transforms = tuple(transforms)
+        self._columns: Optional[List[str]] = list(columns) if columns is not None else None
+
+    def map_chunks(
+        self,
+        transform: Callable[[pd.DataFrame], pd.DataFrame],
+        columns: Optional[Sequence[str]] = None,
+    ) -> "ChunkedDataset":
+        """
+        Return a new stream with ``transform`` applied to every chunk.
+
+        Args:
+            transform: Per-chunk transform
+            columns: Column names after ``transform`` if it changes them;
+                by default the stream keeps this stream's columns
+        """
+        return ChunkedDataset(
+            self._source,
+            self._transforms + (transform,),
+            columns=columns if columns is not None else self._columns,
+        )
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """Read the source and yield transformed chunks."""
+        for transform in self._transforms:
+            reset = getattr(transform, "reset", None)
+            if callable(reset):
+                reset()
+        for chunk in self._source():
+            for transform in self._transforms:
+                chunk = transform(chunk)
+            yield chunk
+
+    @property
+    def columns(self) -> List[str]:
+        """Column names; without known names, those of the first source chunk.
+
+        Transforms are not run (nor reset) for this, so looking up columns
+        never disturbs a pass in progress or its statistics.
+        """
+        if self._columns is None:
+            first = next(iter(self._source()), None)
+            self._columns = list(first.columns) if first is not None else []
+        return self._columns
+
+    def is_empty(self) -> bool:
+        """Whether the stream yields no rows; reads up to the first non-empty chunk."""
+        return not any(len(chunk) for chunk in self.iter_chunks())
+
+    def to_dataframe(self, copy: bool = True) -> pd.DataFrame:
+        """Materialize all chunks into one DataFrame."""
+        chunks = list(self.iter_chunks())
+        if not chunks:
+            return pd.DataFrame()
+        return pd.concat(chunks, ignore_index=True)
+
+    def count_rows(self) -> int:
+        """Number of rows after transforms (one full pass)."""
+        return sum(len(chunk) for chunk in self.iter_chunks())
+
+    def __len__(self) -> int:
+        """Row count for legacy ``len()`` checks; costs a full pass (see ``is_empty``)."""
+        return self.count_rows()
+
+    def __bool__(self) -> bool:
+        """Streams are truthy without counting rows."""
+        return True
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"ChunkedDataset(transforms={len(self._transforms)})"
+
+
+def as_dataframe(data: Any, copy: bool = True) -> pd.DataFrame:
+    """
+    Convert any stored dataset representation to a DataFrame.
+
+    Args:
+        data: DatasetHandle, ChunkedDataset, DataFrame, list of records, or
+            ``{"data": [...]}``
+        copy: Return a frame the caller may modify without touching the
+            stored dataset. Read-only consumers pass ``False`` to avoid the copy.
+
+    Returns:
+        DataFrame with the dataset contents
+    """
+    if isinstance(data, DatasetHandle):
+        return data.to_dataframe(copy=copy)
+    if isinstance(data, ChunkedDataset):
+        logger.info("Materializing chunked dataset into a single DataFrame")
+        return data.to_dataframe()
+    if isinstance(data, pd.DataFrame):
+        return data.copy() if copy else data
+    if isinstance(data, dict) and "data" in data:
+        return pd.DataFrame(data["data"])
+    if data is None:
+        return pd.DataFrame()
+    return pd.DataFrame(data)
+
+
+def as_dataset_handle(data: Any) -> DatasetHandle:
+    """Wrap a DataFrame or list of records in a DatasetHandle (no-op for handles)."""
+    if isinstance(data, DatasetHandle):
+        return data
+    if isinstance(data, ChunkedDataset):
+        return DatasetHandle(data.to_dataframe())
+    return DatasetHandle(data)
+
+
+def is_tabular(data: Any) -> bool:
+    """Whether ``data`` is a dataset representation ``as_dataframe`` understands."""
+    return isinstance(data, (DatasetHandle, ChunkedDataset, pd.DataFrame, list))
+
+
+def is_empty(data: Any) -> bool:
+    """Whether a tabular dataset has no rows, without a full pass over streams."""
+    if isinstance(data, ChunkedDataset):
+        return data.is_empty()
+    return len(data) == 0
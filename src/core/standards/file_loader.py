@@ -1,9 +1,15 @@
 """Robust file loader for biological data formats."""
 
+import hashlib
+import json
 import logging
+import os
+import tempfile
+import threading
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import Optional, Iterator
+from typing import Any, Dict, Optional, Iterator
 import csv
 
 # Optional dependency for encoding detection
@@ -14,9 +20,48 @@ except ImportError:
     HAS_CHARDET = False
     logging.warning("chardet not installed. Encoding detection will use fallback method.")
 
+# Optional dependency for the memory-mapped Feather frame cache
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
 logger = logging.getLogger(__name__)
 
 
+def _user_cache_dir() -> Path:
+    """Per-user cache root (``$XDG_CACHE_HOME/biomapper`` or ``~/.cache/biomapper``)."""
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "biomapper"
+
+
+def _private_dir(path: Path) -> bool:
+    """
+    Create ``path`` readable only by the current user, or check an existing one.
+
+    Cached frames are loaded without re-parsing their source, so a directory
+    other users can write to (or that belongs to someone else) is refused.
+
+    Returns:
+        Whether the directory can be used
+    """
+    try:
+        path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        stat = path.stat()
+        if hasattr(os, "getuid"):
+            if stat.st_uid != os.getuid():
+                logger.warning(f"Not using cache directory {path}: owned by another user")
+                return False
+            if stat.st_mode & 0o077:
+                path.chmod(0o700)
+        return True
+    except OSError as e:
+        logger.debug(f"Cache directory {path} unavailable: {e}")
+        return False
+
+
 class BiologicalFileLoader:
     """Standardized loader for biological data files with robust defaults."""
     
@@ -31,6 +76,144 @@ class BiologicalFileLoader:
     
     # Common comment characters in biological files
     COMMENT_CHARS = ['#', '!', '//', '/*', '--']
+
+    # Persistent cache of sniff results keyed by path, size and mtime.
+    # Set to None to keep the cache in memory only.
+    SNIFF_CACHE_PATH: Optional[Path] = Path(
+        os.getenv("BIOMAPPER_SNIFF_CACHE") or _user_cache_dir() / "file_sniff.json"
+    )
+
+    # Optional sidecar next to a data file (e.g. ``hmdb.tsv.schema.json``)
+    # with any of "encoding", "delimiter" and "comment"; its values are used
+    # as-is and never re-detected.
+    SIDECAR_SUFFIX = ".schema.json"
+
+    # Feather cache of parsed files used by ``auto_load`` (requires pyarrow),
+    # in a directory private to the user. Set to None to disable. Files
+    # smaller than FRAME_CACHE_MIN_BYTES parse faster than the cache
+    # bookkeeping costs and are never cached.
+    FRAME_CACHE_DIR: Optional[Path] = Path(
+        os.getenv("BIOMAPPER_FRAME_CACHE") or _user_cache_dir() / "frames"
+    )
+    FRAME_CACHE_MIN_BYTES = 1_000_000
+
+    _sniff_cache: Optional[Dict[str, Dict[str, Any]]] = None
+    _sniff_lock = threading.Lock()
+
+    @classmethod
+    def _read_sidecar(cls, path: Path) -> Dict[str, Any]:
+        """Read the sidecar schema for ``path``, if one exists."""
+        sidecar = path.with_name(path.name + cls.SIDECAR_SUFFIX)
+        if not sidecar.is_file():
+            return {}
+        try:
+            with open(sidecar, 'r', encoding='utf-8') as f:
+                schema = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable sidecar schema {sidecar}: {e}")
+            return {}
+        return {
+            key: schema[key]
+            for key in ('encoding', 'delimiter', 'comment')
+            if key in schema
+        }
+
+    @classmethod
+    def _load_sniff_cache(cls) -> Dict[str, Dict[str, Any]]:
+        """Return the sniff cache, reading the persisted copy on first use."""
+        if cls._sniff_cache is None:
+            cache: Dict[str, Dict[str, Any]] = {}
+            if cls.SNIFF_CACHE_PATH and cls.SNIFF_CACHE_PATH.is_file():
+                try:
+                    with open(cls.SNIFF_CACHE_PATH, 'r', encoding='utf-8') as f:
+                        cache = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Discarding unreadable sniff cache: {e}")
+            cls._sniff_cache = cache
+        return cls._sniff_cache
+
+    @classmethod
+    def _save_sniff_cache(cls) -> None:
+        """Persist the sniff cache atomically; failures only cost a re-sniff."""
+        if not cls.SNIFF_CACHE_PATH or cls._sniff_cache is None:
+            return
+        try:
+            cls.SNIFF_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(
+                dir=cls.SNIFF_CACHE_PATH.parent, prefix='.sniff-'
+            )
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(cls._sniff_cache, f)
+            os.replace(tmp, cls.SNIFF_CACHE_PATH)
+        except OSError as e:
+            logger.debug(f"Could not persist sniff cache: {e}")
+
+    @classmethod
+    def clear_sniff_cache(cls) -> None:
+        """Forget cached sniff results (the persisted file is left alone)."""
+        with cls._sniff_lock:
+            cls._sniff_cache = None
+
+    @classmethod
+    def sniff(cls, filepath: str, detect_delimiter: bool = True) -> Dict[str, Any]:
+        """
+        Detect encoding, comment character and (optionally) delimiter, once.
+
+        Values come from the sidecar schema if present, then from the sniff
+        cache, and only the remaining ones are detected. Cache entries are
+        keyed by resolved path and invalidated when the file's size or
+        modification time changes.
+
+        Args:
+            filepath: Path to file
+            detect_delimiter: Whether the delimiter is needed
+
+        Returns:
+            Dict with "encoding", "comment" and, if requested, "delimiter"
+        """
+        path = Path(filepath).resolve()
+        try:
+            stat = path.stat()
+        except OSError:
+            stat = None
+
+        sidecar = cls._read_sidecar(path) if stat else {}
+        key = str(path)
+        with cls._sniff_lock:
+            cached = cls._load_sniff_cache().get(key) if stat else None
+            if cached and (cached.get('size'), cached.get('mtime_ns')) == (
+                stat.st_size, stat.st_mtime_ns
+            ):
+                result = dict(cached['sniff'])
+            else:
+                result = {}
+
+        detected = {}
+        encoding = sidecar.get('encoding', result.get('encoding'))
+        if encoding is None:
+            encoding = detected['encoding'] = cls.detect_encoding(str(path))
+        if 'comment' not in sidecar and 'comment' not in result:
+            detected['comment'] = cls.detect_comment_char(str(path), encoding)
+        if (
+            detect_delimiter
+            and 'delimiter' not in sidecar
+            and 'delimiter' not in result
+        ):
+            detected['delimiter'] = cls.detect_delimiter(str(path), encoding)
+
+        result.update(detected)
+        if detected and stat:
+            with cls._sniff_lock:
+                cls._load_sniff_cache()[key] = {
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns,
+                    'sniff': result,
+                }
+                cls._save_sniff_cache()
+        elif not detected:
+            logger.debug(f"Using cached file parameters for {path}")
+
+        return {**result, **sidecar}
     
     @classmethod
     def detect_encoding(cls, filepath: str, sample_size: int = 10000) -> str:
@@ -166,9 +349,10 @@ class BiologicalFileLoader:
         
         # Auto-detect parameters if requested
         if auto_detect:
-            encoding = cls.detect_encoding(filepath)
+            sniffed = cls.sniff(filepath, detect_delimiter=False)
+            encoding = sniffed['encoding']
             if comment is None:
-                comment = cls.detect_comment_char(filepath, encoding)
+                comment = sniffed['comment']
         else:
             encoding = kwargs.pop('encoding', 'utf-8')
         
@@ -238,10 +422,11 @@ class BiologicalFileLoader:
         
         # Auto-detect parameters if requested
         if auto_detect:
-            encoding = cls.detect_encoding(filepath)
-            delimiter = cls.detect_delimiter(filepath, encoding)
+            sniffed = cls.sniff(filepath)
+            encoding = sniffed['encoding']
+            delimiter = sniffed['delimiter']
             if comment is None:
-                comment = cls.detect_comment_char(filepath, encoding)
+                comment = sniffed['comment']
         else:
             encoding = kwargs.pop('encoding', 'utf-8')
             delimiter = kwargs.pop('sep', ',')
@@ -307,9 +492,10 @@ class BiologicalFileLoader:
             file_type = 'tsv' if filepath.endswith('.tsv') else 'csv'
         
         # Auto-detect parameters
-        encoding = cls.detect_encoding(filepath)
-        delimiter = '\t' if file_type == 'tsv' else cls.detect_delimiter(filepath, encoding)
-        comment = cls.detect_comment_char(filepath, encoding)
+        sniffed = cls.sniff(filepath, detect_delimiter=file_type != 'tsv')
+        encoding = sniffed['encoding']
+        delimiter = '\t' if file_type == 'tsv' else sniffed['delimiter']
+        comment = sniffed['comment']
         
         defaults = {
             'sep': delimiter,
@@ -344,21 +530,65 @@ class BiologicalFileLoader:
         cls,
         filepath: str,
         identifier_column: Optional[str] = None,
+        use_cache: bool = True,
+        file_type: str = 'auto',
         **kwargs
     ) -> pd.DataFrame:
         """
         Automatically detect format and load file.
+
+        With pyarrow installed, large files are cached as uncompressed
+        Feather files under ``FRAME_CACHE_DIR``, keyed by the file's path,
+        size and mtime plus the loader options, so later loads read them
+        through a memory map instead of parsing. Without pyarrow nothing is
+        cached.
         
         Args:
             filepath: Path to file
             identifier_column: Column to use as index
+            use_cache: Whether to read and write the frame cache
+            file_type: 'tsv', 'csv', or 'auto' (extension, then content)
             **kwargs: Additional arguments
             
         Returns:
             Loaded DataFrame
         """
         filepath = str(Path(filepath).resolve())
-        
+
+        cache_path = (
+            cls._frame_cache_path(
+                filepath, identifier_column, {'file_type': file_type, **kwargs}
+            )
+            if use_cache
+            else None
+        )
+        if cache_path is not None and cache_path.exists():
+            try:
+                df = cls._read_frame_cache(cache_path)
+                logger.info(f"Loaded {len(df)} rows from frame cache for {filepath}")
+                return df
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable frame cache {cache_path}: {e}")
+
+        df = cls._auto_load_uncached(filepath, identifier_column, file_type, **kwargs)
+        if cache_path is not None:
+            cls._write_frame_cache(cache_path, df)
+        return df
+
+    @classmethod
+    def _auto_load_uncached(
+        cls,
+        filepath: str,
+        identifier_column: Optional[str] = None,
+        file_type: str = 'auto',
+        **kwargs
+    ) -> pd.DataFrame:
+        """Dispatch to the TSV or CSV loader based on type, extension or content."""
+        if file_type == 'tsv':
+            return cls.load_tsv(filepath, identifier_column=identifier_column, **kwargs)
+        if file_type == 'csv':
+            return cls.load_csv(filepath, identifier_column=identifier_column, **kwargs)
+
         # Determine file type from extension
         if filepath.endswith('.tsv') or filepath.endswith('.txt'):
             return cls.load_tsv(filepath, identifier_column=identifier_column, **kwargs)
@@ -366,12 +596,88 @@ class BiologicalFileLoader:
             return cls.load_csv(filepath, identifier_column=identifier_column, **kwargs)
         else:
             # Try to detect from content
-            delimiter = cls.detect_delimiter(filepath)
+            delimiter = cls.sniff(filepath)['delimiter']
             if delimiter == '\t':
                 return cls.load_tsv(filepath, identifier_column=identifier_column, **kwargs)
             else:
                 return cls.load_csv(filepath, identifier_column=identifier_column, **kwargs)
     
+    @classmethod
+    def _frame_cache_path(
+        cls,
+        filepath: str,
+        identifier_column: Optional[str],
+        options: Dict[str, Any],
+    ) -> Optional[Path]:
+        """Cache file for this file version and loader options, if cacheable."""
+        if cls.FRAME_CACHE_DIR is None or not HAS_PYARROW:
+            return None
+        # Callables (converters etc.) have no stable identity across runs
+        if any(callable(value) for value in options.values()):
+            return None
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        if stat.st_size < cls.FRAME_CACHE_MIN_BYTES:
+            return None
+
+        path_hash = hashlib.sha256(filepath.encode()).hexdigest()[:16]
+        version_hash = hashlib.sha256(
+            f"{stat.st_size}:{stat.st_mtime_ns}".encode()
+        ).hexdigest()[:16]
+        options_hash = hashlib.sha256(
+            json.dumps(
+                {
+                    'identifier_column': identifier_column,
+                    'options': options,
+                    'na_values': cls.NA_VALUES,
+                },
+                sort_keys=True,
+                default=repr,
+            ).encode()
+        ).hexdigest()[:16]
+        if not _private_dir(cls.FRAME_CACHE_DIR):
+            return None
+        return cls.FRAME_CACHE_DIR / f"{path_hash}-{version_hash}-{options_hash}.feather"
+
+    @staticmethod
+    def _read_frame_cache(cache_path: Path) -> pd.DataFrame:
+        """Read a cached frame through a memory map."""
+        df = feather.read_table(cache_path, memory_map=True).to_pandas()
+        # Arrow nulls come back as None in object columns; read_csv gives NaN
+        for position in np.flatnonzero(df.dtypes.to_numpy() == object):
+            column = df.iloc[:, position]
+            missing = column.isna()
+            if missing.any():
+                df.iloc[:, position] = column.mask(missing, np.nan)
+        return df
+
+    @classmethod
+    def _write_frame_cache(cls, cache_path: Path, df: pd.DataFrame) -> None:
+        """Write ``df`` to the cache and drop entries for older file versions."""
+        try:
+            fd, tmp = tempfile.mkstemp(dir=cache_path.parent, prefix='.frame-')
+            os.close(fd)
+            try:
+                # Uncompressed so reads can be memory-mapped; the index is
+                # kept in the pandas metadata (identifier_column loads)
+                table = pa.Table.from_pandas(df, preserve_index=True)
+                feather.write_feather(table, tmp, compression='uncompressed')
+                os.replace(tmp, cache_path)
+            finally:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+        except Exception as e:
+            # Mixed-type object columns cannot be stored as Arrow; just re-parse
+            logger.debug(f"Not caching frame for {cache_path.name}: {e}")
+            return
+
+        path_hash, version_hash, _ = cache_path.stem.split('-')
+        for stale in cache_path.parent.glob(f"{path_hash}-*"):
+            if stale.stem.split('-')[1] != version_hash:
+                stale.unlink(missing_ok=True)
+
     @staticmethod
     def _validate_dataframe(df: pd.DataFrame, filepath: str) -> None:
         """
@@ -0,0 +1,277 @@
+"""Interned identifier sets for tracking entities across strategy stages.
+
+Progressive statistics used to keep every identifier seen so far as a list
+in the context, rebuilding a Python set from it at each stage and copying
+the strings along with every context sync. ``IdVocabulary`` assigns each
+identifier a small integer code once, and ``InternedIdSet`` stores a set as
+a sorted array of those codes, so unions, differences and counts are numpy
+operations and strings are only decoded when a report asks for them.
+"""
+
+from collections.abc import Set
+from itertools import repeat
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Codes are positions in the vocabulary; 32 bits is plenty for identifiers
+CODE_DTYPE = np.int32
+
+
+def _sorted_unique(codes: np.ndarray) -> np.ndarray:
+    """Sort ``codes`` and drop duplicates."""
+    codes = np.sort(codes)
+    if len(codes) < 2:
+        return codes
+    keep = np.empty(len(codes), dtype=bool)
+    keep[0] = True
+    np.not_equal(codes[1:], codes[:-1], out=keep[1:])
+    return codes[keep]
+
+
+class IdVocabulary:
+    """Append-only mapping between identifier values and integer codes.
+
+    The code of a value is its position in the vocabulary. Values are only
+    ever appended, so codes stay valid for every set built on a vocabulary,
+    and sets sharing one vocabulary can be combined code-wise. Encoding
+    costs one hash lookup per value, however large the vocabulary grows.
+    """
+
+    __slots__ = ("_codes", "_chunks", "_values")
+
+    def __init__(self, values: Optional[Iterable[Any]] = None):
+        """
+        Create a vocabulary.
+
+        Args:
+            values: Initial values (duplicates are dropped)
+        """
+        self._codes: Dict[Any, int] = {}
+        self._chunks: List[np.ndarray] = []
+        self._values: Optional[np.ndarray] = None
+        if values is not None:
+            self.encode(values)
+
+    @property
+    def values(self) -> np.ndarray:
+        """All interned values in code order, as an object array."""
+        if self._values is None or len(self._values) != len(self._codes):
+            self._values = np.concatenate([np.empty(0, dtype=object)] + self._chunks)
+            self._chunks = [self._values]
+        return self._values
+
+    def encode(self, values: Iterable[Any], add: bool = True) -> np.ndarray:
+        """
+        Return the codes of ``values``.
+
+        Args:
+            values: Identifier values (may contain duplicates)
+            add: Intern unseen values; if False they get code -1
+
+        Returns:
+            Code array aligned with ``values``
+        """
+        if isinstance(values, (np.ndarray, pd.Index, pd.Series)):
+            values = np.asarray(values, dtype=object)
+        else:
+            # Fill element-wise so tuple identifiers are not split into columns
+            items = list(values)
+            values = np.empty(len(items), dtype=object)
+            values[:] = items
+        codes = np.fromiter(
+            map(self._codes.get, values, repeat(-1)), dtype=CODE_DTYPE, count=len(values)
+        )
+        if add:
+            missing = np.flatnonzero(codes < 0)
+            if len(missing):
+                new_codes, new_values = pd.factorize(values[missing], use_na_sentinel=False)
+                size = len(self._codes)
+                codes[missing] = size + new_codes
+                new_values = np.asarray(new_values, dtype=object)
+                self._codes.update(zip(new_values, range(size, size + len(new_values))))
+                self._chunks.append(new_values)
+        return codes
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Return the values of ``codes`` as an object array."""
+        return self.values.take(codes)
+
+    def __len__(self) -> int:
+        """Number of interned values."""
+        return len(self._codes)
+
+    def __reduce__(self) -> tuple:
+        """Pickle the values only; the lookup table is rebuilt on load."""
+        return (IdVocabulary, (self.values,))
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"IdVocabulary(size={len(self._codes)})"
+
+
+class InternedIdSet(Set):
+    """Immutable set of identifiers stored as sorted vocabulary codes.
+
+    Behaves like a ``frozenset`` of the identifier values (``len``, ``in``,
+    iteration, ``|``, ``-``, ``&``, ``==``). Operations between sets sharing a
+    vocabulary never touch the values; other iterables are interned into
+    this set's vocabulary first. Iteration decodes values in first-seen
+    order.
+    """
+
+    __slots__ = ("_vocabulary", "_codes")
+
+    def __init__(
+        self,
+        values: Iterable[Any] = (),
+        vocabulary: Optional[IdVocabulary] = None,
+    ):
+        """
+        Build a set, interning its values.
+
+        Args:
+            values: Identifier values (duplicates and order are irrelevant)
+            vocabulary: Vocabulary to intern into (a new one if None)
+        """
+        self._vocabulary = vocabulary if vocabulary is not None else IdVocabulary()
+        self._codes = _sorted_unique(self._vocabulary.encode(values))
+
+    @classmethod
+    def from_codes(cls, vocabulary: IdVocabulary, codes: np.ndarray) -> "InternedIdSet":
+        """Wrap already sorted, unique ``codes`` of ``vocabulary``."""
+        id_set = cls.__new__(cls)
+        id_set._vocabulary = vocabulary
+        id_set._codes = np.asarray(codes, dtype=CODE_DTYPE)
+        return id_set
+
+    @property
+    def vocabulary(self) -> IdVocabulary:
+        """The vocabulary the codes refer to."""
+        return self._vocabulary
+
+    @property
+    def codes(self) -> np.ndarray:
+        """Sorted unique codes of the members (do not modify)."""
+        return self._codes
+
+    def _from_iterable(self, values: Iterable[Any]) -> "InternedIdSet":
+        """Build results of the generic ``Set`` operators on this vocabulary."""
+        return InternedIdSet(values, vocabulary=self._vocabulary)
+
+    def _other_codes(self, other: Iterable[Any], add: bool = True) -> np.ndarray:
+        """Sorted unique codes of ``other`` in this set's vocabulary.
+
+        With ``add=False`` values unknown to the vocabulary are left out,
+        which is enough for differences and intersections.
+        """
+        if isinstance(other, InternedIdSet) and other._vocabulary is self._vocabulary:
+            return other._codes
+        codes = self._vocabulary.encode(other, add=add)
+        return _sorted_unique(codes[codes >= 0])
+
+    def union(self, *others: Iterable[Any]) -> "InternedIdSet":
+        """Return the members of this set and all ``others``."""
+        codes = self._codes
+        for other in others:
+            codes = _sorted_unique(np.concatenate((codes, self._other_codes(other))))
+        return InternedIdSet.from_codes(self._vocabulary, codes)
+
+    def difference(self, *others: Iterable[Any]) -> "InternedIdSet":
+        """Return the members of this set not in any of ``others``."""
+        codes = self._codes
+        for other in others:
+            codes = np.setdiff1d(codes, self._other_codes(other, add=False), assume_unique=True)
+        return InternedIdSet.from_codes(self._vocabulary, codes)
+
+    def intersection(self, *others: Iterable[Any]) -> "InternedIdSet":
+        """Return the members of this set found in all ``others``."""
+        codes = self._codes
+        for other in others:
+            codes = np.intersect1d(codes, self._other_codes(other, add=False), assume_unique=True)
+        return InternedIdSet.from_codes(self._vocabulary, codes)
+
+    def __or__(self, other: Any) -> Any:
+        """Union with another set."""
+        if not isinstance(other, Set):
+            return NotImplemented
+        return self.union(other)
+
+    def __sub__(self, other: Any) -> Any:
+        """Difference with another set."""
+        if not isinstance(other, Set):
+            return NotImplemented
+        return self.difference(other)
+
+    def __and__(self, other: Any) -> Any:
+        """Intersection with another set."""
+        if not isinstance(other, Set):
+            return NotImplemented
+        return self.intersection(other)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare members; code-wise when the vocabulary is shared."""
+        if isinstance(other, InternedIdSet) and other._vocabulary is self._vocabulary:
+            return np.array_equal(self._codes, other._codes)
+        return super().__eq__(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __len__(self) -> int:
+        """Number of members."""
+        return len(self._codes)
+
+    def __contains__(self, value: object) -> bool:
+        """Whether ``value`` is a member (never interns it)."""
+        try:
+            (code,) = self._vocabulary.encode([value], add=False)
+        except TypeError:
+            return False
+        if code < 0:
+            return False
+        position = np.searchsorted(self._codes, code)
+        return bool(position < len(self._codes) and self._codes[position] == code)
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate the decoded members."""
+        return iter(self.to_list())
+
+    def to_list(self, limit: Optional[int] = None) -> List[Any]:
+        """
+        Decode members into a list.
+
+        Args:
+            limit: Decode only the first ``limit`` members (e.g. report samples)
+
+        Returns:
+            Member values in first-seen order
+        """
+        codes = self._codes if limit is None else self._codes[:limit]
+        return self._vocabulary.decode(codes).tolist()
+
+    @classmethod
+    def _from_bitmap(
+        cls, vocabulary: IdVocabulary, bitmap: np.ndarray, size: int
+    ) -> "InternedIdSet":
+        """Rebuild a set pickled as a packed membership bitmap."""
+        mask = np.unpackbits(bitmap, count=size).astype(bool)
+        return cls.from_codes(vocabulary, np.flatnonzero(mask))
+
+    def __reduce__(self) -> tuple:
+        """Pickle the vocabulary and members; a shared vocabulary is stored once.
+
+        Sets covering much of their vocabulary (such as the cumulative IDs
+        of a strategy) are stored as a bitmap with one bit per vocabulary
+        entry, sparse ones as their codes.
+        """
+        size = len(self._vocabulary)
+        if len(self._codes) * self._codes.itemsize * 8 > size:
+            mask = np.zeros(size, dtype=bool)
+            mask[self._codes] = True
+            return (InternedIdSet._from_bitmap, (self._vocabulary, np.packbits(mask), size))
+        return (InternedIdSet.from_codes, (self._vocabulary, self._codes))
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"InternedIdSet(size={len(self._codes)}, vocabulary={len(self._vocabulary)})"
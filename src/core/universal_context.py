@@ -17,6 +17,10 @@ import logging
 from typing import Any, Dict, Optional, Union
 from collections.abc import MutableMapping
 
+import pandas as pd
+
+from core.standards.dataset_handle import DatasetHandle, as_dataframe
+
 logger = logging.getLogger(__name__)
 
 
@@ -124,9 +128,15 @@ class UniversalContext(MutableMapping):
         return self._data.get('datasets', {})
     
     def set_dataset(self, key: str, data: Any) -> None:
-        """Set a dataset for pipeline handoffs."""
+        """Set a dataset for pipeline handoffs.
+        
+        DataFrames are stored as a ``DatasetHandle`` so the next stage reads
+        the columns directly instead of a serialized list of records.
+        """
         if 'datasets' not in self._data:
             self._data['datasets'] = {}
+        if isinstance(data, pd.DataFrame):
+            data = DatasetHandle(data)
         self._data['datasets'][key] = data
         logger.debug(f"🔄 Dataset '{key}' stored in context (circuitous handoff)")
     
@@ -134,6 +144,13 @@ class UniversalContext(MutableMapping):
         """Get a dataset from context."""
         return self._data.get('datasets', {}).get(key, default)
     
+    def get_dataframe(self, key: str, copy: bool = True) -> Optional[pd.DataFrame]:
+        """Get a dataset as a DataFrame, or None if it does not exist."""
+        data = self.get_dataset(key)
+        if data is None:
+            return None
+        return as_dataframe(data, copy=copy)
+    
     def has_dataset(self, key: str) -> bool:
         """Check if dataset exists."""
         return key in self._data.get('datasets', {})
@@ -205,19 +222,42 @@ class UniversalContext(MutableMapping):
         return f"UniversalContext(datasets={datasets}, keys={list(self._data.keys())})"
     
     # Pipeline orchestration helpers
-    def checkpoint(self, stage_name: str) -> Dict[str, Any]:
+    def checkpoint(self, stage_name: str, store: Any = None) -> Dict[str, Any]:
         """
         Create checkpoint for pipeline stage.
         
         🔄 Circuitous Pattern: Enables stage recovery without
         modifying action implementations.
+
+        Args:
+            stage_name: Name of the completed stage
+            store: Optional ``StepCheckpointStore``; when given, the full
+                context is persisted and its key returned as ``checkpoint_key``
         """
-        return {
+        summary = {
             'stage': stage_name,
             'datasets': list(self.get_datasets().keys()),
             'statistics': dict(self.get_statistics()),
             'parameters': dict(self.get_parameters())
         }
+        if store is not None:
+            key = store.step_key(
+                store.run_key(stage_name, self.get('current_identifiers')),
+                {'name': stage_name},
+                self.get_parameters(),
+            )
+            store.save(key, stage_name, self._data)
+            summary['checkpoint_key'] = key
+        return summary
+
+    def restore_checkpoint(self, store: Any, key: str) -> None:
+        """
+        Restore context state saved by ``checkpoint(..., store=...)``.
+
+        🔄 Circuitous Pattern: Resume a pipeline from a persisted stage.
+        """
+        self._data.update(store.load(key))
+        self._ensure_core_structure()
     
     def validate_handoff(self, required_keys: list) -> bool:
         """
@@ -0,0 +1,393 @@
+"""Local table of UniProt accession history.
+
+``AccessionHistoryTable`` persists how accessions resolve - still primary,
+secondary to one primary, demerged into several primaries, or obsolete - in
+a local SQLite file, with one row per (accession, primary ID). It is filled
+from ``UniProtHistoricalResolverClient`` results and from the UniProt
+``sec_ac.txt`` and ``delac_*.txt`` dumps, so resolution can run offline.
+Loaded dumps are recorded by path, size and modification time, and loading
+an unchanged dump again is a no-op.
+
+Rows carry the same metadata strings as the client results ("primary",
+"secondary:<primary>", "demerged", "obsolete"); errors and composite IDs are
+never stored.
+"""
+
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from .cache_backends import SQLITE_BATCH_SIZE
+
+# UniProt accession format (https://www.uniprot.org/help/accession_numbers)
+ACCESSION_PATTERN = re.compile(
+    r"[OPQ][0-9][A-Z0-9]{3}[0-9]|[A-NR-Z][0-9](?:[A-Z][A-Z0-9]{2}[0-9]){1,2}"
+)
+# Dump lines parsed per chunk
+DUMP_CHUNK_SIZE = 100_000
+# Columns of the frames returned by lookup() and results_frame()
+HISTORY_COLUMNS = ["accession", "primary_id", "metadata"]
+
+MappingResult = Tuple[Optional[List[str]], Optional[str]]
+
+
+def is_history_metadata(metadata: Optional[str]) -> bool:
+    """Whether a client result is a definitive resolution worth storing."""
+    return bool(metadata) and (
+        metadata in ("primary", "demerged", "obsolete") or metadata.startswith("secondary:")
+    )
+
+
+def results_frame(results: Dict[str, MappingResult]) -> pd.DataFrame:
+    """
+    Turn client results into history rows.
+
+    Args:
+        results: Identifier to (primary IDs, metadata), as returned by
+            ``UniProtHistoricalResolverClient.map_identifiers``
+
+    Returns:
+        DataFrame with HISTORY_COLUMNS, one row per primary ID, or a single
+        row without primary ID for unresolved identifiers
+    """
+    accessions, primary_ids, metadata = [], [], []
+    for accession, (ids, meta) in results.items():
+        for primary_id in ids or [None]:
+            accessions.append(accession)
+            primary_ids.append(primary_id)
+            metadata.append(meta)
+    return pd.DataFrame(
+        {"accession": accessions, "primary_id": primary_ids, "metadata": metadata},
+        columns=HISTORY_COLUMNS,
+    )
+
+
+def _iter_dump_lines(path: Union[str, Path]) -> Iterator[pd.Series]:
+    """Data lines of a UniProt dump, in chunks.
+
+    The data starts after the first line made only of underscores; lines
+    after it that hold no accession (e.g. the copyright footer) are dropped
+    by the readers.
+    """
+    with open(path, encoding="utf-8", errors="replace") as handle:
+        for line in handle:
+            stripped = line.strip()
+            if stripped and not stripped.strip("_ "):
+                break
+        chunk: List[str] = []
+        for line in handle:
+            chunk.append(line)
+            if len(chunk) >= DUMP_CHUNK_SIZE:
+                yield pd.Series(chunk, dtype=object).str.strip()
+                chunk = []
+        if chunk:
+            yield pd.Series(chunk, dtype=object).str.strip()
+
+
+def iter_sec_ac(path: Union[str, Path]) -> Iterator[pd.DataFrame]:
+    """
+    Read a UniProt ``sec_ac.txt`` dump in chunks.
+
+    Args:
+        path: Dump file listing "<secondary AC> <primary AC>" pairs
+
+    Yields:
+        DataFrames with ``secondary`` and ``primary`` columns in file order
+    """
+    for lines in _iter_dump_lines(path):
+        pairs = lines.str.split(n=1, expand=True)
+        if pairs.shape[1] < 2:
+            continue
+        pairs.columns = ["secondary", "primary"]
+        valid = pairs["secondary"].str.fullmatch(ACCESSION_PATTERN, na=False) & pairs[
+            "primary"
+        ].str.fullmatch(ACCESSION_PATTERN, na=False)
+        yield pairs[valid].reset_index(drop=True)
+
+
+def read_sec_ac(path: Union[str, Path]) -> pd.DataFrame:
+    """
+    Read a UniProt ``sec_ac.txt`` dump.
+
+    Args:
+        path: Dump file listing "<secondary AC> <primary AC>" pairs
+
+    Returns:
+        DataFrame with ``secondary`` and ``primary`` columns in file order
+    """
+    chunks = list(iter_sec_ac(path))
+    if not chunks:
+        return pd.DataFrame(columns=["secondary", "primary"], dtype=object)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def iter_delac(path: Union[str, Path]) -> Iterator[pd.Series]:
+    """
+    Read a UniProt ``delac_sp.txt`` / ``delac_tr.txt`` dump in chunks.
+
+    Args:
+        path: Dump file listing one deleted accession per line
+
+    Yields:
+        Series of deleted accessions
+    """
+    for lines in _iter_dump_lines(path):
+        yield lines[lines.str.fullmatch(ACCESSION_PATTERN, na=False)].reset_index(drop=True)
+
+
+class AccessionHistoryTable:
+    """UniProt accession history in a local SQLite file."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            path: Database file, created if missing; in memory only if None
+        """
+        self.path = Path(path) if path else None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path) if self.path is not None else ":memory:",
+            check_same_thread=False,
+        )
+        with self._lock, self._conn:
+            if self.path is not None:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS accession_history ("
+                " accession TEXT NOT NULL, primary_id TEXT, metadata TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS accession_history_accession"
+                " ON accession_history (accession)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS loaded_dumps ("
+                " path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL)"
+            )
+
+    def lookup(self, accessions: Iterable[str]) -> pd.DataFrame:
+        """
+        Return the history rows of the known accessions among ``accessions``.
+
+        Args:
+            accessions: Accessions to look up
+
+        Returns:
+            DataFrame with HISTORY_COLUMNS; demerged accessions have one row
+            per primary ID, in the order they were stored
+        """
+        keys = list(dict.fromkeys(accessions))
+        rows: List[Tuple[str, Optional[str], str]] = []
+        with self._lock:
+            for start in range(0, len(keys), SQLITE_BATCH_SIZE):
+                chunk = keys[start : start + SQLITE_BATCH_SIZE]
+                rows.extend(
+                    self._conn.execute(
+                        "SELECT accession, primary_id, metadata FROM accession_history"
+                        f" WHERE accession IN ({','.join('?' * len(chunk))})"
+                        " ORDER BY rowid",
+                        chunk,
+                    )
+                )
+        return pd.DataFrame(rows, columns=HISTORY_COLUMNS)
+
+    def mapping_results(
+        self, accessions: Optional[Iterable[str]] = None
+    ) -> Dict[str, MappingResult]:
+        """
+        Return stored resolutions as client results, e.g. to seed its cache.
+
+        Args:
+            accessions: Accessions to return (every stored one if None)
+
+        Returns:
+            Accession to (primary IDs or None, metadata)
+        """
+        if accessions is None:
+            with self._lock:
+                frame = pd.DataFrame(
+                    self._conn.execute(
+                        "SELECT accession, primary_id, metadata FROM accession_history"
+                        " ORDER BY rowid"
+                    ).fetchall(),
+                    columns=HISTORY_COLUMNS,
+                )
+        else:
+            frame = self.lookup(accessions)
+        results: Dict[str, MappingResult] = {}
+        for accession, primary_id, metadata in frame.itertuples(index=False):
+            ids, _ = results.get(accession, (None, metadata))
+            if primary_id is not None:
+                ids = (ids or []) + [primary_id]
+            results[accession] = (ids, metadata)
+        return results
+
+    def add_results(self, results: Dict[str, MappingResult]) -> int:
+        """
+        Store client results, replacing what is known about their accessions.
+
+        Errors and composite results are skipped.
+
+        Args:
+            results: Identifier to (primary IDs, metadata)
+
+        Returns:
+            Number of accessions stored
+        """
+        definitive = {
+            accession: result
+            for accession, result in results.items()
+            if is_history_metadata(result[1])
+        }
+        return self.add_rows(results_frame(definitive))
+
+    def add_rows(self, rows: pd.DataFrame) -> int:
+        """
+        Store history rows, replacing what is known about their accessions.
+
+        Args:
+            rows: DataFrame with HISTORY_COLUMNS
+
+        Returns:
+            Number of accessions stored
+        """
+        if rows.empty:
+            return 0
+        accessions = rows["accession"].drop_duplicates().tolist()
+        records = rows[HISTORY_COLUMNS].astype(object).where(rows[HISTORY_COLUMNS].notna(), None)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM accession_history WHERE accession = ?",
+                ((accession,) for accession in accessions),
+            )
+            self._conn.executemany(
+                "INSERT INTO accession_history (accession, primary_id, metadata)"
+                " VALUES (?, ?, ?)",
+                records.itertuples(index=False, name=None),
+            )
+        return len(accessions)
+
+    def load_sec_ac(self, path: Union[str, Path]) -> int:
+        """
+        Load secondary and demerged accessions from a ``sec_ac.txt`` dump.
+
+        Secondary accessions listed with several primaries are demerged.
+        Pairs are staged chunk by chunk in a temporary table, so the dump
+        is never held in memory, and stored in one transaction.
+
+        Args:
+            path: Dump file
+
+        Returns:
+            Number of accessions stored
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS sec_ac_load ("
+                " secondary TEXT NOT NULL, primary_id TEXT NOT NULL)"
+            )
+            self._conn.execute("DELETE FROM sec_ac_load")
+            try:
+                for pairs in iter_sec_ac(path):
+                    self._conn.executemany(
+                        "INSERT INTO sec_ac_load (secondary, primary_id) VALUES (?, ?)",
+                        pairs.itertuples(index=False, name=None),
+                    )
+                (stored,) = self._conn.execute(
+                    "SELECT COUNT(DISTINCT secondary) FROM sec_ac_load"
+                ).fetchone()
+                self._conn.execute(
+                    "DELETE FROM accession_history"
+                    " WHERE accession IN (SELECT secondary FROM sec_ac_load)"
+                )
+                self._conn.execute(
+                    "INSERT INTO accession_history (accession, primary_id, metadata)"
+                    " SELECT s.secondary, s.primary_id,"
+                    "  CASE WHEN c.n > 1 THEN 'demerged' ELSE 'secondary:' || s.primary_id END"
+                    " FROM sec_ac_load s JOIN ("
+                    "  SELECT secondary, COUNT(*) AS n FROM sec_ac_load GROUP BY secondary"
+                    " ) c ON c.secondary = s.secondary"
+                    " ORDER BY s.rowid"
+                )
+            finally:
+                self._conn.execute("DELETE FROM sec_ac_load")
+        return stored
+
+    def load_delac(self, path: Union[str, Path]) -> int:
+        """
+        Load obsolete accessions from a ``delac_sp.txt`` / ``delac_tr.txt`` dump.
+
+        Args:
+            path: Dump file
+
+        Returns:
+            Number of accessions stored
+        """
+        stored = 0
+        for deleted in iter_delac(path):
+            rows = pd.DataFrame(
+                {"accession": deleted, "primary_id": None, "metadata": "obsolete"},
+                columns=HISTORY_COLUMNS,
+            )
+            stored += self.add_rows(rows)
+        return stored
+
+    def load_dump(self, path: Union[str, Path], force: bool = False) -> Optional[int]:
+        """
+        Load a UniProt dump, recognized by its file name (sec_ac or delac).
+
+        Args:
+            path: Dump file
+            force: Load the dump even if this table already holds it unchanged
+
+        Returns:
+            Number of accessions stored, or None if the dump was already
+            loaded and has not changed since (same path, size and mtime)
+
+        Raises:
+            ValueError: If the file name matches neither dump
+        """
+        name = Path(path).name.lower()
+        if "sec_ac" in name:
+            loader = self.load_sec_ac
+        elif "delac" in name:
+            loader = self.load_delac
+        else:
+            raise ValueError(f"Unrecognized UniProt history dump: {path}")
+
+        key = str(Path(path).resolve())
+        stat = Path(path).stat()
+        signature = (stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns FROM loaded_dumps WHERE path = ?", (key,)
+            ).fetchone()
+        if not force and row == signature:
+            return None
+
+        stored = loader(path)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO loaded_dumps (path, size, mtime_ns) VALUES (?, ?, ?)",
+                (key, *signature),
+            )
+        return stored
+
+    def __len__(self) -> int:
+        """Number of accessions stored."""
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(DISTINCT accession) FROM accession_history"
+            ).fetchone()
+        return count
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -13,6 +13,8 @@ from core.exceptions import (
     ClientInitializationError,
 )
 
+from .cache_backends import CacheBackend, LRUCache, SQLiteCache
+
 logger = logging.getLogger(__name__)
 
 # Type variable for input/output identifiers
@@ -147,28 +149,61 @@ class BaseMappingClient(abc.ABC):
 class CachedMappingClientMixin:
     """Mixin that adds caching capabilities to a mapping client.
 
-    This mixin provides an in-memory cache for mapping results to improve
-    performance when the same identifiers are mapped multiple times.
+    Results are kept in an in-memory LRU cache (optionally with a TTL) to
+    improve performance when the same identifiers are mapped multiple times.
+    When the client configuration sets ``cache_path``, results are also
+    written through to a persistent SQLite cache, scoped by
+    ``cache_namespace`` (default: the class name) and ``cache_version``, so
+    later runs start warm. ``cache_ttl`` (seconds) applies to both layers.
     """
 
-    def __init__(self, cache_size: int = 1024, **kwargs):
+    # Metadata prefix of transient failures, kept out of the persistent cache
+    ERROR_METADATA_PREFIX = "error:"
+
+    def __init__(
+        self,
+        cache_size: int = 1024,
+        cache_ttl: Optional[float] = None,
+        persistent_cache: Optional[CacheBackend] = None,
+        **kwargs,
+    ):
         """Initialize the cache.
 
         Args:
             cache_size: Maximum number of entries to store in the cache.
+            cache_ttl: Seconds a cached result stays valid (overrides the
+                ``cache_ttl`` config value).
+            persistent_cache: Backend to write results through to (overrides
+                the ``cache_path`` config value).
             **kwargs: Additional arguments to pass to the parent class.
         """
         # Initialize parent class first if this is a mixin
         super().__init__(**kwargs)
 
+        get_config = getattr(self, "get_config_value", lambda key, default=None: default)
+        if cache_ttl is None:
+            cache_ttl = get_config("cache_ttl")
+
         # Initialize cache
-        self._cache: Dict[str, Tuple[Optional[List[str]], Optional[str]]] = {}
+        self._cache = LRUCache(cache_size, ttl=cache_ttl)
         self._cache_size = cache_size
         self._cache_hits = 0
         self._cache_misses = 0
+        self._persistent_hits = 0
         self._cache_initialized = False
         self._cache_lock = asyncio.Lock()  # For thread safety
 
+        # A cache opened from the configuration is closed by close()
+        self._owns_persistent_cache = persistent_cache is None and bool(get_config("cache_path"))
+        if self._owns_persistent_cache:
+            persistent_cache = SQLiteCache(
+                get_config("cache_path"),
+                namespace=get_config("cache_namespace", self.__class__.__name__),
+                version=str(get_config("cache_version", "1")),
+                ttl=cache_ttl,
+            )
+        self._persistent_cache = persistent_cache
+
     async def _get_from_cache(
         self, identifier: str
     ) -> Optional[Tuple[Optional[List[str]], Optional[str]]]:
@@ -180,12 +215,36 @@ class CachedMappingClientMixin:
         Returns:
             The cached result tuple if found, otherwise None.
         """
+        found = await self._get_many_from_cache([identifier])
+        return found.get(identifier)
+
+    async def _get_many_from_cache(
+        self, identifiers: List[str]
+    ) -> Dict[str, Tuple[Optional[List[str]], Optional[str]]]:
+        """Get cached results for several identifiers with one lookup per layer.
+
+        Args:
+            identifiers: The source identifiers to look up.
+
+        Returns:
+            Dictionary of the identifiers found in the cache to their results.
+        """
         async with self._cache_lock:
-            if identifier in self._cache:
-                self._cache_hits += 1
-                return self._cache[identifier]
-            self._cache_misses += 1
-            return None
+            found = self._cache.get_many(identifiers)
+
+        missing = [identifier for identifier in identifiers if identifier not in found]
+        if missing and self._persistent_cache is not None:
+            stored = await asyncio.to_thread(self._persistent_cache.get_many, missing)
+            # JSON round-trips result tuples as lists
+            stored = {identifier: tuple(result) for identifier, result in stored.items()}
+            async with self._cache_lock:
+                self._cache.put_many(stored)
+                self._persistent_hits += len(stored)
+            found.update(stored)
+
+        self._cache_hits += len(found)
+        self._cache_misses += len(identifiers) - len(found)
+        return found
 
     async def _add_to_cache(
         self, identifier: str, result: Tuple[Optional[List[str]], Optional[str]]
@@ -196,30 +255,30 @@ class CachedMappingClientMixin:
             identifier: The source identifier.
             result: The mapping result tuple.
         """
-        async with self._cache_lock:
-            # Simple LRU-like behavior: if cache is full, remove a random entry
-            if len(self._cache) >= self._cache_size:
-                # Remove an arbitrary key (first one)
-                self._cache.pop(next(iter(self._cache)))
-
-            self._cache[identifier] = result
+        await self._add_many_to_cache({identifier: result})
 
     async def _add_many_to_cache(
         self, results: Dict[str, Tuple[Optional[List[str]], Optional[str]]]
     ) -> None:
         """Add multiple mapping results to the cache at once.
 
+        Errors are only kept in memory, so a failed upstream call is retried
+        by later runs instead of being served from the persistent cache.
+
         Args:
             results: Dictionary mapping source identifiers to result tuples.
         """
         async with self._cache_lock:
-            # Simple implementation: just add each result individually
-            for identifier, result in results.items():
-                if len(self._cache) >= self._cache_size:
-                    # Remove an arbitrary key (first one)
-                    self._cache.pop(next(iter(self._cache)))
-
-                self._cache[identifier] = result
+            # Least recently used entries are evicted when the cache is full
+            self._cache.put_many(results)
+        if self._persistent_cache is not None:
+            persistent = {
+                identifier: result
+                for identifier, result in results.items()
+                if not str(result[1] or "").startswith(self.ERROR_METADATA_PREFIX)
+            }
+            if persistent:
+                await asyncio.to_thread(self._persistent_cache.put_many, persistent)
 
     async def _preload_cache(self) -> None:
         """Preload the cache with common mappings.
@@ -232,9 +291,10 @@ class CachedMappingClientMixin:
         """Get statistics about the cache usage.
 
         Returns:
-            Dictionary with cache statistics.
+            Dictionary with cache statistics. Hits include results served
+            by the persistent cache, which adds its own size and hit count.
         """
-        return {
+        stats = {
             "cache_size": len(self._cache),
             "cache_hits": self._cache_hits,
             "cache_misses": self._cache_misses,
@@ -243,13 +303,29 @@ class CachedMappingClientMixin:
             else 0,
             "initialized": self._cache_initialized,
         }
+        if self._persistent_cache is not None:
+            stats["persistent_cache_size"] = len(self._persistent_cache)
+            stats["persistent_hits"] = self._persistent_hits
+        return stats
 
     async def clear_cache(self) -> None:
-        """Clear the cache."""
+        """Clear the cache, including the persistent cache of this namespace."""
         async with self._cache_lock:
             self._cache.clear()
             self._cache_hits = 0
             self._cache_misses = 0
+            self._persistent_hits = 0
+        if self._persistent_cache is not None:
+            await asyncio.to_thread(self._persistent_cache.clear)
+
+    async def close(self) -> None:
+        """Close the persistent cache opened for this client, then the client."""
+        if self._owns_persistent_cache and self._persistent_cache is not None:
+            self._persistent_cache.close()
+            self._persistent_cache = None
+        parent_close = getattr(super(), "close", None)
+        if parent_close is not None:
+            await parent_close()
 
 
 class FileLookupClientMixin:
@@ -0,0 +1,227 @@
+"""Cache backends for mapping clients.
+
+``CachedMappingClientMixin`` keeps recent results in an ``LRUCache`` and,
+when configured, writes through to a ``SQLiteCache`` so results survive the
+process. Both work on batches: ``get_many`` returns only the keys that are
+present and fresh, ``put_many`` stores a mapping of results.
+
+Persistent entries are scoped by namespace (usually the client class) and
+version; bumping the version of a namespace invalidates everything stored
+under older versions, which are pruned when the cache is opened.
+"""
+
+import abc
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+
+# Keys per SELECT ... IN (...) statement (SQLite's default variable limit is 999)
+SQLITE_BATCH_SIZE = 500
+
+# Open connections by resolved database path: [connection, lock, users]
+_connections: Dict[str, list] = {}
+_connections_lock = threading.Lock()
+
+
+def _acquire_connection(path: Path) -> Tuple[sqlite3.Connection, threading.Lock]:
+    """Return the shared connection to ``path`` (and its lock), opening it if needed."""
+    key = str(path.resolve())
+    with _connections_lock:
+        entry = _connections.get(key)
+        if entry is None:
+            entry = [sqlite3.connect(key, check_same_thread=False), threading.Lock(), 0]
+            _connections[key] = entry
+        entry[2] += 1
+        return entry[0], entry[1]
+
+
+def _release_connection(path: Path) -> None:
+    """Drop one user of the shared connection to ``path``; the last one closes it."""
+    key = str(path.resolve())
+    with _connections_lock:
+        entry = _connections.get(key)
+        if entry is None:
+            return
+        entry[2] -= 1
+        if entry[2] <= 0:
+            del _connections[key]
+            with entry[1]:
+                entry[0].close()
+
+
+class CacheBackend(abc.ABC):
+    """Batch key/value cache."""
+
+    @abc.abstractmethod
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Return the fresh entries among ``keys``."""
+
+    @abc.abstractmethod
+    def put_many(self, items: Dict[str, Any]) -> None:
+        """Store ``items``, replacing existing entries."""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Remove every entry."""
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        """Number of stored entries."""
+
+    def close(self) -> None:
+        """Release resources held by the backend."""
+
+
+class LRUCache(CacheBackend):
+    """In-memory least-recently-used cache with an optional TTL."""
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            max_size: Maximum entries; the least recently used is evicted first
+            ttl: Seconds an entry stays valid (no expiry if None)
+            clock: Time source, injectable for tests
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        now = self._clock()
+        found = {}
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= now:
+                del self._entries[key]
+                continue
+            self._entries.move_to_end(key)
+            found[key] = value
+        return found
+
+    def put_many(self, items: Dict[str, Any]) -> None:
+        if self.max_size <= 0:
+            return
+        expires_at = self._clock() + self.ttl if self.ttl is not None else None
+        for key, value in items.items():
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return bool(self.get_many([key]))
+
+
+class SQLiteCache(CacheBackend):
+    """Persistent cache in a local SQLite file, values stored as JSON.
+
+    Caches on the same file share one connection, which is closed when the
+    last of them is closed.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        namespace: str = "default",
+        version: str = "1",
+        ttl: Optional[float] = None,
+    ):
+        """
+        Args:
+            path: Database file; created if missing
+            namespace: Scope of the entries (e.g. the client class name)
+            version: Entries stored under other versions of the namespace
+                are ignored and pruned
+            ttl: Seconds an entry stays valid (no expiry if None)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.namespace = namespace
+        self.version = str(version)
+        self.ttl = ttl
+        self._conn, self._lock = _acquire_connection(self.path)
+        self._closed = False
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " namespace TEXT NOT NULL, version TEXT NOT NULL, key TEXT NOT NULL,"
+                " value TEXT NOT NULL, expires_at REAL,"
+                " PRIMARY KEY (namespace, version, key))"
+            )
+            # Prune stale versions and expired entries of this namespace
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ?"
+                " AND (version != ? OR expires_at <= ?)",
+                (self.namespace, self.version, time.time()),
+            )
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = list(dict.fromkeys(keys))
+        now = time.time()
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), SQLITE_BATCH_SIZE):
+                chunk = keys[start : start + SQLITE_BATCH_SIZE]
+                rows = self._conn.execute(
+                    "SELECT key, value FROM cache_entries"
+                    " WHERE namespace = ? AND version = ?"
+                    " AND (expires_at IS NULL OR expires_at > ?)"
+                    f" AND key IN ({','.join('?' * len(chunk))})",
+                    (self.namespace, self.version, now, *chunk),
+                )
+                found.update((key, json.loads(value)) for key, value in rows)
+        return found
+
+    def put_many(self, items: Dict[str, Any]) -> None:
+        if not items:
+            return
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        rows = [
+            (self.namespace, self.version, key, json.dumps(value), expires_at)
+            for key, value in items.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache_entries"
+                " (namespace, version, key, value, expires_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ? AND version = ?",
+                (self.namespace, self.version),
+            ).fetchone()
+        return count
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            _release_connection(self.path)
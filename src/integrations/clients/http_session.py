@@ -0,0 +1,110 @@
+"""Long-lived aiohttp connection pools shared by API clients.
+
+Opening an ``aiohttp.ClientSession`` per request pays for DNS lookup, TCP
+and TLS setup on every call and defeats keep-alive. A ``SessionPool`` keeps
+one session per event loop instead; ``shared_session_pool`` registers one
+pool per name and connection settings with the process-wide resource
+registry, so every client instance reuses the same connections and the
+action pool closes them on shutdown.
+"""
+
+import asyncio
+import logging
+import weakref
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+
+from core.infrastructure.action_pool import shared_resources
+
+logger = logging.getLogger(__name__)
+
+
+class SessionPool:
+    """One ``aiohttp.ClientSession`` per running event loop."""
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Configure the pool.
+
+        Args:
+            limit: Maximum open connections per session
+            limit_per_host: Maximum open connections per host
+            headers: Default headers sent with every request
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.headers = headers or {}
+        # Sessions are bound to the loop that created them
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def session(self) -> aiohttp.ClientSession:
+        """Session for the running event loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit, limit_per_host=self.limit_per_host
+            )
+            session = aiohttp.ClientSession(connector=connector, headers=self.headers)
+            self._sessions[loop] = session
+        return session
+
+    @property
+    def settings(self) -> Tuple[int, int, Tuple[Tuple[str, str], ...]]:
+        """Connection settings identifying the pool in the registry."""
+        return (self.limit, self.limit_per_host, tuple(sorted(self.headers.items())))
+
+    async def close(self) -> None:
+        """Close the sessions of every event loop.
+
+        A session whose loop still runs in another thread is closed on that
+        loop; sessions of the running loop or of stopped loops are closed
+        here.
+        """
+        loop = asyncio.get_running_loop()
+        sessions = list(self._sessions.items())
+        self._sessions.clear()
+        for session_loop, session in sessions:
+            if session.closed:
+                continue
+            try:
+                if session_loop is not loop and session_loop.is_running():
+                    await asyncio.wrap_future(
+                        asyncio.run_coroutine_threadsafe(session.close(), session_loop)
+                    )
+                else:
+                    await session.close()
+            except Exception as e:
+                logger.warning(f"Failed to close HTTP session: {e}")
+
+
+def shared_session_pool(
+    name: str,
+    limit: int = 100,
+    limit_per_host: int = 10,
+    headers: Optional[Dict[str, str]] = None,
+) -> SessionPool:
+    """
+    Process-wide pool for ``name`` (e.g. ``"uniprot"``) and these settings.
+
+    Clients asking for different connection settings get separate pools,
+    so a later client's limits are never silently ignored.
+
+    Args:
+        name: Pool name; clients of the same service should share one
+        limit: Maximum open connections per session
+        limit_per_host: Maximum open connections per host
+        headers: Default headers sent with every request
+    """
+    pool = SessionPool(limit=limit, limit_per_host=limit_per_host, headers=headers)
+    return shared_resources.get_or_create(
+        ("http_session_pool", name, pool.settings), lambda: pool
+    )
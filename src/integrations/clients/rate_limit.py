@@ -0,0 +1,59 @@
+"""Token-bucket rate limiting for API clients.
+
+A global "sleep until the minimum interval has passed" limiter serializes
+every request, so concurrent batches gain nothing. A ``TokenBucket`` allows
+``rate`` requests per second on average with bursts of up to ``capacity``,
+and callers only wait for their own token: requests already in flight are
+unaffected and new ones are released as tokens accrue.
+"""
+
+import asyncio
+import math
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """Asynchronous token bucket."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst (defaults to one second of tokens, at least 1)
+            clock: Time source, injectable for tests
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, float(math.ceil(rate)))
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """
+        Take one token, waiting until it is available.
+
+        Returns:
+            Seconds waited
+        """
+        self._refill()
+        # Reserve the token now (the balance may go negative) so concurrent
+        # callers queue behind each other instead of racing for the refill
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        wait = -self._tokens / self.rate
+        await asyncio.sleep(wait)
+        return wait
@@ -13,10 +13,12 @@ from typing import Dict, List, Optional, Any, Tuple, Set
 from src.core.exceptions import ClientInitializationError, ClientExecutionError
 from typing import Dict, List, Optional, Any, Tuple, Set  # Added Set
 
+from .accession_history import AccessionHistoryTable
 from .base_client import (
     BaseMappingClient,
     CachedMappingClientMixin,
 )
+from .http_session import shared_session_pool
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +26,12 @@ logger = logging.getLogger(__name__)
 UNIPROT_REST_BASE_URL = "https://rest.uniprot.org/uniprotkb"
 UNIPROT_API_SEARCH_URL = f"{UNIPROT_REST_BASE_URL}/search"
 DEFAULT_REQUEST_TIMEOUT = 30  # seconds
+DEFAULT_MAX_CONCURRENT_REQUESTS = 5
+# Batches hold at most this many IDs, and their longest query (the
+# "(sec_acc:...) OR ..." form) at most this many characters, keeping the
+# request URL well below UniProt's length limit
+DEFAULT_BATCH_SIZE = 50
+MAX_QUERY_LENGTH = 2000
 
 
 class UniProtHistoricalResolverClient(CachedMappingClientMixin, BaseMappingClient):
@@ -63,7 +71,17 @@ class UniProtHistoricalResolverClient(CachedMappingClientMixin, BaseMappingClien
         # Initialize client-specific attributes
         self.base_url = base_url
         self.timeout = timeout
-        self.semaphore = asyncio.Semaphore(5)  # Limit concurrent requests
+        # Limit concurrent requests
+        self.semaphore = asyncio.Semaphore(
+            self.get_config_value("max_concurrent_requests", DEFAULT_MAX_CONCURRENT_REQUESTS)
+        )
+        # Connections are pooled across all client instances
+        self.session_pool = shared_session_pool(
+            "uniprot",
+            limit_per_host=self.get_config_value(
+                "max_concurrent_requests", DEFAULT_MAX_CONCURRENT_REQUESTS
+            ),
+        )
 
         # Mark as initialized
         self._initialized = True
@@ -91,27 +109,29 @@ class UniProtHistoricalResolverClient(CachedMappingClientMixin, BaseMappingClien
 
         try:
             async with self.semaphore:
-                async with aiohttp.ClientSession(timeout=request_timeout) as session:
-                    logger.debug(
-                        f"Querying UniProt REST API: {self.base_url} with params: {params}"
-                    )
-                    logger.info(f"UniProtClient DEBUG: Querying UniProt with: {query}")
-                    async with session.get(self.base_url, params=params) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            logger.info(
-                                f"UniProtClient DEBUG: Response for query [{query}]: {len(data.get('results', []))} results"
-                            )
-                            return data
-                        else:
-                            error_text = await response.text()
-                            error_msg = f"UniProt API error: Status {response.status}, Message: {error_text}"
-                            logger.error(error_msg)
-                            raise ClientExecutionError(
-                                error_msg,
-                                client_name=self.__class__.__name__,
-                                details={"query": query, "status": response.status},
-                            )
+                session = self.session_pool.session()
+                logger.debug(
+                    f"Querying UniProt REST API: {self.base_url} with params: {params}"
+                )
+                logger.info(f"UniProtClient DEBUG: Querying UniProt with: {query}")
+                async with session.get(
+                    self.base_url, params=params, timeout=request_timeout
+                ) as response:
+                    if response.status == 200:
+                        data = await response.json()
+                        logger.info(
+                            f"UniProtClient DEBUG: Response for query [{query}]: {len(data.get('results', []))} results"
+                        )
+                        return data
+                    else:
+                        error_text = await response.text()
+                        error_msg = f"UniProt API error: Status {response.status}, Message: {error_text}"
+                        logger.error(error_msg)
+                        raise ClientExecutionError(
+                            error_msg,
+                            client_name=self.__class__.__name__,
+                            details={"query": query, "status": response.status},
+                        )
         except aiohttp.ClientError as e:
             logger.error(f"HTTP Error querying UniProt API: {e}")
             raise ClientExecutionError(
@@ -462,6 +482,122 @@ class UniProtHistoricalResolverClient(CachedMappingClientMixin, BaseMappingClien
                     processed_ids.add(part)
         return list(processed_ids)
 
+    @staticmethod
+    def _plan_batches(
+        ids: List[str], max_batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> List[List[str]]:
+        """Split IDs into batches whose queries stay under MAX_QUERY_LENGTH.
+
+        Args:
+            ids: Identifiers to resolve.
+            max_batch_size: Maximum identifiers per batch.
+
+        Returns:
+            Batches in input order.
+        """
+        batches: List[List[str]] = []
+        batch: List[str] = []
+        query_length = 0
+        for acc_id in ids:
+            # "(sec_acc:<id>)" plus the " OR " separator
+            clause_length = len(acc_id) + 14
+            if batch and (
+                len(batch) >= max_batch_size
+                or query_length + clause_length > MAX_QUERY_LENGTH
+            ):
+                batches.append(batch)
+                batch, query_length = [], 0
+            batch.append(acc_id)
+            query_length += clause_length
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _to_mapping_result(
+        self, identifier: str, raw_result_dict: Dict[str, Any]
+    ) -> Tuple[Optional[List[str]], Optional[str]]:
+        """Turn a _resolve_batch entry into a (primary IDs, metadata) tuple."""
+        final_primary_ids: Optional[List[str]] = raw_result_dict.get("primary_ids")
+        metadata_str: Optional[str] = None
+
+        is_primary = raw_result_dict.get("is_primary", False)
+        is_secondary = raw_result_dict.get("is_secondary", False)
+        found = raw_result_dict.get("found", False)
+        api_error = raw_result_dict.get("api_error", False)
+
+        if api_error:
+            # API error occurred, mark as batch processing failed
+            metadata_str = f"error:batch_processing_failed:{raw_result_dict.get('api_error_message', 'Unknown API error')}"
+            final_primary_ids = None
+        elif is_primary:
+            metadata_str = "primary"
+            # Ensure final_primary_ids is [identifier] for primary, as per _resolve_batch convention
+            final_primary_ids = [identifier]
+        elif is_secondary:
+            if final_primary_ids and len(final_primary_ids) == 1:
+                metadata_str = f"secondary:{final_primary_ids[0]}"
+            elif final_primary_ids and len(final_primary_ids) > 1:  # Secondary that demerged
+                metadata_str = "demerged"
+                # primary_ids are already set correctly by _resolve_batch for this
+            else:  # is_secondary but no/empty primary_ids from _resolve_batch
+                metadata_str = "error:secondary_no_target"
+                final_primary_ids = None
+        elif found:  # Not primary, not secondary, but _resolve_batch marked as found
+            if final_primary_ids and len(final_primary_ids) > 1:
+                metadata_str = "demerged"
+            elif final_primary_ids and len(final_primary_ids) == 1:
+                # Found, one primary_id, but not categorized as primary or secondary by _resolve_batch.
+                # This indicates an unexpected state or a gap in _resolve_batch's classification.
+                metadata_str = "error:found_unclassified"
+                final_primary_ids = None
+            else:  # Found but no primary_ids or an empty list of primary_ids
+                metadata_str = "obsolete"  # Treat as obsolete if found but no valid primary IDs
+                final_primary_ids = None
+        else:  # Not found (found is False)
+            metadata_str = "obsolete"
+            final_primary_ids = None
+
+        # Fallback if metadata_str somehow wasn't set (should be covered by above logic)
+        if metadata_str is None:
+            metadata_str = "error:metadata_processing_failed"
+            final_primary_ids = None
+
+        # Ensure primary_ids is None if metadata indicates error or no resolution (e.g. "obsolete")
+        if metadata_str == "obsolete" or metadata_str.startswith("error:"):
+            final_primary_ids = None
+
+        return (final_primary_ids, metadata_str)
+
+    async def _process_batch(
+        self, batch: List[str], bypass_cache: bool
+    ) -> Dict[str, Tuple[Optional[List[str]], Optional[str]]]:
+        """Resolve one batch, convert the results and cache them.
+
+        Args:
+            batch: Preprocessed identifiers to resolve.
+            bypass_cache: Don't write results to the cache.
+
+        Returns:
+            Dictionary mapping identifiers to result tuples.
+        """
+        batch_results: Dict[str, Tuple[Optional[List[str]], Optional[str]]] = {}
+        try:
+            raw_results = await self._resolve_batch(batch)
+            for identifier, raw_result_dict in raw_results.items():
+                batch_results[identifier] = self._to_mapping_result(
+                    identifier, raw_result_dict
+                )
+        except Exception as e:
+            logger.error(f"Error processing batch {batch}: {str(e)}")
+            for identifier in batch:
+                batch_results.setdefault(
+                    identifier, (None, f"error:batch_processing_failed:{str(e)}")
+                )
+
+        if not bypass_cache:
+            await self._add_many_to_cache(batch_results)
+        return batch_results
+
     async def map_identifiers(
         self, identifiers: List[str], config: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Tuple[Optional[List[str]], Optional[str]]]:
@@ -510,12 +646,8 @@ class UniProtHistoricalResolverClient(CachedMappingClientMixin, BaseMappingClien
 
         # Filter out already cached identifiers if cache is enabled
         if not bypass_cache:
-            # Check cache for each identifier individually
-            cached_results = {}
-            for identifier in processed_identifiers:
-                cached_result = await self._get_from_cache(identifier)
-                if cached_result is not None:
-                    cached_results[identifier] = cached_result
+            # One cache lookup for all identifiers
+            cached_results = await self._get_many_from_cache(processed_identifiers)
 
             # Update results with cached entries and identify non-cached IDs
             non_cached_ids = []
@@ -549,87 +681,15 @@ class UniProtHistoricalResolverClient(CachedMappingClientMixin, BaseMappingClien
             f"Resolving {len(non_cached_ids)} preprocessed UniProt IDs from API (total {len(processed_identifiers)} preprocessed, from {len(original_identifiers)} original requested)."
         )
 
-        # Process batches using preprocessed IDs
-        batch_size = 50  # UniProt recommends batching for multiple queries
-        for i in range(0, len(non_cached_ids), batch_size):
-            batch = non_cached_ids[i : i + batch_size]
-            try:
-                batch_results_for_processed = await self._resolve_batch(batch)
-                for identifier, raw_result_dict in batch_results_for_processed.items():
-                    final_primary_ids: Optional[List[str]] = raw_result_dict.get(
-                        "primary_ids"
-                    )
-                    metadata_str: Optional[str] = None
-
-                    is_primary = raw_result_dict.get("is_primary", False)
-                    is_secondary = raw_result_dict.get("is_secondary", False)
-                    found = raw_result_dict.get("found", False)
-                    api_error = raw_result_dict.get("api_error", False)
-
-                    if api_error:
-                        # API error occurred, mark as batch processing failed
-                        metadata_str = f"error:batch_processing_failed:{raw_result_dict.get('api_error_message', 'Unknown API error')}"
-                        final_primary_ids = None
-                    elif is_primary:
-                        metadata_str = "primary"
-                        # Ensure final_primary_ids is [identifier] for primary, as per _resolve_batch convention
-                        final_primary_ids = [identifier]
-                    elif is_secondary:
-                        if final_primary_ids and len(final_primary_ids) == 1:
-                            metadata_str = f"secondary:{final_primary_ids[0]}"
-                        elif (
-                            final_primary_ids and len(final_primary_ids) > 1
-                        ):  # Secondary that demerged
-                            metadata_str = "demerged"
-                            # primary_ids are already set correctly by _resolve_batch for this
-                        else:  # is_secondary but no/empty primary_ids from _resolve_batch
-                            metadata_str = "error:secondary_no_target"
-                            final_primary_ids = None
-                    elif (
-                        found
-                    ):  # Not primary, not secondary, but _resolve_batch marked as found
-                        if final_primary_ids and len(final_primary_ids) > 1:
-                            metadata_str = "demerged"
-                        elif final_primary_ids and len(final_primary_ids) == 1:
-                            # Found, one primary_id, but not categorized as primary or secondary by _resolve_batch.
-                            # This indicates an unexpected state or a gap in _resolve_batch's classification.
-                            metadata_str = "error:found_unclassified"
-                            final_primary_ids = None
-                        else:  # Found but no primary_ids or an empty list of primary_ids
-                            metadata_str = "obsolete"  # Treat as obsolete if found but no valid primary IDs
-                            final_primary_ids = None
-                    else:  # Not found (found is False)
-                        metadata_str = "obsolete"
-                        final_primary_ids = None
-
-                    # Fallback if metadata_str somehow wasn't set (should be covered by above logic)
-                    if metadata_str is None:
-                        metadata_str = "error:metadata_processing_failed"
-                        final_primary_ids = None
-
-                    # Ensure primary_ids is None if metadata indicates error or no resolution (e.g. "obsolete")
-                    if metadata_str == "obsolete" or metadata_str.startswith("error:"):
-                        final_primary_ids = None
-
-                    transformed_result: Tuple[Optional[List[str]], Optional[str]] = (
-                        final_primary_ids,
-                        metadata_str,
-                    )
-
-                    processed_results[identifier] = transformed_result
-                    if not bypass_cache:
-                        await self._add_to_cache(identifier, transformed_result)
-            except Exception as e:
-                logger.error(f"Error processing batch {batch}: {str(e)}")
-                for identifier in batch:
-                    if (
-                        identifier not in processed_results
-                        or processed_results[identifier][1] == "error:not_processed"
-                    ):
-                        error_result = (None, f"error:batch_processing_failed:{str(e)}")
-                        processed_results[identifier] = error_result
-                        if not bypass_cache:
-                            await self._add_to_cache(identifier, error_result)
+        # Dispatch all batches at once; the semaphore bounds requests in flight
+        batches = self._plan_batches(
+            non_cached_ids,
+            self.get_config_value("batch_size", DEFAULT_BATCH_SIZE),
+        )
+        for batch_results in await asyncio.gather(
+            *(self._process_batch(batch, bypass_cache) for batch in batches)
+        ):
+            processed_results.update(batch_results)
 
         # Map processed_results back to original_identifiers for the final output
         final_results: Dict[str, Tuple[Optional[List[str]], Optional[str]]] = {}
@@ -752,6 +812,27 @@ class UniProtHistoricalResolverClient(CachedMappingClientMixin, BaseMappingClien
 
         return final_results
 
+    async def load_history(
+        self,
+        history: AccessionHistoryTable,
+        accessions: Optional[List[str]] = None,
+    ) -> int:
+        """Seed the cache with resolutions from a local accession history table.
+
+        With a persistent cache configured, later runs resolve these
+        accessions without calling the API.
+
+        Args:
+            history: Table, e.g. loaded from UniProt sec_ac/delac dumps.
+            accessions: Accessions to load (every stored one if None).
+
+        Returns:
+            Number of accessions added to the cache.
+        """
+        results = await asyncio.to_thread(history.mapping_results, accessions)
+        await self._add_many_to_cache(results)
+        return len(results)
+
     async def reverse_map_identifiers(
         self, identifiers: List[str], config: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Tuple[Optional[List[str]], Optional[str]]]:
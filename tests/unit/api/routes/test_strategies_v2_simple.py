@@ -322,6 +322,31 @@ class TestJobStatusEndpoints:
         data = response.json()
         assert data == test_result
     
+    def test_get_job_results_previews_dataset_handles(self, client, clear_jobs):
+        """DatasetHandle datasets are returned as their first 100 records."""
+        import pandas as pd
+        from src.core.standards.dataset_handle import DatasetHandle
+
+        job_id = str(uuid.uuid4())
+        jobs[job_id] = {
+            "id": job_id,
+            "status": "completed",
+            "strategy_name": "test_strategy",
+            "result": {
+                "datasets": {
+                    "small": DatasetHandle(pd.DataFrame({"id": ["P1", "P2"]})),
+                    "large": DatasetHandle(pd.DataFrame({"id": range(250)})),
+                }
+            },
+        }
+
+        response = client.get(f"/api/strategies/v2/jobs/{job_id}/results")
+
+        assert response.status_code == 200
+        datasets = response.json()["datasets"]
+        assert datasets["small"] == [{"id": "P1"}, {"id": "P2"}]
+        assert datasets["large"] == [{"id": i} for i in range(100)]
+
     def test_get_job_results_not_found(self, client, clear_jobs):
         """Test getting results for non-existent job."""
         nonexistent_job_id = str(uuid.uuid4())
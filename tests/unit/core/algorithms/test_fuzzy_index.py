@@ -0,0 +1,165 @@
+"""Tests for fuzzy_index.py."""
+
+import random
+import string
+
+import pytest
+from fuzzywuzzy import fuzz
+
+from actions.algorithms.fuzzy_matching.fuzzy_index import (
+    FuzzyIndex,
+    token_sort_key,
+)
+
+
+def _random_names(count, seed=7):
+    rng = random.Random(seed)
+    words = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+        for _ in range(300)
+    ]
+    return [" ".join(rng.sample(words, rng.randint(1, 4))) for _ in range(count)]
+
+
+class TestFuzzyIndex:
+    """Test candidate pruning and scoring."""
+
+    def test_token_sort_key(self):
+        assert token_sort_key("Cholesterol, Total") == "cholesterol total"
+        assert token_sort_key(None) == ""
+
+    def test_scores_match_token_sort_ratio(self):
+        index = FuzzyIndex(["total cholesterol", "glucose", "hdl cholesterol"])
+
+        [best] = index.best_matches(["cholesterol totl"])
+
+        assert best.key == "cholesterol total"
+        assert round(best.score) == fuzz.token_sort_ratio(
+            "cholesterol totl", "total cholesterol"
+        )
+
+    def test_duplicate_names_keep_all_payloads(self):
+        index = FuzzyIndex(
+            ["Glucose", "glucose", "Lactate"],
+            payloads=[{"id": "HMDB1"}, {"id": "HMDB2"}, {"id": "HMDB3"}],
+        )
+
+        [best] = index.best_matches(["glucose"])
+
+        assert len(index) == 2
+        assert [p["id"] for p in best.payloads] == ["HMDB1", "HMDB2"]
+
+    def test_cutoff_and_empty_queries(self):
+        index = FuzzyIndex(["glucose"])
+        assert index.best_matches(["tryptophan", ""], score_cutoff=85) == [None, None]
+        assert FuzzyIndex([]).best_matches(["glucose"]) == [None]
+
+    def test_length_window_is_exact_bound(self):
+        low, high = FuzzyIndex._length_window(20, 85)
+        # Any key outside the window cannot reach 85 even if it is a prefix
+        assert fuzz.ratio("a" * 20, "a" * (low - 1)) < 85
+        assert fuzz.ratio("a" * 20, "a" * (high + 1)) < 85
+        assert fuzz.ratio("a" * 20, "a" * low) >= 85
+
+    def test_candidates_for_blocking(self):
+        names = _random_names(500)
+        index = FuzzyIndex(names, payloads=range(len(names)), exhaustive_limit=0, max_candidates=20)
+
+        candidates = index.candidates(names[42])
+
+        assert 42 in candidates
+        assert len(candidates) < len(names) and candidates == sorted(candidates)
+        assert index.candidates("") == []
+
+    @pytest.mark.parametrize("cutoff", [0, 85])
+    def test_pruned_matches_exhaustive_search(self, cutoff):
+        names = _random_names(3000)
+        rng = random.Random(1)
+        # Queries are reference names with one typo
+        queries = []
+        for name in rng.sample(names, 200):
+            pos = rng.randrange(len(name))
+            queries.append(name[:pos] + "x" + name[pos + 1 :])
+
+        exhaustive = FuzzyIndex(names).best_matches(queries, score_cutoff=cutoff)
+        pruned = FuzzyIndex(names, exhaustive_limit=0, max_candidates=50)
+        assert not pruned.exhaustive
+
+        for expected, actual in zip(
+            exhaustive, pruned.best_matches(queries, score_cutoff=cutoff)
+        ):
+            assert (actual is None) == (expected is None)
+            if expected is not None:
+                assert actual.score == pytest.approx(expected.score)
+
+
+class TestFuzzyStringMatchIndex:
+    """Test METABOLITE_FUZZY_STRING_MATCH on top of the index."""
+
+    @pytest.mark.asyncio
+    async def test_matches_and_reuses_index(self):
+        from actions.entities.metabolites.matching.fuzzy_string_match import (
+            MetaboliteFuzzyStringMatch,
+            MetaboliteFuzzyStringMatchParams,
+        )
+
+        action = MetaboliteFuzzyStringMatch()
+        params = MetaboliteFuzzyStringMatchParams(
+            unmapped_key="unmapped", reference_key="reference"
+        )
+
+        def context():
+            return {
+                "datasets": {
+                    "unmapped": [
+                        {"name": "Glucose", "for_stage": 2},
+                        {"name": "Tryptophan", "for_stage": 2},
+                    ],
+                    "reference": [
+                        {"id": "HMDB0000122", "name": "Glucose"},
+                        {"id": "HMDB0000122b", "name": "glucose"},
+                        {"id": "HMDB0000190", "name": "Lactate"},
+                    ],
+                },
+                "statistics": {},
+            }
+
+        ctx = context()
+        result = await action.execute_typed(params, ctx)
+        index = action._index_cache[1]
+        await action.execute_typed(params, context())
+
+        assert result.success
+        assert result.total_matches == 1
+        [match] = ctx["datasets"]["fuzzy_matched"]
+        assert match["matched_id"] == "HMDB0000122"
+        assert match["matched_ids"] == ["HMDB0000122", "HMDB0000122b"]
+        assert match["fuzzy_score"] == 100
+        assert [u["name"] for u in ctx["datasets"]["fuzzy_unmapped"]] == ["Tryptophan"]
+        assert action._index_cache[1] is index
+
+    @pytest.mark.asyncio
+    async def test_index_rebuilt_for_new_records_with_same_names(self):
+        from actions.entities.metabolites.matching.fuzzy_string_match import (
+            MetaboliteFuzzyStringMatch,
+            MetaboliteFuzzyStringMatchParams,
+        )
+
+        action = MetaboliteFuzzyStringMatch()
+        params = MetaboliteFuzzyStringMatchParams(
+            unmapped_key="unmapped", reference_key="reference"
+        )
+
+        async def match(reference_id):
+            ctx = {
+                "datasets": {
+                    "unmapped": [{"name": "Glucose", "for_stage": 2}],
+                    "reference": [{"id": reference_id, "name": "Glucose"}],
+                },
+                "statistics": {},
+            }
+            await action.execute_typed(params, ctx)
+            return ctx["datasets"]["fuzzy_matched"][0]["matched_id"]
+
+        assert await match("HMDB0000122") == "HMDB0000122"
+        assert await match("CHEBI:17234") == "CHEBI:17234"
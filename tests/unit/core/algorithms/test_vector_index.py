@@ -0,0 +1,260 @@
+"""Tests for vector_index.py."""
+
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from actions.algorithms.fuzzy_matching import vector_index
+from actions.algorithms.fuzzy_matching.vector_index import VectorIndex, normalize_rows
+
+
+def _brute_force(queries, references, top_k, threshold=None):
+    q = np.asarray(queries, dtype=np.float64)
+    r = np.asarray(references, dtype=np.float64)
+    sims = (q / np.linalg.norm(q, axis=1, keepdims=True)) @ (
+        r / np.linalg.norm(r, axis=1, keepdims=True)
+    ).T
+    results = []
+    for row in sims:
+        ranked = sorted(enumerate(row), key=lambda x: -x[1])
+        results.append(
+            [(i, s) for i, s in ranked[:top_k] if threshold is None or s >= threshold]
+        )
+    return results
+
+
+def _clustered(count, dim=32, clusters=50, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    labels = rng.integers(clusters, size=count)
+    return (centers[labels] + 0.3 * rng.normal(size=(count, dim))).astype(np.float32)
+
+
+class TestVectorIndex:
+    """Test exact and approximate top-k search."""
+
+    def test_normalize_rows_keeps_zero_rows(self):
+        matrix = normalize_rows([[3.0, 4.0], [0.0, 0.0]])
+        assert matrix.dtype == np.float32 and matrix.flags.c_contiguous
+        np.testing.assert_allclose(matrix, [[0.6, 0.8], [0.0, 0.0]])
+
+    def test_exact_search_matches_brute_force(self):
+        rng = np.random.default_rng(1)
+        references = rng.normal(size=(500, 16))
+        queries = rng.normal(size=(40, 16))
+
+        results = VectorIndex(references).search(queries, top_k=7, threshold=0.1)
+
+        for actual, expected in zip(results, _brute_force(queries, references, 7, 0.1)):
+            assert [i for i, _ in actual] == [i for i, _ in expected]
+            np.testing.assert_allclose([s for _, s in actual], [s for _, s in expected], atol=1e-5)
+
+    def test_small_blocks_give_same_results(self, monkeypatch):
+        rng = np.random.default_rng(2)
+        references = rng.normal(size=(300, 8))
+        queries = rng.normal(size=(25, 8))
+        expected = VectorIndex(references).search(queries, top_k=3)
+
+        monkeypatch.setattr(vector_index, "MAX_BLOCK_ELEMENTS", 1000)
+        blocked = VectorIndex(references).search(queries, top_k=3, block_size=4)
+
+        for actual, reference in zip(blocked, expected):
+            assert [i for i, _ in actual] == [i for i, _ in reference]
+            np.testing.assert_allclose([s for _, s in actual], [s for _, s in reference], atol=1e-6)
+
+    def test_ids_threshold_and_edge_cases(self):
+        index = VectorIndex({"a": [1.0, 0.0], "b": [0.0, 1.0], "c": [0.0, 0.0]})
+
+        assert index.search([[1.0, 0.1]], top_k=5, threshold=0.5) == [
+            [("a", pytest.approx(0.995, abs=1e-3))]
+        ]
+        assert index.search([[0.0, 0.0]], top_k=1)[0][0][1] == 0.0
+        assert VectorIndex([]).search([[1.0, 0.0]]) == [[]]
+
+    def test_save_and_memory_map(self, tmp_path):
+        index = VectorIndex({"x": [1.0, 2.0], "y": [2.0, 1.0]})
+        path = tmp_path / "reference.npy"
+        index.save(path)
+
+        loaded = VectorIndex.load(path)
+
+        assert isinstance(loaded.matrix, np.memmap)
+        assert loaded.search([[1.0, 2.0]], top_k=2) == index.search([[1.0, 2.0]], top_k=2)
+
+    def test_numpy_ivf_with_all_lists_is_exact(self):
+        references = _clustered(2000)
+        queries = _clustered(50, seed=3)
+        exact = VectorIndex(references, ann="none").search(queries, top_k=5)
+
+        ivf = VectorIndex(references, ann="ivf", nprobe=10_000)
+
+        assert ivf.method == "ivf"
+        for actual, expected in zip(ivf.search(queries, top_k=5), exact):
+            assert [i for i, _ in actual] == [i for i, _ in expected]
+
+    def test_numpy_ivf_recall(self, monkeypatch):
+        monkeypatch.setattr(vector_index, "HAS_FAISS", False)
+        references = _clustered(5000)
+        queries = _clustered(200, seed=4)
+        exact = VectorIndex(references, ann="none").search(queries, top_k=1)
+
+        approx = VectorIndex(references, ann_min_size=1000, nprobe=8)
+
+        assert approx.method == "ivf"
+        found = approx.search(queries, top_k=1)
+        recall = np.mean([a[0][0] == e[0][0] for a, e in zip(found, exact)])
+        assert recall >= 0.9
+
+
+class TestSemanticMatchReferenceIndex:
+    """Test SEMANTIC_METABOLITE_MATCH on top of the index."""
+
+    @pytest.mark.asyncio
+    async def test_reference_matrix_is_saved_and_reused(self, tmp_path):
+        from actions.semantic_metabolite_match import (
+            EmbeddingCache,
+            SemanticMetaboliteMatchAction,
+            SemanticMetaboliteMatchParams,
+        )
+
+        params = SemanticMetaboliteMatchParams(
+            unmatched_dataset="arivale_unmatched",
+            reference_map="nightingale_reference",
+            context_fields={"arivale": ["name"], "nightingale": ["unified_name"]},
+            output_key="matches",
+            reference_index_path=str(tmp_path / "nightingale.npy"),
+        )
+        vectors = {
+            "Glucose": [1.0, 0.0, 0.0],
+            "Total cholesterol": [0.0, 1.0, 0.0],
+            "glucose": [0.99, 0.05, 0.0],
+        }
+
+        async def fake_batch(metabolites, fields, dataset_name, model, batch_size, failed=None):
+            calls.append(dataset_name)
+            return {
+                i: vectors[m.get("name") or m.get("unified_name")]
+                for i, m in enumerate(metabolites)
+            }
+
+        client = MagicMock()
+        client.chat.completions.create.return_value.choices = [
+            MagicMock(message=MagicMock(content="YES|0.9|Same compound"))
+        ]
+
+        for _ in range(2):
+            calls = []
+            action = SemanticMetaboliteMatchAction()
+            action.openai_client = client
+            action.embedding_cache = EmbeddingCache()
+            action._generate_embeddings_batch = AsyncMock(side_effect=fake_batch)
+            context = {
+                "datasets": {
+                    "arivale_unmatched": [{"name": "glucose"}],
+                    "nightingale_reference": [
+                        {"unified_name": "Total cholesterol"},
+                        {"unified_name": "Glucose"},
+                    ],
+                }
+            }
+            with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
+                result = await action.execute_typed(
+                    [], "metabolite", params, None, None, context
+                )
+
+            assert result.data["matched_count"] == 1
+            assert context["datasets"]["matches"][0]["matched_name"] == "Glucose"
+
+        # The second run memory-maps the saved matrix instead of re-embedding
+        assert calls == ["arivale_unmatched"]
+
+    @pytest.mark.asyncio
+    async def test_reference_matrix_rebuilt_when_references_change(self, tmp_path):
+        from actions.semantic_metabolite_match import (
+            EmbeddingCache,
+            SemanticMetaboliteMatchAction,
+            SemanticMetaboliteMatchParams,
+        )
+
+        vectors = {"Glucose": [1.0, 0.0], "Lactate": [0.0, 1.0]}
+        calls = []
+
+        async def fake_batch(metabolites, fields, dataset_name, model, batch_size, failed=None):
+            calls.append((model, [m["unified_name"] for m in metabolites]))
+            return {i: vectors[m["unified_name"]] for i, m in enumerate(metabolites)}
+
+        async def build(names, model):
+            params = SemanticMetaboliteMatchParams(
+                unmatched_dataset="arivale_unmatched",
+                reference_map="nightingale_reference",
+                context_fields={"nightingale": ["unified_name"]},
+                embedding_model=model,
+                output_key="matches",
+                reference_index_path=str(tmp_path / "nightingale.npy"),
+            )
+            action = SemanticMetaboliteMatchAction()
+            action.embedding_cache = EmbeddingCache()
+            action._generate_embeddings_batch = AsyncMock(side_effect=fake_batch)
+            reference = [{"unified_name": name} for name in names]
+            return await action._build_reference_index(reference, ["unified_name"], params)
+
+        await build(["Glucose"], "model-a")
+        await build(["Glucose"], "model-a")
+        # Same row count, different reference or model: stale vectors are not reused
+        index = await build(["Lactate"], "model-a")
+        await build(["Lactate"], "model-b")
+
+        assert calls == [
+            ("model-a", ["Glucose"]),
+            ("model-a", ["Lactate"]),
+            ("model-b", ["Lactate"]),
+        ]
+        assert index.search([[0.0, 1.0]], top_k=1)[0][0][0] == 0
+
+    @pytest.mark.asyncio
+    async def test_reference_matrix_not_saved_with_failed_embeddings(self, tmp_path):
+        from actions.semantic_metabolite_match import (
+            EmbeddingCache,
+            SemanticMetaboliteMatchAction,
+            SemanticMetaboliteMatchParams,
+        )
+
+        path = tmp_path / "nightingale.npy"
+        params = SemanticMetaboliteMatchParams(
+            unmatched_dataset="arivale_unmatched",
+            reference_map="nightingale_reference",
+            context_fields={"nightingale": ["unified_name"]},
+            output_key="matches",
+            batch_size=1,
+            reference_index_path=str(path),
+        )
+        reference = [{"unified_name": "Glucose"}, {"unified_name": "Lactate"}]
+
+        def embed(input, model):
+            if failing and "Lactate" in input[0]:
+                raise RuntimeError("rate limited")
+            return MagicMock(data=[MagicMock(embedding=[1.0, 0.0]) for _ in input])
+
+        async def build():
+            action = SemanticMetaboliteMatchAction()
+            action.openai_client = MagicMock()
+            action.openai_client.embeddings.create.side_effect = embed
+            action.embedding_cache = EmbeddingCache()
+            return await action._build_reference_index(reference, ["unified_name"], params)
+
+        failing = True
+        index = await build()
+
+        # The zero row is used for this run but never persisted
+        assert len(index) == 2
+        assert not path.exists()
+        assert not Path(f"{path}.meta.json").exists()
+
+        failing = False
+        await build()
+
+        assert path.exists()
+        assert np.load(path).any(axis=1).all()
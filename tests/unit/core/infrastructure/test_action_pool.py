@@ -0,0 +1,200 @@
+"""Tests for action_pool.py."""
+
+import pytest
+
+from core.infrastructure.action_pool import ActionPool, SharedResources
+
+
+class CountingAction:
+    """Action stub that records instantiations and lifecycle calls."""
+
+    instances = 0
+
+    def __init__(self):
+        CountingAction.instances += 1
+        self.warmed = 0
+        self.closed = False
+
+    async def warmup(self):
+        self.warmed += 1
+
+    async def close(self):
+        self.closed = True
+
+
+class SyncHookAction:
+    """Action stub with synchronous hooks."""
+
+    def __init__(self):
+        self.warmed = False
+
+    def warmup(self):
+        self.warmed = True
+
+
+class FailingWarmupAction:
+    """Action stub whose warmup raises."""
+
+    async def warmup(self):
+        raise RuntimeError("model not available")
+
+
+class ClosableResource:
+    """Shared resource stub."""
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestSharedResources:
+    """Test SharedResources registry."""
+
+    def test_get_or_create_builds_once(self):
+        resources = SharedResources()
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return object()
+
+        first = resources.get_or_create(("model", "a"), factory)
+        second = resources.get_or_create(("model", "a"), factory)
+
+        assert first is second
+        assert len(calls) == 1
+        assert ("model", "a") in resources
+
+    def test_distinct_keys_distinct_resources(self):
+        resources = SharedResources()
+        a = resources.get_or_create("a", object)
+        b = resources.get_or_create("b", object)
+        assert a is not b
+        assert len(resources) == 2
+
+    def test_discard(self):
+        resources = SharedResources()
+        resources.get_or_create("a", object)
+        resources.discard("a")
+        assert "a" not in resources
+        resources.discard("missing")  # no error
+
+    @pytest.mark.asyncio
+    async def test_close_closes_and_clears(self):
+        resources = SharedResources()
+        resource = resources.get_or_create("r", ClosableResource)
+        resources.get_or_create("plain", object)
+
+        await resources.close()
+
+        assert resource.closed
+        assert len(resources) == 0
+
+
+class TestActionPool:
+    """Test ActionPool lifecycle."""
+
+    @pytest.fixture
+    def pool(self):
+        return ActionPool(resources=SharedResources())
+
+    def test_get_instantiates_once(self, pool):
+        CountingAction.instances = 0
+        first = pool.get(CountingAction)
+        second = pool.get(CountingAction)
+
+        assert first is second
+        assert CountingAction.instances == 1
+        assert CountingAction in pool
+        assert len(pool) == 1
+
+    @pytest.mark.asyncio
+    async def test_warmup_runs_hook_once(self, pool):
+        await pool.warmup([CountingAction, SyncHookAction])
+        await pool.warmup([CountingAction])
+
+        assert pool.get(CountingAction).warmed == 1
+        assert pool.get(SyncHookAction).warmed is True
+
+    @pytest.mark.asyncio
+    async def test_warmup_failure_is_not_fatal(self, pool):
+        await pool.warmup([FailingWarmupAction])
+        assert FailingWarmupAction in pool
+
+    @pytest.mark.asyncio
+    async def test_close_runs_hooks_and_releases_resources(self, pool):
+        action = pool.get(CountingAction)
+        resource = pool.resources.get_or_create("r", ClosableResource)
+
+        await pool.close()
+
+        assert action.closed
+        assert resource.closed
+        assert len(pool) == 0
+        assert pool.get(CountingAction) is not action
+
+    @pytest.mark.asyncio
+    async def test_lease_hands_out_distinct_instances_when_busy(self, pool):
+        async with pool.lease(CountingAction) as first:
+            assert first is pool.get(CountingAction)
+            async with pool.lease(CountingAction) as second:
+                assert second is not first
+        # The extra instance is reused rather than recreated
+        async with pool.lease(CountingAction):
+            async with pool.lease(CountingAction) as extra:
+                assert extra is second
+
+        await pool.close()
+        assert second.closed
+
+    def test_default_pool_is_shared(self):
+        assert ActionPool.default() is ActionPool.default()
+
+
+class TestMinimalStrategyServicePooling:
+    """Test that the strategy service reuses pooled action instances."""
+
+    @pytest.mark.asyncio
+    async def test_actions_instantiated_once_across_runs(self, tmp_path):
+        from core.minimal_strategy_service import MinimalStrategyService
+
+        (tmp_path / "pooled.yaml").write_text(
+            "name: POOLED\n"
+            "steps:\n"
+            "  - name: first\n"
+            "    action:\n"
+            "      type: COUNTING_ACTION\n"
+            "      params: {}\n"
+            "  - name: second\n"
+            "    action:\n"
+            "      type: COUNTING_ACTION\n"
+            "      params: {}\n"
+        )
+
+        created = []
+
+        class PooledCountingAction:
+            def __init__(self):
+                created.append(self)
+
+            async def execute(self, **kwargs):
+                return {"output_identifiers": [], "details": {}}
+
+        pool = ActionPool(resources=SharedResources())
+        service = MinimalStrategyService(str(tmp_path), action_pool=pool)
+        service.action_registry = {"COUNTING_ACTION": PooledCountingAction}
+
+        await service.execute_strategy("POOLED")
+        await service.execute_strategy("POOLED")
+        assert len(created) == 1
+
+        # A second service sharing the pool reuses the same instance
+        other = MinimalStrategyService(str(tmp_path), action_pool=pool)
+        other.action_registry = {"COUNTING_ACTION": PooledCountingAction}
+        await other.execute_strategy("POOLED")
+        assert len(created) == 1
+
+        await service.close()
+        assert len(pool) == 0
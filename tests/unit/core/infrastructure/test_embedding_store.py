@@ -0,0 +1,79 @@
+"""Tests for embedding_store.py."""
+
+import numpy as np
+import pytest
+
+from core.infrastructure.embedding_store import DIGEST_SIZE, EmbeddingStore
+
+
+class TestEmbeddingStore:
+    """Test appends, reopening, repair and compaction."""
+
+    def test_round_trip_and_reopen(self, tmp_path):
+        store = EmbeddingStore(tmp_path)
+        store.put_many(["a", "b"], [[1.0, 2.0], [3.0, 4.0]])
+        store.put("c", np.array([5.0, 6.0]))
+
+        assert len(store) == 3 and "b" in store and "z" not in store
+        assert store.get("z") is None
+
+        reopened = EmbeddingStore(tmp_path)
+        vectors = reopened.get_many(["c", "z", "a"])
+        np.testing.assert_array_equal(vectors[0], [5.0, 6.0])
+        assert vectors[1] is None
+        np.testing.assert_array_equal(vectors[2], [1.0, 2.0])
+        assert vectors[0].dtype == np.float32 and not vectors[0].flags.writeable
+
+    def test_reads_see_later_appends(self, tmp_path):
+        store = EmbeddingStore(tmp_path)
+        store.put("a", [1.0])
+        assert store.get("a")[0] == 1.0
+
+        store.put("b", [2.0])
+        assert store.get("b")[0] == 2.0
+
+    def test_dimension_mismatch(self, tmp_path):
+        store = EmbeddingStore(tmp_path)
+        store.put("a", [1.0, 2.0])
+        with pytest.raises(ValueError, match="dimension"):
+            store.put("b", [1.0, 2.0, 3.0])
+        with pytest.raises(ValueError, match="one vector per text"):
+            store.put_many(["c", "d"], [[1.0, 2.0]])
+
+    def test_torn_append_is_truncated(self, tmp_path):
+        store = EmbeddingStore(tmp_path)
+        store.put_many(["a", "b"], [[1.0, 2.0], [3.0, 4.0]])
+        # Simulate a crash after the vector append of a third row
+        with open(store._vectors_path, "ab") as f:
+            f.write(np.array([9.0, 9.0], dtype=np.float32).tobytes()[:6])
+
+        reopened = EmbeddingStore(tmp_path)
+
+        assert len(reopened) == 2
+        assert reopened._vectors_path.stat().st_size == 2 * 2 * 4
+        assert reopened._keys_path.stat().st_size == 2 * DIGEST_SIZE
+        reopened.put("c", [5.0, 6.0])
+        np.testing.assert_array_equal(EmbeddingStore(tmp_path).get("c"), [5.0, 6.0])
+
+    def test_compact_keeps_latest_rows(self, tmp_path):
+        store = EmbeddingStore(tmp_path)
+        store.put_many(["a", "b"], [[1.0], [2.0]])
+        store.put("a", [3.0])
+        assert store.stale_rows == 1
+        old_vectors = store._vectors_path
+
+        assert store.compact() == 1
+
+        assert store.stale_rows == 0 and not old_vectors.exists()
+        reopened = EmbeddingStore(tmp_path)
+        assert reopened.generation == 1
+        assert reopened.get("a")[0] == 3.0 and reopened.get("b")[0] == 2.0
+        assert store.compact() == 0
+
+    def test_shared_instance_per_model(self, tmp_path):
+        store = EmbeddingStore.for_model(tmp_path, "fastembed-sentence-transformers/all-MiniLM")
+
+        assert store is EmbeddingStore.for_model(tmp_path, "fastembed-sentence-transformers/all-MiniLM")
+        assert store is not EmbeddingStore.for_model(tmp_path, "text-embedding-ada-002")
+        assert store.directory.parent == tmp_path.resolve()
+        assert "/" not in store.directory.name
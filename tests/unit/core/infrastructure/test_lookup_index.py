@@ -0,0 +1,71 @@
+"""Tests for lookup_index.py."""
+
+import pytest
+
+from core.infrastructure import lookup_index
+from core.infrastructure.lookup_index import LookupIndex, StringColumn
+
+
+@pytest.fixture
+def index():
+    return LookupIndex.build(
+        tables={
+            "names": {"Cholesterol": "LM1", "Oléic acid": "LM2", "Orphan": "LM9"},
+            "synonyms": {"C27": "LM1"},
+        },
+        records={
+            "LM1": {"COMMON_NAME": "Cholesterol", "FORMULA": "C27H46O"},
+            "LM2": {"COMMON_NAME": "Oléic acid", "FORMULA": float("nan")},
+        },
+        meta={"version": "202501"},
+    )
+
+
+class TestLookupIndex:
+    """Test building, saving, memory-mapping and column lookups."""
+
+    def test_lookup_column(self, index):
+        rows = index.lookup("names", ["Oléic acid", "missing", "Cholesterol", "Oléic acid", "Orphan"])
+
+        assert index.record_ids(rows) == ["LM2", "", "LM1", "LM2", "LM9"]
+        assert index.field("COMMON_NAME", rows) == ["Oléic acid", "", "Cholesterol", "Oléic acid", ""]
+        assert index.field("FORMULA", rows)[:3] == ["", "", "C27H46O"]
+        assert index.field("UNKNOWN", rows) == [""] * 5
+        assert index.lookup("no_such_table", ["Cholesterol"]).tolist() == [-1]
+        assert index.lookup("names", []).tolist() == []
+
+    def test_save_and_memory_map(self, index, tmp_path):
+        path = tmp_path / "static.idx"
+        index.save(path)
+
+        loaded = LookupIndex.open(path)
+
+        # Read-only views of the mapped file, not copies
+        hashes = loaded.tables["names"].hashes
+        assert not hashes.flags.owndata and not hashes.flags.writeable
+        assert loaded.meta == {"version": "202501"}
+        assert len(loaded) == 3 and loaded.table_size("synonyms") == 1
+        keys = ["C27", "Cholesterol", "x"]
+        for table in ("names", "synonyms"):
+            assert loaded.record_ids(loaded.lookup(table, keys)) == index.record_ids(
+                index.lookup(table, keys)
+            )
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "static.json"
+        path.write_text("{}")
+
+        with pytest.raises(ValueError):
+            LookupIndex.open(path)
+
+    def test_hash_collisions_are_resolved_by_key(self, monkeypatch):
+        monkeypatch.setattr(lookup_index, "key_hash", lambda key: 7)
+        index = LookupIndex.build({"t": {"a": "A", "b": "B", "c": "C"}}, {})
+
+        assert index.record_ids(index.lookup("t", ["c", "a", "d", "b"])) == ["C", "A", "", "B"]
+
+    def test_string_column_take(self):
+        column = StringColumn.from_strings(["", "β-alanine", "x"])
+
+        assert column.take([1, -1, 0, 2]) == ["β-alanine", "", "", "x"]
+        assert column[1] == "β-alanine"
@@ -0,0 +1,194 @@
+"""Tests for step_checkpoint.py."""
+
+import pandas as pd
+import pytest
+
+from core.infrastructure.action_pool import ActionPool, SharedResources
+from core.infrastructure.step_checkpoint import StepCheckpointStore
+from core.standards.dataset_handle import ChunkedDataset, DatasetHandle
+from core.universal_context import UniversalContext
+
+
+class TestStepCheckpointStore:
+    """Test key derivation and snapshot round-trips."""
+
+    def test_step_key_changes_with_params_and_predecessor(self):
+        step = {"name": "load", "action": {"type": "LOAD"}}
+        base = StepCheckpointStore.step_key("root", step, {"file_path": "a.csv"})
+
+        assert base == StepCheckpointStore.step_key("root", step, {"file_path": "a.csv"})
+        assert base != StepCheckpointStore.step_key("root", step, {"file_path": "b.csv"})
+        assert base != StepCheckpointStore.step_key("other", step, {"file_path": "a.csv"})
+
+    def test_step_key_tracks_input_file_contents(self, tmp_path):
+        data_file = tmp_path / "input.csv"
+        data_file.write_text("id\nA\n")
+        step = {"name": "load", "action": {"type": "LOAD"}}
+        before = StepCheckpointStore.step_key("root", step, {"file_path": str(data_file)})
+
+        data_file.write_text("id\nA\nB\n")
+        after = StepCheckpointStore.step_key("root", step, {"file_path": str(data_file)})
+
+        assert before != after
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        store = StepCheckpointStore(tmp_path)
+        handle = DatasetHandle(pd.DataFrame({"id": ["A", "B"], "score": [1.0, 0.5]}))
+        context = {
+            "datasets": {"proteins": handle, "legacy": [{"id": "C"}]},
+            "statistics": {"count": 2},
+            "current_identifiers": ["A", "B"],
+            "debug_tracer": object(),
+            "unpicklable": lambda: None,
+        }
+
+        store.save("k1", "load", context)
+        restored = StepCheckpointStore(tmp_path).load("k1")
+
+        assert store.has("k1")
+        assert restored["datasets"]["proteins"] == handle
+        assert restored["datasets"]["legacy"] == [{"id": "C"}]
+        assert restored["statistics"] == {"count": 2}
+        assert restored["current_identifiers"] == ["A", "B"]
+        assert "debug_tracer" not in restored
+        assert "unpicklable" not in restored
+
+    def test_unchanged_datasets_are_written_once(self, tmp_path):
+        store = StepCheckpointStore(tmp_path)
+        handle = DatasetHandle(pd.DataFrame({"id": ["A"]}))
+
+        store.save("k1", "a", {"datasets": {"x": handle}})
+        store.save("k2", "b", {"datasets": {"x": handle, "y": DatasetHandle(pd.DataFrame({"id": ["B"]}))}})
+
+        assert len(list((tmp_path / "blobs").iterdir())) == 2
+
+    def test_prune_removes_stale_checkpoints_and_orphan_blobs(self, tmp_path):
+        import os
+
+        store = StepCheckpointStore(tmp_path, max_age=3600)
+        shared = DatasetHandle(pd.DataFrame({"id": ["A"]}))
+        store.save("old", "a", {"datasets": {"x": shared, "y": [{"id": "old"}]}})
+        store.save("new", "b", {"datasets": {"x": shared}})
+        os.utime(tmp_path / "steps" / "old.pkl", (0, 0))
+        # A blob left behind by a checkpoint that was never completed
+        (tmp_path / "blobs" / "orphan.pkl").write_bytes(b"")
+
+        assert store.prune() == 2
+        assert not store.has("old") and store.has("new")
+        assert store.load("new")["datasets"]["x"] == shared
+        assert len(list((tmp_path / "blobs").iterdir())) == 1
+
+    def test_clear_forgets_removed_blobs(self, tmp_path):
+        store = StepCheckpointStore(tmp_path)
+        handle = DatasetHandle(pd.DataFrame({"id": ["A"]}))
+        store.save("k1", "a", {"datasets": {"x": handle}})
+
+        assert store.clear(["k1"]) == 1
+        assert list((tmp_path / "blobs").iterdir()) == []
+
+        # The handle's blob is written again rather than referenced while missing
+        store.save("k2", "b", {"datasets": {"x": handle}})
+        assert store.load("k2")["datasets"]["x"] == handle
+
+    def test_streamed_dataset_skips_checkpoint(self, tmp_path):
+        store = StepCheckpointStore(tmp_path)
+        stream = ChunkedDataset(lambda: iter([pd.DataFrame({"id": ["A"]})]))
+
+        store.save("k1", "load", {"datasets": {"s": stream}})
+
+        assert not store.has("k1")
+
+    def test_universal_context_checkpoint_with_store(self, tmp_path):
+        store = StepCheckpointStore(tmp_path)
+        context = UniversalContext({"parameters": {"p": 1}})
+        context.set_dataset("a", pd.DataFrame({"id": ["A"]}))
+
+        summary = context.checkpoint("stage1", store=store)
+        assert summary["datasets"] == ["a"]
+
+        fresh = UniversalContext()
+        fresh.restore_checkpoint(store, summary["checkpoint_key"])
+        assert fresh.get_dataframe("a")["id"].tolist() == ["A"]
+
+
+class TestCheckpointResume:
+    """Test resuming strategies through MinimalStrategyService."""
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        from core.minimal_strategy_service import MinimalStrategyService
+
+        strategies = tmp_path / "strategies"
+        strategies.mkdir()
+        (strategies / "resume.yaml").write_text(
+            "name: RESUME\n"
+            "parameters:\n"
+            "  factor: 2\n"
+            "steps:\n"
+            "  - name: load\n"
+            "    action: {type: RECORDING, params: {output_key: a, value: 1}}\n"
+            "  - name: scale\n"
+            "    action: {type: RECORDING, params: {output_key: b, value: '${parameters.factor}'}}\n"
+            "  - name: flaky\n"
+            "    action: {type: FLAKY, params: {output_key: c}}\n"
+        )
+        calls = []
+
+        class Recording:
+            async def execute(self, action_params, context, **kwargs):
+                calls.append(action_params["output_key"])
+                datasets = context.get_action_data("datasets", {})
+                datasets[action_params["output_key"]] = DatasetHandle(
+                    pd.DataFrame({"value": [action_params["value"]]})
+                )
+                return {"output_identifiers": [], "details": {}}
+
+        class Flaky:
+            fail = True
+
+            async def execute(self, action_params, context, **kwargs):
+                calls.append("flaky")
+                if Flaky.fail:
+                    raise RuntimeError("API timeout")
+                stats = context.get_action_data("statistics", {})
+                stats["done"] = True
+                return {"output_identifiers": [], "details": {}}
+
+        svc = MinimalStrategyService(
+            str(strategies), action_pool=ActionPool(resources=SharedResources())
+        )
+        svc.action_registry = {"RECORDING": Recording, "FLAKY": Flaky}
+        svc.calls = calls
+        svc.flaky = Flaky
+        return svc
+
+    @pytest.mark.asyncio
+    async def test_rerun_resumes_after_failed_step(self, service, tmp_path):
+        checkpoints = str(tmp_path / "checkpoints")
+
+        with pytest.raises(RuntimeError):
+            await service.execute_strategy("RESUME", checkpoint_dir=checkpoints)
+        assert service.calls == ["a", "b", "flaky"]
+
+        service.calls.clear()
+        service.flaky.fail = False
+        result = await service.execute_strategy("RESUME", checkpoint_dir=checkpoints)
+
+        assert service.calls == ["flaky"]
+        assert set(result["datasets"]) == {"a", "b"}
+        assert result["statistics"]["done"] is True
+
+    @pytest.mark.asyncio
+    async def test_changed_params_invalidate_suffix(self, service, tmp_path):
+        checkpoints = str(tmp_path / "checkpoints")
+        service.flaky.fail = False
+        await service.execute_strategy("RESUME", checkpoint_dir=checkpoints)
+
+        service.calls.clear()
+        await service.execute_strategy(
+            "RESUME",
+            context={"parameters": {"factor": 3}},
+            checkpoint_dir=checkpoints,
+        )
+        # 'load' is unchanged; 'scale' and everything after it reruns
+        assert service.calls == ["b", "flaky"]
@@ -0,0 +1,283 @@
+"""Tests for step_scheduler.py."""
+
+import asyncio
+import time
+
+import pytest
+
+from core.infrastructure.action_pool import ActionPool, SharedResources
+from core.infrastructure.step_scheduler import (
+    OrderedResultMerger,
+    StepDependencyError,
+    build_step_graph,
+    run_step_graph,
+    step_dataset_keys,
+)
+
+
+def _step(name, action="NOOP", depends_on=None, **params):
+    step = {"name": name, "action": {"type": action, "params": params}}
+    if depends_on is not None:
+        step["depends_on"] = depends_on
+    return step
+
+
+class TestStepGraph:
+    """Test dependency inference."""
+
+    def test_dataset_keys_split_reads_and_writes(self):
+        reads, writes = step_dataset_keys(
+            {
+                "input_key": "raw",
+                "dataset_keys": ["a", "b"],
+                "output_key": "clean",
+                "unmatched_key": "rest",
+                "threshold": 0.5,
+            }
+        )
+        assert reads == {"raw", "a", "b"}
+        assert writes == {"clean", "rest"}
+
+    def test_disjoint_loads_are_independent(self):
+        nodes = build_step_graph(
+            [
+                _step("load_source", output_key="source"),
+                _step("load_target", output_key="target"),
+                _step("merge", dataset_keys=["source", "target"], output_key="merged"),
+            ]
+        )
+        deps = {n.name: n.depends_on for n in nodes}
+        assert deps["load_source"] == set()
+        assert deps["load_target"] == set()
+        assert deps["merge"] == {"load_source", "load_target"}
+
+    def test_write_after_read_and_write_after_write(self):
+        nodes = build_step_graph(
+            [
+                _step("read_a", input_key="a", output_key="b"),
+                _step("overwrite_a", input_key="x", output_key="a"),
+                _step("overwrite_b", input_key="y", output_key="b"),
+            ]
+        )
+        deps = {n.name: n.depends_on for n in nodes}
+        assert deps["overwrite_a"] == {"read_a"}
+        assert deps["overwrite_b"] == {"read_a"}
+
+    def test_step_without_keys_is_barrier(self):
+        nodes = build_step_graph(
+            [
+                _step("load", output_key="a"),
+                _step("report", action="REPORT"),
+                _step("load_more", output_key="b"),
+            ]
+        )
+        deps = {n.name: n.depends_on for n in nodes}
+        assert deps["report"] == {"load"}
+        assert deps["load_more"] == {"report"}
+
+    def test_explicit_depends_on(self):
+        nodes = build_step_graph(
+            [
+                _step("a", output_key="a"),
+                _step("b", input_key="a", output_key="b", depends_on=[]),
+                _step("c", action="REPORT", depends_on="a"),
+            ]
+        )
+        deps = {n.name: n.depends_on for n in nodes}
+        assert deps["b"] == set()
+        assert deps["c"] == {"a"}
+
+    def test_shared_context_updates_are_serialized(self):
+        nodes = build_step_graph(
+            [
+                _step("track_1", action="TRACK_PROGRESSIVE_STATS", input_key="stage_1"),
+                _step("track_2", action="TRACK_PROGRESSIVE_STATS", input_key="stage_2"),
+                _step("export", action="EXPORT_DATASET", input_key="stage_1"),
+                _step("visualize", action="GENERATE_MAPPING_VISUALIZATIONS", input_key="x"),
+            ]
+        )
+        deps = {n.name: n.depends_on for n in nodes}
+        assert deps["track_2"] == {"track_1"}
+        assert deps["export"] == set()
+        assert deps["visualize"] == {"track_1", "track_2", "export"}
+
+    def test_resolves_parameter_placeholders(self):
+        nodes = build_step_graph(
+            [_step("a", output_key="${parameters.out}")],
+            resolve_params=lambda p: {"output_key": "resolved"},
+        )
+        assert nodes[0].writes == {"resolved"}
+
+    def test_invalid_dependencies(self):
+        with pytest.raises(StepDependencyError):
+            build_step_graph([_step("a", depends_on=["missing"])])
+        with pytest.raises(StepDependencyError):
+            build_step_graph([_step("a"), _step("a")])
+
+
+class TestRunStepGraph:
+    """Test concurrent execution."""
+
+    @pytest.mark.asyncio
+    async def test_independent_steps_overlap(self):
+        nodes = build_step_graph(
+            [_step(f"load_{i}", output_key=f"k{i}") for i in range(4)]
+        )
+
+        async def run_step(step):
+            await asyncio.sleep(0.1)
+
+        start = time.perf_counter()
+        await run_step_graph(nodes, run_step, max_concurrency=4)
+        assert time.perf_counter() - start < 0.3
+
+    @pytest.mark.asyncio
+    async def test_respects_dependencies_and_concurrency_limit(self):
+        nodes = build_step_graph(
+            [
+                _step("a", output_key="a"),
+                _step("b", output_key="b"),
+                _step("c", output_key="c"),
+                _step("join", dataset_keys=["a", "b", "c"], output_key="d"),
+            ]
+        )
+        order = []
+        active = 0
+        peak = 0
+
+        async def run_step(step):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            order.append(step["name"])
+            active -= 1
+
+        await run_step_graph(nodes, run_step, max_concurrency=2)
+        assert peak == 2
+        assert order[-1] == "join"
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_running_steps(self):
+        nodes = build_step_graph(
+            [_step("fails", output_key="a"), _step("slow", output_key="b")]
+        )
+        finished = []
+
+        async def run_step(step):
+            if step["name"] == "fails":
+                raise RuntimeError("boom")
+            await asyncio.sleep(1)
+            finished.append(step["name"])
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await run_step_graph(nodes, run_step)
+        assert finished == []
+
+
+class TestParallelStrategyExecution:
+    """Test graph scheduling through MinimalStrategyService."""
+
+    @pytest.mark.asyncio
+    async def test_parallel_strategy_runs_loads_concurrently(self, tmp_path):
+        from core.minimal_strategy_service import MinimalStrategyService
+
+        (tmp_path / "parallel.yaml").write_text(
+            "name: PARALLEL\n"
+            "execution:\n"
+            "  parallel: true\n"
+            "steps:\n"
+            "  - name: load_source\n"
+            "    action: {type: SLOW_LOAD, params: {output_key: source}}\n"
+            "  - name: load_target\n"
+            "    action: {type: SLOW_LOAD, params: {output_key: target}}\n"
+            "  - name: combine\n"
+            "    action:\n"
+            "      type: COMBINE\n"
+            "      params: {dataset_keys: [source, target], output_key: both}\n"
+        )
+        instances = set()
+
+        class SlowLoad:
+            async def execute(self, action_params, context, **kwargs):
+                instances.add(id(self))
+                await asyncio.sleep(0.2)
+                datasets = context.get_action_data("datasets", {})
+                datasets[action_params["output_key"]] = [action_params["output_key"]]
+                return {"output_identifiers": [], "details": {}}
+
+        class Combine:
+            async def execute(self, action_params, context, **kwargs):
+                datasets = context.get_action_data("datasets", {})
+                datasets["both"] = [
+                    item for key in action_params["dataset_keys"] for item in datasets[key]
+                ]
+                return {"output_identifiers": [], "details": {}}
+
+        service = MinimalStrategyService(
+            str(tmp_path), action_pool=ActionPool(resources=SharedResources())
+        )
+        service.action_registry = dict(service.action_registry)
+        service.action_registry.update({"SLOW_LOAD": SlowLoad, "COMBINE": Combine})
+
+        start = time.perf_counter()
+        result = await service.execute_strategy("PARALLEL")
+        elapsed = time.perf_counter() - start
+
+        assert sorted(result["datasets"]["both"]) == ["source", "target"]
+        assert elapsed < 0.4
+        # Concurrent steps of the same action never share an instance
+        assert len(instances) == 2
+
+    @pytest.mark.asyncio
+    async def test_results_merge_in_yaml_order(self, tmp_path):
+        from core.minimal_strategy_service import MinimalStrategyService
+
+        (tmp_path / "reverse.yaml").write_text(
+            "name: REVERSE\n"
+            "execution:\n"
+            "  parallel: true\n"
+            "steps:\n"
+            "  - name: slow\n"
+            "    action: {type: IDENTIFY, params: {output_key: slow, delay: 0.2}}\n"
+            "  - name: fast\n"
+            "    action: {type: IDENTIFY, params: {output_key: fast, delay: 0.0}}\n"
+        )
+        finished = []
+
+        class Identify:
+            async def execute(self, action_params, context, **kwargs):
+                await asyncio.sleep(action_params["delay"])
+                name = action_params["output_key"]
+                finished.append(name)
+                return {
+                    "output_identifiers": [name],
+                    "last_step": name,
+                    "provenance": [{"action": name}],
+                    "details": {},
+                }
+
+        service = MinimalStrategyService(
+            str(tmp_path), action_pool=ActionPool(resources=SharedResources())
+        )
+        service.action_registry = dict(service.action_registry)
+        service.action_registry["IDENTIFY"] = Identify
+
+        result = await service.execute_strategy("REVERSE")
+
+        assert finished == ["fast", "slow"]
+        # As if run sequentially: the later YAML step wins
+        assert result["current_identifiers"] == ["fast"]
+        assert result["provenance"] == [{"action": "slow"}, {"action": "fast"}]
+
+    def test_merger_applies_commits_in_order(self):
+        steps = [_step("a"), _step("b"), _step("c")]
+        merger = OrderedResultMerger(steps)
+        applied = []
+
+        merger.commit(steps[2], lambda: applied.append("c"))
+        merger.commit(steps[1], None)
+        assert applied == []
+
+        merger.commit(steps[0], lambda: applied.append("a"))
+        assert applied == ["a", "c"]
@@ -0,0 +1,195 @@
+"""Tests for the columnar DatasetHandle."""
+
+import pandas as pd
+import pytest
+
+from core.standards.dataset_handle import (
+    ChunkedDataset,
+    DatasetHandle,
+    as_dataframe,
+    as_dataset_handle,
+    is_empty,
+)
+from core.universal_context import UniversalContext
+
+
+class TestDatasetHandle:
+    """Test suite for DatasetHandle."""
+
+    @pytest.fixture
+    def df(self):
+        """Small protein frame."""
+        return pd.DataFrame(
+            {"uniprot": ["P12345", "Q67890", "O11111"], "score": [1.0, 0.5, 0.25]}
+        )
+
+    def test_wraps_dataframe_without_copy(self, df):
+        """The handle shares the DataFrame it was given."""
+        handle = DatasetHandle(df)
+        assert handle.dataframe is df
+        assert len(handle) == 3
+        assert handle.columns == ["uniprot", "score"]
+
+    def test_records_view_matches_to_dict(self, df):
+        """Legacy row access behaves like the old list of records."""
+        handle = DatasetHandle(df)
+        records = df.to_dict("records")
+        assert handle[0] == records[0]
+        assert handle[-1]["uniprot"] == "O11111"
+        assert list(handle) == records
+        assert handle == records
+        assert handle.to_dict("records") is handle.to_records()
+
+    def test_dataframe_constructor_accepts_handle(self, df):
+        """Legacy ``pd.DataFrame(dataset)`` calls keep working."""
+        rebuilt = pd.DataFrame(DatasetHandle(df))
+        assert list(rebuilt["uniprot"]) == ["P12345", "Q67890", "O11111"]
+
+    def test_non_default_index_is_reset(self, df):
+        """Filtered frames are stored with positional indices like records."""
+        handle = DatasetHandle(df[df["uniprot"] != "P12345"])
+        assert list(handle.dataframe.index) == [0, 1]
+        assert handle[0]["uniprot"] == "Q67890"
+
+    def test_from_records(self):
+        """Lists of records are converted to a DataFrame."""
+        handle = DatasetHandle([{"a": 1}, {"a": 2}])
+        assert list(handle.column("a")) == [1, 2]
+
+    def test_empty(self):
+        """Empty handles are falsy like an empty list."""
+        handle = DatasetHandle()
+        assert not handle
+        assert handle.empty
+        assert handle == []
+
+    def test_as_dataframe_copies_by_default(self, df):
+        """Mutating the returned frame does not touch the stored dataset."""
+        handle = DatasetHandle(df)
+        out = as_dataframe(handle)
+        out["uniprot"] = "X"
+        assert handle[0]["uniprot"] == "P12345"
+        assert as_dataframe(handle, copy=False) is df
+
+    def test_as_dataframe_other_types(self, df):
+        """Lists, frames and ``{"data": ...}`` payloads are supported."""
+        assert as_dataframe(df.to_dict("records")).equals(df)
+        assert as_dataframe({"data": [{"a": 1}]})["a"].tolist() == [1]
+        assert as_dataframe(None).empty
+
+    def test_as_dataset_handle_is_idempotent(self, df):
+        """Wrapping a handle returns the same handle."""
+        handle = as_dataset_handle(df)
+        assert as_dataset_handle(handle) is handle
+
+
+class TestChunkedDataset:
+    """Lazy chunk streams."""
+
+    @pytest.fixture
+    def reads(self):
+        return []
+
+    @pytest.fixture
+    def stream(self, reads):
+        def source():
+            reads.append(1)
+            for start in range(0, 6, 2):
+                yield pd.DataFrame({"n": range(start, start + 2)})
+
+        return ChunkedDataset(source)
+
+    def test_transforms_apply_per_chunk(self, stream):
+        """``map_chunks`` returns a new stream and leaves the original intact."""
+        evens = stream.map_chunks(lambda c: c[c["n"] % 2 == 0])
+
+        assert [len(c) for c in evens.iter_chunks()] == [1, 1, 1]
+        assert stream.count_rows() == 6
+        assert as_dataframe(evens)["n"].tolist() == [0, 2, 4]
+
+    def test_transform_reset_called_each_pass(self, stream):
+        """Stateful transforms are reset at the start of every pass."""
+
+        class Counter:
+            def __init__(self):
+                self.rows = 0
+
+            def reset(self):
+                self.rows = 0
+
+            def __call__(self, chunk):
+                self.rows += len(chunk)
+                return chunk
+
+        counter = Counter()
+        counted = stream.map_chunks(counter)
+        counted.count_rows()
+        counted.count_rows()
+        assert counter.rows == 6
+
+    def test_columns_read_first_chunk_only(self, stream, reads):
+        """Column discovery does not consume the whole source."""
+        assert stream.columns == ["n"]
+        assert stream.columns == ["n"]
+        assert len(reads) == 1
+        assert bool(stream)
+
+    def test_known_columns_need_no_read(self, reads):
+        """Columns passed by the loader carry through transforms without a pass."""
+
+        class Counter:
+            rows = 0
+
+            def reset(self):
+                raise AssertionError("columns must not start a pass")
+
+            def __call__(self, chunk):
+                self.rows += len(chunk)
+                return chunk
+
+        def source():
+            reads.append(1)
+            yield pd.DataFrame({"n": [1]})
+
+        counter = Counter()
+        stream = ChunkedDataset(source, columns=["n"]).map_chunks(counter)
+        assert stream.columns == ["n"]
+        assert stream.map_chunks(lambda c: c.assign(m=1), columns=["n", "m"]).columns == [
+            "n",
+            "m",
+        ]
+        assert reads == [] and counter.rows == 0
+
+    def test_is_empty_stops_at_first_rows(self, stream, reads):
+        """Emptiness checks read until the first non-empty chunk."""
+        seen = []
+
+        def track(chunk):
+            seen.append(len(chunk))
+            return chunk
+
+        assert not is_empty(stream.map_chunks(track))
+        assert seen == [2]
+        assert is_empty(stream.map_chunks(lambda c: c[c["n"] < 0]))
+        assert is_empty(DatasetHandle(pd.DataFrame())) and not is_empty([{"n": 1}])
+
+    def test_as_dataset_handle_materializes(self, stream):
+        """Consumers needing a handle get the concatenated chunks."""
+        handle = as_dataset_handle(stream)
+        assert isinstance(handle, DatasetHandle)
+        assert handle.to_dataframe(copy=False)["n"].tolist() == list(range(6))
+
+
+class TestUniversalContextDatasets:
+    """Dataset handoffs through the orchestration UniversalContext."""
+
+    def test_set_dataset_stores_handle(self):
+        """DataFrames are stored columnar and read back without records."""
+        ctx = UniversalContext()
+        df = pd.DataFrame({"id": ["A", "B"]})
+        ctx.set_dataset("proteins", df)
+
+        stored = ctx.get_dataset("proteins")
+        assert isinstance(stored, DatasetHandle)
+        assert ctx.get_dataframe("proteins", copy=False) is df
+        assert ctx.get_dataframe("missing") is None
@@ -329,4 +329,158 @@ class TestEdgeCases:
         assert len(df) == 3
         assert df.iloc[0]['description'] == "Contains, comma"
         assert df.iloc[1]['description'] == "Contains\ttab"
-        assert df.iloc[2]['description'] == 'Contains"quote'
\ No newline at end of file
+        assert df.iloc[2]['description'] == 'Contains"quote'
+
+class TestSniffCache:
+    """Test caching of encoding/delimiter/comment detection."""
+
+    @pytest.fixture
+    def encoding_calls(self, tmp_path, monkeypatch):
+        """Isolate the persistent cache and record encoding detections."""
+        monkeypatch.setattr(
+            BiologicalFileLoader, "SNIFF_CACHE_PATH", tmp_path / "cache" / "sniff.json"
+        )
+        BiologicalFileLoader.clear_sniff_cache()
+        calls = []
+        original = BiologicalFileLoader.detect_encoding.__func__
+
+        def counting_detect_encoding(cls, filepath, sample_size=10000):
+            calls.append(filepath)
+            return original(cls, filepath, sample_size)
+
+        monkeypatch.setattr(
+            BiologicalFileLoader,
+            "detect_encoding",
+            classmethod(counting_detect_encoding),
+        )
+        yield calls
+        BiologicalFileLoader.clear_sniff_cache()
+
+    @pytest.fixture
+    def data_file(self, tmp_path):
+        path = tmp_path / "reference.csv"
+        path.write_text("# header comment\nid;name\nA;alpha\nB;beta\n")
+        return path
+
+    def test_repeated_loads_detect_once(self, encoding_calls, data_file):
+        first = BiologicalFileLoader.load_csv(str(data_file))
+        second = BiologicalFileLoader.load_csv(str(data_file))
+
+        assert first.equals(second)
+        assert list(first.columns) == ["id", "name"]
+        assert len(encoding_calls) == 1
+
+    def test_cache_persists_across_runs(self, encoding_calls, data_file):
+        BiologicalFileLoader.load_csv(str(data_file))
+        BiologicalFileLoader.clear_sniff_cache()  # Simulates a new process
+
+        sniffed = BiologicalFileLoader.sniff(str(data_file))
+
+        assert sniffed == {"encoding": "ascii", "comment": "#", "delimiter": ";"}
+        assert len(encoding_calls) == 1
+
+    def test_modified_file_is_resniffed(self, encoding_calls, data_file):
+        BiologicalFileLoader.sniff(str(data_file))
+        data_file.write_text("id,name\nA,alpha\n")
+
+        assert BiologicalFileLoader.sniff(str(data_file))["delimiter"] == ","
+        assert len(encoding_calls) == 2
+
+    def test_sidecar_schema_skips_detection(self, encoding_calls, data_file):
+        sidecar = data_file.with_name(data_file.name + ".schema.json")
+        sidecar.write_text('{"encoding": "utf-8", "delimiter": ";", "comment": "#"}')
+
+        df = BiologicalFileLoader.load_csv(str(data_file))
+
+        assert list(df.columns) == ["id", "name"]
+        assert encoding_calls == []
+
+
+class TestFrameCache:
+    """Test the parsed-frame cache behind auto_load."""
+
+    @pytest.fixture
+    def cache_dir(self, tmp_path, monkeypatch):
+        pytest.importorskip("pyarrow")
+        cache_dir = tmp_path / "frames"
+        monkeypatch.setattr(BiologicalFileLoader, "FRAME_CACHE_DIR", cache_dir)
+        monkeypatch.setattr(BiologicalFileLoader, "FRAME_CACHE_MIN_BYTES", 0)
+        return cache_dir
+
+    @pytest.fixture
+    def reference(self, tmp_path):
+        path = tmp_path / "reference.tsv"
+        path.write_text("id\tname\tscore\nHMDB01\talpha\t1.5\nHMDB02\tNA\t\n")
+        return path
+
+    def test_second_load_reads_cache(self, cache_dir, reference, monkeypatch):
+        first = BiologicalFileLoader.auto_load(str(reference))
+        assert len(list(cache_dir.iterdir())) == 1
+
+        def fail(*args, **kwargs):
+            raise AssertionError("source file was re-parsed")
+
+        monkeypatch.setattr(BiologicalFileLoader, "load_tsv", fail)
+        second = BiologicalFileLoader.auto_load(str(reference))
+
+        pd.testing.assert_frame_equal(first, second)
+        assert pd.isna(second.loc[1, "name"])
+
+    def test_cached_load_keeps_missing_values_as_nan(self, cache_dir, tmp_path):
+        path = tmp_path / "gaps.csv"
+        path.write_text("id,name,note\nHMDB01,alpha,\nHMDB02,,kept\nHMDB03,gamma,\n")
+
+        first = BiologicalFileLoader.auto_load(str(path))
+        second = BiologicalFileLoader.auto_load(str(path))
+
+        assert len(list(cache_dir.iterdir())) == 1
+        pd.testing.assert_frame_equal(first, second)
+        assert (second.astype(str) == first.astype(str)).all().all()
+        assert second.loc[1, "name"] is not None and pd.isna(second.loc[1, "name"])
+
+    def test_source_change_invalidates_cache(self, cache_dir, reference):
+        BiologicalFileLoader.auto_load(str(reference))
+        reference.write_text("id\tname\tscore\nHMDB03\tgamma\t2.0\n")
+
+        df = BiologicalFileLoader.auto_load(str(reference))
+
+        assert df["id"].tolist() == ["HMDB03"]
+        # The entry for the old file version was replaced
+        assert len(list(cache_dir.iterdir())) == 1
+
+    def test_loader_options_are_part_of_key(self, cache_dir, reference):
+        plain = BiologicalFileLoader.auto_load(str(reference))
+        indexed = BiologicalFileLoader.auto_load(str(reference), identifier_column="id")
+
+        assert "id" in plain.columns
+        assert indexed.index.name == "id"
+        assert len(list(cache_dir.iterdir())) == 2
+
+    def test_small_files_and_opt_out_skip_cache(self, cache_dir, reference, monkeypatch):
+        BiologicalFileLoader.auto_load(str(reference), use_cache=False)
+        monkeypatch.setattr(BiologicalFileLoader, "FRAME_CACHE_MIN_BYTES", 10**9)
+        BiologicalFileLoader.auto_load(str(reference))
+
+        assert not cache_dir.exists()
+
+    def test_cache_dir_is_private(self, cache_dir, reference):
+        BiologicalFileLoader.auto_load(str(reference))
+
+        assert cache_dir.stat().st_mode & 0o777 == 0o700
+        assert [p.suffix for p in cache_dir.iterdir()] == [".feather"]
+
+    def test_shared_cache_dir_is_tightened(self, cache_dir, reference):
+        cache_dir.mkdir(mode=0o777)
+        cache_dir.chmod(0o777)
+
+        BiologicalFileLoader.auto_load(str(reference))
+
+        assert cache_dir.stat().st_mode & 0o777 == 0o700
+
+    def test_no_cache_without_pyarrow(self, cache_dir, reference, monkeypatch):
+        monkeypatch.setattr("core.standards.file_loader.HAS_PYARROW", False)
+
+        df = BiologicalFileLoader.auto_load(str(reference))
+
+        assert df["id"].tolist() == ["HMDB01", "HMDB02"]
+        assert not cache_dir.exists()
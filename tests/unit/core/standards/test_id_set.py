@@ -0,0 +1,82 @@
+"""Tests for interned identifier sets."""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.standards.id_set import IdVocabulary, InternedIdSet
+
+
+class TestIdVocabulary:
+    """Test suite for IdVocabulary."""
+
+    def test_codes_follow_first_appearance(self):
+        """Codes are assigned once, in first-seen order."""
+        vocabulary = IdVocabulary()
+        assert vocabulary.encode(["P1", "P2", "P1"]).tolist() == [0, 1, 0]
+        assert vocabulary.encode(np.array(["P3", "P2"], dtype=object)).tolist() == [2, 1]
+        assert vocabulary.decode(np.array([2, 0])).tolist() == ["P3", "P1"]
+        assert len(vocabulary) == 3
+
+    def test_encode_without_adding(self):
+        """Unknown values get -1 and are not interned."""
+        vocabulary = IdVocabulary(["P1"])
+        assert vocabulary.encode(["P1", "X"], add=False).tolist() == [0, -1]
+        assert len(vocabulary) == 1
+
+
+class TestInternedIdSet:
+    """Test suite for InternedIdSet."""
+
+    @pytest.fixture
+    def ids(self):
+        """Two sets sharing a vocabulary."""
+        first = InternedIdSet(["P1", "P2", "P1", "Q9"])
+        second = InternedIdSet(pd.Series(["P2", "P3"]).unique(), first.vocabulary)
+        return first, second
+
+    def test_behaves_like_frozenset(self, ids):
+        """Membership, length, iteration and comparison match frozenset."""
+        first, _ = ids
+        assert len(first) == 3
+        assert "P2" in first and "P3" not in first and ["P1"] not in first
+        assert list(first) == ["P1", "P2", "Q9"]
+        assert first == {"P1", "P2", "Q9"}
+        assert InternedIdSet() == set()
+
+    def test_set_operations_on_codes(self, ids):
+        """Operators between sets of one vocabulary match the Python sets."""
+        first, second = ids
+        expected_first, expected_second = set(first), set(second)
+        assert set(first | second) == expected_first | expected_second
+        assert set(second - first) == expected_second - expected_first
+        assert set(first & second) == expected_first & expected_second
+        assert (first | second).vocabulary is first.vocabulary
+        assert set(first | {"Z"}) == expected_first | {"Z"}
+        assert first - {"unknown"} == first
+        # Differences never intern the other operand
+        assert len(first.vocabulary) == 5
+
+    def test_to_list_limit(self, ids):
+        """Samples decode only the requested number of members."""
+        first, _ = ids
+        assert first.to_list(limit=2) == ["P1", "P2"]
+
+    def test_pickle_shares_vocabulary(self, ids):
+        """Pickling stores codes and one copy of a shared vocabulary."""
+        first, second = ids
+        restored = pickle.loads(pickle.dumps({"first": first, "second": second}))
+        assert restored["first"].vocabulary is restored["second"].vocabulary
+        assert restored["first"] == first and restored["second"] == second
+        assert restored["second"].codes.dtype == np.int32
+
+    @pytest.mark.parametrize("members", [["P1"], ["P1", "P2", "Q9"], []])
+    def test_pickle_dense_and_sparse(self, members):
+        """Dense sets pickle as bitmaps and sparse ones as codes, losslessly."""
+        vocabulary = IdVocabulary([f"ID{i}" for i in range(40)] + ["P1", "P2", "Q9"])
+        id_set = InternedIdSet(members, vocabulary)
+        restored = pickle.loads(pickle.dumps(id_set))
+        assert list(restored) == members
+        assert restored.codes.dtype == np.int32
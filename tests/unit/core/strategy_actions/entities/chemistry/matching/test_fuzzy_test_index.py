@@ -0,0 +1,244 @@
+"""Tests for block scoring and blocking in CHEMISTRY_FUZZY_TEST_MATCH."""
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from actions.entities.chemistry.matching.fuzzy_test_match import (
+    AbbreviationExpander,
+    ChemistryFuzzyTestMatchAction,
+    ChemistryFuzzyTestMatchParams,
+    ChemistryTestIndex,
+    MultiAlgorithmMatcher,
+    PreparedTests,
+    TestNameNormalizer,
+    _partial_ratio,
+    _ratio,
+    _score_cutoff,
+    _shared_characters,
+    _token_sort_ratio,
+)
+
+SOURCE_TESTS = [
+    "Glucose", "LC 001 Cholesterol, Total", "HDL-C", "ALT", "Triglycerides",
+    "Creatinine, Serum", "TSH", "bun", "Hemoglobin A1c", "Alk Phos", "Sodium",
+    "Vitamin D", "Potassium (Blood)", "Bilirubin", "Glucse",
+]
+TARGET_TESTS = [
+    "glucose", "Total Cholesterol", "hdl cholesterol", "Alanine Aminotransferase",
+    "Triglyceride", "Creatinine", "Thyroid Stimulating Hormone", "Urea Nitrogen",
+    "HbA1c", "Alkaline Phosphatase", "Na", "25-hydroxyvitamin d", "K",
+    "Bilirubin Total", "Calcium", "glucose fasting",
+]
+
+# Scores of the fuzzywuzzy-based matcher at the acceptance thresholds
+BASELINE_MATCHES = [
+    ("tsh triglycerides creatinine", "ast triglycerides creat", "token_sort", (True, 0.75)),
+    ("alt tsh", "hdl ast tsh", "abbreviation", (True, 0.75)),
+    ("ldl", "alt hdl", "partial", (False, 0.0)),
+    ("na glucose", "glucose egfr", "partial", (False, 0.0)),
+    ("hct plt", "alt plt", "partial", (False, 0.0)),
+    ("glucose", "glucose fasting", "partial", (True, 1.0)),
+]
+
+ALGORITHM_ORDERS = [
+    ["exact", "token_sort", "partial", "abbreviation", "synonym"],
+    ["synonym", "phonetic", "abbreviation"],
+    ["partial", "exact", "phonetic", "token_sort"],
+]
+
+
+def _pairwise(sources, targets, algorithms, threshold, stop_at_perfect=True):
+    """The original pairwise loop."""
+    matcher = MultiAlgorithmMatcher()
+    results = []
+    for source in sources:
+        best, best_score, best_method = None, 0.0, "none"
+        for target in targets:
+            is_match, score, method = matcher.match_tests(source, target, algorithms, threshold)
+            if is_match and score > best_score:
+                best, best_score, best_method = target, score, method
+                if stop_at_perfect and score >= 0.99:
+                    break
+        if best and best_score >= threshold:
+            results.append((source, best, best_score, best_method))
+    return results
+
+
+def _indexed(sources, targets, algorithms, threshold, stop_at_perfect=True, **kwargs):
+    prepared_sources = PreparedTests.from_names(sources)
+    prepared_targets = PreparedTests.from_names(targets)
+    index = ChemistryTestIndex(prepared_targets, **kwargs)
+    best = index.best_matches(prepared_sources, algorithms, threshold, stop_at_perfect)
+    return [
+        (prepared_sources.names[i], prepared_targets.names[match[0]], match[1], match[2])
+        for i, match in enumerate(best)
+        if match is not None
+    ]
+
+
+def _random_tests(rng, count):
+    words = list(AbbreviationExpander.ABBREVIATIONS) + ["serum", "total", "free", "ratio"]
+    words += ["".join(rng.choices("abcdefghijklmnop", k=rng.randint(3, 8))) for _ in range(40)]
+    names = []
+    for _ in range(count):
+        name = " ".join(rng.sample(words, rng.randint(1, 3)))
+        if rng.random() < 0.3:
+            pos = rng.randrange(len(name))
+            name = name[:pos] + "x" + name[pos + 1 :]
+        names.append(name.upper() if rng.random() < 0.2 else name)
+    return list(dict.fromkeys(names))
+
+
+class TestChemistryTestIndex:
+    """Test that block scoring reproduces the pairwise matcher."""
+
+    @pytest.mark.parametrize("algorithms", ALGORITHM_ORDERS)
+    @pytest.mark.parametrize("threshold", [0.6, 0.75, 0.95])
+    @pytest.mark.parametrize("stop_at_perfect", [True, False])
+    def test_matches_pairwise_loop(self, algorithms, threshold, stop_at_perfect):
+        expected = _pairwise(SOURCE_TESTS, TARGET_TESTS, algorithms, threshold, stop_at_perfect)
+
+        actual = _indexed(SOURCE_TESTS, TARGET_TESTS, algorithms, threshold, stop_at_perfect)
+
+        assert actual == expected
+
+    def test_matches_pairwise_loop_on_random_tests(self, monkeypatch):
+        rng = random.Random(11)
+        sources, targets = _random_tests(rng, 150), _random_tests(rng, 150)
+        # Several source blocks
+        monkeypatch.setattr(
+            "actions.entities.chemistry.matching.fuzzy_test_match.SCORE_BLOCK_CELLS", 4000
+        )
+
+        for algorithms in ALGORITHM_ORDERS:
+            assert _indexed(sources, targets, algorithms, 0.75) == _pairwise(
+                sources, targets, algorithms, 0.75
+            )
+
+    def test_token_sort_on_punctuated_names(self):
+        sources = ["glucose-fasting", "creat/bun", "ldl-c (calc)"]
+        targets = ["fasting glucose", "bun/creat", "calc ldl c", "hdl cholesterol"]
+
+        expected = _pairwise(sources, targets, ["token_sort"], 0.75)
+
+        assert _indexed(sources, targets, ["token_sort"], 0.75) == expected
+        assert [match[1:3] for match in expected] == [
+            ("fasting glucose", 1.0),
+            ("bun/creat", 1.0),
+            ("calc ldl c", 1.0),
+        ]
+
+    def test_blocking_keeps_key_matches(self):
+        algorithms = ["exact", "synonym", "token_sort"]
+        sources = PreparedTests.from_names(
+            ["Glucose", "SGPT", "Mystery Panel"], {"Mystery Panel": frozenset({"2345-7"})}
+        )
+        targets = PreparedTests.from_names(
+            TARGET_TESTS + ["Unrelated Assay"], {"Unrelated Assay": frozenset({"2345-7"})}
+        )
+        index = ChemistryTestIndex(targets, exhaustive_pair_limit=0)
+
+        candidates = index._candidates(sources, 2)
+        best = index.best_matches(sources, algorithms, 0.75)
+
+        assert [targets.names[m[0]] for m in best[:2]] == ["glucose", "Alanine Aminotransferase"]
+        assert best[1][2] == "synonym"
+        # Sharing a LOINC code makes a pair a candidate, not a match
+        assert targets.names.index("Unrelated Assay") in candidates
+        assert best[2] is None
+
+    def test_blocking_agrees_on_clear_matches(self):
+        rng = random.Random(5)
+        targets = _random_tests(rng, 400)
+        sources = [name[:-1] + "z" if len(name) > 6 else name for name in rng.sample(targets, 60)]
+        algorithms = ALGORITHM_ORDERS[0]
+
+        exhaustive = _indexed(sources, targets, algorithms, 0.9)
+        blocked = _indexed(sources, targets, algorithms, 0.9, exhaustive_pair_limit=0)
+
+        # Pruning may miss matches, but whatever it finds is a real match
+        matcher = MultiAlgorithmMatcher()
+        for source, target, score, method in blocked:
+            assert matcher.match_tests(source, target, algorithms, 0.9) == (True, score, method)
+        assert len(blocked) >= 0.9 * len(exhaustive)
+
+    def test_partial_ratio_prefilter_is_a_bound(self):
+        rng = random.Random(3)
+        texts = ["".join(rng.choices("abcde ", k=rng.randint(1, 12))) for _ in range(200)]
+        shared = _shared_characters(texts, texts)
+
+        for i, j in zip(rng.choices(range(200), k=3000), rng.choices(range(200), k=3000)):
+            shorter = min(len(texts[i]), len(texts[j]))
+            for cutoff in (0.6, 0.8, 0.95):
+                if _partial_ratio(texts[i], texts[j]) / 100.0 >= cutoff:
+                    reachable = _score_cutoff(cutoff) / 100.0
+                    assert shared[i, j] >= reachable * shorter / (2 - reachable) - 1e-9
+
+    @pytest.mark.parametrize("source,target,algorithm,expected", BASELINE_MATCHES)
+    def test_scores_match_fuzzywuzzy_at_thresholds(self, source, target, algorithm, expected):
+        matched, score = expected
+        method = algorithm if matched else "none"
+
+        pairwise = MultiAlgorithmMatcher().match_tests(source, target, [algorithm], 0.75)
+        indexed = _indexed([source], [target], [algorithm], 0.75)
+
+        assert pairwise == (matched, score, method)
+        assert indexed == ([(source, target, score, method)] if matched else [])
+
+    def test_fuzzywuzzy_scorers(self):
+        assert _token_sort_ratio("tsh triglycerides creatinine", "ast triglycerides creat") == 75
+        # fuzzywuzzy keeps underscores as word characters
+        assert _token_sort_ratio("Glucose_Serum", "serum glucose") == 92
+        assert _ratio("alt tsh", "hdl ast tsh") == 67
+        # Windows aligned on matching blocks only, unlike rapidfuzz (80)
+        assert _partial_ratio("ldl", "alt hdl") == 67
+        assert _partial_ratio("ft4", "free t4") == 67
+        assert _partial_ratio("glucose", "glucose fasting") == 100
+
+    def test_normalizer_cache_is_shared(self):
+        TestNameNormalizer.normalize_test_name.cache_clear()
+        TestNameNormalizer().normalize_test_name("LC 123 Glucose, Serum")
+        TestNameNormalizer().normalize_test_name("LC 123 Glucose, Serum")
+
+        assert TestNameNormalizer.normalize_test_name.cache_info().hits == 1
+
+
+class TestBatchMatching:
+    """Test CHEMISTRY_FUZZY_TEST_MATCH end to end on the index."""
+
+    async def test_execute_matches_and_expands_panels(self):
+        source = pd.DataFrame(
+            {"test_name": ["Glucose", "Lipid Panel", None, "TSH", "Zinc"], "loinc": [None] * 5}
+        )
+        target = pd.DataFrame(
+            {
+                "test_name": TARGET_TESTS,
+                "loinc": ["2345-7"] + [None] * (len(TARGET_TESTS) - 1),
+            }
+        )
+        context = {"datasets": {"source": source, "target": target}, "statistics": {}}
+        params = ChemistryFuzzyTestMatchParams(
+            source_key="source",
+            target_key="target",
+            output_key="matched",
+            source_loinc_column="loinc",
+            target_loinc_column="loinc",
+        )
+
+        result = await ChemistryFuzzyTestMatchAction().execute_typed(params, context)
+
+        matched = context["datasets"]["matched"]
+        assert result.success
+        assert dict(zip(matched["source_test"], matched["target_test"])) == {
+            "Glucose": "glucose",
+            "total cholesterol": "Total Cholesterol",
+            "ldl cholesterol": "hdl cholesterol",
+            "hdl cholesterol": "hdl cholesterol",
+            "triglycerides": "Triglyceride",
+            "TSH": "Thyroid Stimulating Hormone",
+        }
+        assert np.isclose(matched["similarity_score"].iloc[0], 1.0)
+        assert result.matched_tests == len(matched)
@@ -0,0 +1,196 @@
+"""Tests for batched, concurrent LIPID MAPS SPARQL queries against a local stub endpoint."""
+
+import asyncio
+import re
+
+import pandas as pd
+import pytest
+from aiohttp import web
+
+from actions.entities.metabolites.external.lipid_maps_sparql_match import (
+    LipidMapsSparqlMatch,
+    LipidMapsSparqlParams,
+)
+from integrations.clients.http_session import shared_session_pool
+
+LABELS = {
+    "LMST01010001": "Cholesterol",
+    "LMFA01010001": "Palmitic acid",
+    "LMFA01030002": "Oleic acid (18:1)",
+}
+
+
+def _binding(lipid_id, label, name=None):
+    binding = {
+        "lipid": {"value": f"http://lipidmaps.org/data/{lipid_id}"},
+        "label": {"value": label},
+        "inchikey": {"value": f"KEY-{lipid_id}"},
+    }
+    if name is not None:
+        binding["name"] = {"value": name}
+    return binding
+
+
+class StubSparqlEndpoint:
+    """Evaluates the three query shapes the action sends."""
+
+    def __init__(self, delay=0.0, fail_batches=False):
+        self.delay = delay
+        self.fail_batches = fail_batches
+        self.queries = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, request):
+        query = await request.text()
+        self.queries.append(query)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            values = re.search(r"VALUES \?name \{(.*?)\}", query)
+            if values:
+                if self.fail_batches:
+                    return web.Response(status=400)
+                names = re.findall(r'"((?:[^"\\]|\\.)*)"', values.group(1))
+                bindings = [
+                    _binding(lipid_id, label, name)
+                    for name in names
+                    for lipid_id, label in LABELS.items()
+                    if label.lower() == name
+                ]
+            else:
+                term = re.search(r'LCASE\("((?:[^"\\]|\\.)*)"\)', query).group(1).lower()
+                contains = "CONTAINS" in query
+                bindings = [
+                    _binding(lipid_id, label)
+                    for lipid_id, label in LABELS.items()
+                    if (term in label.lower() if contains else term == label.lower())
+                ]
+            return web.json_response({"results": {"bindings": bindings}})
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+async def endpoint():
+    async def start(**kwargs):
+        stub = StubSparqlEndpoint(**kwargs)
+        app = web.Application()
+        app.router.add_post("/sparql", stub.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        runners.append(runner)
+        return stub, f"http://127.0.0.1:{port}/sparql"
+
+    runners = []
+    yield start
+    await shared_session_pool("lipid_maps").close()
+    for runner in runners:
+        await runner.cleanup()
+
+
+def _context(names):
+    return {
+        "datasets": {
+            "stage_4_unmapped": pd.DataFrame(
+                {"BIOCHEMICAL_NAME": names, "SUPER_PATHWAY": ["Lipid"] * len(names)}
+            )
+        },
+        "statistics": {},
+    }
+
+
+def _params(url, **kwargs):
+    return LipidMapsSparqlParams(
+        input_key="stage_4_unmapped",
+        unmatched_key="stage_5_unmapped",
+        name_column="BIOCHEMICAL_NAME",
+        endpoint_url=url,
+        **kwargs,
+    )
+
+
+class TestBatchedSparqlQueries:
+    """Test VALUES batching, fallbacks, concurrency and the persistent cache."""
+
+    async def test_exact_matches_share_one_round_trip(self, endpoint):
+        stub, url = await endpoint()
+        context = _context(["Cholesterol", "palmitic acid", "Unknown lipid", "cholesterol"])
+
+        result = await LipidMapsSparqlMatch().execute_typed(
+            _params(url, cache_dir=None, cache_results=False, query_strategy="exact"), context
+        )
+
+        matched = context["datasets"]["stage_5_matched"]
+        assert result.queries_executed == 1
+        assert list(matched["BIOCHEMICAL_NAME"]) == ["Cholesterol", "palmitic acid", "cholesterol"]
+        assert list(matched["lipid_maps_id"]) == ["LMST01010001", "LMFA01010001", "LMST01010001"]
+        assert list(matched["match_type"]) == ["lipid_maps_exact"] * 3
+        assert list(context["datasets"]["stage_5_unmapped"]["BIOCHEMICAL_NAME"]) == ["Unknown lipid"]
+
+    async def test_unmatched_names_fall_back_to_fuzzy(self, endpoint):
+        stub, url = await endpoint()
+        context = _context(["Oleic acid", "Nothing here"])
+
+        result = await LipidMapsSparqlMatch().execute_typed(
+            _params(url, cache_dir=None, cache_results=False), context
+        )
+
+        matched = context["datasets"]["stage_5_matched"]
+        # One batch plus one fuzzy query per unmatched name
+        assert result.queries_executed == 3
+        assert list(matched["lipid_maps_name"]) == ["Oleic acid (18:1)"]
+        assert matched.iloc[0]["confidence_score"] == 0.70
+
+    async def test_failed_batch_falls_back_to_individual_queries(self, endpoint):
+        stub, url = await endpoint(fail_batches=True)
+        context = _context(["Cholesterol", "Oleic acid"])
+
+        result = await LipidMapsSparqlMatch().execute_typed(
+            _params(url, cache_dir=None, cache_results=False), context
+        )
+
+        matched = context["datasets"]["stage_5_matched"]
+        assert result.sparql_errors == 1
+        assert list(matched["match_type"]) == ["lipid_maps_exact", "lipid_maps_fuzzy"]
+
+    async def test_batches_run_concurrently_within_limit(self, endpoint):
+        stub, url = await endpoint(delay=0.05)
+        names = [f"Lipid {i}" for i in range(40)]
+
+        await LipidMapsSparqlMatch().execute_typed(
+            _params(
+                url,
+                cache_dir=None,
+                cache_results=False,
+                query_strategy="exact",
+                batch_size=5,
+                max_concurrent_queries=3,
+            ),
+            _context(names),
+        )
+
+        assert len(stub.queries) == 8
+        assert stub.max_in_flight == 3
+
+    async def test_matches_persist_across_instances(self, endpoint, tmp_path):
+        stub, url = await endpoint()
+        params = _params(url, cache_dir=str(tmp_path), query_strategy="exact")
+
+        await LipidMapsSparqlMatch().execute_typed(params, _context(["Cholesterol"]))
+        context = _context(["Cholesterol"])
+        result = await LipidMapsSparqlMatch().execute_typed(params, context)
+
+        assert (tmp_path / "lipid_maps_sparql.sqlite").exists()
+        assert len(stub.queries) == 1
+        assert result.cache_hits == 1
+        assert context["datasets"]["stage_5_matched"].iloc[0]["lipid_maps_id"] == "LMST01010001"
+
+    def test_batch_query_escapes_values(self):
+        query = LipidMapsSparqlMatch()._generate_batch_query(['A "quoted"\nname'], "exact")
+
+        assert 'VALUES ?name { "a \\"quoted\\"\\nname" }' in query
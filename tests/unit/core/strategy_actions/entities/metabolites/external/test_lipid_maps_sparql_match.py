@@ -237,7 +237,7 @@ class TestLipidMapsSparqlMatch:
             assert matched.iloc[0]["confidence_score"] == 0.70  # Fuzzy match confidence
 
     def test_batch_query_generation(self):
-        """Test that batch queries are generated correctly with UNION."""
+        """Test that batch queries bind all names in one VALUES block."""
         # Setup
         action = LipidMapsSparqlMatch()
         metabolites = ["cholesterol", "palmitic acid", "oleic acid"]
@@ -246,8 +246,8 @@ class TestLipidMapsSparqlMatch:
         query = action._generate_batch_query(metabolites, query_type="exact")
         
         # Assert
-        assert "UNION" in query
-        assert query.count("UNION") == 2  # 3 metabolites = 2 UNIONs
+        assert query.count("VALUES ?name") == 1
+        assert "UNION" not in query
         assert "cholesterol" in query
         assert "palmitic acid" in query
         assert "oleic acid" in query
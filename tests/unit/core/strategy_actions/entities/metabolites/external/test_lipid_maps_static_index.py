@@ -0,0 +1,97 @@
+"""Tests for LIPID_MAPS_STATIC_MATCH on the binary index."""
+
+import json
+
+import pandas as pd
+import pytest
+
+from actions.entities.metabolites.external.lipid_maps_static_match import (
+    LipidMapsStaticMatch,
+    LipidMapsStaticParams,
+)
+from core.infrastructure.lookup_index import index_from_static_json
+
+INDICES = {
+    "exact_names": {"Cholesterol": "LMST01010001", "DHA": "LMFA01030185"},
+    "normalized_names": {"cholesterol": "LMST01010001", "palmitic acid": "LMFA01010001"},
+    "synonyms": {"22:6n3": "LMFA01030185"},
+    "lipid_data": {
+        "LMST01010001": {"COMMON_NAME": "Cholesterol", "FORMULA": "C27H46O", "CATEGORY": "Sterol Lipids"},
+        "LMFA01030185": {"COMMON_NAME": "DHA", "FORMULA": "C22H32O2", "CATEGORY": "Fatty Acyls"},
+    },
+}
+
+
+def _params(data_dir, **kwargs):
+    return LipidMapsStaticParams(
+        input_key="unmapped",
+        output_key="matched",
+        unmatched_key="still_unmapped",
+        data_dir=str(data_dir),
+        data_version="202501",
+        **kwargs,
+    )
+
+
+def _metabolites():
+    return pd.DataFrame(
+        {
+            "identifier": ["Cholesterol", None, " Palmitic Acid ", "22:6n3", "glucose", "DHA"],
+            "value": [1, 2, 3, 4, 5, 6],
+        },
+        index=[10, 11, 12, 13, 14, 15],
+    )
+
+
+async def _run(data_dir, **kwargs):
+    context = {"datasets": {"unmapped": _metabolites()}}
+    result = await LipidMapsStaticMatch().execute_typed(_params(data_dir, **kwargs), context)
+    return result, context["datasets"]["matched"], context["datasets"]["still_unmapped"]
+
+
+class TestStaticIndexMatching:
+    """Test column matching against binary and JSON indices."""
+
+    @pytest.fixture
+    def binary_dir(self, tmp_path):
+        index_from_static_json(INDICES).save(tmp_path / "lipidmaps_static_202501.idx")
+        return tmp_path
+
+    async def test_matches_whole_column(self, binary_dir):
+        result, matched, unmatched = await _run(binary_dir)
+
+        assert (result.exact_matches, result.normalized_matches, result.synonym_matches) == (2, 1, 1)
+        assert list(matched.index) == [10, 12, 13, 15]
+        assert list(matched["lipid_maps_id"]) == [
+            "LMST01010001", "LMFA01010001", "LMFA01030185", "LMFA01030185"
+        ]
+        assert list(matched["match_type"]) == ["exact", "normalized", "synonym", "exact"]
+        assert list(matched["confidence_score"]) == [1.0, 0.95, 0.9, 1.0]
+        # Ids without a record keep empty details
+        assert matched.loc[12, "common_name"] == "" and matched.loc[15, "formula"] == "C22H32O2"
+        assert list(matched["value"]) == [1, 3, 4, 6]
+        assert list(unmatched.index) == [11, 14]
+
+    async def test_binary_index_preferred_and_equivalent_to_json(self, binary_dir, tmp_path_factory):
+        json_dir = tmp_path_factory.mktemp("json")
+        (json_dir / "lipidmaps_static_202501.json").write_text(json.dumps(INDICES))
+        (binary_dir / "lipidmaps_static_202501.json").write_text(json.dumps({}))
+
+        _, from_binary, _ = await _run(binary_dir)
+        _, from_json, _ = await _run(json_dir)
+
+        pd.testing.assert_frame_equal(from_binary, from_json)
+
+    async def test_threshold_rejects_without_falling_through(self, binary_dir):
+        result, matched, unmatched = await _run(binary_dir, confidence_threshold=0.95)
+
+        assert list(matched["match_type"]) == ["exact", "normalized", "exact"]
+        assert list(unmatched.index) == [11, 13, 14]
+
+    async def test_single_identifier(self, binary_dir):
+        action = LipidMapsStaticMatch()
+        params = _params(binary_dir, use_normalized_matching=False)
+        assert action._load_indices(params)
+
+        assert action._match_metabolite("Cholesterol", params)["category"] == "Sterol Lipids"
+        assert action._match_metabolite("cholesterol", params) is None
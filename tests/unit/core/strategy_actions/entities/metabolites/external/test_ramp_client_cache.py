@@ -0,0 +1,145 @@
+"""Tests for RaMPClientModern response caching and concurrent batches against a local stub API."""
+
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from actions.entities.metabolites.external.ramp_client_modern import (
+    RaMPClientModern,
+    RaMPConfig,
+)
+from core.infrastructure.action_pool import shared_resources
+
+KNOWN = {
+    "glucose": ("HMDB0000122", "D-Glucose", "hmdb"),
+    "lactate": ("HMDB0000190", "L-Lactic acid", "hmdb"),
+    "citrate": ("C00158", "Citrate", "kegg"),
+}
+
+
+class StubRaMP:
+    """Answers name lookups for KNOWN and counts requests."""
+
+    def __init__(self, version="v1", delay=0.0, aliases=None):
+        self.version = version
+        self.delay = delay
+        # Requested name -> KNOWN name reported back as inputId
+        self.aliases = aliases or {}
+        self.lookups = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def source_versions(self, request):
+        return web.json_response({"result": [{"source": "hmdb", "version": self.version}]})
+
+    async def ontologies(self, request):
+        payload = await request.json()
+        self.lookups.append(payload["metabolite"])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        result = [
+            {
+                "inputId": name,
+                "metaboliteId": KNOWN[name][0],
+                "metaboliteName": KNOWN[name][1],
+                "sourceId": KNOWN[name][2],
+            }
+            for name in (self.aliases.get(n, n) for n in payload["metabolite"])
+            if name in KNOWN
+        ]
+        return web.json_response({"result": result})
+
+
+@pytest.fixture
+async def ramp_api():
+    async def start(**kwargs):
+        stub = StubRaMP(**kwargs)
+        app = web.Application()
+        app.router.add_get("/api/source-versions", stub.source_versions)
+        app.router.add_post("/api/ontologies-from-metabolites", stub.ontologies)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        runners.append(runner)
+        port = site._server.sockets[0].getsockname()[1]
+        return stub, f"http://127.0.0.1:{port}/api"
+
+    runners = []
+    yield start
+    for runner in runners:
+        await runner.cleanup()
+    await shared_resources.close()
+
+
+async def _lookup(base_url, names, **config):
+    async with RaMPClientModern(RaMPConfig(base_url=base_url, **config)) as client:
+        matches = await client.batch_metabolite_lookup(names, batch_size=2)
+        return matches, client.get_stats()
+
+
+class TestRaMPClientCache:
+    """Test per-name caching, version invalidation and concurrency."""
+
+    async def test_repeated_cohort_only_fetches_new_names(self, ramp_api):
+        stub, url = await ramp_api()
+
+        first, _ = await _lookup(url, ["glucose", "unknown", "lactate"])
+        second, stats = await _lookup(url, ["lactate", "citrate", "glucose", "unknown"])
+
+        assert [m.query_name for m in first] == ["glucose", "lactate"]
+        assert [m.query_name for m in second] == ["lactate", "citrate", "glucose"]
+        assert second[1].confidence_score == pytest.approx(0.85)
+        # The second client only asked for the one name it had not seen
+        assert stub.lookups[-1] == ["citrate"]
+        assert stats["cache_info"]["hits"] == 3 and stats["cache_info"]["misses"] == 1
+
+    async def test_persistent_cache_survives_process_state(self, ramp_api, tmp_path):
+        stub, url = await ramp_api()
+        cache_path = str(tmp_path / "ramp.sqlite")
+
+        await _lookup(url, ["glucose", "lactate"], cache_path=cache_path)
+        # Drop in-process caches, as a new process would start
+        await shared_resources.close()
+        matches, stats = await _lookup(url, ["glucose", "lactate"], cache_path=cache_path)
+
+        assert len(stub.lookups) == 1
+        assert [m.matched_id for m in matches] == ["HMDB0000122", "HMDB0000190"]
+        assert stats["cache_info"]["persistent"]
+
+    async def test_new_source_version_invalidates(self, ramp_api, tmp_path):
+        stub, url = await ramp_api()
+        cache_path = str(tmp_path / "ramp.sqlite")
+
+        await _lookup(url, ["glucose"], cache_path=cache_path)
+        stub.version = "v2"
+        await _lookup(url, ["glucose"], cache_path=cache_path)
+
+        assert stub.lookups == [["glucose"], ["glucose"]]
+
+    async def test_batches_run_concurrently(self, ramp_api):
+        stub, url = await ramp_api(delay=0.05)
+        names = [f"name {i}" for i in range(12)]
+
+        await _lookup(url, names, max_concurrent_requests=3, max_requests_per_second=20.0)
+
+        assert len(stub.lookups) == 6
+        assert stub.max_in_flight == 3
+
+    async def test_unattributed_results_are_not_cached_as_misses(self, ramp_api):
+        stub, url = await ramp_api(aliases={" Glucose": "glucose", "lactic acid": "lactate"})
+
+        first, _ = await _lookup(url, [" Glucose", "lactic acid"])
+        second, _ = await _lookup(url, [" Glucose", "lactic acid"])
+
+        # inputId matches the requested name up to case and whitespace
+        assert first[0].query_name == "glucose"
+        # "lactic acid" came back as "lactate": reported, but not cached as empty
+        assert [m.matched_id for m in first] == ["HMDB0000122", "HMDB0000190"]
+        assert [m.matched_id for m in second] == ["HMDB0000122", "HMDB0000190"]
+        assert stub.lookups == [[" Glucose", "lactic acid"], ["lactic acid"]]
@@ -323,4 +323,4 @@ class TestArchitectureValidation:
         # Should use existing biomapper imports
         import actions.entities.metabolites.matching.fuzzy_string_match as module
         assert hasattr(module, 'fuzz')  # fuzzywuzzy imported
-        assert hasattr(module, 'process')  # process imported
\ No newline at end of file
+        assert hasattr(module, 'FuzzyIndex')  # reference names indexed once
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""Tests for batched search and concurrent validation in HMDB_VECTOR_MATCH."""
+
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+qdrant_client = pytest.importorskip("qdrant_client")
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from actions.entities.metabolites.matching.hmdb_vector_match import (
+    HMDBVectorMatchAction,
+    HMDBVectorMatchParams,
+)
+from core.standards.dataset_handle import DatasetHandle
+
+REFERENCE = ["glucose", "lactate", "alanine", "citrate"]
+
+
+def _vector(name):
+    """Deterministic unit vector per name."""
+    rng = np.random.default_rng(sum(map(ord, name)))
+    vec = rng.normal(size=8)
+    return (vec / np.linalg.norm(vec)).tolist()
+
+
+class FakeEmbedding:
+    """FastEmbed stand-in returning fixed vectors."""
+
+    def embed(self, texts):
+        return [_vector(text.lower()) for text in texts]
+
+
+class CountingQdrant:
+    """Wraps an in-memory client and counts batch requests."""
+
+    def __init__(self, client):
+        self.client = client
+        self.batch_calls = []
+
+    def query_batch_points(self, collection_name, requests):
+        self.batch_calls.append(len(requests))
+        return self.client.query_batch_points(
+            collection_name=collection_name, requests=requests
+        )
+
+
+class SlowLLM:
+    """Synchronous OpenAI stand-in that records concurrency."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        time.sleep(0.05)
+        self.active -= 1
+        content = "YES|0.9|Same compound"
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+        )
+
+
+@pytest.fixture
+def action():
+    client = qdrant_client.QdrantClient(":memory:")
+    client.create_collection(
+        "hmdb_metabolites", vectors_config=VectorParams(size=8, distance=Distance.COSINE)
+    )
+    client.upsert(
+        "hmdb_metabolites",
+        points=[
+            PointStruct(
+                id=i, vector=_vector(name), payload={"name": name, "hmdb_id": f"HMDB{i}"}
+            )
+            for i, name in enumerate(REFERENCE)
+        ],
+    )
+    action = HMDBVectorMatchAction()
+    action.qdrant_client = CountingQdrant(client)
+    action.embedding_model = FakeEmbedding()
+    return action
+
+
+def _context(names):
+    return {
+        "datasets": {
+            "unmapped": DatasetHandle(pd.DataFrame({"BIOCHEMICAL_NAME": names}))
+        },
+        "statistics": {},
+    }
+
+
+class TestBatchedVectorMatch:
+    """Test the batched embedding/search pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_one_search_request_per_batch(self, action):
+        names = ["Glucose", "Lactate", "unknown thing", "Citrate", "Alanine"]
+        context = _context(names)
+        params = HMDBVectorMatchParams(
+            input_key="unmapped",
+            output_key="matched",
+            unmatched_key="unmatched",
+            threshold=0.99,
+            batch_size=2,
+        )
+
+        result = await action.execute_typed(params, context)
+
+        assert result.success, result.error
+        assert action.qdrant_client.batch_calls == [2, 2, 1]
+        matched = context["datasets"]["matched"]
+        assert matched["matched_name"].tolist() == ["glucose", "lactate", "citrate", "alanine"]
+        assert context["datasets"]["unmatched"]["BIOCHEMICAL_NAME"].tolist() == [
+            "unknown thing"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_llm_validation_runs_concurrently_and_bounded(self, action):
+        action.openai_client = SlowLLM()
+        context = _context(REFERENCE * 3)
+        params = HMDBVectorMatchParams(
+            input_key="unmapped",
+            output_key="matched",
+            threshold=0.99,
+            enable_llm_validation=True,
+            max_llm_calls=10,
+            llm_concurrency=3,
+        )
+        # The stand-in client must survive execute_typed's initialization
+        action._initialize_llm_client = lambda: None
+
+        start = time.perf_counter()
+        result = await action.execute_typed(params, context)
+        elapsed = time.perf_counter() - start
+
+        assert result.success, result.error
+        assert result.llm_calls_made == 10
+        assert result.matched_count == 12
+        assert action.openai_client.peak == 3
+        # Ten 50 ms calls, three at a time
+        assert elapsed < 0.4
+
+    @pytest.mark.asyncio
+    async def test_embeddings_are_reused_from_store(self, action, tmp_path):
+        embedded = []
+        action.embedding_model.embed = lambda texts: embedded.extend(texts) or [
+            _vector(text.lower()) for text in texts
+        ]
+        params = HMDBVectorMatchParams(
+            input_key="unmapped",
+            output_key="matched",
+            threshold=0.99,
+            embedding_cache_dir=str(tmp_path),
+        )
+
+        for names in (["Glucose", "Lactate"], ["Lactate", "Citrate"]):
+            result = await action.execute_typed(params, _context(names))
+            assert result.success, result.error
+            assert result.matched_count == 2
+
+        assert embedded == ["Glucose", "Lactate", "Citrate"]
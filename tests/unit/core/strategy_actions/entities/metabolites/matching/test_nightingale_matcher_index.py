@@ -0,0 +1,116 @@
+"""Tests for the cached reference index of NightingaleMatcher."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from actions.entities.metabolites.matching import nightingale_nmr_match
+from actions.entities.metabolites.matching.nightingale_nmr_match import (
+    NightingaleMatcher,
+    NightingaleNmrMatchAction,
+    NightingaleNmrMatchParams,
+)
+
+REFERENCE = pd.DataFrame(
+    [
+        {"nightingale_name": "Total_C", "hmdb_id": "HMDB0000067", "description": "Total cholesterol", "category": "lipids"},
+        {"nightingale_name": "HDL_TG", "hmdb_id": None, "description": "HDL triglycerides", "category": "lipids"},
+        {"nightingale_name": "Glucose", "hmdb_id": "HMDB0000122", "description": "Glucose", "category": "glycolysis"},
+        {"nightingale_name": "glucose", "hmdb_id": "DUPLICATE", "description": "Glucose", "category": "glycolysis"},
+    ]
+)
+
+
+def _reference_match(name, hmdb_id, description, category, confidence):
+    return {
+        "nightingale_name": name, "hmdb_id": hmdb_id, "loinc_code": None,
+        "description": description, "category": category, "unit": "",
+        "confidence": confidence,
+    }
+
+
+class TestNightingaleMatcherIndex:
+    """Test cleaning, index reuse and batch matching."""
+
+    def test_single_pass_abbreviation_expansion(self):
+        matcher = NightingaleMatcher()
+
+        assert matcher._clean_biomarker_name("XXL_VLDL_TG") == "extra extra large vldl triglycerides"
+        assert matcher._clean_biomarker_name("s_ldl_fc") == "small ldl free cholesterol"
+        assert matcher._clean_biomarker_name("Total_CE") == "total cholesterol esters"
+
+    def test_index_is_built_once_per_reference(self, monkeypatch):
+        built = []
+
+        class CountingIndex(nightingale_nmr_match._ReferenceIndex):
+            def __init__(self, reference_df, clean):
+                built.append(reference_df)
+                super().__init__(reference_df, clean)
+
+        monkeypatch.setattr(nightingale_nmr_match, "_ReferenceIndex", CountingIndex)
+        matcher = NightingaleMatcher()
+
+        for name in ["total cholesterol", "HDL triglyceride", "Total Chol"]:
+            matcher.match_biomarker(name, REFERENCE, threshold=0.8)
+        assert len(built) == 1
+
+        matcher.match_biomarker("Total Chol", REFERENCE.copy(), threshold=0.8)
+        matcher.abbreviations = {"TG": "triglycerides"}
+        matcher.match_biomarker("Total Chol", built[-1], threshold=0.8)
+        assert len(built) == 3
+
+    def test_batch_and_single_match_per_row_results(self):
+        # A reference row without a name is never matched
+        reference = pd.concat(
+            [
+                REFERENCE.iloc[:1],
+                pd.DataFrame([{"nightingale_name": np.nan, "hmdb_id": "NO_NAME", "category": "lipids"}]),
+                REFERENCE.iloc[1:],
+            ],
+            ignore_index=True,
+        )
+        names = [
+            "Glucose", " glucose", "Total_C", "total c", "Total Chol", "HDL triglyceride",
+            "XL_HDL_P", "ApoB", "Unknown_XYZ", None, "", 5,
+        ]
+        # Results of the original per-row matcher
+        expected = [
+            _reference_match("Glucose", "HMDB0000122", "Glucose", "glycolysis", 1.0),
+            _reference_match("Glucose", "HMDB0000122", "Glucose", "glycolysis", 1.0),
+            _reference_match("Total_C", "HMDB0000067", "Total cholesterol", "lipids", 1.0),
+            _reference_match("Total_C", "HMDB0000067", "Total cholesterol", "lipids", 1.0),
+            None,
+            _reference_match("HDL_TG", None, "HDL triglycerides", "lipids", 0.97),
+            {
+                "nightingale_name": "XL_HDL_P", "hmdb_id": None, "loinc_code": "30522-7",
+                "description": "HDL particles", "category": "lipoproteins",
+                "unit": "nmol/L", "confidence": 0.9,
+            },
+            {
+                "nightingale_name": "ApoB", "hmdb_id": None, "loinc_code": "1884-6",
+                "description": "Apolipoprotein B", "category": "apolipoproteins",
+                "unit": "g/L", "confidence": 1.0,
+            },
+            None, None, None, None,
+        ]
+
+        batch = NightingaleMatcher().match_biomarkers(names, reference, threshold=0.85)
+        single = [NightingaleMatcher().match_biomarker(n, reference, 0.85) for n in names]
+
+        assert batch == expected
+        assert single == expected
+
+    def test_process_biomarkers_keeps_row_columns(self):
+        df = pd.DataFrame(
+            {"biomarker": ["Glucose", None, "Unknown_XYZ", "Total_C"], "value": [5.1, 1.0, 2.0, 4.2]}
+        )
+        params = NightingaleNmrMatchParams(input_key="in", output_key="out", target_format="both")
+
+        result = NightingaleNmrMatchAction().process_biomarkers(df, params, REFERENCE)
+
+        assert list(result.columns) == [
+            "original_biomarker", "matched_name", "confidence", "hmdb_id",
+            "loinc_code", "description", "category", "unit", "value",
+        ]
+        assert result["matched_name"].tolist() == ["Glucose", "Total_C"]
+        assert result["value"].tolist() == pytest.approx([5.1, 4.2])
@@ -415,3 +415,46 @@ class TestProteinExtractUniProtFromXrefsAction:
         for test_string, expected in test_patterns:
             matches = re.findall(pattern, test_string)
             assert matches == expected, f"Pattern failed for: {test_string}"
+
+    @pytest.mark.parametrize("keep_isoforms", [False, True])
+    async def test_column_extraction_matches_per_value(self, action, keep_isoforms):
+        """Test column-wise extraction against the per-value helper."""
+        xrefs = pd.Series(
+            [
+                "UniProtKB:P12345|UniProtKB:Q14213-2",
+                "UniProtKB:A0A123B4C5|UniProtKB:A0A123B4C5X",  # 10 and 11 characters
+                "UniProtKB:P0075-1|UniProtKB:P00750-12",  # 5 and 6 characters
+                "UniProtKB:P12345-|UniProtKB:invalid",
+                "RefSeq:NP_000001.1",
+                None,
+                42,
+            ],
+            index=[10, 11, 12, 13, 14, 15, 16],
+        )
+
+        id_lists = action._extract_id_lists(xrefs, keep_isoforms)
+
+        for position, value in enumerate(xrefs):
+            expected = action._extract_uniprot_ids(value, keep_isoforms)
+            found = id_lists[position] if position in id_lists.index else []
+            assert found == expected, f"Extraction failed for: {value}"
+
+    async def test_expand_rows_keeps_rows_without_ids(self, action, context_complex):
+        """Test that expand_rows keeps rows without IDs as None when drop_na=False."""
+        params = ExtractUniProtFromXrefsParams(
+            input_key="complex_proteins",
+            xrefs_column="xrefs",
+            handle_multiple="expand_rows",
+            drop_na=False,
+        )
+
+        result = await action.execute_typed(params, context_complex)
+        df = result.data["complex_proteins"]
+
+        assert df["protein_id"].tolist() == [
+            "PROT001", "PROT001", "PROT002", "PROT003", "PROT004", "PROT005"
+        ]
+        assert df["uniprot_id"].tolist() == [
+            "P12345", "Q14213", "P00750", None, None, "P98765"
+        ]
+        assert context_complex["statistics"]["uniprot_extraction"]["rows_with_uniprot_ids"] == 4
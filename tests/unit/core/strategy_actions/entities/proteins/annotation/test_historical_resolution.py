@@ -0,0 +1,102 @@
+"""Tests for PROTEIN_HISTORICAL_RESOLUTION with a local accession history table."""
+
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from actions.entities.proteins.annotation.historical_resolution import (
+    ProteinHistoricalResolutionAction,
+    ProteinHistoricalResolutionParams,
+)
+from core.standards.dataset_handle import as_dataframe
+from integrations.clients.uniprot_historical_resolver_client import (
+    UniProtHistoricalResolverClient,
+)
+
+API_RESULTS = {
+    "P12345": (["P12345"], "primary"),
+    "Q8N2H3": (["P99999"], "secondary:P99999"),
+    "P01023": (["Q00001", "Q00002"], "demerged"),
+    "P11111": (None, "obsolete"),
+    "O00533": (None, "error:batch_processing_failed:timeout"),
+}
+
+
+async def fake_map_identifiers(self, identifiers, config=None):
+    return {i: API_RESULTS[i] for i in identifiers if i in API_RESULTS}
+
+
+@pytest.fixture
+def input_df():
+    return pd.DataFrame(
+        {
+            "uniprot": ["Q8N2H3", "P01023", None, "P11111", "O00533", "Q8N2H3"],
+            "name": ["a", "b", "c", "d", "e", "f"],
+        }
+    )
+
+
+async def run(params, input_df):
+    context = {"datasets": {"unmapped": input_df}, "statistics": {}}
+    with patch.object(
+        UniProtHistoricalResolverClient,
+        "map_identifiers",
+        autospec=True,
+        side_effect=fake_map_identifiers,
+    ) as map_identifiers:
+        result = await ProteinHistoricalResolutionAction().execute_typed(params, context)
+    output = as_dataframe(context["datasets"]["resolved"])
+    return result, output, context["statistics"]["historical_resolution_stats"], map_identifiers
+
+
+def make_params(**kwargs):
+    return ProteinHistoricalResolutionParams(
+        input_key="unmapped", output_key="resolved", cache_path=None, **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_resolutions_expand_rows_in_order(input_df):
+    result, output, stats, _ = await run(make_params(history_path=None), input_df)
+
+    assert result.success is True
+    assert output["uniprot"].tolist()[:4] == ["P99999", "Q00001", "Q00002", None]
+    assert output["name"].tolist() == ["a", "b", "b", "c", "d", "e", "f"]
+    assert output["uniprot_original"].tolist()[:3] == ["Q8N2H3", "P01023", "P01023"]
+    assert output["confidence_score"].tolist()[:3] == [0.90, 0.85, 0.85]
+    assert output["uniprot_resolution_metadata"].tolist()[4:6] == [
+        "obsolete",
+        "error:batch_processing_failed:timeout",
+    ]
+    assert pd.isna(output.loc[4, "match_type"])
+    # Statistics count input rows
+    assert stats["resolved_secondary"] == 2 and stats["resolved_demerged"] == 1
+    assert stats["unresolved_obsolete"] == 1 and stats["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_history_table_avoids_api_calls(input_df, tmp_path):
+    params = make_params(history_path=str(tmp_path / "history.db"))
+    _, first, _, _ = await run(params, input_df)
+
+    _, second, stats, map_identifiers = await run(params, input_df)
+
+    # Only the error is looked up again; definitive resolutions come from the table
+    assert map_identifiers.await_args.args[1] == ["O00533"]
+    assert stats["from_history"] == 3 and stats["from_api"] == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+@pytest.mark.asyncio
+async def test_offline_resolution_from_dumps(input_df, tmp_path):
+    sec_ac = tmp_path / "sec_ac.txt"
+    sec_ac.write_text("Secondary AC  Primary AC\n____________  __________\nQ8N2H3 P99999\n")
+    params = make_params(history_path=None, history_dumps=[str(sec_ac)], offline=True)
+
+    result, output, stats, map_identifiers = await run(params, input_df)
+
+    assert result.success is True
+    map_identifiers.assert_not_awaited()
+    assert output["uniprot"].tolist() == ["P99999", "P01023", None, "P11111", "O00533", "P99999"]
+    assert stats["resolved_secondary"] == 2 and stats["from_api"] == 0
@@ -317,6 +317,76 @@ class TestEdgeCases:
             assert isinstance(result, (str, type(None)))
 
 
+class TestColumnNormalization:
+    """Test that whole-column normalization matches the per-value path."""
+
+    MIXED_VALUES = [
+        "p12345", "sp|P12345|ALBU_HUMAN", "TR|q9y6r4", "Uniprot:P67890", "|Q6EMK4|x",
+        "P12345.3", "P12345-2", "P12345-1.2", "P12345.", "Q9Y6R4-", "sp|P12345-2|X",
+        "123.456.789", "P12345-1-2", "sp||P12345", "|||", "random_string", "O00533_1",
+        "P1234５", "P12345-²", "ß12345", "sp|P12345\n", "P12345\n", 42, 3.5, None, "",
+    ]
+
+    @pytest.fixture
+    def action(self):
+        return ProteinNormalizeAccessionsAction()
+
+    def _per_value(self, action, values, **options):
+        totals = {}
+        normalized = []
+        for value in values:
+            result, stats = action._normalize_single_value_with_stats(value, **options)
+            normalized.append(result)
+            for key, count in stats.items():
+                totals[key] = totals.get(key, 0) + count
+        return normalized, totals
+
+    @pytest.mark.parametrize("strip_isoforms", [True, False])
+    @pytest.mark.parametrize("strip_versions", [True, False])
+    def test_matches_per_value_normalization(self, action, strip_isoforms, strip_versions):
+        options = dict(
+            strip_isoforms=strip_isoforms, strip_versions=strip_versions, validate_format=True
+        )
+        series = pd.Series(self.MIXED_VALUES, name="uniprot_id")
+
+        normalized, stats = action._normalize_column(series, **options)
+        expected, expected_stats = self._per_value(action, self.MIXED_VALUES, **options)
+
+        assert normalized.tolist() == expected
+        assert stats == {"total_processed": len(series), **expected_stats}
+
+    def test_repeated_values_are_normalized_once(self, action, monkeypatch):
+        values = [value for value in self.MIXED_VALUES if value is not None] * 1000
+        series = pd.Series(values, index=range(5, 5 + len(values)), name="uniprot_id")
+        options = dict(strip_isoforms=True, strip_versions=True, validate_format=True)
+        seen = []
+        normalize_values = action._normalize_values
+
+        def spy(texts, *args):
+            seen.append(len(texts))
+            return normalize_values(texts, *args)
+
+        monkeypatch.setattr(action, "_normalize_values", spy)
+        normalized, stats = action._normalize_column(series, **options)
+        expected, expected_stats = self._per_value(action, values, **options)
+
+        assert seen == [len(self.MIXED_VALUES) - 2]
+        assert normalized.index.equals(series.index)
+        assert normalized.tolist() == expected
+        assert stats == {"total_processed": len(series), **expected_stats}
+
+    def test_validation_failures_logged_once(self, action, caplog):
+        series = pd.Series(["P12345", "bad-id", "other", "Q9Y6R4"], name="uniprot_id")
+
+        with caplog.at_level("WARNING"):
+            _, stats = action._normalize_column(series, True, True, True)
+
+        assert stats["validation_failures"] == 2
+        assert len(caplog.records) == 1
+        assert "for 2 values in column 'uniprot_id'" in caplog.text
+        assert "bad-id -> BAD" in caplog.text
+
+
 class TestMultiColumnProcessing:
     """Test processing multiple columns simultaneously."""
 
@@ -0,0 +1,68 @@
+"""Tests for TRACK_PROGRESSIVE_STATS unique entity tracking across stages."""
+
+import pickle
+
+import pandas as pd
+import pytest
+
+from actions.reports.track_progressive_stats import (
+    TrackProgressiveStats,
+    TrackProgressiveStatsParams,
+)
+from core.standards.dataset_handle import DatasetHandle
+from core.standards.id_set import InternedIdSet
+
+
+async def track(context, stage_id, ids, **kwargs):
+    context["datasets"][f"stage_{stage_id}"] = DatasetHandle(
+        pd.DataFrame({"uniprot": ids, "confidence_score": [1.0] * len(ids)})
+    )
+    params = TrackProgressiveStatsParams(
+        input_key=f"stage_{stage_id}",
+        stage_id=stage_id,
+        stage_name=f"Stage {stage_id}",
+        **kwargs,
+    )
+    result = await TrackProgressiveStats().execute_typed(params, context)
+    assert result.success is True
+    return context["progressive_stats"]
+
+
+@pytest.mark.asyncio
+async def test_new_and_cumulative_unique_entities():
+    context = {"datasets": {}}
+    await track(context, 0, ["P1", "P2", "P3", "P4"], is_baseline_stage=True)
+    await track(context, 1, ["P1", "P2", "P2", None])
+    stats = await track(context, 2, ["P2", "P3", "P5"])
+
+    tracking = stats["unique_tracking"]
+    assert isinstance(tracking["all_unique_ids"], InternedIdSet)
+    assert set(tracking["all_unique_ids"]) == {"P1", "P2", "P3", "P5"}
+    assert tracking["total_unique_entities"] == 4
+    assert tracking["by_stage"]["0"]["new_unique_entities"] == 0
+    assert tracking["by_stage"]["1"]["new_unique_entities"] == 2
+    assert tracking["by_stage"]["2"]["new_unique_entities"] == 2
+    assert tracking["by_stage"]["2"]["stage_unique_ids"] == ["P2", "P3", "P5"]
+    assert stats["stages"]["2"]["cumulative_unique_matched"] == 4
+
+    restored = pickle.loads(pickle.dumps(stats))
+    assert restored["unique_tracking"]["all_unique_ids"] == tracking["all_unique_ids"]
+
+
+@pytest.mark.asyncio
+async def test_legacy_id_list_is_converted():
+    context = {
+        "datasets": {},
+        "progressive_stats": {
+            "stages": {},
+            "unique_tracking": {
+                "all_unique_ids": ["P1", "P2"],
+                "total_unique_entities": 2,
+                "by_stage": {},
+            },
+        },
+    }
+    stats = await track(context, 3, ["P2", "P9"])
+
+    assert stats["unique_tracking"]["by_stage"]["3"]["new_unique_entities"] == 1
+    assert set(stats["unique_tracking"]["all_unique_ids"]) == {"P1", "P2", "P9"}
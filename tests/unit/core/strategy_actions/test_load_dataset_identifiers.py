@@ -8,6 +8,7 @@ import os
 
 from actions.typed_base import StandardActionResult
 from core.models.execution_context import StrategyExecutionContext
+from core.standards.dataset_handle import ChunkedDataset, DatasetHandle
 from actions.load_dataset_identifiers import (
     LoadDatasetIdentifiersParams,
     LoadDatasetIdentifiersAction,
@@ -170,7 +171,7 @@ class TestLoadDatasetIdentifiersAction:
 
         # Check data structure
         dataset = context.get_action_data("datasets", {})["test_data"]
-        assert isinstance(dataset, list)
+        assert isinstance(dataset, DatasetHandle)
         assert len(dataset) == 4  # 5 original - 1 empty
 
         # Check columns
@@ -502,6 +503,132 @@ class TestLoadDatasetIdentifiersAction:
             assert row["id_original"].startswith("UniProtKB:")  # Original preserved
 
 
+class TestStreamingLoad:
+    """Test chunked loading and the streaming filter/normalize/export chain."""
+
+    @pytest.fixture
+    def large_file(self, tmp_path):
+        path = tmp_path / "proteins.csv"
+        lines = ["id,category"]
+        for i in range(25):
+            category = "keep" if i % 2 == 0 else "drop"
+            lines.append(f"sp|p{i:05d}|GENE{i},{category}")
+        lines.append(",keep")  # Empty ID
+        path.write_text("\n".join(lines) + "\n")
+        return path
+
+    @pytest.mark.asyncio
+    async def test_chunked_load_stores_stream(self, large_file):
+        params = LoadDatasetIdentifiersParams(
+            file_path=str(large_file),
+            identifier_column="id",
+            output_key="proteins",
+            chunk_size=10,
+        )
+        context = {"datasets": {}, "metadata": {}}
+
+        result = await LoadDatasetIdentifiersAction().execute_typed(
+            [], "unknown", params, None, None, context
+        )
+
+        stream = context["datasets"]["proteins"]
+        assert isinstance(stream, ChunkedDataset)
+        assert result.details["streaming"] is True
+        assert context["metadata"]["proteins"]["row_count"] is None
+
+        df = stream.to_dataframe()
+        assert len(df) == 25
+        # Row numbers continue across chunk boundaries
+        assert df["_row_number"].tolist() == list(range(2, 27))
+
+    @pytest.mark.asyncio
+    async def test_chunked_load_validates_column_eagerly(self, large_file):
+        params = LoadDatasetIdentifiersParams(
+            file_path=str(large_file),
+            identifier_column="missing",
+            output_key="proteins",
+            chunk_size=10,
+        )
+        with pytest.raises(ValueError, match="not found"):
+            await LoadDatasetIdentifiersAction().execute_typed(
+                [], "unknown", params, None, None, {"datasets": {}, "metadata": {}}
+            )
+
+    @pytest.mark.asyncio
+    async def test_streaming_pipeline_matches_eager(self, large_file, tmp_path):
+        from actions.entities.proteins.annotation.normalize_accessions import (
+            ProteinNormalizeAccessionsAction,
+        )
+        from actions.export_dataset import ExportDatasetAction
+        from actions.utils.data_processing.filter_dataset import FilterDatasetAction
+
+        async def run(chunk_size, output):
+            context = {"datasets": {}, "metadata": {}, "statistics": {}}
+            await LoadDatasetIdentifiersAction().execute(
+                [],
+                "unknown",
+                {
+                    "file_path": str(large_file),
+                    "identifier_column": "id",
+                    "output_key": "raw",
+                    "chunk_size": chunk_size,
+                },
+                None,
+                None,
+                context,
+            )
+            await FilterDatasetAction().execute(
+                [],
+                "unknown",
+                {
+                    "input_key": "raw",
+                    "output_key": "kept",
+                    "filter_conditions": [
+                        {"column": "category", "operator": "equals", "value": "keep"}
+                    ],
+                },
+                None,
+                None,
+                context,
+            )
+            await ProteinNormalizeAccessionsAction().execute(
+                [],
+                "unknown",
+                {"input_key": "kept", "id_columns": ["id"], "output_key": "normalized"},
+                None,
+                None,
+                context,
+            )
+            export = await ExportDatasetAction().execute(
+                [],
+                "unknown",
+                {
+                    "input_key": "normalized",
+                    "output_path": str(output),
+                    "format": "tsv",
+                    "columns": ["id", "category"],
+                },
+                None,
+                None,
+                context,
+            )
+            return context, export
+
+        eager_ctx, _ = await run(None, tmp_path / "eager.tsv")
+        stream_ctx, _ = await run(7, tmp_path / "stream.tsv")
+
+        assert isinstance(stream_ctx["datasets"]["normalized"], ChunkedDataset)
+        assert (tmp_path / "stream.tsv").read_text() == (
+            tmp_path / "eager.tsv"
+        ).read_text()
+        # Statistics are accumulated while the export consumes the stream
+        assert (
+            stream_ctx["statistics"]["normalization_stats"]
+            == eager_ctx["statistics"]["normalization_stats"]
+        )
+        assert stream_ctx["statistics"]["normalization_stats"]["total_processed"] == 13
+
+
 class TestRealData:
     """Test with real biological data files."""
 
@@ -0,0 +1,193 @@
+"""Tests for expression_engine.py and its use by CUSTOM_TRANSFORM."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from actions.utils.data_processing.custom_transform_expression import (
+    CustomTransformExpressionAction,
+    CustomTransformExpressionParams,
+    TransformationSpec,
+)
+from actions.utils.data_processing.expression_engine import (
+    NotVectorizable,
+    compile_expression,
+    evaluate_column,
+    evaluate_rows,
+)
+
+COLUMNS = {
+    "ids": pd.Series(
+        ["UniProtKB:P12345", "P67890|Q11111", "Q6EMK4", "", "a;b", "P1 P2"],
+        dtype=object,
+    ),
+    "ids_with_nulls": pd.Series(["P12345|X", None, "Q1", np.nan, ""], dtype=object),
+    "numeric_strings": pd.Series(["1.5", "2", "-3", "0.25"], dtype=object),
+    "ints": pd.Series([3, 0, -7, 12]),
+    "floats": pd.Series([0.95, 0.7, 0.25, np.nan, 1.0]),
+}
+
+EXPRESSIONS = [
+    "value",
+    "value.upper()",
+    "value.replace('UniProtKB:', '')",
+    "value.strip().lower()",
+    "value.split('|')[0]",
+    "value.split('|')[-1]",
+    "value.split()[0]",
+    "value[:3]",
+    "len(value)",
+    "'PREFIX_' + value",
+    "value.startswith(('P', 'Q'))",
+    "'|' in value",
+    "value in ('Q6EMK4', 'Q1')",
+    "value.split('|')[0] if '|' in value else value.split(';')[0] if ';' in value else value",
+    "'Q6EMK4_EDGE_CASE' if value == 'Q6EMK4' else value.split('|')[0] if value and '|' in value else value",
+    "value.upper() if value else 'NULL_VALUE'",
+    "float(value)",
+    "float(value) if value else 0.0",
+    "int(value)",
+    "str(value)",
+    "value * 2 + 1",
+    "value / 4",
+    "10 / value",
+    "-value",
+    "abs(value)",
+    "int(value) if value > 0 else 0",
+    "'high' if float(value) >= 0.9 else 'medium' if float(value) >= 0.7 else 'low'",
+    "np.log10(float(value)) if float(value) > 0 else np.nan",
+    "round(float(value), 2)",
+    "'constant'",
+    "None",
+    "not value",
+]
+
+
+def _expected(expression, column, on_error):
+    try:
+        return evaluate_rows(expression, column, on_error)
+    except Exception as e:
+        return e
+
+
+class TestEvaluateColumn:
+    """Column-wise evaluation must match per-row evaluation exactly."""
+
+    @pytest.mark.parametrize("expression", EXPRESSIONS)
+    @pytest.mark.parametrize("column_name", list(COLUMNS))
+    @pytest.mark.parametrize("on_error", ["keep_original", "null"])
+    def test_matches_per_row(self, expression, column_name, on_error):
+        column = COLUMNS[column_name].copy()
+        expected = _expected(expression, column, on_error)
+        try:
+            actual = evaluate_column(expression, column)
+        except NotVectorizable:
+            return
+        if isinstance(expected, Exception):
+            pytest.fail(f"vectorized {expression!r} succeeded where per-row raised")
+        pd.testing.assert_series_equal(actual, expected, check_names=False)
+
+    @pytest.mark.parametrize(
+        "expression, values",
+        [
+            ("value.upper()", ["p1", "q2"]),
+            ("value.split('|')[0] if '|' in value else value", ["P1|P2", "Q1"]),
+            ("'high' if float(value) >= 0.9 else 'low'", ["0.95", "0.5"]),
+        ],
+    )
+    def test_common_shapes_are_vectorized(self, expression, values):
+        evaluate_column(expression, pd.Series(values))
+
+    @pytest.mark.parametrize(
+        "expression, values",
+        [
+            ("int(value)", ["1", "x"]),  # a row would raise
+            ("value.split('|')[1]", ["a|b", "c"]),  # index out of range
+            ("10 / value", [1, 0]),  # ZeroDivisionError per row
+            ("value.upper() if value else ''", ["a", None]),  # handles nulls
+            ("[x for x in value]", ["ab"]),
+            ("value +", ["a"]),
+        ],
+    )
+    def test_falls_back(self, expression, values):
+        with pytest.raises(NotVectorizable):
+            evaluate_column(expression, pd.Series(values))
+
+    def test_compiled_once_per_expression(self):
+        assert compile_expression("value.upper()") is compile_expression("value.upper()")
+
+    def test_syntax_error_follows_on_error(self):
+        column = pd.Series(["a", "b"])
+        assert evaluate_rows("value +", column, "keep_original").tolist() == ["a", "b"]
+        with pytest.raises(SyntaxError):
+            evaluate_rows("value +", column, "raise")
+
+
+class TestCustomTransformParallel:
+    """Test wave planning and concurrent application."""
+
+    def test_plan_waves(self):
+        spec = TransformationSpec
+        transformations = [
+            spec(column="a", expression="value.upper()"),
+            spec(column="b", expression="value.lower()"),
+            spec(column="a", expression="value + '_x'", new_column="a2"),
+            spec(column="a2", expression="len(value)"),  # reads a2 from previous
+            spec(column="c", expression="value", new_column="d", drop_original=True),
+        ]
+        waves = CustomTransformExpressionAction._plan_waves(
+            transformations, ["a", "b", "c"]
+        )
+        assert waves == [[0, 1], [2], [3, 4]]
+
+    @pytest.mark.asyncio
+    async def test_parallel_matches_sequential(self):
+        frame = pd.DataFrame(
+            {
+                "id": ["UniProtKB:P1", "P2|P3", None],
+                "score": ["0.95", "0.5", "0.8"],
+                "raw": [1, 2, 3],
+            }
+        )
+        transformations = [
+            TransformationSpec(column="id", expression="value.replace('UniProtKB:', '')"),
+            TransformationSpec(
+                column="score",
+                expression="'high' if float(value) >= 0.9 else 'low'",
+                new_column="band",
+            ),
+            TransformationSpec(column="raw", expression="value * 10", new_column="scaled", drop_original=True),
+            TransformationSpec(column="id", expression="value.split('|')[0]"),
+            TransformationSpec(column="stage", expression="'stage_1'"),
+            TransformationSpec(column="score", expression="int(value)", on_error="null"),
+        ]
+
+        results = {}
+        for parallel in (True, False):
+            context = {"datasets": {"input": frame.copy()}, "statistics": {}}
+            params = CustomTransformExpressionParams(
+                input_key="input",
+                output_key="output",
+                transformations=transformations,
+                parallel=parallel,
+            )
+            result = await CustomTransformExpressionAction().execute_typed(
+                current_identifiers=[],
+                current_ontology_type="protein",
+                params=params,
+                source_endpoint=None,
+                target_endpoint=None,
+                context=context,
+            )
+            assert result.success
+            assert result.data["transformations_applied"] == len(transformations)
+            results[parallel] = context["datasets"]["output"].to_dataframe()
+
+        pd.testing.assert_frame_equal(results[True], results[False])
+        output = results[True]
+        assert output["id"].tolist()[:2] == ["P1", "P2"]
+        assert output["band"].tolist() == ["high", "low", "low"]
+        assert output["scaled"].tolist() == [10, 20, 30]
+        assert "raw" not in output.columns
+        assert output["stage"].tolist() == ["stage_1"] * 3
+        assert output["score"].isna().all()
@@ -620,6 +620,57 @@ class TestParseCompositeIdentifiersAction:
         assert "legacy_output" in action_context["datasets"]
         assert len(action_context["datasets"]["legacy_output"]) > 0
 
+    @pytest.mark.asyncio
+    async def test_entity_identity_tracking(self, action_context):
+        """Test entity weight and composite tracking columns."""
+        action = ParseCompositeIdentifiersAction()
+
+        params = ParseCompositeIdentifiersParams(
+            input_key="proteins",
+            id_field="protein_id",
+            output_key="tracked_proteins",
+            separators=[",", ";"],
+            track_entity_identity=True
+        )
+
+        result = await action.execute_typed(params=params, context=action_context)
+
+        assert result.success is True
+        expanded_data = list(action_context["datasets"]["tracked_proteins"])
+        assert [row["protein_id"] for row in expanded_data] == [
+            "P12345", "Q9Y6R4", "O00533", "P38398", "P04626"
+        ]
+        assert [row["_original_index"] for row in expanded_data] == [0, 0, 1, 2, 2]
+        assert [row["_entity_weight"] for row in expanded_data] == [0.5, 0.5, 1.0, 0.5, 0.5]
+        assert [row["_is_composite_component"] for row in expanded_data] == [
+            True, True, False, True, True
+        ]
+        assert expanded_data[0]["_composite_entity_id"] == "P12345,Q9Y6R4"
+        assert expanded_data[2]["_composite_entity_id"] is None
+
+    @pytest.mark.asyncio
+    async def test_overlapping_separators(self):
+        """Test separators sharing characters are applied in sequence."""
+        action = ParseCompositeIdentifiersAction()
+        context = {
+            "datasets": {"ids": [{"id": "A::B:C"}, {"id": "D"}]},
+            "statistics": {},
+        }
+
+        params = ParseCompositeIdentifiersParams(
+            input_key="ids",
+            id_field="id",
+            output_key="split_ids",
+            separators=["::", ":"]
+        )
+
+        result = await action.execute_typed(params=params, context=context)
+
+        assert result.success is True
+        assert [row["id"] for row in context["datasets"]["split_ids"]] == ["A", "B", "C", "D"]
+        assert context["statistics"]["composite_expansion"]["max_components"] == 3
+        assert context["statistics"]["composite_tracking"]["patterns_used"] == {"::": 1, ":": 1}
+
 
 class TestBiologicalIdentifierPatterns:
     """Test parsing of realistic biological identifier patterns."""
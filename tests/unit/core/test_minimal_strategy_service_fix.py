@@ -53,3 +53,33 @@ class TestVariableSubstitution:
         metadata = {"source_files": [{"path": "/data/proteins.csv"}]}
         result = self.service._substitute_parameters(input_str, parameters, metadata)
         assert result == "Load proteins from /data/proteins.csv"
+
+
+class TestSharedContext:
+    def setup_method(self):
+        """Setup test environment with a temporary strategies directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.service = MinimalStrategyService(strategies_dir=self.temp_dir)
+
+    def test_pydantic_context_views_dict_context(self):
+        """Both context styles share one mapping, no copies"""
+        dict_context = {"current_identifiers": ["P12345"], "datasets": {}}
+        dict_context, pydantic_context = self.service._create_dual_context(dict_context)
+
+        assert pydantic_context.custom_action_data is dict_context
+        pydantic_context.set_action_data("statistics", {"n": 1})
+        assert dict_context["statistics"] == {"n": 1}
+        dict_context["datasets"]["a"] = [1]
+        assert pydantic_context.get_action_data("datasets") == {"a": [1]}
+
+    def test_sync_relinks_replaced_custom_data(self):
+        """Replacing custom_action_data folds its keys back into the dict context"""
+        dict_context = {"current_identifiers": [], "datasets": {"a": [1]}}
+        dict_context, pydantic_context = self.service._create_dual_context(dict_context)
+        pydantic_context.custom_action_data = {"datasets": {"b": [2]}, "extra": 1}
+
+        self.service._sync_contexts(dict_context, pydantic_context)
+
+        assert pydantic_context.custom_action_data is dict_context
+        assert set(dict_context["datasets"]) == {"a", "b"}
+        assert dict_context["extra"] == 1
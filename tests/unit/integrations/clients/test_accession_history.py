@@ -0,0 +1,155 @@
+"""Tests for accession_history.py and seeding the UniProt resolver cache from it."""
+
+import pytest
+
+from src.integrations.clients.accession_history import (
+    AccessionHistoryTable,
+    read_sec_ac,
+    results_frame,
+)
+from src.integrations.clients.uniprot_historical_resolver_client import (
+    UniProtHistoricalResolverClient,
+)
+
+SEC_AC = """\
+UniProt - Swiss-Prot Protein Knowledgebase
+Secondary accession numbers
+
+Secondary AC  Primary AC
+____________  __________
+A0A023GPI4    A0A023GPI8
+P01023        P01024
+P01023        P0C0L4
+Q9Y6K9        Q9Y6K9
+"""
+
+DELAC = """\
+UniProt - Swiss-Prot Protein Knowledgebase
+Deleted entries
+_______________
+A0A009HJL9
+P12345
+-----------------------------------------------------------------------
+Copyrighted by the UniProt Consortium, see https://www.uniprot.org/terms
+-----------------------------------------------------------------------
+"""
+
+
+@pytest.fixture
+def dumps(tmp_path):
+    sec_ac = tmp_path / "sec_ac.txt"
+    sec_ac.write_text(SEC_AC)
+    delac = tmp_path / "delac_sp.txt"
+    delac.write_text(DELAC)
+    return sec_ac, delac
+
+
+class TestDumps:
+    """Test reading UniProt sec_ac and delac dumps."""
+
+    def test_read_sec_ac(self, dumps):
+        pairs = read_sec_ac(dumps[0])
+
+        assert pairs.values.tolist() == [
+            ["A0A023GPI4", "A0A023GPI8"],
+            ["P01023", "P01024"],
+            ["P01023", "P0C0L4"],
+            ["Q9Y6K9", "Q9Y6K9"],
+        ]
+
+    def test_load_dumps(self, dumps):
+        table = AccessionHistoryTable()
+
+        assert table.load_dump(dumps[0]) == 3
+        assert table.load_dump(dumps[1]) == 2
+
+        assert table.mapping_results(["A0A023GPI4", "P01023", "P12345", "P99999"]) == {
+            "A0A023GPI4": (["A0A023GPI8"], "secondary:A0A023GPI8"),
+            "P01023": (["P01024", "P0C0L4"], "demerged"),
+            "P12345": (None, "obsolete"),
+        }
+        with pytest.raises(ValueError):
+            table.load_dump(dumps[0].with_name("other.txt"))
+
+    def test_unchanged_dumps_are_skipped(self, dumps, tmp_path):
+        path = tmp_path / "history.db"
+        table = AccessionHistoryTable(path)
+        assert table.load_dump(dumps[0]) == 3
+        table.close()
+
+        reopened = AccessionHistoryTable(path)
+        assert reopened.load_dump(dumps[0]) is None
+        assert reopened.load_dump(dumps[0], force=True) == 3
+        assert len(reopened) == 3
+
+        # A changed dump is loaded again
+        dumps[0].write_text(SEC_AC + "P99999        P01024\n")
+        assert reopened.load_dump(dumps[0]) == 4
+        assert reopened.mapping_results(["P99999", "P01023"]) == {
+            "P99999": (["P01024"], "secondary:P01024"),
+            "P01023": (["P01024", "P0C0L4"], "demerged"),
+        }
+
+    def test_sec_ac_is_streamed(self, dumps, monkeypatch):
+        from src.integrations.clients import accession_history
+
+        # Split the dump across chunks, including the demerged pair
+        monkeypatch.setattr(accession_history, "DUMP_CHUNK_SIZE", 2)
+        table = AccessionHistoryTable()
+
+        assert table.load_sec_ac(dumps[0]) == 3
+        assert table.mapping_results()["P01023"] == (["P01024", "P0C0L4"], "demerged")
+
+
+class TestAccessionHistoryTable:
+    """Test storing and looking up resolutions."""
+
+    def test_results_persist_and_skip_errors(self, tmp_path):
+        path = tmp_path / "history.db"
+        table = AccessionHistoryTable(path)
+        stored = table.add_results(
+            {
+                "P1": (["P1"], "primary"),
+                "D1": (["Q2", "Q1"], "demerged"),
+                "O1": (None, "obsolete"),
+                "E1": (None, "error:batch_processing_failed:timeout"),
+                "X1,Y1": (["A"], "composite:resolved|X1:primary"),
+            }
+        )
+        table.close()
+
+        reopened = AccessionHistoryTable(path)
+        assert stored == 3 and len(reopened) == 3
+        rows = reopened.lookup(["D1", "E1", "O1"])
+        assert rows.values.tolist() == [
+            ["D1", "Q2", "demerged"],
+            ["D1", "Q1", "demerged"],
+            ["O1", None, "obsolete"],
+        ]
+
+    def test_add_replaces_accession(self):
+        table = AccessionHistoryTable()
+        table.add_results({"S1": (["P1", "P2"], "demerged")})
+        table.add_results({"S1": (["P2"], "secondary:P2")})
+
+        assert table.mapping_results() == {"S1": (["P2"], "secondary:P2")}
+
+    def test_results_frame(self):
+        frame = results_frame({"D1": (["Q1", "Q2"], "demerged"), "O1": (None, "obsolete")})
+
+        assert frame.values.tolist() == [
+            ["D1", "Q1", "demerged"],
+            ["D1", "Q2", "demerged"],
+            ["O1", None, "obsolete"],
+        ]
+
+    @pytest.mark.asyncio
+    async def test_seed_client_cache(self, dumps):
+        table = AccessionHistoryTable()
+        table.load_dump(dumps[0])
+        client = UniProtHistoricalResolverClient()
+
+        assert await client.load_history(table, ["P01023"]) == 1
+        results = await client.map_identifiers(["P01023"])
+
+        assert results == {"P01023": (["P01024", "P0C0L4"], "demerged")}
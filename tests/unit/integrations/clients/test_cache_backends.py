@@ -0,0 +1,142 @@
+"""Tests for cache_backends.py and persistent caching in CachedMappingClientMixin."""
+
+import sqlite3
+
+import pytest
+
+from src.integrations.clients.base_client import BaseMappingClient, CachedMappingClientMixin
+from src.integrations.clients.cache_backends import LRUCache, SQLiteCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLRUCache:
+    """Test eviction order and expiry."""
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(2)
+        cache.put_many({"a": 1, "b": 2})
+        assert cache.get_many(["a"]) == {"a": 1}  # "b" is now least recent
+
+        cache.put_many({"c": 3})
+
+        assert cache.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+
+    def test_ttl(self):
+        clock = FakeClock()
+        cache = LRUCache(10, ttl=5, clock=clock)
+        cache.put_many({"a": 1})
+
+        clock.now = 4.9
+        assert "a" in cache
+        clock.now = 5.0
+        assert cache.get_many(["a"]) == {} and len(cache) == 0
+
+
+class TestSQLiteCache:
+    """Test persistence, namespaces and versions."""
+
+    def test_round_trip_across_instances(self, tmp_path):
+        path = tmp_path / "cache.db"
+        cache = SQLiteCache(path, namespace="uniprot")
+        cache.put_many({f"P{i}": [[f"Q{i}"], "primary"] for i in range(1200)})
+        cache.close()
+
+        reopened = SQLiteCache(path, namespace="uniprot")
+        found = reopened.get_many([f"P{i}" for i in range(1300)])
+
+        assert len(found) == 1200 and found["P7"] == [["Q7"], "primary"]
+        assert SQLiteCache(path, namespace="other").get_many(["P7"]) == {}
+
+    def test_version_bump_invalidates_and_prunes(self, tmp_path):
+        path = tmp_path / "cache.db"
+        SQLiteCache(path, version="1").put_many({"a": 1})
+        SQLiteCache(path, namespace="kept", version="1").put_many({"a": 1})
+
+        bumped = SQLiteCache(path, version="2")
+
+        assert bumped.get_many(["a"]) == {} and len(bumped) == 0
+        assert len(SQLiteCache(path, version="1")) == 0
+        assert len(SQLiteCache(path, namespace="kept", version="1")) == 1
+
+    def test_expired_entries_are_ignored(self, tmp_path):
+        cache = SQLiteCache(tmp_path / "cache.db", ttl=-1)
+        cache.put_many({"a": 1})
+        assert cache.get_many(["a"]) == {}
+
+
+class PersistentClient(CachedMappingClientMixin, BaseMappingClient):
+    async def map_identifiers(self, identifiers, config=None):
+        return {}
+
+
+class TestPersistentMixin:
+    """Test write-through caching for mapping clients."""
+
+    @pytest.mark.asyncio
+    async def test_results_survive_new_client(self, tmp_path):
+        config = {"cache_path": str(tmp_path / "cache.db")}
+        first = PersistentClient(cache_size=10, config=config)
+        await first._add_many_to_cache({"P1": (["P1"], "primary"), "P2": (None, "obsolete")})
+
+        second = PersistentClient(cache_size=10, config=config)
+        found = await second._get_many_from_cache(["P1", "P2", "P3"])
+
+        assert found == {"P1": (["P1"], "primary"), "P2": (None, "obsolete")}
+        stats = second.get_cache_stats()
+        assert stats["cache_hits"] == 2 and stats["cache_misses"] == 1
+        assert stats["persistent_hits"] == 2 and stats["persistent_cache_size"] == 2
+
+        # Promoted into memory: the second lookup doesn't hit the database
+        await second._get_from_cache("P1")
+        assert second.get_cache_stats()["persistent_hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_clear_and_version(self, tmp_path):
+        config = {"cache_path": str(tmp_path / "cache.db")}
+        client = PersistentClient(config=config)
+        await client._add_to_cache("P1", (["P1"], "primary"))
+
+        bumped = PersistentClient(config={**config, "cache_version": "2"})
+        assert await bumped._get_from_cache("P1") is None
+
+        await client._add_to_cache("P1", (["P1"], "primary"))
+        await client.clear_cache()
+        assert await PersistentClient(config=config)._get_from_cache("P1") is None
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_persisted(self, tmp_path):
+        config = {"cache_path": str(tmp_path / "cache.db")}
+        client = PersistentClient(config=config)
+        await client._add_many_to_cache(
+            {"P1": (["P1"], "primary"), "E1": (None, "error:batch_processing_failed:timeout")}
+        )
+
+        # Kept in memory for this client, gone for the next run
+        assert await client._get_from_cache("E1") is not None
+        later = PersistentClient(config=config)
+        assert await later._get_many_from_cache(["P1", "E1"]) == {"P1": (["P1"], "primary")}
+
+    @pytest.mark.asyncio
+    async def test_close_releases_shared_connection(self, tmp_path):
+        config = {"cache_path": str(tmp_path / "cache.db")}
+        first, second = PersistentClient(config=config), PersistentClient(config=config)
+        connection = first._persistent_cache._conn
+        assert second._persistent_cache._conn is connection
+
+        await first.close()
+        await second._add_to_cache("P1", (["P1"], "primary"))
+        await second.close()
+
+        # The last user closed the connection
+        with pytest.raises(sqlite3.ProgrammingError):
+            connection.execute("SELECT 1")
+        reopened = PersistentClient(config=config)
+        assert await reopened._get_from_cache("P1") == (["P1"], "primary")
+        await reopened.close()
@@ -0,0 +1,46 @@
+"""Tests for http_session.py."""
+
+import asyncio
+import threading
+
+import pytest
+
+from core.infrastructure.action_pool import shared_resources
+from integrations.clients.http_session import SessionPool, shared_session_pool
+
+
+@pytest.fixture(autouse=True)
+async def release_pools():
+    yield
+    await shared_resources.close()
+
+
+class TestSharedSessionPool:
+    """Test pool registration and shutdown."""
+
+    async def test_pools_are_keyed_on_settings(self):
+        default = shared_session_pool("uniprot")
+        narrow = shared_session_pool("uniprot", limit_per_host=2)
+
+        assert shared_session_pool("uniprot", limit_per_host=10) is default
+        assert shared_session_pool("uniprot", limit_per_host=2) is narrow
+        assert narrow is not default and narrow.limit_per_host == 2
+        assert shared_session_pool("lipid_maps") is not default
+
+    async def test_close_closes_sessions_of_every_loop(self):
+        pool = SessionPool()
+        sessions = []
+
+        async def open_session():
+            sessions.append(pool.session())
+
+        # One session from a loop that has finished, one from the running loop
+        thread = threading.Thread(target=lambda: asyncio.run(open_session()))
+        thread.start()
+        thread.join()
+        await open_session()
+
+        await pool.close()
+
+        assert len(sessions) == 2
+        assert all(session.closed for session in sessions)
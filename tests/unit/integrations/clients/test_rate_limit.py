@@ -0,0 +1,65 @@
+"""Tests for rate_limit.py."""
+
+import asyncio
+
+import pytest
+
+from integrations.clients.rate_limit import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket:
+    """Test bursts, refill and queued waits."""
+
+    async def test_burst_then_queued_waits(self, monkeypatch):
+        clock = FakeClock()
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+
+        monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+        bucket = TokenBucket(rate=4, clock=clock)
+
+        waits = [await bucket.acquire() for _ in range(6)]
+
+        # Four immediate tokens, then each caller waits behind the previous one
+        assert waits[:4] == [0.0] * 4
+        assert waits[4:] == [pytest.approx(0.25), pytest.approx(0.5)]
+        assert sleeps == waits[4:]
+
+    async def test_refill_is_capped(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=1, clock=clock)
+
+        assert await bucket.acquire() == 0.0
+        clock.now = 100.0
+        assert await bucket.acquire() == 0.0
+        clock.now = 100.25
+        bucket._refill()
+        assert bucket._tokens == pytest.approx(0.5)
+
+    async def test_concurrent_callers_are_spread_out(self):
+        bucket = TokenBucket(rate=50, capacity=1)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        async def timed():
+            await bucket.acquire()
+            return loop.time() - start
+
+        times = sorted(await asyncio.gather(*(timed() for _ in range(5))))
+
+        assert times[0] < 0.01
+        assert times[-1] >= 0.075
+
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
@@ -752,4 +752,75 @@ class TestBiologicalDataIntegration:
             # Verify composite ID handling
             composite_result = result["P12345,P67890"]
             assert set(composite_result[0]) == {"P12345", "P67890"}
-            assert "composite:resolved" in composite_result[1]
\ No newline at end of file
+            assert "composite:resolved" in composite_result[1]
+
+class TestUniProtHistoricalResolverConcurrency:
+    """Test pooled connections, batch planning and concurrent dispatch."""
+
+    def test_plan_batches_respects_count_and_query_length(self):
+        short_ids = [f"P{i:05d}" for i in range(120)]
+        assert [len(b) for b in UniProtHistoricalResolverClient._plan_batches(short_ids)] == [50, 50, 20]
+
+        long_ids = [f"A0A{i:07d}-12" for i in range(200)]
+        batches = UniProtHistoricalResolverClient._plan_batches(long_ids, max_batch_size=200)
+        assert sum(batches, []) == long_ids
+        for batch in batches:
+            query = " OR ".join(f"(sec_acc:{acc})" for acc in batch)
+            assert len(query) <= 2000
+        assert len(batches) == 3
+
+    @pytest.mark.asyncio
+    async def test_batches_run_concurrently_within_semaphore(self):
+        client = UniProtHistoricalResolverClient(config={"max_concurrent_requests": 3})
+        active = peak = 0
+
+        async def fake_fetch(query):
+            nonlocal active, peak
+            async with client.semaphore:
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+            return {"results": []}
+
+        ids = [f"P{i:05d}" for i in range(400)]
+        with patch.object(client, "_fetch_uniprot_search_results", side_effect=fake_fetch):
+            results = await client.map_identifiers(ids)
+
+        assert peak == 3
+        assert len(results) == 400
+        assert all(meta == "obsolete" for _, meta in results.values())
+
+    @pytest.mark.asyncio
+    async def test_session_is_shared_across_clients(self):
+        first = UniProtHistoricalResolverClient()
+        second = UniProtHistoricalResolverClient()
+        sessions = []
+
+        def capture(session, *args, **kwargs):
+            sessions.append(session)
+            return mock_aiohttp_session({"results": []})()
+
+        with patch("aiohttp.ClientSession.get", autospec=True, side_effect=capture):
+            await first._fetch_uniprot_search_results("accession:P04637")
+            await second._fetch_uniprot_search_results("accession:P38398")
+
+        assert first.session_pool is second.session_pool
+        assert sessions[0] is sessions[1] and not sessions[0].closed
+        await first.session_pool.close()
+        assert sessions[0].closed
+
+    @pytest.mark.asyncio
+    async def test_cache_lookup_is_one_call(self, monkeypatch):
+        client = UniProtHistoricalResolverClient()
+        await client._add_many_to_cache({"P04637": (["P04637"], "primary")})
+        monkeypatch.setattr(
+            client, "_get_from_cache", AsyncMock(side_effect=AssertionError("per-ID lookup"))
+        )
+
+        with patch.object(client, "_resolve_batch", return_value={}) as mock_resolve:
+            results = await client.map_identifiers(["P04637", "P38398"])
+
+        assert results["P04637"] == (["P04637"], "primary")
+        assert mock_resolve.call_args[0][0] == ["P38398"]
+        assert client.get_cache_stats()["cache_hits"] == 1
@@ -1,5 +1,6 @@
 """Unit tests for semantic metabolite matching action."""
 
+import json
 import os
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
@@ -39,7 +40,19 @@ class TestEmbeddingCache:
 
         # Create new cache instance
         new_cache = EmbeddingCache(str(tmp_path))
-        assert new_cache.get(text) == embedding
+        assert new_cache.get(text) == pytest.approx(embedding)
+
+    def test_legacy_json_files_are_migrated(self, tmp_path):
+        """Per-text JSON files from earlier versions are still read."""
+        import hashlib
+
+        text = "test metabolite"
+        cache_file = tmp_path / f"{hashlib.md5(text.encode()).hexdigest()}.json"
+        cache_file.write_text(json.dumps([0.5, 0.25]))
+
+        cache = EmbeddingCache(str(tmp_path))
+        assert cache.get(text) == [0.5, 0.25]
+        assert text in cache.store
 
     def test_invalid_disk_cache(self, tmp_path):
         """Test handling of corrupted cache files."""
@@ -70,10 +83,11 @@ class TestSemanticMetaboliteMatchAction:
         """Mock OpenAI client."""
         client = MagicMock()
 
-        # Mock embedding response
-        embedding_response = MagicMock()
-        embedding_response.data = [MagicMock(embedding=[0.1] * 1536)]
-        client.embeddings.create.return_value = embedding_response
+        # Mock embedding response, one embedding per input text
+        def create_embeddings(input, model):
+            return MagicMock(data=[MagicMock(embedding=[0.1] * 1536) for _ in input])
+
+        client.embeddings.create.side_effect = create_embeddings
 
         # Mock chat completion response
         chat_response = MagicMock()
@@ -204,11 +218,36 @@ class TestSemanticMetaboliteMatchAction:
 
         embeddings = await action._generate_embeddings(texts, "text-embedding-ada-002")
 
-        # Should only call API twice (test1 cached on second occurrence)
-        assert mock_openai_client.embeddings.create.call_count == 2
+        # One batched request for the distinct texts
+        assert mock_openai_client.embeddings.create.call_count == 1
+        assert mock_openai_client.embeddings.create.call_args.kwargs["input"] == [
+            "test1",
+            "test2",
+        ]
         assert len(embeddings) == 3
         assert embeddings[0] == embeddings[2]  # Cached result
 
+    @pytest.mark.asyncio
+    async def test_generate_embeddings_batches_cache_misses(self, action, mock_openai_client):
+        """Only uncached texts are requested, in batches of batch_size."""
+        action.openai_client = mock_openai_client
+        action.embedding_cache = EmbeddingCache()
+        action.embedding_cache.set("cached", [0.5] * 1536)
+        texts = ["cached"] + [f"text{i}" for i in range(5)]
+
+        embeddings = await action._generate_embeddings(
+            texts, "model", batch_size=2, concurrency=2
+        )
+
+        batches = [
+            call.kwargs["input"]
+            for call in mock_openai_client.embeddings.create.call_args_list
+        ]
+        assert sorted(batches) == [["text0", "text1"], ["text2", "text3"], ["text4"]]
+        assert embeddings[0] == [0.5] * 1536
+        assert all(emb == [0.1] * 1536 for emb in embeddings[1:])
+        assert "text4" in action.embedding_cache
+
     @pytest.mark.asyncio
     async def test_generate_embeddings_error_handling(self, action):
         """Test embedding generation error handling."""
@@ -222,6 +261,52 @@ class TestSemanticMetaboliteMatchAction:
         assert len(embeddings) == 1
         assert all(v == 0.0 for v in embeddings[0])
 
+    @pytest.mark.asyncio
+    async def test_failed_embeddings_match_model_dimension(self, action):
+        """Zero vectors for failed texts have the length of the model's vectors."""
+        action.openai_client = MagicMock()
+        action.openai_client.embeddings.create.side_effect = Exception("API Error")
+        action.embedding_cache = EmbeddingCache(namespace="text-embedding-3-large")
+        action.embedding_cache.set("cached", [0.5] * 8)
+
+        embeddings = await action._generate_embeddings(["cached", "new"], "model")
+        assert embeddings[1] == [0.0] * 8
+
+        action.embedding_cache = EmbeddingCache(namespace="text-embedding-3-large")
+        embeddings = await action._generate_embeddings(["new"], "text-embedding-3-large")
+        assert len(embeddings[0]) == 3072
+
+    def test_embedding_cache_per_model(self, action, tmp_path):
+        """Each embedding model gets its own cache namespace."""
+        action.openai_client = MagicMock()
+        with patch.dict(os.environ, {"SEMANTIC_MATCH_CACHE_DIR": str(tmp_path)}):
+            action._initialize_clients("text-embedding-3-small")
+            small_cache = action.embedding_cache
+            small_cache.set("glucose", [0.1, 0.2])
+
+            action._initialize_clients("text-embedding-3-large")
+            assert action.embedding_cache.namespace == "text-embedding-3-large"
+            assert action.embedding_cache.get("glucose") is None
+
+            action._initialize_clients("text-embedding-3-small")
+            assert action.embedding_cache.get("glucose") == pytest.approx([0.1, 0.2])
+
+    def test_embedding_cache_follows_run_cache_dir(self, action, tmp_path):
+        """A reused instance picks up each run's cache directory."""
+        action.openai_client = MagicMock()
+        first_dir, second_dir = tmp_path / "first", tmp_path / "second"
+        with patch.dict(os.environ, {"SEMANTIC_MATCH_CACHE_DIR": str(first_dir)}):
+            action._initialize_clients("text-embedding-3-small")
+            assert action.embedding_cache.cache_dir == first_dir
+
+            os.environ["SEMANTIC_MATCH_CACHE_DIR"] = str(second_dir)
+            action._initialize_clients("text-embedding-3-small")
+            assert action.embedding_cache.cache_dir == second_dir
+
+            # An explicit cache_dir param wins over the environment
+            action._initialize_clients("text-embedding-3-small", str(first_dir))
+            assert action.embedding_cache.cache_dir == first_dir
+
     @pytest.mark.asyncio
     async def test_validate_match_with_llm(self, action, mock_openai_client):
         """Test LLM validation."""